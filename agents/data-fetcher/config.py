@@ -46,6 +46,9 @@ exchange_config = {
     },
 }
 
+# Quota del budget market data per IP (120 req/s, condiviso con historical-data e frontend)
+BYBIT_MARKET_SHARE = float(os.getenv("BYBIT_MARKET_SHARE", "0.5"))
+
 # ----------------------------------------------------------------------
 # Configurazione Download Dati
 # ----------------------------------------------------------------------
@@ -64,6 +67,10 @@ WARMUP_CANDLES = 100
 # Candele totali da scaricare (CANDLES_LIMIT + WARMUP_CANDLES)
 TOTAL_CANDLES_TO_FETCH = CANDLES_LIMIT + WARMUP_CANDLES
 
+# Modalità incrementale: scarica solo le candele dopo l'ultima salvata
+# (ricalcola gli indicatori solo sulla coda usando la finestra di warmup salvata)
+INCREMENTAL_FETCH = os.getenv("INCREMENTAL_FETCH", "true").lower() == "true"
+
 # Numero di simboli da analizzare (top per volume)
 # Nota: Scarichiamo 150 per avere margine - historical-data si ferma a 100 successi
 TOP_SYMBOLS_COUNT = 150
@@ -71,12 +78,21 @@ TOP_SYMBOLS_COUNT = 150
 # Giorni di dati massimi da mantenere nel database
 DATA_RETENTION_DAYS = 90
 
+# Retention realtime_ohlcv: candele sempre mantenute per serie (warmup indicatori + display)
+RETENTION_MIN_CANDLES = TOTAL_CANDLES_TO_FETCH
+
+# Tetto massimo di candele per serie (0 = nessun limite)
+RETENTION_MAX_CANDLES = int(os.getenv("RETENTION_MAX_CANDLES", "1000"))
+
+# Ogni quanti minuti il daemon esegue la retention
+RETENTION_INTERVAL_MINUTES = 60
+
+# Righe massime cancellate per transazione (WAL piccolo, lock brevi)
+RETENTION_BATCH_ROWS = 5000
+
 # Intervallo di aggiornamento candele (minuti)
 UPDATE_INTERVAL_MINUTES = 15
 
-# File di segnale per refresh manuale
-REFRESH_SIGNAL_FILE = "refresh_signal.txt"
-
 # ----------------------------------------------------------------------
 # Configurazione Cache (shared volume)
 # ----------------------------------------------------------------------
@@ -3,5 +3,9 @@ Core module - Database Cache
 """
 
 from .database_cache import DatabaseCache
+from .bulk_writer import RealtimeBulkWriter
+from .rate_limiter import BybitRateLimiter, get_rate_limiter
+from .ticker_cache import TickerCache
+from .retention import RealtimeRetention
 
-__all__ = ['DatabaseCache']
+__all__ = ['DatabaseCache', 'RealtimeBulkWriter', 'BybitRateLimiter', 'get_rate_limiter', 'TickerCache', 'RealtimeRetention']
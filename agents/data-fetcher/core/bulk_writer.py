@@ -0,0 +1,134 @@
+"""
+🚚 Bulk Writer Module - Vectorized realtime_ohlcv upserts
+
+Turns indicator DataFrames into column arrays once and streams every row
+of a fetch cycle through a single prepared executemany inside one
+transaction (instead of one execute per candle and one commit per symbol).
+Rows go straight to realtime_ohlcv_c (integer ids + epoch-ms timestamps,
+see core.compact_schema); the latest_candles rows and the table_stats
+counters of the written series are refreshed in the same transaction,
+which also publishes the candles_updated event (core.event_bus).
+"""
+
+import logging
+import time
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .compact_schema import compact_name, get_ids, to_epoch_ms
+from .event_bus import CANDLES_UPDATED, publish, ring
+from .indicators import INDICATOR_COLUMNS
+from .latest_candles import refresh_latest
+from .table_stats import refresh_series_stats
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+VALUE_COLUMNS = OHLCV_COLUMNS + INDICATOR_COLUMNS
+
+REALTIME_UPSERT_SQL = f'''
+    INSERT OR REPLACE INTO {compact_name('realtime_ohlcv')}
+    (symbol_id, tf_id, ts, {', '.join(VALUE_COLUMNS)})
+    VALUES ({', '.join(['?'] * (3 + len(VALUE_COLUMNS)))})
+'''
+
+
+def frame_to_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert an OHLCV + indicators DataFrame into column arrays.
+
+    Args:
+        df: DataFrame with datetime index (or 'timestamp' column)
+
+    Returns:
+        Tuple of (timestamps as int64 epoch ms,
+        float64 matrix with VALUE_COLUMNS in order; missing columns are NaN)
+    """
+    if 'timestamp' in df.columns:
+        timestamps = to_epoch_ms(df['timestamp'])
+    else:
+        timestamps = to_epoch_ms(df.index)
+
+    values = df.reindex(columns=VALUE_COLUMNS).to_numpy(dtype=np.float64, na_value=np.nan)
+    return timestamps, values
+
+
+class RealtimeBulkWriter:
+    """
+    Accumulates realtime candles for a whole fetch cycle and writes them
+    in one transaction.
+
+    Usage:
+        writer = RealtimeBulkWriter(db_cache)
+        writer.add(symbol, '15m', df_with_indicators)
+        saved = writer.flush()
+    """
+
+    def __init__(self, db_cache):
+        self.db_cache = db_cache
+        self._batches: List[Tuple[str, str, np.ndarray, np.ndarray]] = []
+        self.pending_rows = 0
+        self.last_rows_per_sec = 0.0
+        self.last_duration_sec = 0.0
+
+    def add(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Queue a DataFrame for the next flush.
+
+        Returns:
+            Number of rows queued
+        """
+        if df is None or df.empty:
+            return 0
+
+        timestamps, values = frame_to_arrays(df)
+        self._batches.append((symbol, timeframe, timestamps, values))
+        self.pending_rows += len(timestamps)
+        return len(timestamps)
+
+    def _iter_rows(self, ids: List[Tuple[int, int]]) -> Iterator[list]:
+        """Yield parameter rows batch by batch (NaN converted to NULL)"""
+        for (symbol_id, tf_id), (_, _, timestamps, values) in zip(ids, self._batches):
+            cells = values.astype(object)
+            cells[np.isnan(values)] = None
+            for ts, row in zip(timestamps.tolist(), cells.tolist()):
+                yield [symbol_id, tf_id, ts, *row]
+
+    def flush(self) -> int:
+        """
+        Write all queued rows with a single executemany in one transaction.
+
+        Returns:
+            Number of rows written
+        """
+        if not self._batches:
+            return 0
+
+        total = self.pending_rows
+        timeframes = sorted({timeframe for _, timeframe, _, _ in self._batches})
+        start = time.perf_counter()
+
+        conn = self.db_cache._get_connection()
+        try:
+            with conn:
+                ids = [get_ids(conn, symbol, timeframe, create=True) for symbol, timeframe, _, _ in self._batches]
+                conn.executemany(REALTIME_UPSERT_SQL, self._iter_rows(ids))
+                # Same transaction: readers never see candles newer than the snapshot
+                refresh_latest(conn, ids)
+                refresh_series_stats(conn, 'realtime_ohlcv', ids)
+                publish(conn, CANDLES_UPDATED,
+                        {'timeframes': timeframes, 'series': len(set(ids)), 'rows': total})
+        finally:
+            conn.close()
+            self._batches = []
+            self.pending_rows = 0
+        ring(self.db_cache.db_path, CANDLES_UPDATED)
+
+        self.last_duration_sec = time.perf_counter() - start
+        self.last_rows_per_sec = total / self.last_duration_sec if self.last_duration_sec > 0 else 0.0
+
+        logging.info(
+            f"💾 Bulk upsert: {total:,} rows in {self.last_duration_sec:.2f}s "
+            f"({self.last_rows_per_sec:,.0f} rows/s)"
+        )
+        return total
@@ -16,6 +16,16 @@ from typing import List, Dict, Tuple, Optional
 import pandas as pd
 from termcolor import colored
 
+from .bulk_writer import RealtimeBulkWriter
+from .event_bus import ensure_events_table
+from .latest_candles import LATEST_VIEW, LATEST_TABLE, ensure_latest_table
+from .retention import RealtimeRetention
+from .table_stats import check_stats, ensure_stats, get_table_summary
+from .compact_migration import ensure_compact_tables
+from .compact_schema import compact_name, from_epoch_ms, get_ids, ms_to_text
+
+REALTIME_TABLE = compact_name('realtime_ohlcv')
+
 # Database path from environment
 SHARED_DATA_PATH = os.getenv("SHARED_DATA_PATH", "/app/shared")
 DB_PATH = f"{SHARED_DATA_PATH}/data_cache/trading_data.db"
@@ -88,50 +98,36 @@ class DatabaseCache:
             INSERT OR IGNORE INTO update_status (id, status) VALUES (1, 'IDLE')
         ''')
         
+        conn.commit()
+        
         # =========================================
         # TABLE 3: realtime_ohlcv (MAIN TABLE)
+        # Compact layout v2: realtime_ohlcv_c + compatibility view.
+        # The data-fetcher starts first and is the designated migrator: it
+        # copies every legacy v1 table, the other agents wait for it
         # =========================================
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS realtime_ohlcv (
-                symbol TEXT,
-                timeframe TEXT,
-                timestamp TEXT,
-                open REAL,
-                high REAL,
-                low REAL,
-                close REAL,
-                volume REAL,
-                
-                -- Technical Indicators (16 total)
-                sma_20 REAL,
-                sma_50 REAL,
-                ema_12 REAL,
-                ema_26 REAL,
-                bb_upper REAL,
-                bb_mid REAL,
-                bb_lower REAL,
-                macd REAL,
-                macd_signal REAL,
-                macd_hist REAL,
-                rsi REAL,
-                stoch_k REAL,
-                stoch_d REAL,
-                atr REAL,
-                volume_sma REAL,
-                obv REAL,
-                
-                PRIMARY KEY (symbol, timeframe, timestamp)
-            )
-        ''')
+        ensure_compact_tables(conn, migrate=True)
         
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_rt_symbol ON realtime_ohlcv(symbol)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_rt_timeframe ON realtime_ohlcv(timeframe)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_rt_timestamp ON realtime_ohlcv(timestamp)')
+        # =========================================
+        # TABLE 4: latest_candles (newest candle per series)
+        # =========================================
+        ensure_latest_table(conn)
+        
+        # =========================================
+        # TABLE 5: table_stats (row counts / time bounds per series)
+        # =========================================
+        ensure_stats(conn, 'realtime_ohlcv')
+        
+        # =========================================
+        # TABLE 6: agent_events (change notifications between agents)
+        # =========================================
+        ensure_events_table(conn)
         
         conn.commit()
         conn.close()
         
-        logging.info("🗄️ Database initialized (3 tables: top_symbols, update_status, realtime_ohlcv)")
+        logging.info("🗄️ Database initialized (6 tables: top_symbols, update_status, realtime_ohlcv, "
+                     "latest_candles, table_stats, agent_events)")
     
     # =========================================
     # TOP SYMBOLS METHODS
@@ -212,6 +208,9 @@ class DatabaseCache:
         Save OHLCV data with indicators to realtime_ohlcv table.
         Uses INSERT OR REPLACE for upsert behavior.
         
+        Single-symbol wrapper around RealtimeBulkWriter; fetch cycles should
+        queue every symbol on one writer and flush once instead.
+        
         Args:
             symbol: Trading pair
             timeframe: Candle timeframe
@@ -220,88 +219,86 @@ class DatabaseCache:
         if df is None or df.empty:
             return 0
         
-        conn = self._get_connection()
-        cur = conn.cursor()
-        
-        data = df.reset_index()
-        if 'timestamp' in data.columns:
-            if pd.api.types.is_datetime64_any_dtype(data['timestamp']):
-                data['timestamp'] = data['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Indicator columns (16 total)
-        indicator_cols = [
-            'sma_20', 'sma_50', 'ema_12', 'ema_26',
-            'bb_upper', 'bb_mid', 'bb_lower',
-            'macd', 'macd_signal', 'macd_hist',
-            'rsi', 'stoch_k', 'stoch_d', 'atr',
-            'volume_sma', 'obv'
-        ]
-        
-        count = 0
-        for _, row in data.iterrows():
-            try:
-                # Build dynamic query with indicators
-                cols = 'symbol, timeframe, timestamp, open, high, low, close, volume'
-                placeholders = '?, ?, ?, ?, ?, ?, ?, ?'
-                values = [
-                    symbol, timeframe, row['timestamp'],
-                    float(row['open']), float(row['high']), 
-                    float(row['low']), float(row['close']), 
-                    float(row['volume'])
-                ]
-                
-                for col in indicator_cols:
-                    cols += f', {col}'
-                    placeholders += ', ?'
-                    val = row.get(col, None) if hasattr(row, 'get') else (row[col] if col in row.index else None)
-                    values.append(None if val is None or pd.isna(val) else float(val))
-                
-                cur.execute(f'''
-                    INSERT OR REPLACE INTO realtime_ohlcv 
-                    ({cols})
-                    VALUES ({placeholders})
-                ''', values)
-                count += 1
-            except Exception as e:
-                logging.warning(f"Error saving realtime candle {symbol}[{timeframe}]: {e}")
-        
-        conn.commit()
-        conn.close()
-        return count
+        writer = RealtimeBulkWriter(self)
+        writer.add(symbol, timeframe, df)
+        return writer.flush()
     
     def get_realtime_ohlcv(self, symbol: str, timeframe: str, limit: int = 500) -> pd.DataFrame:
         """Get real-time OHLCV data with indicators from database"""
         conn = self._get_connection()
+        ids = get_ids(conn, symbol, timeframe)
+        if ids is None:
+            conn.close()
+            return pd.DataFrame()
         
-        query = '''
-            SELECT timestamp, open, high, low, close, volume,
+        query = f'''
+            SELECT ts AS timestamp, open, high, low, close, volume,
                    sma_20, sma_50, ema_12, ema_26,
                    bb_upper, bb_mid, bb_lower,
                    macd, macd_signal, macd_hist,
                    rsi, stoch_k, stoch_d, atr,
                    volume_sma, obv
-            FROM realtime_ohlcv
-            WHERE symbol = ? AND timeframe = ?
-            ORDER BY timestamp DESC
+            FROM {REALTIME_TABLE}
+            WHERE symbol_id = ? AND tf_id = ?
+            ORDER BY ts DESC
             LIMIT ?
         '''
         
-        df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
+        df = pd.read_sql_query(query, conn, params=(*ids, limit))
         conn.close()
         
         if len(df) > 0:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = from_epoch_ms(df['timestamp'])
             df = df.sort_values('timestamp')
             df.set_index('timestamp', inplace=True)
         
         return df
     
+    def get_last_timestamps(self, timeframe: str) -> Dict[str, str]:
+        """
+        Get the latest stored candle timestamp per symbol for a timeframe.
+        
+        Returns:
+            Dict symbol -> timestamp string ('%Y-%m-%d %H:%M:%S')
+        """
+        conn = self._get_connection()
+        cur = conn.cursor()
+        
+        # One row per series in the snapshot (no MAX(ts) per symbol)
+        cur.execute(f'''
+            SELECT s.symbol, l.ts
+            FROM {LATEST_TABLE} l
+            JOIN symbol_ids s ON s.id = l.symbol_id
+            WHERE l.tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
+        ''', (timeframe,))
+        
+        result = {row[0]: ms_to_text(row[1]) for row in cur.fetchall()}
+        conn.close()
+        return result
+    
+    def get_latest_candles(self, timeframe: str = None) -> pd.DataFrame:
+        """Newest candle + indicators + 24h change of every series (one scan of latest_candles)"""
+        conn = self._get_connection()
+        try:
+            query = f'SELECT * FROM {LATEST_VIEW}'
+            params = ()
+            if timeframe:
+                query += ' WHERE timeframe = ?'
+                params = (timeframe,)
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+    
     def get_symbols(self) -> List[str]:
         """Get all symbols with candle data"""
         conn = self._get_connection()
         cur = conn.cursor()
         
-        cur.execute('SELECT DISTINCT symbol FROM realtime_ohlcv ORDER BY symbol')
+        cur.execute(f'''
+            SELECT symbol FROM symbol_ids
+            WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE} WHERE symbol_id = symbol_ids.id)
+            ORDER BY symbol
+        ''')
         symbols = [row[0] for row in cur.fetchall()]
         
         conn.close()
@@ -313,46 +310,47 @@ class DatabaseCache:
         cur = conn.cursor()
         
         if symbol:
-            cur.execute('SELECT DISTINCT timeframe FROM realtime_ohlcv WHERE symbol = ?', (symbol,))
+            cur.execute(f'''
+                SELECT timeframe FROM timeframe_ids
+                WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE}
+                             WHERE symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)
+                               AND tf_id = timeframe_ids.id)
+            ''', (symbol,))
         else:
-            cur.execute('SELECT DISTINCT timeframe FROM realtime_ohlcv')
+            cur.execute(f'''
+                SELECT timeframe FROM timeframe_ids
+                WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE} WHERE tf_id = timeframe_ids.id)
+            ''')
         
         timeframes = [row[0] for row in cur.fetchall()]
         conn.close()
         return timeframes
     
     def get_stats(self) -> Dict:
-        """Get database statistics"""
+        """Get database statistics (from the table_stats counters, no table scan)"""
         conn = self._get_connection()
-        cur = conn.cursor()
-        
-        cur.execute('SELECT COUNT(DISTINCT symbol) FROM realtime_ohlcv')
-        symbols_count = cur.fetchone()[0]
-        
-        cur.execute('SELECT COUNT(DISTINCT timeframe) FROM realtime_ohlcv')
-        tf_count = cur.fetchone()[0]
-        
-        cur.execute('SELECT COUNT(*) FROM realtime_ohlcv')
-        candles_count = cur.fetchone()[0]
-        
-        cur.execute('SELECT MIN(timestamp), MAX(timestamp) FROM realtime_ohlcv')
-        time_range = cur.fetchone()
-        
-        # Top symbols stats
-        cur.execute('SELECT COUNT(*) FROM top_symbols')
-        top_count = cur.fetchone()[0]
-        
+        summary = get_table_summary(conn, 'realtime_ohlcv')
+        if summary is None:
+            # Counters not built yet: scan the table once
+            row = conn.execute(f'''
+                SELECT COUNT(DISTINCT symbol_id), COUNT(DISTINCT tf_id), COUNT(*), MIN(ts), MAX(ts)
+                FROM {REALTIME_TABLE}
+            ''').fetchone()
+            summary = {'symbols': row[0], 'timeframes': row[1], 'rows': row[2],
+                       'min_date': ms_to_text(row[3]), 'max_date': ms_to_text(row[4])}
+        
+        top_count = conn.execute('SELECT COUNT(*) FROM top_symbols').fetchone()[0]
         conn.close()
         
         # Database file size
         db_size = Path(self.db_path).stat().st_size if Path(self.db_path).exists() else 0
         
         return {
-            'symbols': symbols_count or 0,
-            'timeframes': tf_count or 0,
-            'candles': candles_count or 0,
-            'min_date': time_range[0] if time_range else None,
-            'max_date': time_range[1] if time_range else None,
+            'symbols': summary['symbols'] or 0,
+            'timeframes': summary['timeframes'] or 0,
+            'candles': summary['rows'] or 0,
+            'min_date': summary['min_date'],
+            'max_date': summary['max_date'],
             'top_symbols_count': top_count or 0,
             'db_size_mb': db_size / (1024 * 1024)
         }
@@ -372,34 +370,17 @@ class DatabaseCache:
             print(colored(f"  📅 Data range: {stats['min_date'][:16]} → {stats['max_date'][:16]}", "white"))
         print(colored("="*60, "cyan"))
     
+    def check_table_stats(self) -> Dict:
+        """Compare the realtime_ohlcv counters with the table and repair drifted series"""
+        conn = self._get_connection()
+        try:
+            return check_stats(conn, 'realtime_ohlcv')
+        finally:
+            conn.close()
+    
     def cleanup_old_data(self, keep_candles: int = 500):
         """Cleanup old candles keeping only latest N per symbol/timeframe"""
-        conn = self._get_connection()
-        cur = conn.cursor()
-        
-        # Get all symbol-timeframe combinations
-        cur.execute('SELECT DISTINCT symbol, timeframe FROM realtime_ohlcv')
-        pairs = cur.fetchall()
-        
-        deleted = 0
-        for symbol, tf in pairs:
-            cur.execute('''
-                DELETE FROM realtime_ohlcv
-                WHERE symbol = ? AND timeframe = ?
-                AND timestamp NOT IN (
-                    SELECT timestamp FROM realtime_ohlcv
-                    WHERE symbol = ? AND timeframe = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                )
-            ''', (symbol, tf, symbol, tf, keep_candles))
-            deleted += cur.rowcount
-        
-        conn.commit()
-        conn.close()
-        
-        if deleted > 0:
-            logging.info(f"🧹 Cleaned up {deleted} old candles")
+        return RealtimeRetention(self, max_candles=keep_candles).run().deleted
     
     # =========================================
     # UPDATE STATUS METHODS
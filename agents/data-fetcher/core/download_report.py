@@ -0,0 +1,41 @@
+"""
+🧾 Download Report Module - Console output of the fetch cycles
+
+- print_symbols_table(): top symbols ranked by 24h volume
+- display_download_summary(): stats of one candle download cycle
+"""
+
+from typing import List, Tuple
+
+from termcolor import colored
+
+
+def print_symbols_table(volumes: List[Tuple[str, float]]):
+    """Print formatted table of symbols with volume"""
+    print(colored("-" * 50, "cyan"))
+    print(colored(f"{'#':<4} {'Symbol':<20} {'Volume 24h':>20}", "white", attrs=['bold']))
+    print(colored("-" * 50, "cyan"))
+
+    for i, (symbol, vol) in enumerate(volumes, 1):
+        symbol_short = symbol.replace('/USDT:USDT', '')
+        vol_str = f"${vol/1e9:.2f}B" if vol >= 1e9 else f"${vol/1e6:.1f}M" if vol >= 1e6 else f"${vol/1e3:.1f}K"
+        print(f"{i:<4} {symbol_short:<20} {vol_str:>20}")
+
+    print(colored("-" * 50, "cyan"))
+
+
+def display_download_summary(stats):
+    """Display download summary"""
+    print(colored("\n" + "="*60, "cyan"))
+    print(colored("📊 DOWNLOAD SUMMARY", "cyan", attrs=['bold']))
+    print(colored("="*60, "cyan"))
+    print(colored(f"  ✅ Symbols processed: {stats['symbols_processed']}", "green"))
+    print(colored(f"  📈 Total candles saved: {stats['candles_saved']:,}", "green"))
+    if stats.get('incremental_pairs'):
+        print(colored(f"  ⏩ Incremental pairs: {stats['incremental_pairs']}", "green"))
+    if stats.get('rows_per_sec'):
+        print(colored(f"  ⚡ Write throughput: {stats['rows_per_sec']:,.0f} rows/s", "green"))
+    print(colored(f"  🪙 Unique symbols: {len(stats.get('downloaded_symbols', []))}", "green"))
+    if stats['errors'] > 0:
+        print(colored(f"  ❌ Errors: {stats['errors']}", "red"))
+    print(colored("="*60, "cyan"))
@@ -0,0 +1,97 @@
+"""
+⏩ Incremental Fetch Module
+
+Helpers for the incremental candle update mode:
+- decide per symbol whether only the tail since the last stored candle
+  can be fetched (instead of TOTAL_CANDLES_TO_FETCH candles)
+- download one timeframe with full and tail requests split accordingly
+(indicators for the tail are computed by core.indicator_engine)
+"""
+
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from termcolor import colored
+
+import config
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Get timeframe duration in milliseconds"""
+    unit = timeframe[-1]
+    amount = int(timeframe[:-1])
+    if unit == 'm':
+        return amount * 60 * 1000
+    if unit == 'h':
+        return amount * 60 * 60 * 1000
+    if unit == 'd':
+        return amount * 24 * 60 * 60 * 1000
+    raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def to_ms(ts) -> int:
+    """Convert a naive-UTC timestamp (str or datetime) to epoch milliseconds"""
+    return int(pd.Timestamp(ts).value // 10**6)
+
+
+def build_since_map(
+    symbols: List[str],
+    timeframe: str,
+    last_timestamps: Dict[str, str],
+    now_ms: int = None
+) -> Dict[str, int]:
+    """
+    Map symbols eligible for incremental fetch to their `since` (epoch ms).
+
+    The last stored candle is re-fetched because it may have been saved
+    while still forming. Symbols without stored data, or missing more than
+    CANDLES_LIMIT candles (e.g. daemon was down), are left out and get a
+    full download.
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    now_ms = now_ms or to_ms(datetime.utcnow())
+
+    since_map = {}
+    for symbol in symbols:
+        last_ts = last_timestamps.get(symbol)
+        if not last_ts:
+            continue
+        last_ms = to_ms(last_ts)
+        if (now_ms - last_ms) // tf_ms > config.CANDLES_LIMIT:
+            continue
+        since_map[symbol] = last_ms
+    return since_map
+
+
+async def download_timeframe(
+    fetcher,
+    db_cache,
+    symbols: List[str],
+    timeframe: str,
+    incremental: bool
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, int]]:
+    """
+    Download one timeframe for `symbols` with a CryptoDataFetcher.
+
+    Symbols with recent stored candles only fetch the tail (CANDLES_LIMIT
+    since their last stored candle); the others get TOTAL_CANDLES_TO_FETCH
+    (CANDLES_LIMIT + warmup, so indicators are valid from the first row).
+
+    Returns:
+        (symbol -> downloaded DataFrame, since_map of the tail symbols)
+    """
+    since_map = {}
+    if incremental:
+        since_map = build_since_map(symbols, timeframe, db_cache.get_last_timestamps(timeframe))
+    full_symbols = [s for s in symbols if s not in since_map]
+
+    data = {}
+    if full_symbols:
+        data.update(await fetcher.download_symbols(full_symbols, timeframe, config.TOTAL_CANDLES_TO_FETCH))
+    if since_map:
+        print(colored(f"⏩ Incremental fetch for {len(since_map)} symbols", "cyan"))
+        data.update(await fetcher.download_symbols(
+            list(since_map), timeframe, config.CANDLES_LIMIT, since_map=since_map
+        ))
+    return data, since_map
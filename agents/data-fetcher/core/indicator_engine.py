@@ -0,0 +1,183 @@
+"""
+⚙️ Indicator Engine Module - Streaming indicators per (symbol, timeframe)
+
+Keeps one IndicatorState per series in memory, persists it to the
+`indicator_state` table so it survives restarts, and extends series
+candle by candle instead of recomputing the whole DataFrame.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .incremental import timeframe_to_ms, to_ms
+from .indicators import calculate_all_indicators
+from .streaming_indicators import IndicatorState, stream_frame
+
+
+class StreamingIndicatorEngine:
+    """
+    Streaming indicator engine backed by SQLite.
+
+    Usage:
+        engine = StreamingIndicatorEngine(db_cache)
+        df_tail = engine.extend(symbol, '15m', new_candles, load_stored)
+        df_full = engine.compute(symbol, '15m', full_download)
+        engine.save()   # after the candles were written
+    """
+
+    def __init__(self, db_cache):
+        self.db_cache = db_cache
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._dirty = set()
+        self._init_table()
+
+    def _init_table(self):
+        conn = self.db_cache._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS indicator_state (
+                symbol TEXT,
+                timeframe TEXT,
+                last_timestamp TEXT,
+                state_json TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (symbol, timeframe)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def load(self, timeframe: str = None) -> int:
+        """Load persisted states into memory (all, or one timeframe)"""
+        conn = self.db_cache._get_connection()
+        if timeframe:
+            rows = conn.execute(
+                'SELECT symbol, timeframe, state_json FROM indicator_state WHERE timeframe = ?',
+                (timeframe,)
+            ).fetchall()
+        else:
+            rows = conn.execute('SELECT symbol, timeframe, state_json FROM indicator_state').fetchall()
+        conn.close()
+
+        for symbol, tf, state_json in rows:
+            try:
+                self._states[(symbol, tf)] = IndicatorState.from_dict(json.loads(state_json))
+            except (ValueError, KeyError) as e:
+                logging.warning(f"Discarding invalid indicator state {symbol}[{tf}]: {e}")
+        return len(rows)
+
+    def save(self) -> int:
+        """Persist states changed since the last save in one transaction"""
+        if not self._dirty:
+            return 0
+
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        rows = [
+            (symbol, tf, self._states[(symbol, tf)].last_timestamp,
+             json.dumps(self._states[(symbol, tf)].to_dict()), now)
+            for symbol, tf in self._dirty if (symbol, tf) in self._states
+        ]
+        conn = self.db_cache._get_connection()
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO indicator_state
+                    (symbol, timeframe, last_timestamp, state_json, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+        finally:
+            conn.close()
+
+        self._dirty.clear()
+        return len(rows)
+
+    def reset(self):
+        """Drop in-memory states (e.g. after a failed write) so they are reloaded"""
+        self._states.clear()
+        self._dirty.clear()
+
+    def get_state(self, symbol: str, timeframe: str) -> Optional[IndicatorState]:
+        return self._states.get((symbol, timeframe))
+
+    def seed(self, symbol: str, timeframe: str, df: pd.DataFrame, now_ms: int = None):
+        """
+        Set the state from a batch-computed frame (OHLCV + indicators).
+        Only closed candles are committed.
+        """
+        closed = df[_closed_mask(df.index, timeframe, now_ms)]
+        self._states[(symbol, timeframe)] = IndicatorState.from_history(closed)
+        self._dirty.add((symbol, timeframe))
+
+    def extend(
+        self,
+        symbol: str,
+        timeframe: str,
+        new: pd.DataFrame,
+        load_stored: Callable[[], pd.DataFrame],
+        now_ms: int = None
+    ) -> pd.DataFrame:
+        """
+        Compute indicators for freshly fetched candles in O(1) per candle.
+
+        Closed candles advance the state; a still-forming last candle is
+        evaluated on a copy. If the state is missing or not contiguous with
+        the new candles, it is rebuilt from stored rows via load_stored().
+
+        Returns:
+            New candles (OHLCV + indicators) not yet committed to the state
+        """
+        key = (symbol, timeframe)
+        first_new = new.index.min()
+        state = self._states.get(key)
+
+        if not self._is_contiguous(state, first_new, timeframe):
+            stored = load_stored()
+            if stored is None or stored.empty:
+                state = IndicatorState()
+            else:
+                state = IndicatorState.from_history(stored[stored.index < first_new])
+            self._states[key] = state
+
+        closed = _closed_mask(new.index, timeframe, now_ms)
+        forming_last = bool(len(closed)) and not closed[-1]
+        result = stream_frame(state, new, commit_last=not forming_last)
+        self._dirty.add(key)
+        return result
+
+    def compute(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        load_stored: Optional[Callable[[], pd.DataFrame]] = None
+    ) -> pd.DataFrame:
+        """
+        Indicators for downloaded candles.
+
+        With load_stored (incremental tail) the series is extended in O(1)
+        per candle; otherwise the full frame is batch-computed and seeds
+        the state.
+        """
+        if load_stored is not None:
+            return self.extend(symbol, timeframe, df, load_stored)
+        df_with_indicators = calculate_all_indicators(df)
+        self.seed(symbol, timeframe, df_with_indicators)
+        return df_with_indicators
+
+    @staticmethod
+    def _is_contiguous(state: Optional[IndicatorState], first_new, timeframe: str) -> bool:
+        if state is None or state.last_timestamp is None:
+            return False
+        last_ms = to_ms(state.last_timestamp)
+        first_ms = to_ms(first_new)
+        return first_ms - timeframe_to_ms(timeframe) <= last_ms <= first_ms
+
+
+def _closed_mask(index: pd.DatetimeIndex, timeframe: str, now_ms: int = None):
+    """True for candles whose period has ended"""
+    now_ms = now_ms or to_ms(datetime.utcnow())
+    open_ms = ((pd.DatetimeIndex(index) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).to_numpy()
+    return (open_ms + timeframe_to_ms(timeframe)) <= now_ms
@@ -9,6 +9,8 @@ import pandas as pd
 import numpy as np
 from typing import Optional
 
+from .indicator_kernels import obv, true_range, stochastic_k, rolling_std
+
 # List of indicator columns
 INDICATOR_COLUMNS = [
     'sma_20', 'sma_50', 'ema_12', 'ema_26',
@@ -72,9 +74,9 @@ def calculate_ema(df: pd.DataFrame, periods: list = [12, 26]) -> pd.DataFrame:
 def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, std_dev: float = 2.0) -> pd.DataFrame:
     """Calculate Bollinger Bands"""
     df['bb_mid'] = df['close'].rolling(window=period).mean()
-    rolling_std = df['close'].rolling(window=period).std()
-    df['bb_upper'] = df['bb_mid'] + (rolling_std * std_dev)
-    df['bb_lower'] = df['bb_mid'] - (rolling_std * std_dev)
+    bb_std = rolling_std(df['close'], period)
+    df['bb_upper'] = df['bb_mid'] + (bb_std * std_dev)
+    df['bb_lower'] = df['bb_mid'] - (bb_std * std_dev)
     return df
 
 
@@ -103,14 +105,7 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
 
 def calculate_stochastic(df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> pd.DataFrame:
     """Calculate Stochastic Oscillator"""
-    low_min = df['low'].rolling(window=k_period).min()
-    high_max = df['high'].rolling(window=k_period).max()
-    
-    # Avoid division by zero
-    range_val = high_max - low_min
-    range_val = range_val.replace(0, np.nan)
-    
-    df['stoch_k'] = 100 * ((df['close'] - low_min) / range_val)
+    df['stoch_k'] = stochastic_k(df['high'], df['low'], df['close'], k_period)
     df['stoch_d'] = df['stoch_k'].rolling(window=d_period).mean()
     
     return df
@@ -118,12 +113,7 @@ def calculate_stochastic(df: pd.DataFrame, k_period: int = 14, d_period: int = 3
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """Calculate ATR (Average True Range)"""
-    high_low = df['high'] - df['low']
-    high_close = abs(df['high'] - df['close'].shift())
-    low_close = abs(df['low'] - df['close'].shift())
-    
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    df['atr'] = true_range.rolling(window=period).mean()
+    df['atr'] = true_range(df['high'], df['low'], df['close']).rolling(window=period).mean()
     
     return df
 
@@ -134,14 +124,6 @@ def calculate_volume_indicators(df: pd.DataFrame, period: int = 20) -> pd.DataFr
     df['volume_sma'] = df['volume'].rolling(window=period).mean()
     
     # OBV (On Balance Volume)
-    obv = [0]
-    for i in range(1, len(df)):
-        if df['close'].iloc[i] > df['close'].iloc[i-1]:
-            obv.append(obv[-1] + df['volume'].iloc[i])
-        elif df['close'].iloc[i] < df['close'].iloc[i-1]:
-            obv.append(obv[-1] - df['volume'].iloc[i])
-        else:
-            obv.append(obv[-1])
-    df['obv'] = obv
+    df['obv'] = obv(df['close'], df['volume'])
     
     return df
@@ -0,0 +1,110 @@
+"""
+📍 Latest Candles Module - Per-series snapshot of realtime_ohlcv
+
+`latest_candles` holds one row per (symbol, timeframe): the newest candle
+with its indicators, the previous MACD histogram and the 24h price change.
+The bulk writer refreshes the series it wrote inside its own transaction,
+so the snapshot never disagrees with realtime_ohlcv_c; whole-market views
+read ~600 rows instead of one ORDER BY ts DESC LIMIT query per symbol.
+
+v_latest_candles exposes it with symbol / timeframe / timestamp text.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from .compact_schema import compact_name, ts_text
+from .indicators import INDICATOR_COLUMNS
+
+LATEST_TABLE = 'latest_candles'
+LATEST_VIEW = 'v_latest_candles'
+REALTIME_TABLE = compact_name('realtime_ohlcv')
+DAY_MS = 24 * 60 * 60 * 1000
+VALUE_COLUMNS = ['open', 'high', 'low', 'close', 'volume'] + INDICATOR_COLUMNS
+
+LATEST_TABLE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {LATEST_TABLE} (
+        symbol_id INTEGER NOT NULL,
+        tf_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        {', '.join(f'{c} REAL' for c in VALUE_COLUMNS)},
+        macd_hist_prev REAL,
+        close_24h_ago REAL,
+        change_24h_pct REAL,
+        updated_at TEXT,
+        PRIMARY KEY (symbol_id, tf_id)
+    ) WITHOUT ROWID
+'''
+
+LATEST_VIEW_SQL = f'''
+    CREATE VIEW IF NOT EXISTS {LATEST_VIEW} AS
+    SELECT s.symbol, t.timeframe, {ts_text('l')} AS timestamp,
+           {', '.join(f'l.{c}' for c in VALUE_COLUMNS)},
+           l.macd_hist_prev, l.close_24h_ago, l.change_24h_pct, l.updated_at
+    FROM {LATEST_TABLE} l
+    JOIN symbol_ids s ON s.id = l.symbol_id
+    JOIN timeframe_ids t ON t.id = l.tf_id
+'''
+
+# Newest candle of one series plus the previous candle and the last candle
+# at least 24h older (primary-key seeks only)
+REFRESH_SQL = f'''
+    INSERT OR REPLACE INTO {LATEST_TABLE}
+    (symbol_id, tf_id, ts, {', '.join(VALUE_COLUMNS)}, macd_hist_prev, close_24h_ago, change_24h_pct, updated_at)
+    SELECT d.symbol_id, d.tf_id, d.ts, {', '.join(f'd.{c}' for c in VALUE_COLUMNS)},
+           (SELECT p.macd_hist FROM {REALTIME_TABLE} p
+            WHERE p.symbol_id = d.symbol_id AND p.tf_id = d.tf_id AND p.ts < d.ts
+            ORDER BY p.ts DESC LIMIT 1),
+           a.close,
+           CASE WHEN a.close > 0 THEN (d.close - a.close) / a.close * 100 END,
+           :now
+    FROM {REALTIME_TABLE} d
+    LEFT JOIN {REALTIME_TABLE} a ON a.symbol_id = d.symbol_id AND a.tf_id = d.tf_id
+         AND a.ts = (SELECT MAX(ts) FROM {REALTIME_TABLE}
+                     WHERE symbol_id = d.symbol_id AND tf_id = d.tf_id AND ts <= d.ts - {DAY_MS})
+    WHERE d.symbol_id = :sid AND d.tf_id = :tid
+      AND d.ts = (SELECT MAX(ts) FROM {REALTIME_TABLE} WHERE symbol_id = :sid AND tf_id = :tid)
+'''
+
+
+def ensure_latest_table(conn: sqlite3.Connection) -> bool:
+    """
+    Create latest_candles and its view (caller commits).
+
+    Returns:
+        True if the table was created and filled from realtime_ohlcv_c
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (LATEST_TABLE,)
+    ).fetchone()
+    conn.execute(LATEST_TABLE_SQL)
+    conn.execute(LATEST_VIEW_SQL)
+    if exists:
+        return False
+
+    series = conn.execute(f'''
+        SELECT s.id, t.id FROM symbol_ids s, timeframe_ids t
+        WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE} WHERE symbol_id = s.id AND tf_id = t.id)
+    ''').fetchall()
+    refresh_latest(conn, series)
+    if series:
+        logging.info(f"📍 latest_candles initialized ({len(series)} series)")
+    return True
+
+
+def refresh_latest(conn: sqlite3.Connection, series: Iterable[Tuple[int, int]], now: datetime = None) -> int:
+    """
+    Re-read the newest candle of each (symbol_id, tf_id) into latest_candles.
+
+    Runs inside the caller's transaction (the bulk writer's upsert).
+
+    Returns:
+        Number of series refreshed
+    """
+    now = (now or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+    params = [{'sid': sid, 'tid': tid, 'now': now} for sid, tid in dict.fromkeys(series)]
+    if params:
+        conn.executemany(REFRESH_SQL, params)
+    return len(params)
@@ -0,0 +1,122 @@
+"""
+📡 Market Requests Module - Rate-limited Bybit market data calls
+
+Every ticker/candle request of the data-fetcher goes through the
+process-wide BybitRateLimiter ('market' group):
+- fetch_ohlcv_frame(): candles for one symbol as a DataFrame
+- fetch_ticker_snapshot(): one bulk tickers request (all linear perpetuals)
+- rank_symbols_by_volume(): 24h volumes from the bulk snapshot, with a
+  per-symbol fetch_ticker fallback
+- refresh_ticker_snapshot(): bulk snapshot stored in ticker_snapshot
+"""
+
+import asyncio
+import logging
+from asyncio import Semaphore
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .rate_limiter import BybitRateLimiter
+from .ticker_cache import TickerCache, parse_tickers
+
+TICKER_FALLBACK_CONCURRENCY = 20
+
+
+async def fetch_ohlcv_frame(
+    limiter: BybitRateLimiter,
+    exchange,
+    symbol: str,
+    timeframe: str,
+    limit: int = 200,
+    since: int = None
+) -> Optional[pd.DataFrame]:
+    """Download OHLCV candles for a symbol (optionally only since epoch ms)"""
+    try:
+        ohlcv = await limiter.call(
+            'market', exchange.fetch_ohlcv, symbol, timeframe=timeframe, since=since, limit=min(limit, 1000)
+        )
+
+        if not ohlcv:
+            return None
+
+        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        df.sort_index(inplace=True)
+
+        return df
+
+    except Exception as e:
+        logging.error(f"Download error {symbol}[{timeframe}]: {e}")
+        return None
+
+
+async def fetch_ticker_volume(limiter: BybitRateLimiter, exchange, symbol: str) -> tuple:
+    """Fetch 24h volume for a symbol"""
+    try:
+        ticker = await limiter.call('market', exchange.fetch_ticker, symbol)
+        return symbol, ticker.get('quoteVolume', 0)
+    except Exception as e:
+        logging.debug(f"Ticker error {symbol}: {e}")
+        return symbol, None
+
+
+async def fetch_ticker_snapshot(limiter: BybitRateLimiter, exchange, symbols: List[str]) -> List[Dict]:
+    """One bulk tickers request for all linear perpetuals (rows for `symbols`)"""
+    tickers = await limiter.call(
+        'market', exchange.fetch_tickers, None, {'type': 'swap', 'subType': 'linear'}
+    )
+    return parse_tickers(tickers or {}, symbols)
+
+
+async def refresh_ticker_snapshot(limiter: BybitRateLimiter, exchange, symbols: List[str], db_cache) -> int:
+    """Store a fresh bulk snapshot in ticker_snapshot (0 on failure, never raises)"""
+    try:
+        return TickerCache(db_cache).save(await fetch_ticker_snapshot(limiter, exchange, symbols))
+    except Exception as e:
+        logging.warning(f"Ticker snapshot refresh failed: {e}")
+        return 0
+
+
+async def fetch_volumes_per_symbol(limiter: BybitRateLimiter, exchange, symbols: List[str]) -> List[Tuple[str, float]]:
+    """Fallback: one fetch_ticker per symbol (TICKER_FALLBACK_CONCURRENCY in flight)"""
+    semaphore = Semaphore(TICKER_FALLBACK_CONCURRENCY)
+
+    async def fetch_with_semaphore(symbol):
+        async with semaphore:
+            return await fetch_ticker_volume(limiter, exchange, symbol)
+
+    tasks = [fetch_with_semaphore(s) for s in symbols]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [r for r in results if isinstance(r, tuple) and r[1] is not None]
+
+
+async def rank_symbols_by_volume(
+    limiter: BybitRateLimiter,
+    exchange,
+    symbols: List[str]
+) -> Tuple[List[Tuple[str, float]], List[Dict]]:
+    """
+    24h quote volume for `symbols`, sorted descending.
+
+    Uses one bulk tickers request; falls back to per-symbol tickers if it
+    fails or returns nothing.
+
+    Returns:
+        (list of (symbol, volume_24h), ticker snapshot rows - empty on fallback)
+    """
+    try:
+        snapshot = await fetch_ticker_snapshot(limiter, exchange, symbols)
+    except Exception as e:
+        logging.warning(f"Bulk tickers failed, falling back to per-symbol tickers: {e}")
+        snapshot = []
+
+    if snapshot:
+        symbol_volumes = [(row['symbol'], row['volume_24h']) for row in snapshot]
+    else:
+        symbol_volumes = await fetch_volumes_per_symbol(limiter, exchange, symbols)
+
+    symbol_volumes.sort(key=lambda x: x[1], reverse=True)
+    return symbol_volumes, snapshot
@@ -0,0 +1,150 @@
+"""
+🧹 Retention Module - Set-based realtime_ohlcv cleanup
+
+Computes the cutoff of every (symbol, timeframe) series in one
+window-function query and deletes the expired rows as primary-key range
+deletes, grouped into short transactions of at most `batch_rows` rows so
+the write lock is released often and the WAL stays small.
+
+A row expires when it is beyond the newest `max_candles` of its series,
+or older than `max_age_days` while the series still keeps `min_candles`
+newer rows (the warmup window of the indicators is never cut).
+
+Each batch refreshes the table_stats counters of the series it trimmed in
+the same transaction.
+"""
+
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from .compact_schema import compact_name, epoch_ms
+from .table_stats import refresh_series_stats
+
+REALTIME_TABLE = compact_name('realtime_ohlcv')
+
+# One pass over the table: rank every series newest-first, then per series
+# the newest expired timestamp and the number of expired rows
+CUTOFF_SQL = f'''
+    SELECT symbol_id, tf_id,
+           MAX(CASE WHEN rn > :max_keep OR (ts < :min_ts AND rn > :min_keep) THEN ts END) AS cutoff,
+           SUM(rn > :max_keep OR (ts < :min_ts AND rn > :min_keep)) AS expired
+    FROM (
+        SELECT symbol_id, tf_id, ts,
+               ROW_NUMBER() OVER (PARTITION BY symbol_id, tf_id ORDER BY ts DESC) AS rn
+        FROM {REALTIME_TABLE}
+    )
+    GROUP BY symbol_id, tf_id
+    HAVING expired > 0
+'''
+
+RANGE_DELETE_SQL = f'DELETE FROM {REALTIME_TABLE} WHERE symbol_id = ? AND tf_id = ? AND ts <= ?'
+
+# Upper bound of the next range of `batch_rows` expired rows of one series
+SPLIT_SQL = f'''
+    SELECT ts FROM {REALTIME_TABLE}
+    WHERE symbol_id = ? AND tf_id = ? AND ts > ? AND ts <= ?
+    ORDER BY ts
+    LIMIT 1 OFFSET ?
+'''
+
+
+@dataclass
+class RetentionResult:
+    """Outcome of one retention run"""
+    series: int = 0
+    deleted: int = 0
+    batches: int = 0
+    duration_sec: float = 0.0
+
+
+class RealtimeRetention:
+    """
+    Retention policy for realtime_ohlcv.
+
+    Args:
+        db_cache: DatabaseCache (provides _get_connection)
+        max_age_days: Drop candles older than this (None = no age limit)
+        min_candles: Candles always kept per series (indicator warmup + display)
+        max_candles: Hard cap per series (None = no cap)
+        batch_rows: Maximum rows deleted per transaction
+        pause_sec: Sleep between batches (lets readers and writers in)
+
+    Usage:
+        retention = RealtimeRetention(db_cache, max_age_days=90, min_candles=300)
+        result = retention.run()
+    """
+
+    def __init__(self, db_cache, max_age_days: Optional[int] = None, min_candles: int = 0,
+                 max_candles: Optional[int] = None, batch_rows: int = 5000, pause_sec: float = 0.05):
+        self.db_cache = db_cache
+        self.max_age_days = max_age_days
+        self.min_candles = min_candles
+        self.max_candles = max_candles
+        self.batch_rows = max(1, batch_rows)
+        self.pause_sec = pause_sec
+
+    def compute_cutoffs(self, conn, now: datetime = None) -> List[Tuple[int, int, int, int]]:
+        """(symbol_id, tf_id, cutoff_ts, expired_rows) for every series with expired rows"""
+        now = now or datetime.utcnow()
+        params = {
+            'max_keep': self.max_candles if self.max_candles is not None else sys.maxsize,
+            'min_keep': self.min_candles,
+            'min_ts': epoch_ms(now - timedelta(days=self.max_age_days)) if self.max_age_days else -1,
+        }
+        return conn.execute(CUTOFF_SQL, params).fetchall()
+
+    def _split(self, conn, symbol_id: int, tf_id: int, cutoff: int, expired: int):
+        """Range deletes of at most batch_rows rows for one series (oldest first)"""
+        ranges, lower = [], -1
+        while expired > self.batch_rows:
+            lower = conn.execute(SPLIT_SQL, (symbol_id, tf_id, lower, cutoff, self.batch_rows - 1)).fetchone()[0]
+            ranges.append((symbol_id, tf_id, lower, self.batch_rows))
+            expired -= self.batch_rows
+        ranges.append((symbol_id, tf_id, cutoff, expired))
+        return ranges
+
+    def plan_batches(self, conn, cutoffs) -> List[List[Tuple[int, int, int]]]:
+        """Group the range deletes into batches of at most batch_rows rows"""
+        batches, current, size = [], [], 0
+        for symbol_id, tf_id, cutoff, expired in cutoffs:
+            for sid, tid, upto, rows in self._split(conn, symbol_id, tf_id, cutoff, expired):
+                if current and size + rows > self.batch_rows:
+                    batches.append(current)
+                    current, size = [], 0
+                current.append((sid, tid, upto))
+                size += rows
+        if current:
+            batches.append(current)
+        return batches
+
+    def run(self, now: datetime = None) -> RetentionResult:
+        """Apply the policy; returns counts and duration"""
+        start = time.time()
+        result = RetentionResult()
+
+        conn = self.db_cache._get_connection()
+        try:
+            cutoffs = self.compute_cutoffs(conn, now)
+            result.series = len(cutoffs)
+            for batch in self.plan_batches(conn, cutoffs):
+                with conn:
+                    for params in batch:
+                        result.deleted += conn.execute(RANGE_DELETE_SQL, params).rowcount
+                    refresh_series_stats(conn, 'realtime_ohlcv', [(sid, tid) for sid, tid, _ in batch])
+                result.batches += 1
+                if self.pause_sec:
+                    time.sleep(self.pause_sec)
+            if result.deleted:
+                conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+        finally:
+            conn.close()
+
+        result.duration_sec = time.time() - start
+        if result.deleted:
+            logging.info(f"🧹 Retention: deleted {result.deleted:,} candles from {result.series} series "
+                         f"in {result.batches} batches ({result.duration_sec:.2f}s)")
+        return result
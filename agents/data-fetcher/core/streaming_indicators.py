@@ -0,0 +1,321 @@
+"""
+🌊 Streaming Indicators Module - O(1) per candle
+
+Stateful counterpart of core.indicators.calculate_all_indicators.
+Each (symbol, timeframe) keeps rolling sums, EMA states, monotonic deques
+for the stochastic min/max and the running OBV, so appending one candle
+updates all 16 INDICATOR_COLUMNS in constant time.
+
+Output matches the batch functions (up to floating point rounding), see
+scripts/check_streaming_indicators.py.
+"""
+
+import copy
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .indicators import INDICATOR_COLUMNS
+
+NAN = float('nan')
+
+
+class RollingWindow:
+    """Fixed-size window with a running sum (re-synced every `size` pushes to bound drift)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.nonzero = 0
+        self._pushes = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.size:
+            old = self.values[0]
+            self.total -= old
+            self.nonzero -= old != 0
+        self.values.append(value)
+        self.total += value
+        self.nonzero += value != 0
+
+        self._pushes += 1
+        if self._pushes >= self.size:
+            self.total = math.fsum(self.values)
+            self._pushes = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        if not self.full:
+            return NAN
+        if self.nonzero == 0:
+            return 0.0
+        return self.total / self.size
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1) of a full window"""
+        if not self.full:
+            return NAN
+        mean = self.total / self.size
+        return math.sqrt(math.fsum((v - mean) ** 2 for v in self.values) / (self.size - 1))
+
+    def to_dict(self) -> Dict:
+        return {'size': self.size, 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RollingWindow':
+        window = cls(data['size'])
+        for value in data['values']:
+            window.push(value)
+        return window
+
+
+class MonotonicWindow:
+    """Sliding min (or max) over the last `size` pushes using a monotonic deque"""
+
+    def __init__(self, size: int, mode: str):
+        self.size = size
+        self.mode = mode
+        self.items = deque()  # (index, value)
+
+    def push(self, index: int, value: float):
+        if self.mode == 'min':
+            while self.items and self.items[-1][1] >= value:
+                self.items.pop()
+        else:
+            while self.items and self.items[-1][1] <= value:
+                self.items.pop()
+        self.items.append((index, value))
+        while self.items[0][0] <= index - self.size:
+            self.items.popleft()
+
+    def value(self) -> float:
+        return self.items[0][1]
+
+    def to_dict(self) -> Dict:
+        return {'size': self.size, 'mode': self.mode, 'items': [list(i) for i in self.items]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MonotonicWindow':
+        window = cls(data['size'], data['mode'])
+        window.items = deque((int(i), float(v)) for i, v in data['items'])
+        return window
+
+
+def _ema_step(prev: Optional[float], value: float, span: int) -> float:
+    """EMA with adjust=False (same recursion as pandas ewm)"""
+    if prev is None:
+        return value
+    alpha = 2.0 / (span + 1)
+    return (1 - alpha) * prev + alpha * value
+
+
+class IndicatorState:
+    """Incremental indicator state for one (symbol, timeframe) series"""
+
+    def __init__(self):
+        self.count = 0
+        self.last_timestamp: Optional[str] = None
+        self.prev_close: Optional[float] = None
+
+        self.close_20 = RollingWindow(20)
+        self.close_50 = RollingWindow(50)
+        self.volume_20 = RollingWindow(20)
+        self.gain_14 = RollingWindow(14)
+        self.loss_14 = RollingWindow(14)
+        self.tr_14 = RollingWindow(14)
+        self.stoch_k_3 = deque(maxlen=3)
+        self.low_14 = MonotonicWindow(14, 'min')
+        self.high_14 = MonotonicWindow(14, 'max')
+
+        self.ema_12: Optional[float] = None
+        self.ema_26: Optional[float] = None
+        self.macd_signal: Optional[float] = None
+        self.obv = 0.0
+
+    def push(self, timestamp: str, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """
+        Append one candle and return the 16 indicator values for it.
+
+        Returns:
+            Dict indicator -> value (NaN while an indicator is warming up)
+        """
+        prev_close = self.prev_close
+        index = self.count
+
+        self.close_20.push(close)
+        self.close_50.push(close)
+        self.volume_20.push(volume)
+
+        delta = 0.0 if prev_close is None else close - prev_close
+        self.gain_14.push(delta if delta > 0 else 0.0)
+        self.loss_14.push(-delta if delta < 0 else 0.0)
+
+        if prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self.tr_14.push(true_range)
+
+        self.low_14.push(index, low)
+        self.high_14.push(index, high)
+
+        self.ema_12 = _ema_step(self.ema_12, close, 12)
+        self.ema_26 = _ema_step(self.ema_26, close, 26)
+        macd = self.ema_12 - self.ema_26
+        self.macd_signal = _ema_step(self.macd_signal, macd, 9)
+
+        if prev_close is not None:
+            if close > prev_close:
+                self.obv += volume
+            elif close < prev_close:
+                self.obv -= volume
+
+        self.count += 1
+        self.prev_close = close
+        self.last_timestamp = timestamp
+
+        bb_mid = self.close_20.mean()
+        bb_std = self.close_20.std()
+
+        avg_gain = self.gain_14.mean()
+        avg_loss = self.loss_14.mean()
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss)) if avg_loss and not math.isnan(avg_loss) else NAN
+
+        stoch_k = NAN
+        if self.count >= 14:
+            low_min = self.low_14.value()
+            value_range = self.high_14.value() - low_min
+            if value_range != 0:
+                stoch_k = 100 * ((close - low_min) / value_range)
+        self.stoch_k_3.append(stoch_k)
+        stoch_d = math.fsum(self.stoch_k_3) / 3 if len(self.stoch_k_3) == 3 else NAN
+
+        return {
+            'sma_20': bb_mid,
+            'sma_50': self.close_50.mean(),
+            'ema_12': self.ema_12,
+            'ema_26': self.ema_26,
+            'bb_upper': bb_mid + bb_std * 2.0,
+            'bb_mid': bb_mid,
+            'bb_lower': bb_mid - bb_std * 2.0,
+            'macd': macd,
+            'macd_signal': self.macd_signal,
+            'macd_hist': macd - self.macd_signal,
+            'rsi': rsi,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'atr': self.tr_14.mean(),
+            'volume_sma': self.volume_20.mean(),
+            'obv': self.obv,
+        }
+
+    def clone(self) -> 'IndicatorState':
+        """Copy used to evaluate a still-forming candle without committing it"""
+        return copy.deepcopy(self)
+
+    def to_dict(self) -> Dict:
+        """Serialize state (JSON-compatible)"""
+        return {
+            'count': self.count,
+            'last_timestamp': self.last_timestamp,
+            'prev_close': self.prev_close,
+            'close_20': self.close_20.to_dict(),
+            'close_50': self.close_50.to_dict(),
+            'volume_20': self.volume_20.to_dict(),
+            'gain_14': self.gain_14.to_dict(),
+            'loss_14': self.loss_14.to_dict(),
+            'tr_14': self.tr_14.to_dict(),
+            'stoch_k_3': list(self.stoch_k_3),
+            'low_14': self.low_14.to_dict(),
+            'high_14': self.high_14.to_dict(),
+            'ema_12': self.ema_12,
+            'ema_26': self.ema_26,
+            'macd_signal': self.macd_signal,
+            'obv': self.obv,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'IndicatorState':
+        state = cls()
+        state.count = data['count']
+        state.last_timestamp = data['last_timestamp']
+        state.prev_close = data['prev_close']
+        for name in ('close_20', 'close_50', 'volume_20', 'gain_14', 'loss_14', 'tr_14'):
+            setattr(state, name, RollingWindow.from_dict(data[name]))
+        state.stoch_k_3 = deque(data['stoch_k_3'], maxlen=3)
+        state.low_14 = MonotonicWindow.from_dict(data['low_14'])
+        state.high_14 = MonotonicWindow.from_dict(data['high_14'])
+        state.ema_12 = data['ema_12']
+        state.ema_26 = data['ema_26']
+        state.macd_signal = data['macd_signal']
+        state.obv = data['obv']
+        return state
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame) -> 'IndicatorState':
+        """
+        Rebuild state from stored rows (OHLCV + indicators, oldest first).
+
+        Windows are replayed from the rows; the recursive values (EMAs, MACD
+        signal, OBV) continue from the stored indicators of the last row so
+        new candles extend the stored series exactly.
+        """
+        state = cls()
+        for ts, high, low, close, volume in zip(
+            _timestamp_strings(df.index), df['high'].tolist(), df['low'].tolist(),
+            df['close'].tolist(), df['volume'].tolist()
+        ):
+            state.push(ts, high, low, close, volume)
+
+        if not df.empty:
+            last = df.iloc[-1]
+            for name in ('ema_12', 'ema_26', 'macd_signal', 'obv'):
+                if name in df.columns and pd.notna(last[name]):
+                    setattr(state, name, float(last[name]))
+        return state
+
+
+def _timestamp_strings(index: pd.Index) -> list:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+    return [str(ts) for ts in index]
+
+
+def stream_frame(state: IndicatorState, df: pd.DataFrame, commit_last: bool = True) -> pd.DataFrame:
+    """
+    Push OHLCV rows through a state and return them with indicator columns.
+
+    Args:
+        state: State to advance (rows at or before state.last_timestamp are skipped)
+        df: OHLCV rows (datetime index), oldest first
+        commit_last: If False, the last row is evaluated on a clone (forming candle)
+
+    Returns:
+        DataFrame with OHLCV + INDICATOR_COLUMNS for the rows that were pushed
+    """
+    timestamps = _timestamp_strings(df.index)
+    rows, keep = [], []
+    last_pos = len(df) - 1
+
+    for pos, (ts, high, low, close, volume) in enumerate(zip(
+        timestamps, df['high'].tolist(), df['low'].tolist(),
+        df['close'].tolist(), df['volume'].tolist()
+    )):
+        if state.last_timestamp is not None and ts <= state.last_timestamp:
+            continue
+        target = state if commit_last or pos < last_pos else state.clone()
+        rows.append(target.push(ts, high, low, close, volume))
+        keep.append(pos)
+
+    result = df.iloc[keep].copy()
+    values = np.array([[r[c] for c in INDICATOR_COLUMNS] for r in rows], dtype=np.float64).reshape(-1, len(INDICATOR_COLUMNS))
+    for i, col in enumerate(INDICATOR_COLUMNS):
+        result[col] = values[:, i]
+    return result
@@ -0,0 +1,250 @@
+"""
+📏 Table Stats Module - Maintained row counts and time bounds per series
+
+`table_stats` keeps, for every tracked candle-keyed table and every
+(symbol, timeframe) series, the row count and the first / last candle.
+Writers refresh the series they touched inside their own transaction
+(primary-key range count plus two seeks), so dashboard and CLI statistics
+read a few hundred rows instead of scanning millions with COUNT(*),
+COUNT(DISTINCT ...) and MIN/MAX.
+
+Bookkeeping lives in the writers rather than in triggers: the bulk
+upserts use INSERT OR REPLACE, whose implicit deletes do not fire DELETE
+triggers, so trigger-maintained counters would drift on every overwrite.
+
+`table_stats_meta` records when a table was (re)built and last checked;
+get_table_summary() returns None for a table that was never built so
+callers can fall back to the full scan. check_stats() is the background
+consistency checker: one GROUP BY over the table, mismatching series are
+recounted inside a write transaction.
+
+Shared verbatim by data-fetcher (core/), historical-data (core/) and
+frontend (database/).
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .compact_schema import compact_name, ms_to_text
+
+STATS_TABLE = 'table_stats'
+STATS_META = 'table_stats_meta'
+
+# Candle-keyed tables whose writers keep their counters up to date
+TRACKED_TABLES = ('realtime_ohlcv', 'training_data', 'training_labels', 'ml_training_labels')
+
+STATS_TABLE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+        table_name TEXT NOT NULL,
+        symbol_id INTEGER NOT NULL,
+        tf_id INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        min_ts INTEGER,
+        max_ts INTEGER,
+        updated_at TEXT,
+        PRIMARY KEY (table_name, symbol_id, tf_id)
+    ) WITHOUT ROWID
+'''
+
+STATS_META_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {STATS_META} (
+        table_name TEXT PRIMARY KEY,
+        rebuilt_at TEXT,
+        checked_at TEXT,
+        mismatches INTEGER DEFAULT 0
+    )
+'''
+
+
+def _now_text(now: datetime = None) -> str:
+    return (now or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _refresh_sql(table: str) -> str:
+    """Recount one series (separate subqueries: a lone MIN()/MAX() is a seek)"""
+    series = f'FROM {compact_name(table)} WHERE symbol_id = :sid AND tf_id = :tid'
+    return f'''
+        INSERT OR REPLACE INTO {STATS_TABLE}
+        (table_name, symbol_id, tf_id, row_count, min_ts, max_ts, updated_at)
+        SELECT :table, :sid, :tid, (SELECT COUNT(*) {series}),
+               (SELECT MIN(ts) {series}), (SELECT MAX(ts) {series}), :now
+    '''
+
+
+def ensure_stats(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    Create the stats tables and build the counters of `table` once (caller commits).
+
+    Returns:
+        True if the counters of `table` were built now
+    """
+    conn.execute(STATS_TABLE_SQL)
+    conn.execute(STATS_META_SQL)
+    if conn.execute(f'SELECT 1 FROM {STATS_META} WHERE table_name = ?', (table,)).fetchone():
+        return False
+    series = rebuild_stats(conn, table)
+    if series:
+        logging.info(f"📏 table_stats initialized for {table} ({series} series)")
+    return True
+
+
+def rebuild_stats(conn: sqlite3.Connection, table: str, now: datetime = None) -> int:
+    """
+    Recompute every series of `table` with one GROUP BY (caller commits).
+
+    Returns:
+        Number of series
+    """
+    now = _now_text(now)
+    conn.execute(f'DELETE FROM {STATS_TABLE} WHERE table_name = ?', (table,))
+    series = conn.execute(f'''
+        INSERT INTO {STATS_TABLE} (table_name, symbol_id, tf_id, row_count, min_ts, max_ts, updated_at)
+        SELECT ?, symbol_id, tf_id, COUNT(*), MIN(ts), MAX(ts), ?
+        FROM {compact_name(table)}
+        GROUP BY symbol_id, tf_id
+    ''', (table, now)).rowcount
+    conn.execute(f'INSERT OR REPLACE INTO {STATS_META} (table_name, rebuilt_at, checked_at, mismatches) '
+                 f'VALUES (?, ?, ?, 0)', (table, now, now))
+    return series
+
+
+def refresh_series_stats(conn: sqlite3.Connection, table: str, series: Iterable[Tuple[int, int]],
+                         now: datetime = None) -> int:
+    """
+    Recount the given (symbol_id, tf_id) series of `table`.
+
+    Runs inside the caller's transaction (the write that changed them);
+    series left empty are removed.
+
+    Returns:
+        Number of series refreshed
+    """
+    now = _now_text(now)
+    params = [{'table': table, 'sid': sid, 'tid': tid, 'now': now} for sid, tid in dict.fromkeys(series)]
+    if params:
+        conn.executemany(_refresh_sql(table), params)
+        conn.execute(f'DELETE FROM {STATS_TABLE} WHERE table_name = ? AND row_count = 0', (table,))
+    return len(params)
+
+
+def tracked_series(conn: sqlite3.Connection, table: str, symbol: str = None,
+                   timeframe: str = None) -> List[Tuple[int, int]]:
+    """(symbol_id, tf_id) of the recorded series of `table`, optionally filtered (before a delete)"""
+    sql = f'''
+        SELECT st.symbol_id, st.tf_id FROM {STATS_TABLE} st
+        JOIN symbol_ids s ON s.id = st.symbol_id
+        JOIN timeframe_ids t ON t.id = st.tf_id
+        WHERE st.table_name = ?
+    '''
+    params = [table]
+    if symbol:
+        sql += ' AND s.symbol = ?'
+        params.append(symbol)
+    if timeframe:
+        sql += ' AND t.timeframe = ?'
+        params.append(timeframe)
+    try:
+        return [tuple(row) for row in conn.execute(sql, params).fetchall()]
+    except sqlite3.OperationalError:
+        return []
+
+
+def get_table_summary(conn: sqlite3.Connection, table: str) -> Optional[Dict]:
+    """
+    Totals of `table` from its counters (one row per series is read).
+
+    Returns:
+        Dict with series, symbols, timeframes, rows, min_date, max_date
+        (dates as '%Y-%m-%d %H:%M:%S'), or None if the counters were never
+        built (callers fall back to scanning the table)
+    """
+    try:
+        if not conn.execute(f'SELECT 1 FROM {STATS_META} WHERE table_name = ?', (table,)).fetchone():
+            return None
+        row = conn.execute(f'''
+            SELECT COUNT(*), COUNT(DISTINCT symbol_id), COUNT(DISTINCT tf_id),
+                   COALESCE(SUM(row_count), 0), MIN(min_ts), MAX(max_ts)
+            FROM {STATS_TABLE} WHERE table_name = ?
+        ''', (table,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return {
+        'series': row[0],
+        'symbols': row[1],
+        'timeframes': row[2],
+        'rows': row[3],
+        'min_date': ms_to_text(row[4]),
+        'max_date': ms_to_text(row[5]),
+    }
+
+
+def get_series_stats(conn: sqlite3.Connection, table: str, timeframe: str = None) -> Optional[List[Dict]]:
+    """
+    Per-series counters of `table` (symbol, timeframe, rows, start_date, end_date).
+
+    Returns:
+        List ordered by symbol, timeframe, or None if the counters were never built
+    """
+    if get_table_summary(conn, table) is None:
+        return None
+    sql = f'''
+        SELECT s.symbol, t.timeframe, st.row_count, st.min_ts, st.max_ts
+        FROM {STATS_TABLE} st
+        JOIN symbol_ids s ON s.id = st.symbol_id
+        JOIN timeframe_ids t ON t.id = st.tf_id
+        WHERE st.table_name = ?
+    '''
+    params = [table]
+    if timeframe:
+        sql += ' AND t.timeframe = ?'
+        params.append(timeframe)
+    sql += ' ORDER BY s.symbol, t.timeframe'
+    return [
+        {'symbol': symbol, 'timeframe': tf, 'rows': rows,
+         'start_date': ms_to_text(min_ts), 'end_date': ms_to_text(max_ts)}
+        for symbol, tf, rows, min_ts, max_ts in conn.execute(sql, params).fetchall()
+    ]
+
+
+def check_stats(conn: sqlite3.Connection, table: str, fix: bool = True, now: datetime = None) -> Dict:
+    """
+    Consistency check: compare the counters of `table` with a full GROUP BY.
+
+    The scan runs outside any transaction; mismatching series are recounted
+    inside a write transaction (so a write that landed in between is not
+    overwritten with stale numbers).
+
+    Returns:
+        Dict with series (scanned), mismatched, fixed
+    """
+    with conn:
+        ensure_stats(conn, table)
+    actual = {
+        (sid, tid): (rows, min_ts, max_ts)
+        for sid, tid, rows, min_ts, max_ts in conn.execute(f'''
+            SELECT symbol_id, tf_id, COUNT(*), MIN(ts), MAX(ts)
+            FROM {compact_name(table)} GROUP BY symbol_id, tf_id
+        ''')
+    }
+    recorded = {
+        (sid, tid): (rows, min_ts, max_ts)
+        for sid, tid, rows, min_ts, max_ts in conn.execute(
+            f'SELECT symbol_id, tf_id, row_count, min_ts, max_ts FROM {STATS_TABLE} WHERE table_name = ?',
+            (table,)
+        )
+    }
+    mismatched = [key for key in actual.keys() | recorded.keys() if actual.get(key) != recorded.get(key)]
+
+    result = {'series': len(actual), 'mismatched': len(mismatched), 'fixed': 0}
+    with conn:
+        if fix and mismatched:
+            result['fixed'] = refresh_series_stats(conn, table, mismatched, now)
+        conn.execute(f'UPDATE {STATS_META} SET checked_at = ?, mismatches = ? WHERE table_name = ?',
+                     (_now_text(now), len(mismatched), table))
+
+    if mismatched:
+        logging.warning(f"📏 table_stats {table}: {len(mismatched)} of {len(actual)} series out of date"
+                        f"{' (fixed)' if result['fixed'] else ''}")
+    return result
@@ -0,0 +1,123 @@
+"""
+🎫 Ticker Cache Module - Bulk ticker snapshot
+
+Parses the result of one bulk `fetch_tickers` call (all linear perpetuals)
+and stores it in the `ticker_snapshot` table, so the ranking pipeline, the
+frontend and historical-data can read 24h volume, last price and change
+without calling the exchange again.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+TICKER_COLUMNS = ['symbol', 'last_price', 'change_24h_pct', 'volume_24h', 'base_volume_24h', 'high_24h', 'low_24h']
+
+# ccxt unified ticker field for each column
+TICKER_FIELDS = {
+    'last_price': 'last',
+    'change_24h_pct': 'percentage',
+    'volume_24h': 'quoteVolume',
+    'base_volume_24h': 'baseVolume',
+    'high_24h': 'high',
+    'low_24h': 'low',
+}
+
+
+def _to_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_tickers(tickers: Dict[str, Dict], symbols: Iterable[str]) -> List[Dict]:
+    """
+    Extract snapshot rows for `symbols` from a ccxt fetch_tickers() result.
+
+    Symbols without a ticker or without quote volume are left out.
+
+    Returns:
+        List of dicts with TICKER_COLUMNS, sorted by volume_24h descending
+    """
+    rows = []
+    for symbol in symbols:
+        ticker = tickers.get(symbol)
+        if not ticker:
+            continue
+        row = {'symbol': symbol}
+        for column, field in TICKER_FIELDS.items():
+            row[column] = _to_float(ticker.get(field))
+        if row['volume_24h'] is None:
+            continue
+        rows.append(row)
+
+    rows.sort(key=lambda r: r['volume_24h'], reverse=True)
+    return rows
+
+
+class TickerCache:
+    """
+    `ticker_snapshot` table (one row per symbol, replaced on every save).
+
+    Usage:
+        cache = TickerCache(db_cache)
+        cache.save(parse_tickers(tickers, symbols))
+        snapshot = cache.load()
+    """
+
+    def __init__(self, db_cache):
+        self.db_cache = db_cache
+        self._init_table()
+
+    def _init_table(self):
+        conn = self.db_cache._get_connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS ticker_snapshot (
+                symbol TEXT PRIMARY KEY,
+                last_price REAL,
+                change_24h_pct REAL,
+                volume_24h REAL,
+                base_volume_24h REAL,
+                high_24h REAL,
+                low_24h REAL,
+                fetched_at TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def save(self, rows: List[Dict]) -> int:
+        """Replace the snapshot in one transaction"""
+        if not rows:
+            return 0
+
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        values = [tuple(row[c] for c in TICKER_COLUMNS) + (now,) for row in rows]
+
+        conn = self.db_cache._get_connection()
+        try:
+            with conn:
+                conn.execute('DELETE FROM ticker_snapshot')
+                conn.executemany(f'''
+                    INSERT INTO ticker_snapshot ({', '.join(TICKER_COLUMNS)}, fetched_at)
+                    VALUES ({', '.join(['?'] * (len(TICKER_COLUMNS) + 1))})
+                ''', values)
+        finally:
+            conn.close()
+
+        logging.info(f"💾 Saved ticker snapshot ({len(values)} symbols)")
+        return len(values)
+
+    def load(self) -> List[Dict]:
+        """Snapshot rows sorted by volume_24h descending"""
+        conn = self.db_cache._get_connection()
+        try:
+            cur = conn.execute(f'''
+                SELECT {', '.join(TICKER_COLUMNS)}, fetched_at
+                FROM ticker_snapshot
+                ORDER BY volume_24h DESC
+            ''')
+            return [dict(zip(TICKER_COLUMNS + ['fetched_at'], row)) for row in cur.fetchall()]
+        finally:
+            conn.close()
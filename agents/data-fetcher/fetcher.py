@@ -8,13 +8,20 @@ Downloads OHLCV data and saves it to the shared SQLite database.
 import asyncio
 import logging
 import pandas as pd
-from datetime import datetime
 from asyncio import Semaphore
 from termcolor import colored
 from typing import List, Dict, Optional, Tuple
 
 import config
-from core.indicators import calculate_all_indicators, INDICATOR_COLUMNS
+from core.bulk_writer import RealtimeBulkWriter
+from core.download_report import print_symbols_table
+from core.incremental import download_timeframe
+from core.indicator_engine import StreamingIndicatorEngine
+from core.market_requests import (
+    fetch_ohlcv_frame, fetch_ticker_snapshot, rank_symbols_by_volume, refresh_ticker_snapshot
+)
+from core.rate_limiter import BybitRateLimiter, get_rate_limiter
+from core.ticker_cache import TickerCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,13 +37,17 @@ class CryptoDataFetcher:
         async with CryptoDataFetcher() as fetcher:
             symbols = await fetcher.fetch_and_save_top_symbols(db_cache, n=100)
             data = await fetcher.download_symbols(symbols, '15m')
+    
+    All ticker/candle requests go through the process-wide BybitRateLimiter.
     """
     
-    def __init__(self, exchange=None):
+    def __init__(self, exchange=None, rate_limiter: BybitRateLimiter = None):
         self._exchange = exchange
         self._own_exchange = False
         self.markets = None
         self.downloaded_symbols = []
+        self.ticker_snapshot: List[Dict] = []
+        self.rate_limiter = rate_limiter or get_rate_limiter(config.BYBIT_MARKET_SHARE)
     
     async def __aenter__(self):
         if self._exchange is None:
@@ -88,19 +99,17 @@ class CryptoDataFetcher:
         
         return symbols
     
-    async def get_ticker_volume(self, symbol: str) -> tuple:
-        """Fetch 24h volume for a symbol"""
-        try:
-            ticker = await self._exchange.fetch_ticker(symbol)
-            return symbol, ticker.get('quoteVolume', 0)
-        except Exception as e:
-            logging.debug(f"Ticker error {symbol}: {e}")
-            return symbol, None
+    async def fetch_ticker_snapshot(self, symbols: List[str]) -> List[Dict]:
+        """One bulk tickers request for all linear perpetuals (rows for `symbols`)"""
+        return await fetch_ticker_snapshot(self.rate_limiter, self._exchange, symbols)
     
     async def fetch_top_symbols_with_volume(self, n: int = None, symbols: List[str] = None) -> List[Tuple[str, float]]:
         """
         Fetch top N symbols by volume with their volumes.
         
+        Ranking is done by core.market_requests.rank_symbols_by_volume();
+        the parsed bulk snapshot is kept in self.ticker_snapshot.
+        
         Returns:
             List of tuples (symbol, volume_24h) sorted by volume descending
         """
@@ -112,28 +121,15 @@ class CryptoDataFetcher:
         
         print(colored(f"\n📊 Analyzing volumes for {len(symbols)} symbols...", "cyan"))
         
-        semaphore = Semaphore(20)
-        
-        async def fetch_with_semaphore(symbol):
-            async with semaphore:
-                return await self.get_ticker_volume(symbol)
-        
-        tasks = [fetch_with_semaphore(s) for s in symbols]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        symbol_volumes = []
-        for result in results:
-            if isinstance(result, tuple) and result[1] is not None:
-                symbol_volumes.append(result)
-        
-        # Sort by volume descending
-        symbol_volumes.sort(key=lambda x: x[1], reverse=True)
+        symbol_volumes, self.ticker_snapshot = await rank_symbols_by_volume(
+            self.rate_limiter, self._exchange, symbols
+        )
         
         # Take top N
         top_symbols = symbol_volumes[:n]
         
         print(colored(f"✅ Top {len(top_symbols)} symbols by volume:", "green"))
-        self._print_symbols_table(top_symbols)
+        print_symbols_table(top_symbols)
         
         return top_symbols
     
@@ -152,57 +148,32 @@ class CryptoDataFetcher:
         
         # Save to database
         db_cache.save_top_symbols(top_symbols_with_volume)
+        if self.ticker_snapshot:
+            TickerCache(db_cache).save(self.ticker_snapshot)
         
         # Return only symbols
         return [symbol for symbol, _ in top_symbols_with_volume]
     
-    def _print_symbols_table(self, volumes: List[Tuple[str, float]]):
-        """Print formatted table of symbols with volume"""
-        print(colored("-" * 50, "cyan"))
-        print(colored(f"{'#':<4} {'Symbol':<20} {'Volume 24h':>20}", "white", attrs=['bold']))
-        print(colored("-" * 50, "cyan"))
-        
-        for i, (symbol, vol) in enumerate(volumes, 1):
-            symbol_short = symbol.replace('/USDT:USDT', '')
-            vol_str = f"${vol/1e9:.2f}B" if vol >= 1e9 else f"${vol/1e6:.1f}M" if vol >= 1e6 else f"${vol/1e3:.1f}K"
-            print(f"{i:<4} {symbol_short:<20} {vol_str:>20}")
-        
-        print(colored("-" * 50, "cyan"))
-    
-    async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 200) -> Optional[pd.DataFrame]:
-        """Download OHLCV candles for a symbol"""
-        try:
-            ohlcv = await self._exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=min(limit, 1000))
-            
-            if not ohlcv:
-                return None
-            
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
-            
-            return df
-            
-        except Exception as e:
-            logging.error(f"Download error {symbol}[{timeframe}]: {e}")
-            return None
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 200, since: int = None) -> Optional[pd.DataFrame]:
+        """Download OHLCV candles for a symbol (optionally only since epoch ms)"""
+        return await fetch_ohlcv_frame(self.rate_limiter, self._exchange, symbol, timeframe, limit, since)
     
     async def download_symbols(
         self, 
         symbols: List[str], 
         timeframe: str, 
         limit: int = 200,
-        max_concurrent: int = 15
+        max_concurrent: int = 15,
+        since_map: Dict[str, int] = None
     ) -> Dict[str, pd.DataFrame]:
-        """Download candles for a list of symbols"""
+        """Download candles for a list of symbols (since_map: symbol -> since epoch ms)"""
         semaphore = Semaphore(max_concurrent)
         results = {}
+        since_map = since_map or {}
         
         async def fetch_single(symbol):
             async with semaphore:
-                await asyncio.sleep(0.05)
-                df = await self.fetch_ohlcv(symbol, timeframe, limit)
+                df = await self.fetch_ohlcv(symbol, timeframe, limit, since=since_map.get(symbol))
                 return symbol, df
         
         print(colored(f"\n⬇️  Downloading {len(symbols)} symbols [{timeframe}]...", "yellow"))
@@ -264,16 +235,30 @@ async def fetch_top_symbols_and_save(exchange, db_cache) -> List[str]:
         return symbols
 
 
-async def fetch_candles_for_symbols(exchange, db_cache, symbols: List[str] = None, timeframes: List[str] = None):
+async def fetch_candles_for_symbols(
+    exchange,
+    db_cache,
+    symbols: List[str] = None,
+    timeframes: List[str] = None,
+    incremental: bool = None,
+    indicator_engine: StreamingIndicatorEngine = None
+):
     """
     Download candles for specified symbols (or those saved in database).
     Called periodically every 15 minutes.
     
+    In incremental mode, symbols with recent stored candles only fetch the
+    tail since their last stored timestamp; indicators for that tail are
+    computed by the streaming engine (O(1) per candle) and only the tail
+    rows are upserted.
+    
     Args:
         exchange: ccxt exchange instance
         db_cache: DatabaseCache instance
         symbols: Symbol list (if None, uses database symbols)
         timeframes: Timeframe list (if None, uses config.ENABLED_TIMEFRAMES)
+        incremental: Incremental mode (if None, uses config.INCREMENTAL_FETCH)
+        indicator_engine: Streaming engine kept across cycles (if None, loaded from DB)
     """
     import time
     start_time = time.time()
@@ -282,15 +267,32 @@ async def fetch_candles_for_symbols(exchange, db_cache, symbols: List[str] = Non
         'symbols_processed': 0,
         'candles_saved': 0,
         'errors': 0,
-        'downloaded_symbols': []
+        'downloaded_symbols': [],
+        'rows_per_sec': 0.0,
+        'incremental_pairs': 0
     }
     
+    if incremental is None:
+        incremental = config.INCREMENTAL_FETCH
+    
+    if indicator_engine is None:
+        indicator_engine = StreamingIndicatorEngine(db_cache)
+        indicator_engine.load()
+    
+    # All timeframes are queued here and written in one transaction per cycle
+    writer = RealtimeBulkWriter(db_cache)
+    
     # Set status to UPDATING
     db_cache.set_status_updating()
     
     async with CryptoDataFetcher(exchange) as fetcher:
         await fetcher.load_markets()
         
+        # One bulk request keeps ticker_snapshot fresh for the frontend
+        await refresh_ticker_snapshot(
+            fetcher.rate_limiter, fetcher.exchange, await fetcher.get_usdt_perpetual_symbols(), db_cache
+        )
+        
         # If not specified, use symbols from database
         if symbols is None:
             symbols = db_cache.get_top_symbols_list()
@@ -309,25 +311,39 @@ async def fetch_candles_for_symbols(exchange, db_cache, symbols: List[str] = Non
             print(colored(f"⏰ TIMEFRAME: {tf}", "magenta", attrs=['bold']))
             print(colored(f"{'='*60}", "magenta"))
             
-            # Scarica CANDLES_LIMIT + WARMUP per avere indicatori validi fin dall'inizio
-            data = await fetcher.download_symbols(symbols, tf, config.TOTAL_CANDLES_TO_FETCH)
+            # Symbols with recent stored candles only fetch the tail
+            data, since_map = await download_timeframe(fetcher, db_cache, symbols, tf, incremental)
             
             for symbol, df in data.items():
                 if df is not None and len(df) > 0:
                     try:
-                        # Calculate indicators and save to realtime_ohlcv table
-                        df_with_indicators = calculate_all_indicators(df)
-                        saved = db_cache.save_realtime_data(symbol, tf, df_with_indicators)
+                        # Calculate indicators and queue for the cycle-wide bulk upsert
+                        load_stored = None
+                        if symbol in since_map:
+                            load_stored = lambda: db_cache.get_realtime_ohlcv(symbol, tf, limit=config.TOTAL_CANDLES_TO_FETCH)
+                            stats['incremental_pairs'] += 1
+                        writer.add(symbol, tf, indicator_engine.compute(symbol, tf, df, load_stored))
                         
                         stats['symbols_processed'] += 1
-                        stats['candles_saved'] += saved
                         if symbol not in stats['downloaded_symbols']:
                             stats['downloaded_symbols'].append(symbol)
                     except Exception as e:
-                        logging.error(f"Save error {symbol}[{tf}]: {e}")
+                        logging.error(f"Indicator error {symbol}[{tf}]: {e}")
                         stats['errors'] += 1
             
-            print(colored(f"💾 Saved {len(data)} symbols to realtime_ohlcv (OHLCV + 16 indicators)", "green"))
+            print(colored(f"📦 Queued {len(data)} symbols for realtime_ohlcv ({writer.pending_rows:,} rows pending)", "green"))
+        
+        # Single transaction for the whole cycle
+        try:
+            stats['candles_saved'] = writer.flush()
+            stats['rows_per_sec'] = writer.last_rows_per_sec
+            print(colored(f"💾 Saved {stats['candles_saved']:,} candles to realtime_ohlcv (OHLCV + 16 indicators)", "green"))
+            indicator_engine.save()
+        except Exception as e:
+            logging.error(f"Bulk save error: {e}")
+            stats['errors'] += 1
+            # States may be ahead of the database now: rebuild them next cycle
+            indicator_engine.reset()
         
         fetcher.print_downloaded_summary()
     
@@ -342,7 +358,7 @@ async def fetch_candles_for_symbols(exchange, db_cache, symbols: List[str] = Non
     return stats
 
 
-async def full_refresh(exchange, db_cache):
+async def full_refresh(exchange, db_cache, indicator_engine: StreamingIndicatorEngine = None):
     """
     Execute full refresh: update top symbols list and download all candles.
     Called at startup and when manually requested from frontend.
@@ -361,19 +377,7 @@ async def full_refresh(exchange, db_cache):
     symbols = await fetch_top_symbols_and_save(exchange, db_cache)
     
     # 2. Download candles for all timeframes (this will set IDLE at the end)
-    stats = await fetch_candles_for_symbols(exchange, db_cache, symbols)
+    stats = await fetch_candles_for_symbols(exchange, db_cache, symbols, indicator_engine=indicator_engine)
     
     return stats
 
-
-def display_download_summary(stats):
-    """Display download summary"""
-    print(colored("\n" + "="*60, "cyan"))
-    print(colored("📊 DOWNLOAD SUMMARY", "cyan", attrs=['bold']))
-    print(colored("="*60, "cyan"))
-    print(colored(f"  ✅ Symbols processed: {stats['symbols_processed']}", "green"))
-    print(colored(f"  📈 Total candles saved: {stats['candles_saved']:,}", "green"))
-    print(colored(f"  🪙 Unique symbols: {len(stats.get('downloaded_symbols', []))}", "green"))
-    if stats['errors'] > 0:
-        print(colored(f"  ❌ Errors: {stats['errors']}", "red"))
-    print(colored("="*60, "cyan"))
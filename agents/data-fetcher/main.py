@@ -6,30 +6,30 @@ Daemon mode:
 - If no saved list: does initial full refresh (top 100 + candles)
 - Every 15 minutes: automatic OHLCV data update (keeps existing list)
 
-Manual triggers (via signal files):
-- 'refresh_signal.txt' → Refresh OHLCV data only (keeps current Top 100 list)
-- 'update_list_signal.txt' → Update Top 100 ranking by volume + refresh all data
+Manual triggers (events on the shared database, see core.event_bus):
+- 'refresh_requested' → Refresh OHLCV data only (keeps current Top 100 list)
+- 'list_update_requested' → Update Top 100 ranking by volume + refresh all data
+
+Between updates the daemon sleeps on the event bus, so a trigger from the
+dashboard (or scripts/publish_event.py) is handled immediately without
+polling.
 
 The bot runs in daemon mode and stays alive continuously.
 """
 
 import asyncio
 import sys
-import os
 from datetime import datetime
-from pathlib import Path
 from termcolor import colored
 import ccxt.async_support as ccxt
 
 import config
 from core.database_cache import DatabaseCache
-from fetcher import full_refresh, fetch_candles_for_symbols, display_download_summary
-
-
-# Shared path for signal files
-SHARED_PATH = os.getenv("SHARED_DATA_PATH", "/app/shared")
-REFRESH_SIGNAL_FILE = f"{SHARED_PATH}/refresh_signal.txt"  # Refresh OHLCV data only
-UPDATE_LIST_SIGNAL_FILE = f"{SHARED_PATH}/update_list_signal.txt"  # Update top 100 list + refresh data
+from core.indicator_engine import StreamingIndicatorEngine
+from core.retention import RealtimeRetention
+from core.event_bus import EventSubscriber, LIST_UPDATE_REQUESTED, REFRESH_REQUESTED
+from core.download_report import display_download_summary
+from fetcher import full_refresh, fetch_candles_for_symbols
 
 
 def print_header():
@@ -48,22 +48,6 @@ def print_header():
 """, "cyan"))
 
 
-def check_refresh_signal():
-    """Check if OHLCV data refresh signal exists (refresh data only, keep existing list)"""
-    if Path(REFRESH_SIGNAL_FILE).exists():
-        Path(REFRESH_SIGNAL_FILE).unlink()  # Delete signal file
-        return True
-    return False
-
-
-def check_update_list_signal():
-    """Check if update list signal exists (update top 100 list + refresh all data)"""
-    if Path(UPDATE_LIST_SIGNAL_FILE).exists():
-        Path(UPDATE_LIST_SIGNAL_FILE).unlink()  # Delete signal file
-        return True
-    return False
-
-
 async def run_daemon():
     """Run the daemon that fetches data periodically"""
     print(colored("\n🤖 DAEMON MODE - Bot will stay active and update data automatically", "yellow", attrs=['bold']))
@@ -71,6 +55,24 @@ async def run_daemon():
     db_cache = DatabaseCache()
     exchange = ccxt.bybit(config.exchange_config)
     
+    # Streaming indicator states survive restarts via the indicator_state table
+    indicator_engine = StreamingIndicatorEngine(db_cache)
+    indicator_engine.load()
+    
+    # Scheduled realtime_ohlcv cleanup (DATA_RETENTION_DAYS + per-series cap)
+    retention = RealtimeRetention(
+        db_cache,
+        max_age_days=config.DATA_RETENTION_DAYS,
+        min_candles=config.RETENTION_MIN_CANDLES,
+        max_candles=config.RETENTION_MAX_CANDLES or None,
+        batch_rows=config.RETENTION_BATCH_ROWS,
+    )
+    last_retention = None
+    
+    # Durable subscriber: a trigger published while the agent was down is handled on start
+    subscriber = EventSubscriber(db_cache.db_path, [REFRESH_REQUESTED, LIST_UPDATE_REQUESTED],
+                                 name='data-fetcher')
+    
     try:
         # Check if we have saved symbols in DB
         saved_symbols = db_cache.get_top_symbols_list()
@@ -78,56 +80,52 @@ async def run_daemon():
         if not saved_symbols:
             # No saved list - do initial full refresh (list + data)
             print(colored("\n🚀 DAEMON START - No saved list, doing initial full refresh...", "green", attrs=['bold']))
-            stats = await full_refresh(exchange, db_cache)
+            stats = await full_refresh(exchange, db_cache, indicator_engine)
         else:
             # We have a saved list - just refresh OHLCV data
             print(colored(f"\n🚀 DAEMON START - Found {len(saved_symbols)} saved symbols, refreshing data...", "green", attrs=['bold']))
-            stats = await fetch_candles_for_symbols(exchange, db_cache, saved_symbols)
+            stats = await fetch_candles_for_symbols(exchange, db_cache, saved_symbols, indicator_engine=indicator_engine)
         
         display_download_summary(stats)
         db_cache.print_db_stats()
         
         print(colored("\n✅ Initial load complete!", "green", attrs=['bold']))
+        last_retention = await run_retention(retention, last_retention)
         print_next_update_info()
         
-        # Main loop - update every 15 minutes
+        # Main loop - update every 15 minutes or as soon as a trigger is published
         while True:
-            signal_type = None
+            events = await subscriber.wait_async(config.UPDATE_INTERVAL_MINUTES * 60)
+            topics = {event.topic for event in events}
             
-            # Wait with signal check
-            for _ in range(config.UPDATE_INTERVAL_MINUTES * 60):
-                await asyncio.sleep(1)
-                
-                # Check for update list signal (priority)
-                if check_update_list_signal():
-                    signal_type = "UPDATE_LIST"
-                    print(colored("\n🔔 Update Top 100 List signal detected!", "yellow", attrs=['bold']))
-                    break
-                
-                # Check for data refresh signal
-                if check_refresh_signal():
-                    signal_type = "REFRESH_DATA"
-                    print(colored("\n🔔 Refresh Data signal detected!", "yellow", attrs=['bold']))
-                    break
+            signal_type = None
+            if LIST_UPDATE_REQUESTED in topics:
+                # Update list (priority: it also refreshes the data)
+                signal_type = "UPDATE_LIST"
+                print(colored("\n🔔 Update Top 100 List requested!", "yellow", attrs=['bold']))
+            elif REFRESH_REQUESTED in topics:
+                signal_type = "REFRESH_DATA"
+                print(colored("\n🔔 Refresh Data requested!", "yellow", attrs=['bold']))
             
             # Execute based on signal type
             if signal_type == "UPDATE_LIST":
                 # Update top 100 list + refresh all data
                 print(colored("\n📋 Updating Top 100 List + Refreshing Data...", "magenta", attrs=['bold']))
-                stats = await full_refresh(exchange, db_cache)
+                stats = await full_refresh(exchange, db_cache, indicator_engine)
                 
             elif signal_type == "REFRESH_DATA":
                 # Only refresh OHLCV data for existing list
                 print(colored("\n🔄 Refreshing OHLCV Data (using saved list)...", "cyan", attrs=['bold']))
-                stats = await fetch_candles_for_symbols(exchange, db_cache)
+                stats = await fetch_candles_for_symbols(exchange, db_cache, indicator_engine=indicator_engine)
                 
             else:
                 # Normal periodic update - only candles
                 print(colored(f"\n🔄 Periodic data update... [{datetime.now().strftime('%H:%M:%S')}]", "cyan"))
-                stats = await fetch_candles_for_symbols(exchange, db_cache)
+                stats = await fetch_candles_for_symbols(exchange, db_cache, indicator_engine=indicator_engine)
             
             display_download_summary(stats)
             db_cache.print_db_stats()
+            last_retention = await run_retention(retention, last_retention)
             print_next_update_info()
             
     except asyncio.CancelledError:
@@ -136,16 +134,43 @@ async def run_daemon():
         print(colored(f"\n❌ Daemon error: {e}", "red"))
         raise
     finally:
+        subscriber.close()
         if exchange:
             await exchange.close()
 
 
+async def run_retention(retention: RealtimeRetention, last_run: datetime = None) -> datetime:
+    """Run the retention policy and the table_stats check if RETENTION_INTERVAL_MINUTES have passed; returns the last run time"""
+    now = datetime.now()
+    if last_run and (now - last_run).total_seconds() < config.RETENTION_INTERVAL_MINUTES * 60:
+        return last_run
+    
+    try:
+        # Batched deletes are blocking SQLite work: keep them off the event loop
+        result = await asyncio.to_thread(retention.run)
+        if result.deleted:
+            print(colored(f"🧹 Retention: {result.deleted:,} old candles removed from {result.series} series "
+                          f"({result.duration_sec:.1f}s)", "cyan"))
+    except Exception as e:
+        print(colored(f"⚠️ Retention error: {e}", "yellow"))
+    
+    try:
+        # Background consistency check of the table_stats counters (same schedule)
+        check = await asyncio.to_thread(retention.db_cache.check_table_stats)
+        if check['mismatched']:
+            print(colored(f"📏 table_stats: {check['mismatched']} series repaired", "yellow"))
+    except Exception as e:
+        print(colored(f"⚠️ table_stats check error: {e}", "yellow"))
+    return now
+
+
 def print_next_update_info():
     """Print info about next update and available signals"""
     print(colored(f"\n⏰ Next automatic update in {config.UPDATE_INTERVAL_MINUTES} minutes", "cyan"))
     print(colored("💡 Manual triggers available:", "cyan"))
-    print(colored("   • 'refresh_signal.txt' → Refresh OHLCV data (keeps current list)", "white"))
-    print(colored("   • 'update_list_signal.txt' → Update Top 100 ranking + refresh data", "white"))
+    print(colored("   • 'refresh_requested' event → Refresh OHLCV data (keeps current list)", "white"))
+    print(colored("   • 'list_update_requested' event → Update Top 100 ranking + refresh data", "white"))
+    print(colored("   (dashboard buttons or: python scripts/publish_event.py refresh_requested)", "white"))
 
 
 async def main():
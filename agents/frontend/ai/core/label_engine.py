@@ -0,0 +1,138 @@
+"""
+⚙️ ATR Label Engine - Universe labeling with the vectorized kernels
+
+label_universe() labels every symbol of a timeframe with a single
+atr_stop_kernel() call: the series are concatenated and all their valid
+entries simulated together (an entry's window never crosses the end of
+its series). ATRLabeler.generate_labels_for_universe() and
+generate_labels_for_timeframe() are thin wrappers around it.
+
+Results are bit-identical to the per-bar Python simulation of
+ai.core.label_reference (use_kernel=False, scripts/check_atr_label_kernel.py).
+"""
+
+import logging
+from math import log
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .label_kernels import atr_stop_kernel, atr_wilder, exit_type_names
+
+logger = logging.getLogger(__name__)
+
+MIN_ATR_PCT = 0.001  # Entries with a smaller ATR (flat market) are not labeled
+
+
+def label_columns(tf: str) -> List[str]:
+    """Canonical label column order of a timeframe"""
+    return [
+        # TARGETS (for ML training)
+        f'score_long_{tf}', f'score_short_{tf}',
+        # DIAGNOSTICS (for analysis, not training)
+        f'realized_return_long_{tf}', f'realized_return_short_{tf}',
+        f'mfe_long_{tf}', f'mfe_short_{tf}',
+        f'mae_long_{tf}', f'mae_short_{tf}',
+        f'bars_held_long_{tf}', f'bars_held_short_{tf}',
+        f'exit_type_long_{tf}', f'exit_type_short_{tf}',
+        f'atr_pct_{tf}',
+    ]
+
+
+def labels_frame(index, tf: str, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Labels DataFrame with the canonical column order"""
+    return pd.DataFrame({name: columns[name] for name in label_columns(tf)}, index=index)
+
+
+def label_universe(
+    frames: Dict[str, pd.DataFrame],
+    timeframe: str,
+    k_fixed_sl: float,
+    k_trailing: float,
+    max_bars: int,
+    atr_period: int,
+    time_penalty_lambda: float,
+    trading_cost: float,
+    progress_callback: Callable = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Label every symbol of a timeframe with a single kernel call.
+
+    Args:
+        frames: {symbol: OHLCV DataFrame}
+        timeframe: '15m' or '1h' (label column suffix)
+        k_fixed_sl / k_trailing: Stop multipliers of the ATR
+        max_bars: Longest holding period
+        atr_period: ATR period
+        time_penalty_lambda / trading_cost: score = R - λ*log(1+D) - costs
+        progress_callback: Optional callback (symbols_prepared, total_symbols, timeframe)
+
+    Returns:
+        {symbol: labels DataFrame} with the columns of label_columns()
+    """
+    tf = timeframe
+
+    # Per symbol: ATR and valid entries (ATR calculated, enough future bars, ATR not too small)
+    arrays, entries, global_entries, offset = [], [], [], 0
+    for done, (symbol, df) in enumerate(frames.items(), 1):
+        close = df['close'].values.astype(np.float64)
+        high = df['high'].values.astype(np.float64)
+        low = df['low'].values.astype(np.float64)
+        n = len(df)
+
+        atr = atr_wilder(high, low, close, atr_period)
+        atr_pct = np.zeros(n)
+        atr_pct[atr_period:] = atr[atr_period:] / close[atr_period:]
+
+        local = np.arange(atr_period + 1, max(n - max_bars, atr_period + 1))
+        local = local[~(atr_pct[local] < MIN_ATR_PCT)]
+        arrays.append((high, low, close, atr_pct))
+        entries.append(local)
+        global_entries.append(local + offset)
+        offset += n
+
+        if progress_callback:
+            progress_callback(done, len(frames), timeframe)
+
+    if not frames:
+        return {}
+    high, low, close, atr_pct = (np.concatenate(parts) for parts in zip(*arrays))
+    all_entries = np.concatenate(global_entries)
+    logger.info(f"Generating ATR-based labels for {tf}: {len(frames)} series, {len(all_entries)} entries")
+    sides = atr_stop_kernel(high, low, close, atr_pct, all_entries, k_fixed_sl, k_trailing, max_bars)
+
+    # λ*log(1+D) per possible D with math.log: identical to label_reference.score()
+    penalty = np.array([time_penalty_lambda * log(1 + d) for d in range(max_bars + 1)])
+    entry_price = close[all_entries]
+
+    values = {}
+    for side, out in sides.items():
+        if side == 'long':
+            realized = (out['exit_price'] - entry_price) / entry_price
+        else:
+            realized = (entry_price - out['exit_price']) / entry_price
+        values[f'score_{side}_{tf}'] = realized - penalty[out['bars_held']] - trading_cost
+        values[f'realized_return_{side}_{tf}'] = realized
+        values[f'mfe_{side}_{tf}'] = out['mfe']
+        values[f'mae_{side}_{tf}'] = out['mae']
+        values[f'bars_held_{side}_{tf}'] = out['bars_held'].astype(np.float64)
+        values[f'exit_type_{side}_{tf}'] = exit_type_names(out['exit_type'])
+    values[f'atr_pct_{tf}'] = atr_pct[all_entries]
+
+    # Scatter back per symbol (rows without a valid entry: NaN / 'invalid')
+    results = {}
+    start = 0
+    for (symbol, df), local in zip(frames.items(), entries):
+        picked = slice(start, start + len(local))
+        start += len(local)
+        columns = {}
+        for name, column in values.items():
+            if column.dtype == object:
+                full = np.full(len(df), 'invalid', dtype=object)
+            else:
+                full = np.full(len(df), np.nan)
+            full[local] = column[picked]
+            columns[name] = full
+        results[symbol] = labels_frame(df.index, tf, columns)
+    return results
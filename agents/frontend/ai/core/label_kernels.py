@@ -0,0 +1,304 @@
+"""
+⚙️ ATR Label Kernels - Vectorized ATR and batched ATR-stop simulation
+
+Array counterparts of ai.core.label_reference (calculate_atr_reference(),
+simulate_long() / simulate_short()):
+
+- atr_wilder(): true range with NumPy, Wilder smoothing as a tight loop
+  over native floats (the recursion is sequential; the same operations
+  on float64 give the same values as the reference loop)
+- atr_stop_kernel(): fixed SL + ATR trailing stop for every entry at
+  once. The loop runs over the max_bars future offsets; at offset j each
+  array op covers the trades still open (gathering candle i + 1 + j of
+  each), and closed trades are dropped from the working arrays, so the
+  work shrinks with the stop hits. Entries of several symbols can
+  be simulated in one call on concatenated arrays (see
+  ATRLabeler.generate_labels_for_universe): an entry's window never
+  crosses its series end, so series never mix.
+- atr_stop_sweep_kernel(): the same simulation for a vector of trailing
+  multipliers in one pass over the offsets, each entry run up to its own
+  horizon. It records where each trade hit its stop, so the outcome of
+  any shorter max_bars follows by truncation (see ai.core.label_sweep).
+
+Results are bit-identical to the Python reference of label_reference
+(scripts/check_atr_label_kernel.py).
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# exit_type codes (EXIT_TYPE_NAMES[code + 1] gives the label text)
+EXIT_INVALID = -1
+EXIT_TIME = 0
+EXIT_TRAILING = 1
+EXIT_FIXED_SL = 2
+EXIT_TYPE_NAMES = np.array(['invalid', 'time', 'trailing', 'fixed_sl'], dtype=object)
+
+DEFAULT_CHUNK_ROWS = 16384
+NO_STOP = np.iinfo(np.int32).max  # Sweep exit_bar of a trade still open at its horizon
+
+
+def exit_type_names(codes: np.ndarray) -> np.ndarray:
+    """int8 exit_type codes → object array of 'fixed_sl' / 'trailing' / 'time' / 'invalid'"""
+    return EXIT_TYPE_NAMES[codes.astype(np.int64) + 1]
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """max(high-low, |high-prev close|, |low-prev close|); 0 on the first candle"""
+    tr = np.zeros(len(high))
+    if len(high) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(np.maximum(high[1:] - low[1:], np.abs(high[1:] - prev_close)),
+                            np.abs(low[1:] - prev_close))
+    return tr
+
+
+def atr_wilder(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    ATR with the conventions of calculate_atr(): zeros up to `period`,
+    simple mean of TR[1..period] at `period`, Wilder smoothing after.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(high)
+    tr = true_range(high, low, close)
+    atr = np.zeros(n)
+    if n > period:
+        value = float(np.mean(tr[1:period + 1]))
+        smoothed = [value]
+        for tr_i in tr[period + 1:].tolist():
+            value = (value * (period - 1) + tr_i) / period
+            smoothed.append(value)
+        atr[period:] = smoothed
+    return atr
+
+
+def _simulate_side(high, low, close, entries, atr_pct, k_fixed_sl, k_trailing, max_bars, long_side: bool):
+    """All `entries` (indices) of one side"""
+    entry = close[entries]
+    k = len(entries)
+    if long_side:
+        fixed_sl = entry * (1 - k_fixed_sl * atr_pct)
+    else:
+        fixed_sl = entry * (1 + k_fixed_sl * atr_pct)
+    trailing_mult = 1 - k_trailing * atr_pct if long_side else 1 + k_trailing * atr_pct
+
+    exit_price = np.empty(k)
+    bars_held = np.full(k, max_bars, dtype=np.int32)
+    exit_type = np.full(k, EXIT_TIME, dtype=np.int8)
+    max_at_exit = np.empty(k)
+    min_at_exit = np.empty(k)
+
+    # Open trades only: the arrays shrink as trades close
+    open_ = np.arange(k)
+    bar_index = entries.copy()
+    max_seen = entry.copy()
+    min_seen = entry.copy()
+    open_fixed = fixed_sl
+    open_mult = trailing_mult
+
+    for j in range(max_bars):
+        bar_index += 1
+        bar_high = high[bar_index]
+        bar_low = low[bar_index]
+        np.maximum(max_seen, bar_high, out=max_seen)
+        np.minimum(min_seen, bar_low, out=min_seen)
+
+        # REGOLA FONDAMENTALE: lo stop non peggiora mai
+        if long_side:
+            effective_sl = np.maximum(open_fixed, max_seen * open_mult)
+            hit = bar_low <= effective_sl
+        else:
+            effective_sl = np.minimum(open_fixed, min_seen * open_mult)
+            hit = bar_high >= effective_sl
+
+        closed = np.flatnonzero(hit)
+        if len(closed):
+            rows = open_[closed]
+            exit_price[rows] = effective_sl[closed]
+            bars_held[rows] = j + 1
+            exit_type[rows] = np.where(effective_sl[closed] == open_fixed[closed], EXIT_FIXED_SL, EXIT_TRAILING)
+            max_at_exit[rows] = max_seen[closed]
+            min_at_exit[rows] = min_seen[closed]
+            keep = ~hit
+            open_, bar_index = open_[keep], bar_index[keep]
+            max_seen, min_seen = max_seen[keep], min_seen[keep]
+            open_fixed, open_mult = open_fixed[keep], open_mult[keep]
+            if not len(open_):
+                break
+
+    # Time exit at the close of the last bar of the window
+    exit_price[open_] = close[entries[open_] + max_bars]
+    max_at_exit[open_] = max_seen
+    min_at_exit[open_] = min_seen
+
+    if long_side:
+        mfe = (max_at_exit - entry) / entry
+        mae = (entry - min_at_exit) / entry
+    else:
+        mfe = (entry - min_at_exit) / entry
+        mae = (max_at_exit - entry) / entry
+    return exit_price, bars_held, exit_type, mfe, mae
+
+
+def atr_stop_kernel(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr_pct: np.ndarray,
+    entries: np.ndarray,
+    k_fixed_sl: float,
+    k_trailing: float,
+    max_bars: int,
+    chunk_rows: int = None,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Simulate LONG and SHORT ATR-stop trades for the given entry indices.
+
+    Entry i uses the candles i+1 .. i+max_bars, which must exist and belong
+    to the same series as i; its stops use atr_pct[i]. Entries are
+    simulated in blocks of `chunk_rows` (default DEFAULT_CHUNK_ROWS), which
+    keeps the working arrays of a large universe cache-sized.
+
+    Returns:
+        {'long': side, 'short': side}, each side a dict of arrays aligned
+        with `entries`: exit_price (float64), bars_held (int32), exit_type
+        (int8 EXIT_* code), mfe, mae (float64)
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    entries = np.asarray(entries, dtype=np.int64)
+    entry_atr = np.asarray(atr_pct, dtype=np.float64)[entries]
+
+    chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+    k = len(entries)
+
+    result = {}
+    for side, long_side in (('long', True), ('short', False)):
+        out = {'exit_price': np.empty(k), 'bars_held': np.empty(k, dtype=np.int32),
+               'exit_type': np.empty(k, dtype=np.int8), 'mfe': np.empty(k), 'mae': np.empty(k)}
+        for start in range(0, k, chunk_rows):
+            block = slice(start, start + chunk_rows)
+            (out['exit_price'][block], out['bars_held'][block], out['exit_type'][block],
+             out['mfe'][block], out['mae'][block]) = _simulate_side(
+                high, low, close, entries[block], entry_atr[block], k_fixed_sl, k_trailing, max_bars, long_side)
+        result[side] = out
+    return result
+
+
+def _sweep_side(high, low, close, entries, horizons, atr_pct, k_fixed_sl, k_trailings, long_side: bool):
+    """All (entry, k_trailing) pairs of one side, entry-major"""
+    n_k = len(k_trailings)
+    pair_entry = np.repeat(np.arange(len(entries)), n_k)
+    k_trailing = np.tile(k_trailings, len(entries))
+    entry = close[entries][pair_entry]
+    entry_atr = atr_pct[pair_entry]
+    if long_side:
+        fixed_sl = entry * (1 - k_fixed_sl * entry_atr)
+        trailing_mult = 1 - k_trailing * entry_atr
+    else:
+        fixed_sl = entry * (1 + k_fixed_sl * entry_atr)
+        trailing_mult = 1 + k_trailing * entry_atr
+
+    k = len(pair_entry)
+    exit_bar = np.full(k, NO_STOP, dtype=np.int32)
+    exit_price = np.full(k, np.nan)
+    exit_type = np.full(k, EXIT_TIME, dtype=np.int8)
+
+    open_ = np.arange(k)
+    bar_index = entries[pair_entry]
+    horizon = horizons[pair_entry]
+    max_seen = entry.copy()
+    min_seen = entry.copy()
+    open_fixed = fixed_sl
+    open_mult = trailing_mult
+
+    for j in range(int(horizons.max(initial=0))):
+        # Trades at their horizon stay open: the next candle may be another series
+        keep = horizon > j
+        if not keep.all():
+            open_, bar_index, horizon = open_[keep], bar_index[keep], horizon[keep]
+            max_seen, min_seen = max_seen[keep], min_seen[keep]
+            open_fixed, open_mult = open_fixed[keep], open_mult[keep]
+
+        bar_index += 1
+        bar_high = high[bar_index]
+        bar_low = low[bar_index]
+        np.maximum(max_seen, bar_high, out=max_seen)
+        np.minimum(min_seen, bar_low, out=min_seen)
+
+        if long_side:
+            effective_sl = np.maximum(open_fixed, max_seen * open_mult)
+            hit = bar_low <= effective_sl
+        else:
+            effective_sl = np.minimum(open_fixed, min_seen * open_mult)
+            hit = bar_high >= effective_sl
+
+        closed = np.flatnonzero(hit)
+        if len(closed):
+            rows = open_[closed]
+            exit_price[rows] = effective_sl[closed]
+            exit_bar[rows] = j + 1
+            exit_type[rows] = np.where(effective_sl[closed] == open_fixed[closed], EXIT_FIXED_SL, EXIT_TRAILING)
+            keep = ~hit
+            open_, bar_index, horizon = open_[keep], bar_index[keep], horizon[keep]
+            max_seen, min_seen = max_seen[keep], min_seen[keep]
+            open_fixed, open_mult = open_fixed[keep], open_mult[keep]
+            if not len(open_):
+                break
+
+    shape = (len(entries), n_k)
+    return exit_bar.reshape(shape).T, exit_price.reshape(shape).T, exit_type.reshape(shape).T
+
+
+def atr_stop_sweep_kernel(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr_pct: np.ndarray,
+    entries: np.ndarray,
+    horizons: np.ndarray,
+    k_fixed_sl: float,
+    k_trailings: np.ndarray,
+    chunk_rows: int = None,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Stop exits of LONG and SHORT ATR-stop trades for several k_trailing values.
+
+    Entry i is followed for horizons[i] candles (i+1 .. i+horizons[i] must
+    exist), once per k_trailing, with the operations of atr_stop_kernel().
+    A trade that hits its stop at bar b <= M has the same exit with
+    max_bars = M; one still open at bar M exits on time at close[i + M].
+    Blocks hold about `chunk_rows` (entry, k_trailing) pairs.
+
+    Returns:
+        {'long': side, 'short': side}, each side a dict of (k_trailings, entries)
+        arrays: exit_bar (int32, NO_STOP if no stop up to the horizon),
+        exit_price (float64, NaN without a stop), exit_type (int8 EXIT_FIXED_SL /
+        EXIT_TRAILING, EXIT_TIME without a stop)
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    entries = np.asarray(entries, dtype=np.int64)
+    horizons = np.asarray(horizons, dtype=np.int64)
+    k_trailings = np.asarray(k_trailings, dtype=np.float64)
+    entry_atr = np.asarray(atr_pct, dtype=np.float64)[entries]
+
+    block_entries = max(1, (chunk_rows or DEFAULT_CHUNK_ROWS) // max(len(k_trailings), 1))
+    shape = (len(k_trailings), len(entries))
+
+    result = {}
+    for side, long_side in (('long', True), ('short', False)):
+        out = {'exit_bar': np.empty(shape, dtype=np.int32), 'exit_price': np.empty(shape),
+               'exit_type': np.empty(shape, dtype=np.int8)}
+        for start in range(0, len(entries), block_entries):
+            block = slice(start, start + block_entries)
+            out['exit_bar'][:, block], out['exit_price'][:, block], out['exit_type'][:, block] = _sweep_side(
+                high, low, close, entries[block], horizons[block], entry_atr[block],
+                k_fixed_sl, k_trailings, long_side)
+        result[side] = out
+    return result
@@ -0,0 +1,269 @@
+"""
+🐢 ATR Label Reference - Per-bar Python simulation
+
+The original loops of ATRLabeler, kept as the reference the vectorized
+kernels (label_kernels / label_engine) are checked against
+(scripts/check_atr_label_kernel.py):
+
+- calculate_atr_reference(): Wilder ATR, one bar at a time
+- simulate_long() / simulate_short(): one trade, one bar at a time
+- generate_labels_reference(): every entry of one series, one trade at a time
+
+ATRLabeler.generate_labels_for_timeframe(use_kernel=False) delegates here.
+"""
+
+import logging
+from math import log
+from typing import Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .label_engine import MIN_ATR_PCT, labels_frame
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_atr_reference(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Calculate Average True Range (ATR) - per-bar reference loop.
+
+    Args:
+        high: Array of high prices
+        low: Array of low prices
+        close: Array of close prices
+        period: ATR period (default: 14)
+
+    Returns:
+        Array of ATR values
+    """
+    n = len(high)
+    tr = np.zeros(n)
+    atr = np.zeros(n)
+
+    # True Range calculation
+    for i in range(1, n):
+        tr1 = high[i] - low[i]
+        tr2 = abs(high[i] - close[i-1])
+        tr3 = abs(low[i] - close[i-1])
+        tr[i] = max(tr1, tr2, tr3)
+
+    # First ATR is simple average
+    if n > period:
+        atr[period] = np.mean(tr[1:period+1])
+
+        # Subsequent ATRs use EMA-style smoothing
+        for i in range(period + 1, n):
+            atr[i] = (atr[i-1] * (period - 1) + tr[i]) / period
+
+    return atr
+
+
+def score(realized_return: float, bars_held: int, time_penalty_lambda: float, trading_cost: float) -> float:
+    """score = R - λ*log(1+D) - costs"""
+    return realized_return - time_penalty_lambda * log(1 + bars_held) - trading_cost
+
+
+def simulate_long(
+    entry_price: float,
+    atr_pct: float,
+    high_prices: np.ndarray,
+    low_prices: np.ndarray,
+    close_prices: np.ndarray,
+    k_fixed_sl: float,
+    k_trailing: float,
+    max_bars: int
+) -> Tuple[float, int, str, float, float]:
+    """
+    Simulate a LONG trade with ATR-based stops.
+
+    Args:
+        entry_price: Entry price (close of entry candle)
+        atr_pct: ATR as percentage of price at entry
+        high_prices: Array of high prices after entry
+        low_prices: Array of low prices after entry
+        close_prices: Array of close prices after entry
+        k_fixed_sl: Fixed SL multiplier
+        k_trailing: Trailing multiplier
+        max_bars: Maximum bars to hold
+
+    Returns:
+        Tuple of (exit_price, bars_held, exit_type, mfe, mae)
+    """
+    n_bars = min(len(high_prices), max_bars)
+
+    # Fixed Stop Loss (never moves)
+    fixed_sl = entry_price * (1 - k_fixed_sl * atr_pct)
+
+    max_seen = entry_price
+    min_seen = entry_price
+
+    for i in range(n_bars):
+        # Max seen drives the trailing stop, min seen the MAE
+        if high_prices[i] > max_seen:
+            max_seen = high_prices[i]
+        if low_prices[i] < min_seen:
+            min_seen = low_prices[i]
+
+        trailing_sl = max_seen * (1 - k_trailing * atr_pct)
+
+        # The stop never gets worse
+        effective_sl = max(fixed_sl, trailing_sl)
+
+        if low_prices[i] <= effective_sl:
+            exit_type = 'fixed_sl' if effective_sl == fixed_sl else 'trailing'
+            mfe = (max_seen - entry_price) / entry_price
+            mae = (entry_price - min_seen) / entry_price
+            return effective_sl, i + 1, exit_type, mfe, mae
+
+    # Time exit (max bars reached)
+    exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
+    mfe = (max_seen - entry_price) / entry_price
+    mae = (entry_price - min_seen) / entry_price
+
+    return exit_price, n_bars, 'time', mfe, mae
+
+
+def simulate_short(
+    entry_price: float,
+    atr_pct: float,
+    high_prices: np.ndarray,
+    low_prices: np.ndarray,
+    close_prices: np.ndarray,
+    k_fixed_sl: float,
+    k_trailing: float,
+    max_bars: int
+) -> Tuple[float, int, str, float, float]:
+    """
+    Simulate a SHORT trade with ATR-based stops (mirror of simulate_long).
+
+    Returns:
+        Tuple of (exit_price, bars_held, exit_type, mfe, mae)
+    """
+    n_bars = min(len(high_prices), max_bars)
+
+    # Fixed Stop Loss (never moves) - above entry for SHORT
+    fixed_sl = entry_price * (1 + k_fixed_sl * atr_pct)
+
+    min_seen = entry_price
+    max_seen = entry_price
+
+    for i in range(n_bars):
+        # Min seen drives the trailing stop, max seen the MAE
+        if low_prices[i] < min_seen:
+            min_seen = low_prices[i]
+        if high_prices[i] > max_seen:
+            max_seen = high_prices[i]
+
+        trailing_sl = min_seen * (1 + k_trailing * atr_pct)
+
+        # The stop never gets worse: for SHORT the lower one
+        effective_sl = min(fixed_sl, trailing_sl)
+
+        if high_prices[i] >= effective_sl:
+            exit_type = 'fixed_sl' if effective_sl == fixed_sl else 'trailing'
+            mfe = (entry_price - min_seen) / entry_price
+            mae = (max_seen - entry_price) / entry_price
+            return effective_sl, i + 1, exit_type, mfe, mae
+
+    # Time exit (max bars reached)
+    exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
+    mfe = (entry_price - min_seen) / entry_price
+    mae = (max_seen - entry_price) / entry_price
+
+    return exit_price, n_bars, 'time', mfe, mae
+
+
+def generate_labels_reference(
+    df: pd.DataFrame,
+    timeframe: str,
+    k_fixed_sl: float,
+    k_trailing: float,
+    max_bars: int,
+    atr_period: int,
+    time_penalty_lambda: float,
+    trading_cost: float,
+    progress_callback: Callable = None
+) -> pd.DataFrame:
+    """
+    Labels of one series with the per-bar simulation (parameters as
+    label_engine.label_universe()).
+
+    Args:
+        df: OHLCV DataFrame with columns [open, high, low, close, volume]
+        timeframe: '15m' or '1h' (label column suffix)
+        k_fixed_sl / k_trailing: Stop multipliers of the ATR
+        max_bars: Longest holding period
+        atr_period: ATR period
+        time_penalty_lambda / trading_cost: score = R - λ*log(1+D) - costs
+        progress_callback: Optional callback (done, total, timeframe)
+
+    Returns:
+        DataFrame with the columns of label_engine.label_columns()
+    """
+    tf = timeframe
+    close = df['close'].values
+    high = df['high'].values
+    low = df['low'].values
+    n = len(df)
+
+    atr = calculate_atr_reference(high, low, close, atr_period)
+    atr_pct = np.zeros(n)
+    atr_pct[atr_period:] = atr[atr_period:] / close[atr_period:]
+
+    columns = {
+        f'{prefix}_{side}': np.full(n, np.nan)
+        for prefix in ('score', 'realized_return', 'mfe', 'mae', 'bars_held')
+        for side in ('long', 'short')
+    }
+    exit_type = {'long': np.empty(n, dtype=object), 'short': np.empty(n, dtype=object)}
+    atr_pct_at_entry = np.full(n, np.nan)
+
+    # Valid range: need ATR calculated and enough future bars
+    start_idx = atr_period + 1
+    end_idx = n - max_bars
+
+    logger.info(f"Generating ATR-based labels for {tf}: {start_idx} to {end_idx}")
+
+    for i in range(start_idx, end_idx):
+        if progress_callback and i % 1000 == 0:
+            progress_callback(i - start_idx, end_idx - start_idx, timeframe)
+
+        entry_price = close[i]
+        current_atr_pct = atr_pct[i]
+
+        # Skip if ATR is too small (avoid division issues)
+        if current_atr_pct < MIN_ATR_PCT:
+            exit_type['long'][i] = exit_type['short'][i] = 'invalid'
+            continue
+
+        atr_pct_at_entry[i] = current_atr_pct
+        future = (high[i + 1: i + 1 + max_bars], low[i + 1: i + 1 + max_bars], close[i + 1: i + 1 + max_bars])
+
+        for side, simulate in (('long', simulate_long), ('short', simulate_short)):
+            exit_price, bars, exit_t, mfe, mae = simulate(
+                entry_price, current_atr_pct, *future, k_fixed_sl, k_trailing, max_bars
+            )
+            if side == 'long':
+                r = (exit_price - entry_price) / entry_price
+            else:
+                r = (entry_price - exit_price) / entry_price  # SHORT profits when price goes down
+            columns[f'score_{side}'][i] = score(r, bars, time_penalty_lambda, trading_cost)
+            columns[f'realized_return_{side}'][i] = r
+            columns[f'mfe_{side}'][i] = mfe
+            columns[f'mae_{side}'][i] = mae
+            columns[f'bars_held_{side}'][i] = bars
+            exit_type[side][i] = exit_t
+
+    # Mark edges as invalid
+    for side in exit_type.values():
+        side[:start_idx] = 'invalid'
+        side[end_idx:] = 'invalid'
+
+    result = {f'{name}_{tf}': values for name, values in columns.items()}
+    result.update({f'exit_type_{side}_{tf}': values for side, values in exit_type.items()})
+    result[f'atr_pct_{tf}'] = atr_pct_at_entry
+    return labels_frame(df.index, tf, result)
+
+
+__all__ = ['calculate_atr_reference', 'simulate_long', 'simulate_short', 'generate_labels_reference']
@@ -0,0 +1,224 @@
+"""
+🧮 ATR Label Sweep - Many label configs from one simulation
+
+Most label configs of a parameter search share their price path work:
+
+- k_trailing changes the stops: one atr_stop_sweep_kernel() pass
+  simulates a whole vector of them, up to the largest max_bars
+- max_bars only truncates: a stop hit at bar b <= M is the exit with
+  max_bars = M, a trade still open at bar M exits on time at close[i + M]
+- time_penalty_lambda and trading_cost only transform realized_return
+  and bars_held (score = R - λ*log(1+D) - costs)
+
+ATRLabelSweep keeps the stop exits per k_trailing; outcomes() for a
+config is then a lookup plus array arithmetic. k_trailing values outside
+the swept vector are simulated on first use and cached. Results are
+bit-identical to ATRLabeler.generate_labels_for_timeframe()
+(scripts/check_atr_label_sweep.py); mfe / mae are not kept.
+
+from_search_space() builds the sweep a parameter search needs: the step
+grid of k_trailing_<tf> and the max_bars_<tf> range of a search space
+such as LabelOptimizer's PARAM_SEARCH_SPACE.
+"""
+
+import logging
+from math import log
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .label_kernels import EXIT_TIME, atr_stop_sweep_kernel, atr_wilder, exit_type_names
+from .labels import ATRLabelConfig
+
+logger = logging.getLogger(__name__)
+
+SIDES = ('long', 'short')
+TIMEFRAME_SUFFIXES = ('_15m', '_1h')
+
+
+def timeframe_search_space(search_space: Dict[str, Dict], timeframe: str) -> Dict[str, Dict]:
+    """Parameters of a search space used by one timeframe (shared ones and <name>_<timeframe>)"""
+    return {
+        name: space for name, space in search_space.items()
+        if not name.endswith(TIMEFRAME_SUFFIXES) or name.endswith(f'_{timeframe}')
+    }
+
+
+def step_grid(space: Dict) -> np.ndarray:
+    """Values of a stepped parameter (low, low + step, ..., high)"""
+    count = int(round((space['high'] - space['low']) / space['step'])) + 1
+    return np.round(space['low'] + space['step'] * np.arange(count), 10)
+
+
+class ATRLabelSweep:
+    """
+    Stop exits of one OHLC series for a vector of k_trailing values and
+    every max_bars in [min_max_bars, max_max_bars].
+
+    k_fixed_sl and atr_period come from `config` and are fixed for the sweep.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        timeframe: str,
+        k_trailings: Iterable[float],
+        max_bars_range: tuple,
+        config: ATRLabelConfig = None
+    ):
+        """
+        Args:
+            df: OHLCV DataFrame (only high, low, close are read)
+            timeframe: '15m' or '1h' (label column suffix and k_fixed_sl)
+            k_trailings: Trailing multipliers simulated up front
+            max_bars_range: (min_max_bars, max_max_bars) the lookups may ask for
+            config: k_fixed_sl / atr_period (default ATRLabelConfig())
+        """
+        self.config = config or ATRLabelConfig()
+        self.timeframe = timeframe
+        self.index = df.index
+        self.k_fixed_sl = self.config.get_k_fixed_sl(timeframe)
+        self.min_max_bars, self.max_max_bars = int(max_bars_range[0]), int(max_bars_range[1])
+        if not 1 <= self.min_max_bars <= self.max_max_bars:
+            raise ValueError(f"Invalid max_bars range: {max_bars_range}")
+
+        self.high = df['high'].values.astype(np.float64)
+        self.low = df['low'].values.astype(np.float64)
+        self.close = df['close'].values.astype(np.float64)
+        n = len(df)
+        period = self.config.atr_period
+
+        # ATR and entries as generate_labels_for_universe(), for the smallest max_bars
+        atr = atr_wilder(self.high, self.low, self.close, period)
+        self.atr_pct = np.zeros(n)
+        self.atr_pct[period:] = atr[period:] / self.close[period:]
+        entries = np.arange(period + 1, max(n - self.min_max_bars, period + 1))
+        self.entries = entries[~(self.atr_pct[entries] < 0.001)]
+        # Each entry is followed as far as the largest max_bars or the series end
+        self.horizons = np.minimum(self.max_max_bars, n - 1 - self.entries)
+        self.entry_price = self.close[self.entries]
+
+        self._log_table = np.array([log(1 + d) for d in range(self.max_max_bars + 1)])
+        self._exits = {}  # round(k_trailing, 10) -> {side: (exit_bar, exit_price, exit_type)}
+        self.add_k_trailings(k_trailings)
+
+    @classmethod
+    def from_search_space(
+        cls,
+        df: pd.DataFrame,
+        timeframe: str,
+        search_space: Dict[str, Dict],
+        config: ATRLabelConfig = None
+    ) -> 'ATRLabelSweep':
+        """Sweep of the k_trailing_<tf> grid over the max_bars_<tf> range of a search space"""
+        bars_space = search_space[f'max_bars_{timeframe}']
+        return cls(df, timeframe, step_grid(search_space[f'k_trailing_{timeframe}']),
+                   (bars_space['low'], bars_space['high']), config)
+
+    @staticmethod
+    def _key(k_trailing: float) -> float:
+        return round(float(k_trailing), 10)
+
+    def add_k_trailings(self, k_trailings: Iterable[float]):
+        """Simulate the k_trailing values not swept yet (one kernel pass)"""
+        missing = {}
+        for k in k_trailings:
+            if self._key(k) not in self._exits:
+                missing.setdefault(self._key(k), float(k))
+        missing = list(missing.values())
+        if not missing:
+            return
+        logger.info(f"Label sweep {self.timeframe}: {len(missing)} k_trailing x {len(self.entries)} entries, "
+                    f"max_bars up to {self.max_max_bars}")
+        sides = atr_stop_sweep_kernel(self.high, self.low, self.close, self.atr_pct, self.entries,
+                                      self.horizons, self.k_fixed_sl, np.array(missing))
+        for row, k in enumerate(missing):
+            self._exits[self._key(k)] = {
+                side: (out['exit_bar'][row], out['exit_price'][row], out['exit_type'][row])
+                for side, out in sides.items()
+            }
+
+    @property
+    def k_trailings(self) -> list:
+        return sorted(self._exits)
+
+    def outcomes(
+        self,
+        k_trailing: float,
+        max_bars: int,
+        time_penalty_lambda: float = None,
+        trading_cost: float = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Labels of one config on its valid entries.
+
+        Args:
+            k_trailing / max_bars: Stop config (max_bars within max_bars_range)
+            time_penalty_lambda / trading_cost: Scoring (default: from config)
+
+        Returns:
+            {'entries': row positions, 'atr_pct', and per side 'score_<side>',
+             'realized_return_<side>', 'bars_held_<side>' (int32),
+             'exit_type_<side>' (int8 EXIT_* codes)}
+        """
+        max_bars = int(max_bars)
+        if not self.min_max_bars <= max_bars <= self.max_max_bars:
+            raise ValueError(f"max_bars {max_bars} outside the sweep range "
+                             f"[{self.min_max_bars}, {self.max_max_bars}]")
+        lam = self.config.time_penalty_lambda if time_penalty_lambda is None else time_penalty_lambda
+        cost = self.config.trading_cost if trading_cost is None else trading_cost
+        self.add_k_trailings([k_trailing])
+        exits = self._exits[self._key(k_trailing)]
+
+        # Entries with max_bars future candles (entries are sorted)
+        valid = np.searchsorted(self.entries, len(self.close) - max_bars, side='left')
+        entries = self.entries[:valid]
+        entry_price = self.entry_price[:valid]
+        time_exit_price = self.close[entries + max_bars]
+        penalty = lam * self._log_table[:max_bars + 1]  # λ*log(1+D) as label_reference.score()
+
+        result = {'entries': entries, 'atr_pct': self.atr_pct[entries]}
+        for side in SIDES:
+            exit_bar, exit_price, exit_type = (a[:valid] for a in exits[side])
+            stopped = exit_bar <= max_bars
+            exit_price = np.where(stopped, exit_price, time_exit_price)
+            bars_held = np.where(stopped, exit_bar, max_bars).astype(np.int32)
+            if side == 'long':
+                realized = (exit_price - entry_price) / entry_price
+            else:
+                realized = (entry_price - exit_price) / entry_price
+            result[f'score_{side}'] = realized - penalty[bars_held] - cost
+            result[f'realized_return_{side}'] = realized
+            result[f'bars_held_{side}'] = bars_held
+            result[f'exit_type_{side}'] = np.where(stopped, exit_type, EXIT_TIME).astype(np.int8)
+        return result
+
+    def labels(self, k_trailing: float, max_bars: int, time_penalty_lambda: float = None,
+               trading_cost: float = None) -> pd.DataFrame:
+        """
+        outcomes() as a labels DataFrame over the whole series: the columns of
+        generate_labels_for_timeframe() except mfe / mae (NaN / 'invalid' off entry)
+        """
+        tf = self.timeframe
+        out = self.outcomes(k_trailing, max_bars, time_penalty_lambda, trading_cost)
+        rows = out['entries']
+        n = len(self.close)
+
+        def scatter(values, fill, dtype=np.float64):
+            full = np.full(n, fill, dtype=dtype)
+            full[rows] = values
+            return full
+
+        columns = {}
+        for prefix in ('score', 'realized_return', 'bars_held'):
+            for side in SIDES:
+                columns[f'{prefix}_{side}_{tf}'] = scatter(out[f'{prefix}_{side}'], np.nan)
+        for side in SIDES:
+            columns[f'exit_type_{side}_{tf}'] = scatter(exit_type_names(out[f'exit_type_{side}']),
+                                                        'invalid', dtype=object)
+        columns[f'atr_pct_{tf}'] = scatter(out['atr_pct'], np.nan)
+        return pd.DataFrame(columns, index=self.index)
+
+
+__all__ = ['ATRLabelSweep', 'timeframe_search_space', 'step_grid']
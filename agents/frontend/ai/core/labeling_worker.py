@@ -0,0 +1,113 @@
+"""
+🏷️ Labeling Worker - One (symbol, timeframe) labeling task
+
+Entry point of the labeling job's worker processes
+(components/tabs/train/labeling_jobs.py). A task reads the OHLC prices of
+one training_data series with its own read-only SQLite connection, labels
+it with ATRLabeler and returns the training_labels_c rows (ids and
+epoch-ms timestamps, no text parsing in the writer); the job's single
+writer inserts them.
+
+Imports only numpy / pandas / sqlite3 and ai.core.labels, so a spawned
+worker starts without loading the dashboard (streamlit, database pool).
+"""
+
+import sqlite3
+from typing import List, Tuple
+
+import pandas as pd
+
+from .labels import ATRLabeler, ATRLabelConfig
+
+# Epoch-ms conversion of the compact tables (database/compact_schema.py)
+_EPOCH = pd.Timestamp('1970-01-01')
+_MS = pd.Timedelta(milliseconds=1)
+
+
+def load_label_prices(db_path: str, symbol_id: int, tf_id: int) -> pd.DataFrame:
+    """high / low / close of one training_data series, indexed by timestamp"""
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, timeout=30)
+    try:
+        df = pd.read_sql_query('''
+            SELECT ts, high, low, close FROM training_data_c
+            WHERE symbol_id = ? AND tf_id = ?
+            ORDER BY ts
+        ''', conn, params=(symbol_id, tf_id))
+    finally:
+        conn.close()
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop('ts').to_numpy(), unit='ms'), name='timestamp')
+    return df
+
+
+def _valid_labels(timeframe: str, labels_df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with a valid label on both sides"""
+    tf = timeframe
+    valid_mask = labels_df[f'exit_type_long_{tf}'] != 'invalid'
+    return labels_df[valid_mask].dropna(subset=[f'score_long_{tf}', f'score_short_{tf}'])
+
+
+def _label_values(timeframe: str, result_df: pd.DataFrame) -> list:
+    """Value columns as lists, in training_labels order (score_long ... atr_pct)"""
+    tf = timeframe
+    
+    def values(name):
+        return result_df[f'{name}_{tf}'].tolist()
+    
+    return [
+        values('score_long'),
+        values('score_short'),
+        values('realized_return_long'),
+        values('realized_return_short'),
+        values('mfe_long'),
+        values('mfe_short'),
+        values('mae_long'),
+        values('mae_short'),
+        result_df[f'bars_held_long_{tf}'].astype(int).tolist(),
+        result_df[f'bars_held_short_{tf}'].astype(int).tolist(),
+        values('exit_type_long'),
+        values('exit_type_short'),
+        result_df[f'atr_pct_{tf}'].fillna(0.0).astype(float).tolist(),
+    ]
+
+
+def build_label_rows(symbol: str, timeframe: str, labels_df: pd.DataFrame) -> list:
+    """
+    training_labels rows (INSERT parameter tuples) of the valid labels,
+    built column-wise instead of row by row.
+    """
+    result_df = _valid_labels(timeframe, labels_df)
+    if len(result_df) == 0:
+        return []
+    n = len(result_df)
+    timestamps = [str(ts) for ts in result_df.index]
+    return list(zip(timestamps, [symbol] * n, [timeframe] * n, *_label_values(timeframe, result_df)))
+
+
+def build_compact_label_rows(symbol_id: int, tf_id: int, timeframe: str, labels_df: pd.DataFrame) -> list:
+    """build_label_rows() for training_labels_c: (symbol_id, tf_id, ts ms, values...)"""
+    result_df = _valid_labels(timeframe, labels_df)
+    if len(result_df) == 0:
+        return []
+    n = len(result_df)
+    ts = ((result_df.index - _EPOCH) // _MS).tolist()
+    return list(zip([symbol_id] * n, [tf_id] * n, ts, *_label_values(timeframe, result_df)))
+
+
+def label_series(db_path: str, symbol: str, timeframe: str, symbol_id: int, tf_id: int,
+                 config: ATRLabelConfig) -> Tuple[str, str, List[tuple], str]:
+    """
+    Label one series (runs in a worker process).
+    
+    Returns:
+        (symbol, timeframe, rows, message) - training_labels_c rows
+        (build_compact_label_rows), empty when there is nothing to insert
+    """
+    df = load_label_prices(db_path, symbol_id, tf_id)
+    if len(df) == 0:
+        return symbol, timeframe, [], "No data available"
+    
+    labels_df = ATRLabeler(config).generate_labels_for_timeframe(df, timeframe)
+    rows = build_compact_label_rows(symbol_id, tf_id, timeframe, labels_df)
+    if not rows:
+        return symbol, timeframe, [], "No valid labels generated"
+    return symbol, timeframe, rows, "Success"
@@ -22,15 +22,23 @@ Dove:
 - λ = time penalty coefficient
 - costs = trading fees
 
+generate_labels_for_timeframe() / generate_labels_for_universe() delegate
+to ai.core.label_engine (vectorized kernels, several symbols in one
+call); use_kernel=False runs the per-bar Python simulation of
+ai.core.label_reference, the reference for the kernels.
+
 Reference: ATR-based labeling for ML-safe training
 """
 
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional, Dict, List
+from typing import Dict, List
 from dataclasses import dataclass
 import logging
-from math import log
+
+from .label_engine import label_universe
+from .label_kernels import atr_wilder
+from .label_reference import generate_labels_reference
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +108,7 @@ class ATRLabelConfig:
 
 def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
     """
-    Calculate Average True Range (ATR).
+    Calculate Average True Range (ATR), vectorized (label_kernels.atr_wilder).
     
     Args:
         high: Array of high prices
@@ -111,26 +119,7 @@ def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period:
     Returns:
         Array of ATR values
     """
-    n = len(high)
-    tr = np.zeros(n)
-    atr = np.zeros(n)
-    
-    # True Range calculation
-    for i in range(1, n):
-        tr1 = high[i] - low[i]
-        tr2 = abs(high[i] - close[i-1])
-        tr3 = abs(low[i] - close[i-1])
-        tr[i] = max(tr1, tr2, tr3)
-    
-    # First ATR is simple average
-    if n > period:
-        atr[period] = np.mean(tr[1:period+1])
-        
-        # Subsequent ATRs use EMA-style smoothing
-        for i in range(period + 1, n):
-            atr[i] = (atr[i-1] * (period - 1) + tr[i]) / period
-    
-    return atr
+    return atr_wilder(high, low, close, period)
 
 
 class ATRLabeler:
@@ -154,357 +143,68 @@ class ATRLabeler:
         """
         self.config = config or ATRLabelConfig()
     
-    def _simulate_long(
+    def generate_labels_for_timeframe(
         self,
-        entry_price: float,
-        atr_pct: float,
-        high_prices: np.ndarray,
-        low_prices: np.ndarray,
-        close_prices: np.ndarray,
-        k_fixed_sl: float,
-        k_trailing: float,
-        max_bars: int
-    ) -> Tuple[float, int, str, float, float]:
+        df: pd.DataFrame,
+        timeframe: str = '15m',
+        progress_callback: callable = None,
+        use_kernel: bool = True
+    ) -> pd.DataFrame:
         """
-        Simulate a LONG trade with ATR-based stops.
+        Generate labels for a specific timeframe.
         
         Args:
-            entry_price: Entry price (close of entry candle)
-            atr_pct: ATR as percentage of price at entry
-            high_prices: Array of high prices after entry
-            low_prices: Array of low prices after entry
-            close_prices: Array of close prices after entry
-            k_fixed_sl: Fixed SL multiplier
-            k_trailing: Trailing multiplier
-            max_bars: Maximum bars to hold
+            df: OHLCV DataFrame with columns [open, high, low, close, volume]
+            timeframe: '15m' or '1h'
+            progress_callback: Optional callback for progress updates
+            use_kernel: Vectorized kernels (default) or the per-bar Python reference
         
         Returns:
-            Tuple of (exit_price, bars_held, exit_type, mfe, mae)
+            DataFrame with label columns
         """
-        n_bars = min(len(high_prices), max_bars)
-        
-        # Fixed Stop Loss (NON SI MUOVE MAI)
-        fixed_sl = entry_price * (1 - k_fixed_sl * atr_pct)
-        
-        # Tracking variables
-        max_seen = entry_price
-        min_seen = entry_price
-        
-        for i in range(n_bars):
-            # Update max seen (per trailing)
-            if high_prices[i] > max_seen:
-                max_seen = high_prices[i]
-            
-            # Update min seen (per MAE)
-            if low_prices[i] < min_seen:
-                min_seen = low_prices[i]
-            
-            # Trailing Stop (segue il max)
-            trailing_sl = max_seen * (1 - k_trailing * atr_pct)
-            
-            # REGOLA FONDAMENTALE: lo stop non peggiora mai
-            effective_sl = max(fixed_sl, trailing_sl)
-            
-            # Check if effective_sl hit
-            if low_prices[i] <= effective_sl:
-                exit_price = effective_sl
-                bars_held = i + 1
-                
-                # Determine exit type
-                if effective_sl == fixed_sl:
-                    exit_type = 'fixed_sl'
-                else:
-                    exit_type = 'trailing'
-                
-                # Calculate MFE/MAE up to exit
-                mfe = (max_seen - entry_price) / entry_price
-                mae = (entry_price - min_seen) / entry_price
-                
-                return exit_price, bars_held, exit_type, mfe, mae
-        
-        # Time exit (max bars reached)
-        exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
-        bars_held = n_bars
-        exit_type = 'time'
-        
-        # Calculate MFE/MAE up to exit
-        mfe = (max_seen - entry_price) / entry_price
-        mae = (entry_price - min_seen) / entry_price
-        
-        return exit_price, bars_held, exit_type, mfe, mae
+        if use_kernel:
+            return self.generate_labels_for_universe({None: df}, timeframe, progress_callback)[None]
+        return generate_labels_reference(df, timeframe, progress_callback=progress_callback,
+                                         **self._label_params(timeframe))
     
-    def _simulate_short(
-        self,
-        entry_price: float,
-        atr_pct: float,
-        high_prices: np.ndarray,
-        low_prices: np.ndarray,
-        close_prices: np.ndarray,
-        k_fixed_sl: float,
-        k_trailing: float,
-        max_bars: int
-    ) -> Tuple[float, int, str, float, float]:
-        """
-        Simulate a SHORT trade with ATR-based stops.
-        
-        Args:
-            entry_price: Entry price (close of entry candle)
-            atr_pct: ATR as percentage of price at entry
-            high_prices: Array of high prices after entry
-            low_prices: Array of low prices after entry
-            close_prices: Array of close prices after entry
-            k_fixed_sl: Fixed SL multiplier
-            k_trailing: Trailing multiplier
-            max_bars: Maximum bars to hold
-        
-        Returns:
-            Tuple of (exit_price, bars_held, exit_type, mfe, mae)
-        """
-        n_bars = min(len(high_prices), max_bars)
-        
-        # Fixed Stop Loss (NON SI MUOVE MAI) - per SHORT è sopra entry
-        fixed_sl = entry_price * (1 + k_fixed_sl * atr_pct)
-        
-        # Tracking variables
-        min_seen = entry_price
-        max_seen = entry_price
-        
-        for i in range(n_bars):
-            # Update min seen (per trailing - SHORT profit when price goes down)
-            if low_prices[i] < min_seen:
-                min_seen = low_prices[i]
-            
-            # Update max seen (per MAE)
-            if high_prices[i] > max_seen:
-                max_seen = high_prices[i]
-            
-            # Trailing Stop (segue il min) - per SHORT è sopra
-            trailing_sl = min_seen * (1 + k_trailing * atr_pct)
-            
-            # REGOLA FONDAMENTALE: lo stop non peggiora mai
-            # Per SHORT: effective_sl = min(fixed_sl, trailing_sl)
-            effective_sl = min(fixed_sl, trailing_sl)
-            
-            # Check if effective_sl hit
-            if high_prices[i] >= effective_sl:
-                exit_price = effective_sl
-                bars_held = i + 1
-                
-                # Determine exit type
-                if effective_sl == fixed_sl:
-                    exit_type = 'fixed_sl'
-                else:
-                    exit_type = 'trailing'
-                
-                # Calculate MFE/MAE up to exit (inverted for SHORT)
-                mfe = (entry_price - min_seen) / entry_price
-                mae = (max_seen - entry_price) / entry_price
-                
-                return exit_price, bars_held, exit_type, mfe, mae
-        
-        # Time exit (max bars reached)
-        exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
-        bars_held = n_bars
-        exit_type = 'time'
-        
-        # Calculate MFE/MAE up to exit
-        mfe = (entry_price - min_seen) / entry_price
-        mae = (max_seen - entry_price) / entry_price
-        
-        return exit_price, bars_held, exit_type, mfe, mae
+    def _label_params(self, timeframe: str) -> dict:
+        """Stop and scoring parameters of a timeframe (label_universe() keywords)"""
+        return dict(
+            k_fixed_sl=self.config.get_k_fixed_sl(timeframe),
+            k_trailing=self.config.get_k_trailing(timeframe),
+            max_bars=self.config.get_max_bars(timeframe),
+            atr_period=self.config.atr_period,
+            time_penalty_lambda=self.config.time_penalty_lambda,
+            trading_cost=self.config.trading_cost
+        )
     
-    def _calculate_score(
+    def generate_labels_for_universe(
         self,
-        realized_return: float,
-        bars_held: int
-    ) -> float:
-        """
-        Calculate final score.
-        
-        Formula: score = R - λ*log(1+D) - costs
-        
-        Args:
-            realized_return: R = (exit_price - entry_price) / entry_price
-            bars_held: D = number of bars held
-        
-        Returns:
-            Score (continuous, not normalized)
-        """
-        # Time penalty: λ * log(1 + D)
-        time_penalty = self.config.time_penalty_lambda * log(1 + bars_held)
-        
-        # Final score
-        score = realized_return - time_penalty - self.config.trading_cost
-        
-        return score
-    
-    def generate_labels_for_timeframe(
-        self,
-        df: pd.DataFrame,
+        frames: Dict[str, pd.DataFrame],
         timeframe: str = '15m',
         progress_callback: callable = None
-    ) -> pd.DataFrame:
+    ) -> Dict[str, pd.DataFrame]:
         """
-        Generate labels for a specific timeframe.
+        Label every symbol of a timeframe with a single kernel call
+        (label_engine.label_universe() with this labeler's config).
         
         Args:
-            df: OHLCV DataFrame with columns [open, high, low, close, volume]
+            frames: {symbol: OHLCV DataFrame}
             timeframe: '15m' or '1h'
-            progress_callback: Optional callback for progress updates
+            progress_callback: Optional callback (symbols_prepared, total_symbols, timeframe)
         
         Returns:
-            DataFrame with label columns
+            {symbol: labels DataFrame} with the columns of generate_labels_for_timeframe()
         """
-        tf = timeframe
-        k_fixed_sl = self.config.get_k_fixed_sl(timeframe)
-        k_trailing = self.config.get_k_trailing(timeframe)
-        max_bars = self.config.get_max_bars(timeframe)
-        atr_period = self.config.atr_period
-        
-        # Convert to numpy for speed
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        
-        n = len(df)
-        
-        # Calculate ATR
-        atr = calculate_atr(high, low, close, atr_period)
-        atr_pct = np.zeros(n)
-        atr_pct[atr_period:] = atr[atr_period:] / close[atr_period:]
-        
-        # Initialize output arrays
-        score_long = np.full(n, np.nan)
-        score_short = np.full(n, np.nan)
-        realized_return_long = np.full(n, np.nan)
-        realized_return_short = np.full(n, np.nan)
-        mfe_long = np.full(n, np.nan)
-        mfe_short = np.full(n, np.nan)
-        mae_long = np.full(n, np.nan)
-        mae_short = np.full(n, np.nan)
-        bars_held_long = np.full(n, np.nan)
-        bars_held_short = np.full(n, np.nan)
-        exit_type_long = np.empty(n, dtype=object)
-        exit_type_short = np.empty(n, dtype=object)
-        atr_pct_at_entry = np.full(n, np.nan)
-        
-        # Valid range: need ATR calculated and enough future bars
-        start_idx = atr_period + 1
-        end_idx = n - max_bars
-        
-        logger.info(f"Generating ATR-based labels for {tf}: {start_idx} to {end_idx}")
-        
-        for i in range(start_idx, end_idx):
-            if progress_callback and i % 1000 == 0:
-                progress_callback(i - start_idx, end_idx - start_idx, timeframe)
-            
-            entry_price = close[i]
-            current_atr_pct = atr_pct[i]
-            
-            # Skip if ATR is too small (avoid division issues)
-            if current_atr_pct < 0.001:
-                exit_type_long[i] = 'invalid'
-                exit_type_short[i] = 'invalid'
-                continue
-            
-            atr_pct_at_entry[i] = current_atr_pct
-            
-            # Future price arrays (after entry)
-            future_high = high[i + 1: i + 1 + max_bars]
-            future_low = low[i + 1: i + 1 + max_bars]
-            future_close = close[i + 1: i + 1 + max_bars]
-            
-            # ═══════════════════════════════════════════════════════════════
-            # LONG SIMULATION
-            # ═══════════════════════════════════════════════════════════════
-            
-            exit_price_l, bars_l, exit_t_l, mfe_l, mae_l = self._simulate_long(
-                entry_price=entry_price,
-                atr_pct=current_atr_pct,
-                high_prices=future_high,
-                low_prices=future_low,
-                close_prices=future_close,
-                k_fixed_sl=k_fixed_sl,
-                k_trailing=k_trailing,
-                max_bars=max_bars
-            )
-            
-            # Realized return for LONG
-            r_long = (exit_price_l - entry_price) / entry_price
-            
-            # Score for LONG
-            s_long = self._calculate_score(r_long, bars_l)
-            
-            # Store LONG results
-            score_long[i] = s_long
-            realized_return_long[i] = r_long
-            mfe_long[i] = mfe_l
-            mae_long[i] = mae_l
-            bars_held_long[i] = bars_l
-            exit_type_long[i] = exit_t_l
-            
-            # ═══════════════════════════════════════════════════════════════
-            # SHORT SIMULATION
-            # ═══════════════════════════════════════════════════════════════
-            
-            exit_price_s, bars_s, exit_t_s, mfe_s, mae_s = self._simulate_short(
-                entry_price=entry_price,
-                atr_pct=current_atr_pct,
-                high_prices=future_high,
-                low_prices=future_low,
-                close_prices=future_close,
-                k_fixed_sl=k_fixed_sl,
-                k_trailing=k_trailing,
-                max_bars=max_bars
-            )
-            
-            # Realized return for SHORT (profit when price goes down)
-            r_short = (entry_price - exit_price_s) / entry_price
-            
-            # Score for SHORT
-            s_short = self._calculate_score(r_short, bars_s)
-            
-            # Store SHORT results
-            score_short[i] = s_short
-            realized_return_short[i] = r_short
-            mfe_short[i] = mfe_s
-            mae_short[i] = mae_s
-            bars_held_short[i] = bars_s
-            exit_type_short[i] = exit_t_s
-        
-        # Mark edges as invalid
-        exit_type_long[:start_idx] = 'invalid'
-        exit_type_short[:start_idx] = 'invalid'
-        exit_type_long[end_idx:] = 'invalid'
-        exit_type_short[end_idx:] = 'invalid'
-        
-        # Create result DataFrame
-        labels_df = pd.DataFrame({
-            # TARGETS (for ML training)
-            f'score_long_{tf}': score_long,
-            f'score_short_{tf}': score_short,
-            
-            # DIAGNOSTICS (for analysis, not training)
-            f'realized_return_long_{tf}': realized_return_long,
-            f'realized_return_short_{tf}': realized_return_short,
-            f'mfe_long_{tf}': mfe_long,
-            f'mfe_short_{tf}': mfe_short,
-            f'mae_long_{tf}': mae_long,
-            f'mae_short_{tf}': mae_short,
-            f'bars_held_long_{tf}': bars_held_long,
-            f'bars_held_short_{tf}': bars_held_short,
-            f'exit_type_long_{tf}': exit_type_long,
-            f'exit_type_short_{tf}': exit_type_short,
-            f'atr_pct_{tf}': atr_pct_at_entry,
-        }, index=df.index)
-        
-        return labels_df
+        return label_universe(frames, timeframe, progress_callback=progress_callback,
+                              **self._label_params(timeframe))
     
     def generate_all_labels(
         self,
         df: pd.DataFrame,
         timeframes: List[str] = None,
-        progress_callback: callable = None
+        progress_callback: callable = None,
+        use_kernel: bool = True
     ) -> pd.DataFrame:
         """
         Generate labels for all specified timeframes.
@@ -513,6 +213,7 @@ class ATRLabeler:
             df: OHLCV DataFrame
             timeframes: List of timeframes to process (default: ['15m'])
             progress_callback: Optional callback for progress updates
+            use_kernel: Vectorized kernels (default) or the per-bar Python reference
         
         Returns:
             DataFrame with all label columns
@@ -524,7 +225,7 @@ class ATRLabeler:
         
         for tf in timeframes:
             logger.info(f"Generating ATR-based labels for timeframe: {tf}")
-            labels = self.generate_labels_for_timeframe(df, tf, progress_callback)
+            labels = self.generate_labels_for_timeframe(df, tf, progress_callback, use_kernel)
             all_labels.append(labels)
         
         # Combine all labels
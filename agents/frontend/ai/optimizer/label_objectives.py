@@ -0,0 +1,136 @@
+"""
+🎯 Label Optimization Objectives
+
+Objectives LabelOptimizer maximizes over the labels of a trial: win rate,
+Sharpe, profit factor, expected value, total return and win rate x
+profit factor. LONG and SHORT labels are pooled; fewer than 100 labels
+score -inf.
+
+objective_value() works on the label arrays of ATRLabelSweep.outcomes()
+(OBJECTIVE_KEYS); calculate_objective() on a labels DataFrame of
+ATRLabeler.generate_labels_for_timeframe().
+"""
+
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+OBJECTIVE_KEYS = ('score_long', 'score_short', 'realized_return_long', 'realized_return_short')
+MIN_LABELS = 100  # Fewer labels give no meaningful evaluation
+MAX_PROFIT_FACTOR = 10.0  # Cap to avoid extreme values
+
+
+class OptimizationObjective(Enum):
+    """Available optimization objectives"""
+    WIN_RATE = "win_rate"
+    SHARPE_RATIO = "sharpe_ratio"
+    PROFIT_FACTOR = "profit_factor"
+    EXPECTED_VALUE = "expected_value"
+    TOTAL_RETURN = "total_return"
+    COMBO_WR_PF = "combo_wr_pf"
+
+
+def calculate_objective(
+    labels_df: pd.DataFrame,
+    timeframe: str,
+    objective: OptimizationObjective
+) -> float:
+    """
+    Objective value of a labels DataFrame.
+
+    Args:
+        labels_df: DataFrame with the generated labels
+        timeframe: '15m' or '1h'
+        objective: Objective to compute
+
+    Returns:
+        Objective value (higher is better)
+    """
+    tf = timeframe
+
+    exit_col = f'exit_type_long_{tf}'
+    if exit_col not in labels_df.columns:
+        return float('-inf')
+
+    valid_labels = labels_df[labels_df[exit_col] != 'invalid']
+
+    return objective_value(
+        valid_labels[f'score_long_{tf}'].values,
+        valid_labels[f'score_short_{tf}'].values,
+        valid_labels[f'realized_return_long_{tf}'].values,
+        valid_labels[f'realized_return_short_{tf}'].values,
+        objective
+    )
+
+
+def objective_value(
+    score_long: np.ndarray,
+    score_short: np.ndarray,
+    return_long: np.ndarray,
+    return_short: np.ndarray,
+    objective: OptimizationObjective
+) -> float:
+    """Objective on the valid labels (LONG / SHORT scores and returns)"""
+    if len(score_long) < MIN_LABELS:
+        return float('-inf')
+
+    # LONG and SHORT are evaluated together
+    all_scores = np.concatenate([score_long, score_short])
+    all_returns = np.concatenate([return_long, return_short])
+
+    valid_mask = ~np.isnan(all_scores) & ~np.isnan(all_returns)
+    all_scores = all_scores[valid_mask]
+    all_returns = all_returns[valid_mask]
+
+    if len(all_scores) == 0:
+        return float('-inf')
+
+    if objective == OptimizationObjective.WIN_RATE:
+        # Share of positive scores
+        return np.sum(all_scores > 0) / len(all_scores)
+
+    elif objective == OptimizationObjective.SHARPE_RATIO:
+        # Sharpe = mean / std (no annualization needed to compare trials)
+        if np.std(all_returns) < 1e-8:
+            return 0.0
+        return np.mean(all_returns) / np.std(all_returns)
+
+    elif objective == OptimizationObjective.PROFIT_FACTOR:
+        # Profit Factor = sum of profits / |sum of losses|
+        profits = all_returns[all_returns > 0].sum()
+        losses = abs(all_returns[all_returns < 0].sum())
+        if losses < 1e-8:
+            return MAX_PROFIT_FACTOR if profits > 0 else 0.0
+        return min(profits / losses, MAX_PROFIT_FACTOR)
+
+    elif objective == OptimizationObjective.EXPECTED_VALUE:
+        # EV = (win_rate * avg_win) - (loss_rate * avg_loss)
+        wins = all_returns[all_returns > 0]
+        losses = all_returns[all_returns < 0]
+
+        if len(wins) == 0 or len(losses) == 0:
+            return np.mean(all_returns)
+
+        win_rate = len(wins) / len(all_returns)
+        loss_rate = 1 - win_rate
+        return (win_rate * np.mean(wins)) - (loss_rate * abs(np.mean(losses)))
+
+    elif objective == OptimizationObjective.TOTAL_RETURN:
+        return np.sum(all_returns)
+
+    elif objective == OptimizationObjective.COMBO_WR_PF:
+        # Win Rate * Profit Factor
+        win_rate = np.sum(all_scores > 0) / len(all_scores)
+
+        profits = all_returns[all_returns > 0].sum()
+        losses = abs(all_returns[all_returns < 0].sum())
+        pf = profits / losses if losses > 1e-8 else 1.0
+
+        return win_rate * min(pf, MAX_PROFIT_FACTOR)
+
+    else:
+        return float('-inf')
+
+
+__all__ = ['OptimizationObjective', 'OBJECTIVE_KEYS', 'calculate_objective', 'objective_value']
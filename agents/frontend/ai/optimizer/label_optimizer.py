@@ -3,36 +3,39 @@
 
 Ottimizza i parametri del Trailing Stop Labeler usando Optuna.
 Obiettivi disponibili: Win Rate, Sharpe, Profit Factor, Expected Value, etc.
+
+The objectives are computed by ai/optimizer/label_objectives.py.
+Trials do not regenerate labels: an ATRLabelSweep simulates every
+k_trailing of the grid once, up to the largest max_bars, and each trial
+derives its labels by truncation (max_bars) and arithmetic (λ, costs).
+
+With several symbols the objective is computed symbol by symbol and
+reported to Optuna after each one, so the pruner stops hopeless trials
+after the first symbols. Studies with an RDB storage survive restarts and
+can be shared by several processes (ai/optimizer/label_study.py,
+scripts/optimize_labels.py).
 """
 
 import optuna
 from optuna.trial import Trial
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Callable
+from typing import Dict, List, Tuple, Optional, Callable, Union
 from dataclasses import dataclass
-from enum import Enum
 import logging
 import time
 
 # Import del labeler
 try:
-    from ai.core.labels import TrailingStopLabeler, TrailingLabelConfig
+    from ai.core.labels import TrailingLabelConfig
+    from ai.core.label_sweep import ATRLabelSweep, timeframe_search_space
     LABELER_AVAILABLE = True
 except ImportError:
     LABELER_AVAILABLE = False
 
-logger = logging.getLogger(__name__)
-
+from .label_objectives import OBJECTIVE_KEYS, OptimizationObjective, objective_value
 
-class OptimizationObjective(Enum):
-    """Obiettivi di ottimizzazione disponibili"""
-    WIN_RATE = "win_rate"
-    SHARPE_RATIO = "sharpe_ratio"
-    PROFIT_FACTOR = "profit_factor"
-    EXPECTED_VALUE = "expected_value"
-    TOTAL_RETURN = "total_return"
-    COMBO_WR_PF = "combo_wr_pf"
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -52,9 +55,9 @@ class OptimizationResult:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 PARAM_SEARCH_SPACE = {
-    # Trailing Stop (diverso per timeframe)
-    "trailing_stop_pct_15m": {"low": 0.005, "high": 0.03, "step": 0.001},  # 0.5% - 3.0%
-    "trailing_stop_pct_1h": {"low": 0.01, "high": 0.05, "step": 0.001},    # 1.0% - 5.0%
+    # Trailing Stop = ATR% * k_trailing (diverso per timeframe)
+    "k_trailing_15m": {"low": 0.5, "high": 3.0, "step": 0.1},
+    "k_trailing_1h": {"low": 0.5, "high": 3.0, "step": 0.1},
     
     # Max bars (diverso per timeframe)
     "max_bars_15m": {"low": 12, "high": 96, "step": 6},
@@ -68,110 +71,6 @@ PARAM_SEARCH_SPACE = {
 }
 
 
-def _calculate_objective(
-    labels_df: pd.DataFrame,
-    timeframe: str,
-    objective: OptimizationObjective
-) -> float:
-    """
-    Calcola il valore dell'obiettivo per un set di labels.
-    
-    Args:
-        labels_df: DataFrame con le labels generate
-        timeframe: '15m' o '1h'
-        objective: Tipo di obiettivo da calcolare
-    
-    Returns:
-        Valore dell'obiettivo (maggiore è meglio)
-    """
-    tf = timeframe
-    
-    # Filtra solo righe valide
-    exit_col = f'exit_type_long_{tf}'
-    if exit_col not in labels_df.columns:
-        return float('-inf')
-    
-    valid_mask = labels_df[exit_col] != 'invalid'
-    valid_labels = labels_df[valid_mask]
-    
-    if len(valid_labels) < 100:  # Minimo 100 labels per valutazione significativa
-        return float('-inf')
-    
-    # Estrai score e return
-    score_long = valid_labels[f'score_long_{tf}'].values
-    score_short = valid_labels[f'score_short_{tf}'].values
-    return_long = valid_labels[f'realized_return_long_{tf}'].values
-    return_short = valid_labels[f'realized_return_short_{tf}'].values
-    
-    # Combina LONG e SHORT per valutazione complessiva
-    all_scores = np.concatenate([score_long, score_short])
-    all_returns = np.concatenate([return_long, return_short])
-    
-    # Filtra NaN
-    valid_mask = ~np.isnan(all_scores) & ~np.isnan(all_returns)
-    all_scores = all_scores[valid_mask]
-    all_returns = all_returns[valid_mask]
-    
-    if len(all_scores) == 0:
-        return float('-inf')
-    
-    # Calcola l'obiettivo richiesto
-    if objective == OptimizationObjective.WIN_RATE:
-        # Percentuale di score positivi
-        win_rate = np.sum(all_scores > 0) / len(all_scores)
-        return win_rate
-    
-    elif objective == OptimizationObjective.SHARPE_RATIO:
-        # Sharpe = mean / std (annualizzato non necessario per confronto)
-        if np.std(all_returns) < 1e-8:
-            return 0.0
-        sharpe = np.mean(all_returns) / np.std(all_returns)
-        return sharpe
-    
-    elif objective == OptimizationObjective.PROFIT_FACTOR:
-        # Profit Factor = somma profitti / |somma perdite|
-        profits = all_returns[all_returns > 0].sum()
-        losses = abs(all_returns[all_returns < 0].sum())
-        if losses < 1e-8:
-            return 10.0 if profits > 0 else 0.0  # Cap at 10
-        pf = profits / losses
-        return min(pf, 10.0)  # Cap per evitare valori estremi
-    
-    elif objective == OptimizationObjective.EXPECTED_VALUE:
-        # EV = (win_rate * avg_win) - (loss_rate * avg_loss)
-        wins = all_returns[all_returns > 0]
-        losses = all_returns[all_returns < 0]
-        
-        if len(wins) == 0 or len(losses) == 0:
-            return np.mean(all_returns)
-        
-        win_rate = len(wins) / len(all_returns)
-        loss_rate = 1 - win_rate
-        avg_win = np.mean(wins)
-        avg_loss = abs(np.mean(losses))
-        
-        ev = (win_rate * avg_win) - (loss_rate * avg_loss)
-        return ev
-    
-    elif objective == OptimizationObjective.TOTAL_RETURN:
-        # Somma dei rendimenti
-        return np.sum(all_returns)
-    
-    elif objective == OptimizationObjective.COMBO_WR_PF:
-        # Win Rate * Profit Factor
-        win_rate = np.sum(all_scores > 0) / len(all_scores)
-        
-        profits = all_returns[all_returns > 0].sum()
-        losses = abs(all_returns[all_returns < 0].sum())
-        pf = profits / losses if losses > 1e-8 else 1.0
-        pf = min(pf, 10.0)
-        
-        return win_rate * pf
-    
-    else:
-        return float('-inf')
-
-
 class LabelOptimizer:
     """
     Ottimizzatore Optuna per i parametri del labeling.
@@ -179,30 +78,50 @@ class LabelOptimizer:
     
     def __init__(
         self,
-        ohlcv_df: pd.DataFrame,
+        ohlcv_df: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
         timeframe: str = '15m',
         objective: OptimizationObjective = OptimizationObjective.WIN_RATE,
         n_trials: int = 50,
         timeout: Optional[int] = 300,  # 5 minuti default
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        config: 'TrailingLabelConfig' = None,
+        storage: Optional[str] = None,
+        study_name: Optional[str] = None,
+        n_jobs: int = 1,
+        seed: Optional[int] = 42,
+        max_trials: Optional[int] = None
     ):
         """
         Inizializza l'ottimizzatore.
         
         Args:
-            ohlcv_df: DataFrame con dati OHLCV
+            ohlcv_df: OHLCV DataFrame, or {symbol: DataFrame} (pruned symbol by symbol)
             timeframe: '15m' o '1h'
             objective: Obiettivo di ottimizzazione
             n_trials: Numero massimo di trial Optuna
             timeout: Timeout in secondi (None = no timeout)
             progress_callback: Callback per aggiornare il progresso
+            config: k_fixed_sl and atr_period (fixed, default TrailingLabelConfig())
+            storage: RDB URL of the study (None = in memory)
+            study_name: Study name (default label_optimization_<timeframe>)
+            n_jobs: Trials run in parallel by this process (threads)
+            seed: TPESampler seed (one per process of a shared study)
+            max_trials: Stop once the study has max_trials finished trials (any process)
         """
         self.ohlcv_df = ohlcv_df
+        self.frames = ohlcv_df if isinstance(ohlcv_df, dict) else {None: ohlcv_df}
         self.timeframe = timeframe
         self.objective = objective
         self.n_trials = n_trials
         self.timeout = timeout
         self.progress_callback = progress_callback
+        self.config = config
+        self.storage = storage
+        self.study_name = study_name or f"label_optimization_{timeframe}"
+        self.n_jobs = n_jobs
+        self.seed = seed
+        self.max_trials = max_trials
+        self.sweeps = {}  # {symbol: ATRLabelSweep}, built by optimize()
         
         # Contatori per progress
         self._trial_count = 0
@@ -215,25 +134,29 @@ class LabelOptimizer:
             # Suggerisci parametri
             params = self._suggest_params(trial)
             
-            # Crea config
-            config = TrailingLabelConfig(
-                trailing_stop_pct_15m=params['trailing_stop_pct_15m'],
-                trailing_stop_pct_1h=params['trailing_stop_pct_1h'],
-                max_bars_15m=params['max_bars_15m'],
-                max_bars_1h=params['max_bars_1h'],
-                time_penalty_lambda=params['time_penalty_lambda'],
-                trading_cost=params['trading_cost']
-            )
-            
-            # Genera labels
-            labeler = TrailingStopLabeler(config)
-            labels_df = labeler.generate_labels_for_timeframe(
-                self.ohlcv_df, 
-                self.timeframe
-            )
+            # Labels from the sweeps (no new simulation for the k_trailing of the grid)
+            tf = self.timeframe
+            parts = {key: [] for key in OBJECTIVE_KEYS}
+            for step, sweep in enumerate(self.sweeps.values()):
+                out = sweep.outcomes(
+                    params[f'k_trailing_{tf}'],
+                    params[f'max_bars_{tf}'],
+                    params['time_penalty_lambda'],
+                    params['trading_cost']
+                )
+                for key, values in parts.items():
+                    values.append(out[key])
+                
+                # Partial objective over the symbols evaluated so far
+                if step < len(self.sweeps) - 1:
+                    partial = objective_value(*(np.concatenate(parts[k]) for k in OBJECTIVE_KEYS),
+                                              self.objective)
+                    trial.report(partial, step)
+                    if trial.should_prune():
+                        raise optuna.TrialPruned()
             
             # Calcola obiettivo
-            value = _calculate_objective(labels_df, self.timeframe, self.objective)
+            value = objective_value(*(np.concatenate(parts[k]) for k in OBJECTIVE_KEYS), self.objective)
             
             # Aggiorna contatori
             self._trial_count += 1
@@ -258,7 +181,7 @@ class LabelOptimizer:
         """Suggerisci parametri per un trial"""
         params = {}
         
-        for param_name, space in PARAM_SEARCH_SPACE.items():
+        for param_name, space in timeframe_search_space(PARAM_SEARCH_SPACE, self.timeframe).items():
             if 'log' in space and space['log']:
                 params[param_name] = trial.suggest_float(
                     param_name,
@@ -298,7 +221,7 @@ class LabelOptimizer:
             OptimizationResult con best params, study, e statistiche
         """
         if not LABELER_AVAILABLE:
-            raise ImportError("TrailingStopLabeler not available")
+            raise ImportError("ATRLabelSweep not available")
         
         start_time = time.time()
         
@@ -306,12 +229,21 @@ class LabelOptimizer:
         self._trial_count = 0
         self._best_value = float('-inf')
         
-        # Crea lo studio Optuna
-        study = optuna.create_study(
-            direction="maximize",
-            sampler=optuna.samplers.TPESampler(seed=42),
-            study_name=f"label_optimization_{self.timeframe}"
-        )
+        # One simulation for the whole k_trailing grid, up to the largest max_bars
+        self.sweeps = {
+            symbol: ATRLabelSweep.from_search_space(df, self.timeframe, PARAM_SEARCH_SPACE, self.config)
+            for symbol, df in self.frames.items()
+        }
+        
+        # Create (or resume) the Optuna study; label_study imports this module
+        from .label_study import create_label_study, study_result
+        study = create_label_study(self.study_name, self.storage, self.seed)
+        callbacks = []
+        if self.max_trials:
+            callbacks.append(optuna.study.MaxTrialsCallback(
+                self.max_trials,
+                states=(optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+            ))
         
         # Ottimizza
         objective_fn = self._create_objective_function()
@@ -320,62 +252,40 @@ class LabelOptimizer:
             objective_fn,
             n_trials=self.n_trials,
             timeout=self.timeout,
+            n_jobs=self.n_jobs,
+            callbacks=callbacks,
             show_progress_bar=False,  # Usiamo il nostro progress callback
             catch=(Exception,)  # Cattura eccezioni per non fermare l'ottimizzazione
         )
         
-        elapsed_time = time.time() - start_time
-        
-        # Estrai risultati
-        best_params = study.best_params
-        best_value = study.best_value
-        
-        # Calcola importanza parametri
-        try:
-            param_importances = optuna.importance.get_param_importances(study)
-        except Exception:
-            param_importances = None
-        
-        # Costruisci history
-        optimization_history = []
-        for trial in study.trials:
-            if trial.state == optuna.trial.TrialState.COMPLETE:
-                optimization_history.append({
-                    'trial': trial.number,
-                    'value': trial.value,
-                    'params': trial.params
-                })
-        
-        return OptimizationResult(
-            best_params=best_params,
-            best_value=best_value,
-            study=study,
-            optimization_history=optimization_history,
-            param_importances=param_importances,
-            elapsed_time=elapsed_time,
-            n_trials=len(study.trials)
-        )
+        return study_result(study, time.time() - start_time)
 
 
 def optimize_labels_with_optuna(
-    ohlcv_df: pd.DataFrame,
+    ohlcv_df: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
     timeframe: str = '15m',
     objective: str = 'win_rate',
     n_trials: int = 50,
     timeout: int = 300,
-    progress_callback: Optional[Callable] = None
+    progress_callback: Optional[Callable] = None,
+    config: 'TrailingLabelConfig' = None,
+    storage: Optional[str] = None,
+    n_jobs: int = 1
 ) -> OptimizationResult:
     """
     Funzione di convenienza per ottimizzare i parametri delle labels.
     
     Args:
-        ohlcv_df: DataFrame OHLCV
+        ohlcv_df: OHLCV DataFrame or {symbol: DataFrame}
         timeframe: '15m' o '1h'
         objective: 'win_rate', 'sharpe_ratio', 'profit_factor', 
                    'expected_value', 'total_return', 'combo_wr_pf'
         n_trials: Numero di trials
         timeout: Timeout in secondi
         progress_callback: Callback per progress updates
+        config: k_fixed_sl and atr_period (fixed)
+        storage: RDB URL of the study (None = in memory)
+        n_jobs: Trials run in parallel
     
     Returns:
         OptimizationResult
@@ -389,7 +299,10 @@ def optimize_labels_with_optuna(
         objective=obj_enum,
         n_trials=n_trials,
         timeout=timeout,
-        progress_callback=progress_callback
+        progress_callback=progress_callback,
+        config=config,
+        storage=storage,
+        n_jobs=n_jobs
     )
     
     return optimizer.optimize()
@@ -397,24 +310,13 @@ def optimize_labels_with_optuna(
 
 def get_default_params(timeframe: str = '15m') -> Dict:
     """Restituisce i parametri default per un timeframe"""
-    if timeframe == '15m':
-        return {
-            'trailing_stop_pct_15m': 0.015,
-            'trailing_stop_pct_1h': 0.025,
-            'max_bars_15m': 48,
-            'max_bars_1h': 24,
-            'time_penalty_lambda': 0.001,
-            'trading_cost': 0.001
-        }
-    else:
-        return {
-            'trailing_stop_pct_15m': 0.015,
-            'trailing_stop_pct_1h': 0.025,
-            'max_bars_15m': 48,
-            'max_bars_1h': 24,
-            'time_penalty_lambda': 0.001,
-            'trading_cost': 0.001
-        }
+    defaults = TrailingLabelConfig()
+    return {
+        f'k_trailing_{timeframe}': defaults.get_k_trailing(timeframe),
+        f'max_bars_{timeframe}': defaults.get_max_bars(timeframe),
+        'time_penalty_lambda': defaults.time_penalty_lambda,
+        'trading_cost': defaults.trading_cost
+    }
 
 
 # Esporta
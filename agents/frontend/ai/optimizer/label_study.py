@@ -0,0 +1,260 @@
+"""
+🗄️ Label Studies - Persistent, multi-process label optimization
+
+run_label_study() runs a LabelOptimizer study on the training_data series
+of one timeframe, outside the Streamlit process (scripts/optimize_labels.py):
+
+- The study lives in an RDB storage (LABEL_STUDY_STORAGE, a SQLite file
+  by default): it survives restarts, a new run with the same name resumes
+  it, and the dashboard reads its trials (components/tabs/train/
+  label_studies.py)
+- `workers` spawned processes share the study: each loads the series,
+  builds its own label sweeps and runs trials (n_jobs threads each) with
+  its own sampler seed, until the study has n_trials more finished trials
+- Trials are evaluated symbol by symbol, so the pruner stops the hopeless
+  ones after the first symbols (see LabelOptimizer)
+
+The study records its timeframe, objective and symbols: resuming it on
+another symbol set would mix incomparable trials, so it is refused. A
+resumed study keeps its stored symbols and their order (the pruning
+order), even if the row counts changed since.
+
+Imports only optuna / numpy / pandas / sqlite3 and ai.core, so a spawned
+worker starts without loading the dashboard.
+"""
+
+import multiprocessing
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import optuna
+import pandas as pd
+
+from ai.core.labels import ATRLabelConfig
+from ai.core.labeling_worker import load_label_prices
+from .label_optimizer import LabelOptimizer, OptimizationObjective, OptimizationResult
+
+LABEL_STUDY_PREFIX = 'label_optimization'
+FINISHED_STATES = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+# Pruning (one step per symbol, so only studies with several symbols prune)
+PRUNER_STARTUP_TRIALS = 5   # Complete trials before pruning starts
+PRUNER_WARMUP_SYMBOLS = 2   # Symbols evaluated before a trial can be pruned
+
+
+def label_study_name(timeframe: str, objective: str) -> str:
+    """Default study name: one study per (timeframe, objective)"""
+    return f"{LABEL_STUDY_PREFIX}_{timeframe}_{objective}"
+
+
+def label_study_storage(storage: Optional[str]):
+    """
+    Optuna storage for an RDB URL (None = in-memory study).
+
+    SQLite gets a long busy timeout: several processes write trials to the same file.
+    """
+    if not storage:
+        return None
+    engine_kwargs = {'connect_args': {'timeout': 60}} if storage.startswith('sqlite') else {}
+    return optuna.storages.RDBStorage(storage, engine_kwargs=engine_kwargs)
+
+
+def create_label_study(study_name: str, storage: Optional[str] = None, seed: Optional[int] = 42) -> optuna.Study:
+    """Create a label optimization study, or load it if the storage already has it"""
+    return optuna.create_study(
+        direction="maximize",
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=optuna.pruners.MedianPruner(
+            n_startup_trials=PRUNER_STARTUP_TRIALS,
+            n_warmup_steps=PRUNER_WARMUP_SYMBOLS
+        ),
+        study_name=study_name,
+        storage=label_study_storage(storage),
+        load_if_exists=True
+    )
+
+
+def study_result(study: optuna.Study, elapsed_time: float = 0.0) -> OptimizationResult:
+    """OptimizationResult of a study (also one loaded from a storage)"""
+    completed = [t for t in study.trials if t.state == optuna.trial.TrialState.COMPLETE]
+
+    # Parameter importances need complete trials
+    try:
+        param_importances = optuna.importance.get_param_importances(study)
+    except Exception:
+        param_importances = None
+
+    return OptimizationResult(
+        best_params=study.best_params if completed else {},
+        best_value=study.best_value if completed else float('-inf'),
+        study=study,
+        optimization_history=[
+            {'trial': t.number, 'value': t.value, 'params': t.params} for t in completed
+        ],
+        param_importances=param_importances,
+        elapsed_time=elapsed_time,
+        n_trials=len(study.trials)
+    )
+
+
+def list_label_series(db_path: str, timeframe: str, symbols: Sequence[str] = None,
+                      max_symbols: int = None) -> List[Tuple[str, int, int]]:
+    """
+    (symbol, symbol_id, tf_id) of the training_data series of a timeframe.
+
+    Longest series first (table_stats counters), then by symbol. The order is
+    the pruning order of the trials: run_label_study() keeps the order stored
+    with a study instead of re-deriving it from the current counters.
+    """
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, timeout=30)
+    try:
+        base = '''
+            SELECT s.symbol, s.id, t.id FROM symbol_ids s
+            JOIN timeframe_ids t ON t.timeframe = ?
+            {stats}
+            WHERE EXISTS (SELECT 1 FROM training_data_c c WHERE c.symbol_id = s.id AND c.tf_id = t.id)
+            ORDER BY {order} s.symbol
+        '''
+        try:
+            rows = conn.execute(base.format(
+                stats="LEFT JOIN table_stats ts ON ts.table_name = 'training_data' "
+                      "AND ts.symbol_id = s.id AND ts.tf_id = t.id",
+                order="COALESCE(ts.row_count, 0) DESC,"
+            ), (timeframe,)).fetchall()
+        except sqlite3.OperationalError:
+            # Database without table_stats
+            rows = conn.execute(base.format(stats='', order=''), (timeframe,)).fetchall()
+    finally:
+        conn.close()
+
+    if symbols:
+        wanted = set(symbols)
+        rows = [row for row in rows if row[0] in wanted]
+    return rows[:max_symbols] if max_symbols else rows
+
+
+def load_label_frames(db_path: str, series: Sequence[Tuple[str, int, int]]) -> Dict[str, pd.DataFrame]:
+    """{symbol: high / low / close DataFrame} of the given series"""
+    return {symbol: load_label_prices(db_path, symbol_id, tf_id) for symbol, symbol_id, tf_id in series}
+
+
+def _study_worker(db_path: str, series: list, timeframe: str, objective: str, storage: str,
+                  study_name: str, max_trials: int, timeout: Optional[int], n_jobs: int,
+                  seed: Optional[int], config: ATRLabelConfig):
+    """One worker process: runs trials of the shared study until it has max_trials finished ones"""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    LabelOptimizer(
+        load_label_frames(db_path, series),
+        timeframe=timeframe,
+        objective=OptimizationObjective(objective),
+        n_trials=None,
+        timeout=timeout,
+        config=config,
+        storage=storage,
+        study_name=study_name,
+        n_jobs=n_jobs,
+        seed=seed,
+        max_trials=max_trials
+    ).optimize()
+
+
+def run_label_study(
+    db_path: str,
+    storage: str,
+    timeframe: str = '15m',
+    objective: str = 'win_rate',
+    n_trials: int = 100,
+    study_name: str = None,
+    workers: int = 1,
+    n_jobs: int = 1,
+    timeout: Optional[int] = None,
+    symbols: Sequence[str] = None,
+    max_symbols: int = None,
+    config: ATRLabelConfig = None,
+    seed: int = 42
+) -> OptimizationResult:
+    """
+    Run (or resume) a persistent label optimization study.
+
+    Args:
+        db_path: trading_data.db with training_data_c
+        storage: Optuna RDB URL (e.g. sqlite:////app/shared/data_cache/label_studies.db)
+        n_trials: Trials to add to the study (finished = complete or pruned)
+        workers: Processes sharing the study
+        n_jobs: Trial threads per process
+        timeout: Seconds per worker (None = until n_trials)
+        symbols / max_symbols: Series to optimize on (default: all of the timeframe)
+        seed: Sampler seed of the first worker (the others use seed + index)
+
+    Returns:
+        OptimizationResult of the whole study (earlier runs included)
+    """
+    start_time = time.time()
+    objective = OptimizationObjective(objective).value
+    study_name = study_name or label_study_name(timeframe, objective)
+    config = config or ATRLabelConfig()
+
+    study = create_label_study(study_name, storage, seed)
+    stored_symbols = study.user_attrs.get('symbols')
+    series = list_label_series(db_path, timeframe, symbols or stored_symbols, max_symbols)
+    if not series:
+        raise ValueError(f"No training_data series for {timeframe}")
+    if stored_symbols and set(stored_symbols) == {s[0] for s in series}:
+        # Resume in the stored (pruning) order, whatever the current row counts
+        by_symbol = {s[0]: s for s in series}
+        series = [by_symbol[symbol] for symbol in stored_symbols]
+
+    setup = {'timeframe': timeframe, 'objective': objective, 'symbols': [s[0] for s in series],
+             'k_fixed_sl': config.get_k_fixed_sl(timeframe), 'atr_period': config.atr_period}
+    stored = {key: study.user_attrs[key] for key in setup if key in study.user_attrs}
+    changed = sorted(key for key in stored if stored[key] != setup[key])
+    if changed:
+        raise ValueError(f"Study '{study_name}' was run with another {', '.join(changed)}: use a new study name")
+    for key, value in setup.items():
+        study.set_user_attr(key, value)
+
+    max_trials = len([t for t in study.trials if t.state in FINISHED_STATES]) + n_trials
+    args = (db_path, series, timeframe, objective, storage, study_name, max_trials, timeout, n_jobs)
+    if workers <= 1:
+        _study_worker(*args, seed, config)
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(_study_worker, *args, seed + index, config) for index in range(workers)]
+            for future in futures:
+                future.result()
+
+    study = optuna.load_study(study_name=study_name, storage=label_study_storage(storage))
+    return study_result(study, time.time() - start_time)
+
+
+def get_label_studies(storage: str) -> List[optuna.study.StudySummary]:
+    """Summaries of the label studies in a storage (empty if there is none)"""
+    try:
+        summaries = optuna.get_all_study_summaries(storage=label_study_storage(storage))
+    except Exception:
+        return []
+    return [s for s in summaries if s.study_name.startswith(LABEL_STUDY_PREFIX)]
+
+
+def load_label_study(storage: str, study_name: str) -> OptimizationResult:
+    """A stored label study as an OptimizationResult"""
+    return study_result(optuna.load_study(study_name=study_name, storage=label_study_storage(storage)))
+
+
+__all__ = [
+    'run_label_study',
+    'list_label_series',
+    'load_label_frames',
+    'get_label_studies',
+    'load_label_study',
+    'label_study_name',
+    'create_label_study',
+    'label_study_storage',
+    'study_result',
+    'LABEL_STUDY_PREFIX',
+    'PRUNER_STARTUP_TRIALS',
+    'PRUNER_WARMUP_SYMBOLS',
+]
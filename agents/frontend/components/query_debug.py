@@ -0,0 +1,31 @@
+"""
+🐞 Query debug panel
+Per-statement SQLite timings collected by the connection pool (DB_DEBUG_PANEL=true)
+"""
+
+import pandas as pd
+import streamlit as st
+
+from database import query_stats, reset_query_stats
+
+
+def render_query_debug(top_n: int = 25):
+    """Render the slowest statements (by total time) in a sidebar expander"""
+    with st.expander("🐞 SQL timings", expanded=False):
+        stats = query_stats()
+        if not stats:
+            st.caption("No queries recorded yet")
+            return
+
+        df = pd.DataFrame(stats[:top_n])
+        total_ms = sum(row['total_ms'] for row in stats)
+        calls = sum(row['calls'] for row in stats)
+        st.caption(f"{calls:,} statements, {total_ms:,.0f} ms total ({len(stats)} distinct)")
+        st.dataframe(
+            df[['mode', 'calls', 'total_ms', 'avg_ms', 'max_ms', 'sql']].round(2),
+            use_container_width=True,
+            hide_index=True,
+        )
+        if st.button("Reset timings", key="btn_reset_query_stats", use_container_width=True):
+            reset_query_stats()
+            st.rerun()
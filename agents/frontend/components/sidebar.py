@@ -8,7 +8,7 @@ import streamlit as st
 import streamlit.components.v1 as components
 from datetime import datetime, timedelta
 
-from database import get_update_status
+from database import get_update_status, request_data_refresh
 from styles.colors import PALETTE, STATUS_COLORS
 
 
@@ -382,9 +382,6 @@ def render_control_panel():
 
 def render_refresh_button():
     """Render the manual refresh button (OHLCV data only)"""
-    from config import REFRESH_SIGNAL_FILE
-    from pathlib import Path
-    
     status_data = get_update_status()
     is_updating = status_data.get('status') == 'UPDATING'
     
@@ -398,20 +395,15 @@ def render_refresh_button():
     else:
         if st.button("🔄 Force Refresh Data", use_container_width=True, key="btn_refresh", 
                      help="Refresh OHLCV candles for coins in current Top 100 list"):
-            try:
-                Path(REFRESH_SIGNAL_FILE).parent.mkdir(parents=True, exist_ok=True)
-                Path(REFRESH_SIGNAL_FILE).write_text("refresh requested from dashboard")
-                st.success("✅ Refresh signal sent!")
+            if request_data_refresh():
+                st.success("✅ Refresh requested!")
                 st.rerun()
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
+            else:
+                st.error("❌ Error: refresh request not sent (database unavailable)")
 
 
 def render_update_list_button():
     """Render the button to update Top 100 list"""
-    from config import UPDATE_LIST_SIGNAL_FILE
-    from pathlib import Path
-    
     status_data = get_update_status()
     is_updating = status_data.get('status') == 'UPDATING'
     
@@ -424,13 +416,11 @@ def render_update_list_button():
     else:
         if st.button("📋 Update Top 100 List", use_container_width=True, key="btn_update_list",
                      help="Fetch new Top 100 coins by volume and refresh all data"):
-            try:
-                Path(UPDATE_LIST_SIGNAL_FILE).parent.mkdir(parents=True, exist_ok=True)
-                Path(UPDATE_LIST_SIGNAL_FILE).write_text("update list requested from dashboard")
-                st.success("✅ Update list signal sent!")
+            if request_data_refresh(update_list=True):
+                st.success("✅ Update list requested!")
                 st.rerun()
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
+            else:
+                st.error("❌ Error: update list request not sent (database unavailable)")
 
 
 def render_sidebar():
@@ -439,6 +429,15 @@ def render_sidebar():
     render_portfolio_live()
     render_refresh_button()
     render_update_list_button()
+    render_query_debug_panel()
+
+
+def render_query_debug_panel():
+    """Render SQL timings of the connection pool (only with DB_DEBUG_PANEL=true)"""
+    from config import DB_DEBUG_PANEL
+    if DB_DEBUG_PANEL:
+        from components.query_debug import render_query_debug
+        render_query_debug()
 
 
 def render_portfolio_live():
@@ -11,7 +11,7 @@ import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
 
-from database import get_top_symbols, get_stats
+from database import get_top_symbols, get_ticker_snapshot, get_latest_candles, get_stats
 from charts import create_market_overview_chart
 from utils import format_volume
 
@@ -33,6 +33,19 @@ def render_coins_section():
     df_top = pd.DataFrame(top_symbols)
     df_top['coin'] = df_top['symbol'].str.replace('/USDT:USDT', '')
     
+    # Last price / 24h change from the bulk ticker snapshot (if available)
+    tickers = get_ticker_snapshot()
+    if tickers:
+        df_top['last_price'] = df_top['symbol'].map(lambda s: tickers.get(s, {}).get('last_price'))
+        df_top['change_24h_pct'] = df_top['symbol'].map(lambda s: tickers.get(s, {}).get('change_24h_pct'))
+    else:
+        # Fallback: last 15m candle snapshot kept by the data-fetcher
+        latest = get_latest_candles('15m')
+        if not latest.empty:
+            latest = latest.set_index('symbol')
+            df_top['last_price'] = df_top['symbol'].map(latest['close'])
+            df_top['change_24h_pct'] = df_top['symbol'].map(latest['change_24h_pct'])
+    
     total_vol = df_top['volume_24h'].sum()
     avg_vol = df_top['volume_24h'].mean()
     
@@ -57,6 +57,18 @@ def get_crypto_table_css() -> str:
         .pct-col {
             color: #fbbf24 !important;
         }
+        .price-col {
+            color: #ffffff !important;
+            font-family: 'Orbitron', sans-serif;
+        }
+        .change-up {
+            color: #00ff88 !important;
+            font-weight: 600;
+        }
+        .change-down {
+            color: #ff4757 !important;
+            font-weight: 600;
+        }
         .table-container {
             max-height: 500px;
             overflow-y: auto;
@@ -68,26 +80,43 @@ def get_crypto_table_css() -> str:
     """
 
 
+def _format_price(value) -> str:
+    if value is None or value != value:
+        return '-'
+    return f"${value:,.2f}" if value >= 1 else f"${value:.6g}"
+
+
+def _format_change(value) -> str:
+    if value is None or value != value:
+        return '<td>-</td>'
+    css = 'change-up' if value >= 0 else 'change-down'
+    return f'<td class="{css}">{value:+.2f}%</td>'
+
+
 def render_crypto_table_html(df_display, total_vol: float) -> str:
     """
     Generate HTML table for Top 100 coins.
     
     Args:
         df_display: DataFrame with columns: rank, coin, volume_24h, Volume 24h, % of Total
+            (optional: last_price, change_24h_pct from the ticker snapshot)
         total_vol: Total volume for percentage calculation
         
     Returns:
         Complete HTML string for the table
     """
     table_html = get_crypto_table_css()
+    show_ticker = 'last_price' in df_display.columns
+    ticker_headers = "<th>Price</th><th>24h %</th>" if show_ticker else ""
     
-    table_html += """
+    table_html += f"""
     <div class="table-container">
     <table class="crypto-table">
         <thead>
             <tr>
                 <th>#</th>
                 <th>Coin</th>
+                {ticker_headers}
                 <th>Volume 24h</th>
                 <th>% of Total</th>
             </tr>
@@ -96,10 +125,15 @@ def render_crypto_table_html(df_display, total_vol: float) -> str:
     """
     
     for _, row in df_display.iterrows():
+        ticker_cells = ""
+        if show_ticker:
+            ticker_cells = (f'<td class="price-col">{_format_price(row["last_price"])}</td>'
+                            f'{_format_change(row["change_24h_pct"])}')
         table_html += f"""
             <tr>
                 <td class="rank-col">{row['rank']}</td>
                 <td class="coin-col">{row['coin']}</td>
+                {ticker_cells}
                 <td class="vol-col">{row['Volume 24h']}</td>
                 <td class="pct-col">{row['% of Total']}</td>
             </tr>
@@ -25,7 +25,7 @@ def get_training_stats() -> dict:
         cur = conn.cursor()
         
         for table in ['training_data', 'training_labels']:
-            cur.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
+            cur.execute(f"SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='{table}'")
             if cur.fetchone():
                 stats[table]['exists'] = True
                 
@@ -0,0 +1,88 @@
+"""
+🔬 Label Studies - Results of the persistent label optimization studies
+
+The studies run outside the dashboard (scripts/optimize_labels.py, see
+ai/optimizer/label_study.py) and are stored in LABEL_STUDY_STORAGE; this
+section only reads them: trial counts, best parameters and the
+optimization history. A study still running shows its progress on
+refresh.
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from config import LABEL_STUDY_STORAGE
+
+try:
+    from ai.optimizer.label_study import get_label_studies, load_label_study
+    OPTUNA_AVAILABLE = True
+except ImportError:
+    OPTUNA_AVAILABLE = False
+
+
+def _history_chart(history: list, objective: str) -> go.Figure:
+    """Trial values and running best"""
+    values = pd.Series([h['value'] for h in history], index=[h['trial'] for h in history])
+    finite = values.where(values > float('-inf'))
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=finite.index, y=finite.values, mode='markers', name='Trial',
+                             marker=dict(size=5, color='#00d4ff', opacity=0.6)))
+    fig.add_trace(go.Scatter(x=finite.index, y=finite.cummax().values, mode='lines', name='Best',
+                             line=dict(color='#00ff88', width=2)))
+    fig.update_layout(template='plotly_dark', height=300, margin=dict(l=10, r=10, t=30, b=10),
+                      title=f"{objective} per trial", xaxis_title="Trial", yaxis_title=objective)
+    return fig
+
+
+@st.fragment
+def render_label_studies_section():
+    """Stored label optimization studies (refresh button reruns only this section)"""
+    st.markdown("#### 🔬 Label Optimization Studies")
+    st.caption("Run long sweeps outside the dashboard: "
+               "`python scripts/optimize_labels.py --timeframe 15m --trials 500 --workers 4`")
+    if not OPTUNA_AVAILABLE:
+        st.info("ℹ️ Optuna is not installed in this environment")
+        return
+
+    studies = get_label_studies(LABEL_STUDY_STORAGE)
+    if not studies:
+        st.info("ℹ️ No label optimization study yet")
+        return
+
+    names = [s.study_name for s in sorted(studies, key=lambda s: s.datetime_start or pd.Timestamp.min)][::-1]
+    c1, c2 = st.columns([4, 1])
+    name = c1.selectbox("Study", names, key='label_study_name')
+    c2.button("🔄 Refresh", key='label_study_refresh', use_container_width=True)
+
+    result = load_label_study(LABEL_STUDY_STORAGE, name)
+    states = pd.Series([t.state.name for t in result.study.trials]).value_counts()
+    attrs = result.study.user_attrs
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Trials", len(result.study.trials))
+    m2.metric("Complete", int(states.get('COMPLETE', 0)))
+    m3.metric("Pruned", int(states.get('PRUNED', 0)))
+    m4.metric("Best", f"{result.best_value:.4f}" if result.best_params else "-")
+    if attrs:
+        st.caption(f"{attrs.get('timeframe', '?')} · {attrs.get('objective', '?')} · "
+                   f"{len(attrs.get('symbols', []))} symbols · k_fixed_sl {attrs.get('k_fixed_sl', '?')} · "
+                   f"ATR period {attrs.get('atr_period', '?')}")
+
+    if not result.best_params:
+        st.info("ℹ️ No completed trial yet")
+        return
+
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        st.markdown("**Best parameters**")
+        st.dataframe(pd.DataFrame({'value': result.best_params}), width='stretch')
+        if result.param_importances:
+            st.markdown("**Importance**")
+            st.dataframe(pd.DataFrame({'importance': result.param_importances}).round(3), width='stretch')
+    with c2:
+        st.plotly_chart(_history_chart(result.optimization_history, attrs.get('objective', 'value')),
+                        width='stretch')
+
+
+__all__ = ['render_label_studies_section']
@@ -10,6 +10,7 @@ Structure:
 ├────────────────────────────────────────────────────────────────┤
 │ ⚙️ ATR Configuration (sliders)                                  │
 │ [🏷️ Generate Labels] ← single action button                    │
+│ 🔄 Job progress (background job, auto-refresh)                 │
 ├────────────────────────────────────────────────────────────────┤
 │ 📤 Status (auto - shows existing labels count)                 │
 ├────────────────────────────────────────────────────────────────┤
@@ -30,6 +31,7 @@ Modules used:
 - labeling_config: ATR configuration UI
 - labeling_db: Database operations
 - labeling_pipeline: Label generation
+- labeling_jobs: Background multi-process labeling job
 - labeling_table: Labels table preview
 - labeling_analysis: Charts and diagnostics
 - labeling_visualizer: Candlestick visualization
@@ -54,12 +56,16 @@ from database import (
     EXPECTED_FEATURE_COUNT
 )
 
-# Import pipeline
-from .labeling_pipeline import run_labeling_pipeline_both
+# Import background labeling job
+from .labeling_jobs import start_labeling_job, get_labeling_job, is_labeling_job_running
+from database.labeling_jobs import JOB_RUNNING, JOB_DONE
 
 # Import table preview
 from .labeling_table import render_labels_table_preview
 
+# Import stored label optimization studies
+from .label_studies import render_label_studies_section
+
 # Import visualizer
 from .labeling_visualizer import get_available_symbols_with_labels
 
@@ -110,7 +116,7 @@ def render_status_section() -> bool:
                 <span style="color: #888; margin-left: 15px;">
                     📊 <b>{feat_count}</b> features (expected: {expected}) | 
                     🏷️ {len(view_stats.get('label_columns', []))} label columns | 
-                    📁 {view_stats.get('row_count', 0):,} joinable rows{missing_text}
+                    📁 {view_stats.get('row_count', 0):,} rows (generation {view_stats.get('generation', 0)}){missing_text}
                 </span>
             </div>
             """, unsafe_allow_html=True)
@@ -329,32 +335,36 @@ def render_visualizer(selected_symbol: str, timeframe: str):
         st.error(f"Error loading visualizer: {e}")
 
 
-def run_labeling_process(config, symbols_15m: list, symbols_1h: list):
-    """Run ATR-based labeling with progress display."""
-    st.markdown("#### 🔄 Generating ATR-Based Labels")
-    
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    current_tf_text = st.empty()
-    
-    total_symbols = len(symbols_15m) + len(symbols_1h)
+@st.fragment(run_every="2s")
+def render_labeling_job_progress():
+    """Progress of the background labeling job (polls the labeling_jobs status table)"""
+    job = get_labeling_job()
+    if not job:
+        return
     
-    def update_progress(current, total, symbol, timeframe):
-        if timeframe == '15m':
-            overall = current
-        else:
-            overall = len(symbols_15m) + current
-        progress_bar.progress(overall / total_symbols if total_symbols > 0 else 0)
-        current_tf_text.markdown(f"**Processing: {timeframe}**")
-        status_text.text(f"Symbol {overall}/{total_symbols}: {symbol.replace('/USDT:USDT', '')}")
+    total = job['total_tasks'] or 0
+    handled = (job['done_tasks'] or 0) + (job['failed_tasks'] or 0)
     
-    success, message = run_labeling_pipeline_both(config, update_progress)
+    if job['status'] == JOB_RUNNING:
+        st.markdown(f"#### 🔄 Generating ATR-Based Labels (job #{job['id']})")
+        st.progress(handled / total if total else 0)
+        st.text(f"Series {handled}/{total} | {job['rows_written'] or 0:,} rows | {job['workers']} processes")
+        st.caption(f"{job['message'] or ''} | Runs in the background - the dashboard stays usable")
+        return
     
-    if success:
-        st.success(f"✅ {message}")
+    # Finished while this page was watching: reload the label sections once
+    if st.session_state.get('labeling_job_watch') == job['id']:
+        st.session_state['labeling_job_watch'] = None
         st.cache_data.clear()
+        st.rerun()
+    
+    if job['status'] == JOB_DONE:
+        st.success(f"✅ Job #{job['id']} ({job['finished_at']}): {job['message']}")
     else:
-        st.error(f"❌ {message}")
+        st.error(f"❌ Job #{job['id']} {job['status']}: {job['message']}")
+    if job['errors']:
+        with st.expander(f"⚠️ {job['failed_tasks']} series skipped"):
+            st.text("\n".join(job['errors']))
 
 
 def render_labeling_step():
@@ -363,9 +373,10 @@ def render_labeling_step():
     
     Flow:
     1. Check prerequisites (training features available)
-    2. Show ATR configuration
-    3. Single Generate Labels button
-    4. Auto-display all sections when labels exist
+    2. Show ATR configuration (and the stored label optimization studies)
+    3. Single Generate Labels button (starts a background job)
+    4. Job progress, polled from the labeling_jobs table
+    5. Auto-display all sections when labels exist
     """
     st.markdown("### 🏷️ Step 2: Labeling (ATR-Based)")
     st.caption("Generate training labels using ATR-based Trailing Stop simulation")
@@ -394,17 +405,23 @@ def render_labeling_step():
     st.divider()
     config = render_atr_config_section()
     
+    with st.expander("🔬 Label Optimization Studies", expanded=False):
+        render_label_studies_section()
+    
     # === SINGLE ACTION BUTTON ===
     st.divider()
     
-    if st.button("🏷️ Generate Labels", use_container_width=True, type="primary"):
-        st.session_state['start_labeling'] = True
+    running = is_labeling_job_running()
+    if st.button("🏷️ Generate Labels", use_container_width=True, type="primary", disabled=running):
+        job_id, message = start_labeling_job(config)
+        if job_id is None:
+            st.error(f"❌ {message}")
+        else:
+            st.session_state['labeling_job_watch'] = job_id
+            st.info(f"ℹ️ {message}")
     
-    # === RUN LABELING ===
-    if st.session_state.get('start_labeling'):
-        st.divider()
-        run_labeling_process(config, symbols_15m, symbols_1h)
-        st.session_state['start_labeling'] = False
+    # === LABELING JOB PROGRESS ===
+    render_labeling_job_progress()
     
     # === AUTO SECTIONS (only if labels exist) ===
     st.divider()
@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 import logging
 from typing import Dict, Optional
 
+from database import get_connection
 from styles.tables import render_html_table
 
 logger = logging.getLogger(__name__)
@@ -24,13 +25,14 @@ def get_label_quality_from_db() -> Optional[Dict]:
         Dictionary with quality metrics or None if no data
     """
     try:
-        import sqlite3
-        conn = sqlite3.connect('/app/shared/data_cache/trading_data.db')
+        conn = get_connection()
+        if not conn:
+            return None
         
         # Check if training_labels table exists
         check = pd.read_sql_query(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='training_labels'", 
+            "WHERE type IN ('table', 'view') AND name='training_labels'", 
             conn
         )
         if len(check) == 0:
@@ -157,8 +159,7 @@ def create_score_vs_return_scatter() -> go.Figure:
         Plotly figure
     """
     try:
-        import sqlite3
-        conn = sqlite3.connect('/app/shared/data_cache/trading_data.db')
+        conn = get_connection()
         
         # Sample for performance
         df = pd.read_sql_query("""
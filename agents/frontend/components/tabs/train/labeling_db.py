@@ -9,7 +9,11 @@ Database operations for training labels:
 """
 
 import pandas as pd
-from database import get_connection
+from database import get_connection, get_write_connection
+from database.compact_migration import drop_compact_table, ensure_compact_table
+from database.compact_schema import from_epoch_ms, series_filter
+from database.table_stats import get_series_stats, rebuild_stats
+from database.xgb_view import create_xgb_view, refresh_xgb_training
 
 
 def get_training_features_symbols(timeframe: str) -> list:
@@ -24,6 +28,17 @@ def get_training_features_symbols(timeframe: str) -> list:
         expected_1h = 8760
         threshold = 0.95
         
+        # Candle counts from the table_stats counters (no scan of training_data)
+        series = get_series_stats(conn, 'training_data')
+        if series is not None:
+            counts = {}
+            for s in series:
+                counts.setdefault(s['symbol'], {})[s['timeframe']] = s['rows']
+            return [
+                symbol for symbol, c in sorted(counts.items())
+                if c.get('15m', 0) / expected_15m >= threshold and c.get('1h', 0) / expected_1h >= threshold
+            ]
+        
         cur.execute('''
             SELECT symbol
             FROM (
@@ -53,15 +68,18 @@ def get_training_features_data(symbol: str, timeframe: str) -> pd.DataFrame:
     if not conn:
         return pd.DataFrame()
     try:
-        df = pd.read_sql_query('''
-            SELECT * FROM training_data 
-            WHERE symbol=? AND timeframe=?
-            ORDER BY timestamp
+        # Read the compact table in primary-key order (no sort, no text parsing)
+        df = pd.read_sql_query(f'''
+            SELECT * FROM training_data_c d
+            WHERE {series_filter('d')}
+            ORDER BY d.ts
         ''', conn, params=(symbol, timeframe))
         
         if len(df) > 0:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
+            df.index = from_epoch_ms(df.pop('ts')).rename('timestamp')
+            df = df.drop(columns=['symbol_id', 'tf_id'])
+            df.insert(0, 'timeframe', timeframe)
+            df.insert(0, 'symbol', symbol)
         
         return df
     except Exception as e:
@@ -78,7 +96,7 @@ def get_training_labels_stats():
     try:
         cur = conn.cursor()
         
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_labels'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_labels'")
         if not cur.fetchone():
             return None
         
@@ -114,40 +132,16 @@ def get_training_labels_stats():
 
 def create_training_labels_table():
     """Create training_labels table - LABELS ONLY (no OHLCV)"""
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return False
     try:
-        cur = conn.cursor()
-        
-        cur.execute('DROP TABLE IF EXISTS training_labels')
-        
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS training_labels (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                symbol TEXT NOT NULL,
-                timeframe TEXT NOT NULL,
-                score_long REAL,
-                score_short REAL,
-                realized_return_long REAL,
-                realized_return_short REAL,
-                mfe_long REAL,
-                mfe_short REAL,
-                mae_long REAL,
-                mae_short REAL,
-                bars_held_long INTEGER,
-                bars_held_short INTEGER,
-                exit_type_long TEXT,
-                exit_type_short TEXT,
-                atr_pct REAL,
-                UNIQUE(symbol, timeframe, timestamp)
-            )
-        ''')
-        
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_tl_symbol_tf_ts ON training_labels(symbol, timeframe, timestamp)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_tl_score_long ON training_labels(score_long)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_tl_score_short ON training_labels(score_short)')
+        # training_labels is a view over the compact training_labels_c table
+        # No score indexes: score filters match ~half the rows, where an index
+        # scan with per-row lookups is slower than scanning the table
+        drop_compact_table(conn, 'training_labels')
+        ensure_compact_table(conn, 'training_labels')
+        rebuild_stats(conn, 'training_labels')
         
         conn.commit()
         return True
@@ -159,47 +153,15 @@ def create_training_labels_table():
 
 def create_xgb_training_view():
     """Create VIEW v_xgb_training for XGBoost training - includes ALL available features"""
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return False
     try:
-        cur = conn.cursor()
-        
-        cur.execute('DROP VIEW IF EXISTS v_xgb_training')
-        
-        # Include ALL available features from training_data (18 features)
-        # 5 OHLCV + 13 technical indicators actually available in database
-        cur.execute('''
-            CREATE VIEW v_xgb_training AS
-            SELECT
-                d.symbol, d.timeframe, d.timestamp,
-                -- OHLCV (5 features)
-                d.open, d.high, d.low, d.close, d.volume,
-                -- Moving Averages (4 features)
-                d.sma_20, d.sma_50, d.ema_12, d.ema_26,
-                -- Bollinger Bands (3 features) - bb_mid is the actual column name
-                d.bb_upper, d.bb_mid AS bb_middle, d.bb_lower,
-                -- Momentum indicators (4 features)
-                d.rsi, d.macd, d.macd_signal, d.macd_hist,
-                -- Stochastic (2 features)
-                d.stoch_k, d.stoch_d,
-                -- Other indicators (3 features)
-                d.atr, d.volume_sma, d.obv,
-                -- Labels
-                l.score_long, l.score_short,
-                l.realized_return_long, l.realized_return_short,
-                l.mfe_long, l.mfe_short, l.mae_long, l.mae_short,
-                l.bars_held_long, l.bars_held_short,
-                l.exit_type_long, l.exit_type_short,
-                l.atr_pct
-            FROM training_data d
-            INNER JOIN training_labels l
-                ON d.symbol = l.symbol
-               AND d.timeframe = l.timeframe
-               AND d.timestamp = l.timestamp
-        ''')
-        
+        create_xgb_view(conn)
         conn.commit()
+        
+        # Materialize the series not yet refreshed by the pipeline
+        refresh_xgb_training(conn)
         return True
     except Exception as e:
         print(f"Error creating VIEW: {e}")
@@ -208,6 +170,23 @@ def create_xgb_training_view():
         conn.close()
 
 
+def refresh_xgb_training_table(timeframe: str, symbols: list) -> dict:
+    """Rebuild the materialized v_xgb_training rows of freshly labeled symbols"""
+    conn = get_write_connection()
+    if not conn:
+        return {}
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='view' AND name='v_xgb_training'").fetchone():
+            create_xgb_view(conn)
+            conn.commit()
+        return refresh_xgb_training(conn, timeframe, force_symbols=symbols)
+    except Exception as e:
+        print(f"Error refreshing xgb_training: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
 def get_label_statistics(timeframe: str) -> dict:
     """Get statistics about generated labels"""
     conn = get_connection()
@@ -261,5 +240,6 @@ __all__ = [
     'get_training_labels_stats',
     'create_training_labels_table',
     'create_xgb_training_view',
+    'refresh_xgb_training_table',
     'get_label_statistics'
 ]
@@ -0,0 +1,261 @@
+"""
+🏷️ Labeling Jobs - Multi-process labeling off the Streamlit thread
+
+start_labeling_job() labels every (symbol, timeframe) series in the
+background and returns at once:
+
+- A process pool (spawn, LABELING_WORKERS processes) runs one
+  ai.core.labeling_worker.label_series task per series: read, label and
+  build the insert rows in parallel
+- A coordinator thread is the single writer. It takes the results as they
+  complete and, per symbol, replaces its labels and advances the
+  labeling_jobs status row in one transaction (commit per symbol). Rows
+  go straight to training_labels_c (ids, epoch-ms timestamps)
+- At most WINDOW_PER_WORKER tasks per worker are in flight, so finished
+  results never pile up in memory while the writer is busy
+- After a timeframe's last task: v_xgb_training refresh, Parquet export and
+  a labels_rebuilt event; after all of them the v_xgb_training VIEW
+
+The dashboard polls the status row (get_labeling_job()), so it stays
+responsive while the job runs.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Sequence, Tuple
+
+from config import DB_PATH, LABELING_WORKERS
+from database import get_connection, get_write_connection
+from database.compact_schema import get_ids
+from database.event_bus import LABELS_REBUILT, publish, ring
+from database.labeling_jobs import (
+    JOB_DONE, JOB_FAILED, JOB_INTERRUPTED, JOB_RUNNING,
+    create_labeling_job, get_latest_labeling_job, update_labeling_job,
+)
+from database.training_lake import export_xgb_training
+from ai.core.labels import ATRLabelConfig
+from ai.core.labeling_worker import label_series
+from .labeling_db import (
+    get_training_features_symbols,
+    create_training_labels_table,
+    create_xgb_training_view,
+    refresh_xgb_training_table
+)
+from .labeling_pipeline import write_compact_labels
+
+WINDOW_PER_WORKER = 2  # Tasks queued per worker process
+
+_job_lock = threading.Lock()
+_active_job_id = None  # Job running in this process
+
+
+def labeling_workers() -> int:
+    """Worker processes of a labeling job"""
+    return LABELING_WORKERS or os.cpu_count() or 1
+
+
+def _labeling_tasks(timeframes: Sequence[str]) -> List[Tuple[str, str, int, int]]:
+    """(symbol, timeframe, symbol_id, tf_id) of every series to label, timeframes interleaved"""
+    conn = get_connection()
+    if not conn:
+        return []
+    try:
+        per_tf = []
+        for tf in timeframes:
+            series = []
+            for symbol in get_training_features_symbols(tf):
+                ids = get_ids(conn, symbol, tf)
+                if ids:
+                    series.append((symbol, tf, ids[0], ids[1]))
+            per_tf.append(series)
+    finally:
+        conn.close()
+    # Interleave so both timeframes progress (and finish) together
+    tasks = []
+    for position in range(max((len(s) for s in per_tf), default=0)):
+        tasks.extend(s[position] for s in per_tf if position < len(s))
+    return tasks
+
+
+def start_labeling_job(config: ATRLabelConfig, timeframes: Sequence[str] = ('15m', '1h'),
+                       workers: int = None) -> Tuple[Optional[int], str]:
+    """
+    Start labeling all training series in the background.
+
+    Returns:
+        (job_id, message) - job_id is None when the job did not start
+    """
+    global _active_job_id
+    with _job_lock:
+        if _active_job_id is not None:
+            return None, f"Labeling job #{_active_job_id} is already running"
+
+        tasks = _labeling_tasks(timeframes)
+        if not tasks:
+            return None, "No symbols found for labeling"
+        if not create_training_labels_table():
+            return None, "Failed to create training_labels table"
+
+        workers = min(workers or labeling_workers(), len(tasks))
+        conn = get_write_connection()
+        if not conn:
+            return None, "Database connection failed"
+        try:
+            job_id = create_labeling_job(conn, list(timeframes), len(tasks), workers)
+            # Owned before it is visible, so get_labeling_job() never sees it as interrupted
+            _active_job_id = job_id
+            conn.commit()
+        except Exception:
+            _active_job_id = None
+            raise
+        finally:
+            conn.close()
+
+        threading.Thread(target=_run_job, args=(job_id, config, tasks, workers),
+                         name=f'labeling-job-{job_id}', daemon=True).start()
+        return job_id, f"Labeling job #{job_id} started: {len(tasks)} series on {workers} processes"
+
+
+def get_labeling_job() -> Optional[dict]:
+    """
+    Status of the last labeling job (None if there is none).
+
+    A job still marked running but not owned by this process was cut off by
+    a dashboard restart: it is recorded as interrupted.
+    """
+    conn = get_connection()
+    if not conn:
+        return None
+    try:
+        job = get_latest_labeling_job(conn)
+    finally:
+        conn.close()
+
+    if job and job['status'] == JOB_RUNNING and job['id'] != _active_job_id:
+        _update_job(job['id'], status=JOB_INTERRUPTED, message="Interrupted (dashboard restarted)")
+        job['status'] = JOB_INTERRUPTED
+    return job
+
+
+def is_labeling_job_running() -> bool:
+    """True while a labeling job runs in this process"""
+    return _active_job_id is not None
+
+
+def _update_job(job_id: int, **changes):
+    """update_labeling_job() in a transaction of its own"""
+    conn = get_write_connection()
+    if not conn:
+        return
+    try:
+        update_labeling_job(conn, job_id, **changes)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _write_result(job_id: int, symbol: str, timeframe: str, ids: tuple, rows: list, message: str) -> bool:
+    """Replace one symbol's labels and advance the job (one commit); True if labels were written"""
+    conn = get_write_connection()
+    if not conn:
+        raise RuntimeError("Database connection failed")
+    try:
+        current = f"{symbol} {timeframe}"
+        if rows:
+            write_compact_labels(conn, rows, *ids)
+            update_labeling_job(conn, job_id, done=1, rows=len(rows), current=current,
+                                message=f"Labeled {current}")
+        else:
+            update_labeling_job(conn, job_id, failed=1, current=current,
+                                error=f"{current}: {message}")
+        conn.commit()
+        return bool(rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _finish_timeframe(job_id: int, timeframe: str, symbols: list, rows: int):
+    """v_xgb_training refresh, Parquet export and labels_rebuilt event of a labeled timeframe"""
+    if not symbols:
+        return
+    _update_job(job_id, message=f"Refreshing v_xgb_training ({timeframe})")
+    refresh_xgb_training_table(timeframe, symbols)
+    export_xgb_training(timeframe, symbols, replace_all=True)
+
+    conn = get_write_connection()
+    if not conn:
+        return
+    try:
+        publish(conn, LABELS_REBUILT, {'timeframe': timeframe, 'symbols': len(symbols), 'rows': rows})
+        conn.commit()
+    finally:
+        conn.close()
+    ring(DB_PATH, LABELS_REBUILT)
+
+
+def _run_job(job_id: int, config: ATRLabelConfig, tasks: list, workers: int):
+    """Coordinator thread: feeds the pool and writes the results"""
+    global _active_job_id
+    remaining = Counter(task[1] for task in tasks)
+    symbols = defaultdict(list)
+    rows_per_tf = Counter()
+
+    try:
+        pending_tasks = iter(tasks)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            in_flight = {}
+
+            def submit_next():
+                task = next(pending_tasks, None)
+                if task is not None:
+                    symbol, tf, symbol_id, tf_id = task
+                    future = pool.submit(label_series, DB_PATH, symbol, tf, symbol_id, tf_id, config)
+                    in_flight[future] = (symbol, tf, (symbol_id, tf_id))
+
+            for _ in range(workers * WINDOW_PER_WORKER):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol, tf, ids = in_flight.pop(future)
+                    try:
+                        _, _, rows, message = future.result()
+                    except Exception as e:
+                        rows, message = [], f"Worker error: {e}"
+                    submit_next()
+
+                    if _write_result(job_id, symbol, tf, ids, rows, message):
+                        symbols[tf].append(symbol)
+                        rows_per_tf[tf] += len(rows)
+                    del rows
+
+                    remaining[tf] -= 1
+                    if remaining[tf] == 0:
+                        _finish_timeframe(job_id, tf, symbols[tf], rows_per_tf[tf])
+
+        if not any(symbols.values()):
+            _update_job(job_id, status=JOB_FAILED, message="All series failed")
+            return
+        create_xgb_training_view()
+        summary = ", ".join(f"{tf}: {len(s)} symbols, {rows_per_tf[tf]:,} rows" for tf, s in symbols.items())
+        _update_job(job_id, status=JOB_DONE, message=f"Generated ATR-based labels ({summary})")
+    except Exception as e:
+        _update_job(job_id, status=JOB_FAILED, message=f"Labeling job failed: {e}")
+    finally:
+        _active_job_id = None
+
+
+__all__ = [
+    'start_labeling_job',
+    'get_labeling_job',
+    'is_labeling_job_running',
+    'labeling_workers',
+]
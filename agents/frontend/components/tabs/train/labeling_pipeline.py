@@ -3,18 +3,26 @@
 
 Pipeline functions for generating and saving ATR-based training labels:
 - Generate labels for single symbol  
+- Label a whole timeframe universe in one vectorized call
 - Batch insert for faster DB writes
-- Run pipeline for both timeframes
+- Run pipeline for both timeframes (synchronous; the dashboard uses labeling_jobs)
 """
 
 import os
-from database import get_connection
+from database import get_write_connection
+from database.compact_schema import COMPACT_TABLES, compact_name, get_ids
+from database.event_bus import LABELS_REBUILT, publish, ring
+from database.table_stats import refresh_series_stats
+from database.training_lake import export_xgb_training
+from config import DB_PATH
 from ai.core.labels import ATRLabeler, ATRLabelConfig
+from ai.core.labeling_worker import build_label_rows
 from .labeling_db import (
     get_training_features_symbols,
     get_training_features_data,
     create_training_labels_table,
-    create_xgb_training_view
+    create_xgb_training_view,
+    refresh_xgb_training_table
 )
 
 
@@ -36,79 +44,80 @@ def generate_labels_for_symbol(
     labeler = ATRLabeler(config)
     labels_df = labeler.generate_labels_for_timeframe(df, timeframe)
     
-    result_df = df.join(labels_df)
-    
-    # Filter valid rows
-    valid_mask = result_df[f'exit_type_long_{timeframe}'] != 'invalid'
-    result_df = result_df[valid_mask]
-    
-    label_cols = [f'score_long_{timeframe}', f'score_short_{timeframe}']
-    result_df = result_df.dropna(subset=label_cols)
-    
-    if len(result_df) == 0:
+    batch_data = build_label_rows(symbol, timeframe, labels_df)
+    if not batch_data:
         return symbol, False, 0, None, "No valid labels generated"
     
-    result_df = result_df.reset_index()
-    
-    # Prepare batch data
-    batch_data = []
-    for _, row in result_df.iterrows():
-        atr_pct = row.get(f'atr_pct_{timeframe}', 0.0)
-        if atr_pct is None or (hasattr(atr_pct, '__float__') and str(atr_pct) == 'nan'):
-            atr_pct = 0.0
-        
-        batch_data.append((
-            str(row['timestamp']),
-            symbol,
-            timeframe,
-            row[f'score_long_{timeframe}'],
-            row[f'score_short_{timeframe}'],
-            row[f'realized_return_long_{timeframe}'],
-            row[f'realized_return_short_{timeframe}'],
-            row[f'mfe_long_{timeframe}'],
-            row[f'mfe_short_{timeframe}'],
-            row[f'mae_long_{timeframe}'],
-            row[f'mae_short_{timeframe}'],
-            int(row[f'bars_held_long_{timeframe}']),
-            int(row[f'bars_held_short_{timeframe}']),
-            row[f'exit_type_long_{timeframe}'],
-            row[f'exit_type_short_{timeframe}'],
-            float(atr_pct)
-        ))
-    
     return symbol, True, len(batch_data), batch_data, "Success"
 
 
+def write_labels(conn, all_batch_data: list, timeframe: str, symbols_to_delete: list) -> int:
+    """
+    Replace the labels of the given symbols inside the caller's transaction
+    (caller commits). Also keeps the training_labels row counters in step.
+    Returns the number of symbols written.
+    """
+    cur = conn.cursor()
+    
+    # Delete existing labels for all processed symbols in one go
+    for symbol in symbols_to_delete:
+        cur.execute('DELETE FROM training_labels WHERE symbol=? AND timeframe=?', (symbol, timeframe))
+    
+    # Batch insert all data
+    cur.executemany('''
+        INSERT INTO training_labels 
+        (timestamp, symbol, timeframe,
+         score_long, score_short, 
+         realized_return_long, realized_return_short,
+         mfe_long, mfe_short, mae_long, mae_short,
+         bars_held_long, bars_held_short,
+         exit_type_long, exit_type_short,
+         atr_pct)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', all_batch_data)
+    
+    # Row counters of the rewritten series (same transaction)
+    symbols = dict.fromkeys(list(symbols_to_delete) + [row[1] for row in all_batch_data])
+    series = [ids for ids in (get_ids(conn, s, timeframe) for s in symbols) if ids]
+    refresh_series_stats(conn, 'training_labels', series)
+    return len(symbols)
+
+
+LABEL_COLUMNS = [c for c, _, _ in COMPACT_TABLES['training_labels']]
+COMPACT_LABELS_INSERT_SQL = f'''
+    INSERT INTO {compact_name('training_labels')}
+    (symbol_id, tf_id, ts, {', '.join(LABEL_COLUMNS)})
+    VALUES ({', '.join(['?'] * (3 + len(LABEL_COLUMNS)))})
+'''
+
+
+def write_compact_labels(conn, rows: list, symbol_id: int, tf_id: int):
+    """
+    Replace one series' labels straight in training_labels_c (rows from
+    ai.core.labeling_worker.build_compact_label_rows) inside the caller's
+    transaction; no view triggers, no timestamp parsing. Caller commits.
+    """
+    conn.execute(f'DELETE FROM {compact_name("training_labels")} WHERE symbol_id = ? AND tf_id = ?',
+                 (symbol_id, tf_id))
+    conn.executemany(COMPACT_LABELS_INSERT_SQL, rows)
+    refresh_series_stats(conn, 'training_labels', [(symbol_id, tf_id)])
+
+
 def batch_insert_labels(all_batch_data: list, timeframe: str, symbols_to_delete: list) -> tuple:
     """
     Batch insert all labels in a single transaction.
     Much faster than row-by-row insert.
     """
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return False, 0, "Database connection failed"
     
     try:
-        cur = conn.cursor()
-        
-        # Delete existing labels for all processed symbols in one go
-        for symbol in symbols_to_delete:
-            cur.execute('DELETE FROM training_labels WHERE symbol=? AND timeframe=?', (symbol, timeframe))
-        
-        # Batch insert all data
-        cur.executemany('''
-            INSERT INTO training_labels 
-            (timestamp, symbol, timeframe,
-             score_long, score_short, 
-             realized_return_long, realized_return_short,
-             mfe_long, mfe_short, mae_long, mae_short,
-             bars_held_long, bars_held_short,
-             exit_type_long, exit_type_short,
-             atr_pct)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', all_batch_data)
+        symbols = write_labels(conn, all_batch_data, timeframe, symbols_to_delete)
+        publish(conn, LABELS_REBUILT, {'timeframe': timeframe, 'symbols': symbols, 'rows': len(all_batch_data)})
         
         conn.commit()
+        ring(DB_PATH, LABELS_REBUILT)
         return True, len(all_batch_data), "Batch insert successful"
         
     except Exception as e:
@@ -126,7 +135,7 @@ def run_labeling_pipeline_single(
 ):
     """
     Run ATR-based labeling for a single timeframe.
-    Optimized with batch insert.
+    All symbols are labeled in one vectorized call, then batch inserted.
     """
     
     if create_table:
@@ -137,36 +146,44 @@ def run_labeling_pipeline_single(
     if not symbols:
         return False, 0, f"No symbols found for {timeframe}"
     
-    max_bars = config.get_max_bars(timeframe)
-    
-    # Process sequentially (Streamlit-safe) but batch insert at end
-    all_batch_data = []
-    symbols_processed = []
+    # Load every series, then label the whole universe in one kernel call
+    frames = {}
     errors = []
     
     for i, symbol in enumerate(symbols):
         if progress_callback:
             progress_callback(i + 1, len(symbols), symbol, timeframe)
         
-        try:
-            symbol_name, success, rows, batch_data, message = generate_labels_for_symbol(
-                symbol, timeframe, config, max_bars
-            )
-            
-            if success and batch_data:
-                all_batch_data.extend(batch_data)
-                symbols_processed.append(symbol_name)
-            else:
-                errors.append(f"{symbol_name}: {message}")
-                
-        except Exception as e:
-            errors.append(f"{symbol}: {str(e)}")
+        df = get_training_features_data(symbol, timeframe)
+        if df is None or len(df) == 0:
+            errors.append(f"{symbol}: No data available")
+        else:
+            frames[symbol] = df[['high', 'low', 'close']]
+    
+    all_batch_data = []
+    symbols_processed = []
+    
+    try:
+        labels = ATRLabeler(config).generate_labels_for_universe(frames, timeframe)
+    except Exception as e:
+        return False, 0, f"Labeling failed: {e}"
+    
+    for symbol, labels_df in labels.items():
+        batch_data = build_label_rows(symbol, timeframe, labels_df)
+        if batch_data:
+            all_batch_data.extend(batch_data)
+            symbols_processed.append(symbol)
+        else:
+            errors.append(f"{symbol}: No valid labels generated")
     
     # Batch insert all results at the end
     if all_batch_data:
         success, total_rows, message = batch_insert_labels(all_batch_data, timeframe, symbols_processed)
         if not success:
             return False, 0, f"Batch insert failed: {message}"
+        # Materialized v_xgb_training, then the columnar copy (no-op without pyarrow)
+        refresh_xgb_training_table(timeframe, symbols_processed)
+        export_xgb_training(timeframe, symbols_processed, replace_all=True)
     else:
         total_rows = 0
     
@@ -218,12 +235,18 @@ def generate_and_save_labels(
         return False, 0, message
     
     success, total, msg = batch_insert_labels(batch_data, timeframe, [symbol])
+    if success:
+        refresh_xgb_training_table(timeframe, [symbol])
+        export_xgb_training(timeframe, [symbol])
     return success, total, msg
 
 
 __all__ = [
     'generate_and_save_labels',
     'generate_labels_for_symbol',
+    'build_label_rows',
+    'write_labels',
+    'write_compact_labels',
     'batch_insert_labels',
     'run_labeling_pipeline_single',
     'run_labeling_pipeline_both'
@@ -8,7 +8,9 @@ Uses v_xgb_training VIEW to show OHLCV + indicators + labels together.
 import streamlit as st
 import pandas as pd
 from typing import Optional
-from database import get_connection
+from database import get_connection, refresh_stale_xgb_training
+from database.compact_schema import series_filter, ts_text
+from database.xgb_view import XGB_TABLE
 
 
 def get_labels_for_table(symbol: str, timeframe: str, limit: int = 10000) -> pd.DataFrame:
@@ -23,18 +25,18 @@ def get_labels_for_table(symbol: str, timeframe: str, limit: int = 10000) -> pd.
     Returns:
         DataFrame with complete data (OHLCV + indicators + labels)
     """
+    refresh_stale_xgb_training(timeframe)
     conn = get_connection()
     if not conn:
         return pd.DataFrame()
     
     try:
-        # Use v_xgb_training VIEW - has everything joined!
-        # SELECT ALL 24 columns from the VIEW
-        query = '''
+        # Range scan of the materialized v_xgb_training table (everything joined!)
+        query = f'''
             SELECT 
-                symbol,
-                timeframe,
-                timestamp,
+                ? AS symbol,
+                ? AS timeframe,
+                {ts_text('x')} AS timestamp,
                 open, high, low, close, volume,
                 rsi, atr, macd,
                 score_long,
@@ -50,13 +52,13 @@ def get_labels_for_table(symbol: str, timeframe: str, limit: int = 10000) -> pd.
                 exit_type_long,
                 exit_type_short,
                 atr_pct
-            FROM v_xgb_training
-            WHERE symbol = ? AND timeframe = ?
-            ORDER BY timestamp ASC
+            FROM {XGB_TABLE} x
+            WHERE {series_filter('x')}
+            ORDER BY x.ts ASC
             LIMIT ?
         '''
         
-        df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
+        df = pd.read_sql_query(query, conn, params=(symbol, timeframe, symbol, timeframe, limit))
         
         if len(df) > 0:
             df['timestamp'] = pd.to_datetime(df['timestamp'])
@@ -12,7 +12,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from typing import Optional
 import logging
-from database import get_connection
+from database import get_connection, refresh_stale_xgb_training
+from database.compact_schema import series_filter, ts_text
+from database.xgb_view import XGB_TABLE
 from styles.tables import render_html_table
 
 logger = logging.getLogger(__name__)
@@ -23,15 +25,16 @@ def get_labels_with_prices(symbol: str, timeframe: str, last_n: int = 200) -> pd
     Get labels with OHLCV prices from v_xgb_training VIEW.
     The VIEW already has everything joined!
     """
+    refresh_stale_xgb_training(timeframe)
     conn = get_connection()
     if not conn:
         return pd.DataFrame()
     
     try:
-        # Use v_xgb_training VIEW - has OHLCV + indicators + labels
-        query = '''
+        # Latest rows of the materialized v_xgb_training table, in key order
+        query = f'''
             SELECT 
-                timestamp,
+                {ts_text('x')} AS timestamp,
                 open,
                 high,
                 low,
@@ -52,9 +55,9 @@ def get_labels_with_prices(symbol: str, timeframe: str, last_n: int = 200) -> pd
                 mae_long,
                 mae_short,
                 atr_pct
-            FROM v_xgb_training
-            WHERE symbol = ? AND timeframe = ?
-            ORDER BY timestamp DESC
+            FROM {XGB_TABLE} x
+            WHERE {series_filter('x')}
+            ORDER BY x.ts DESC
             LIMIT ?
         '''
         
@@ -71,20 +74,20 @@ def get_labels_with_prices(symbol: str, timeframe: str, last_n: int = 200) -> pd
         logger.error(f"Error fetching from v_xgb_training VIEW: {e}")
         # Fallback: try training_data directly (has OHLCV)
         try:
-            query = '''
+            query = f'''
                 SELECT 
-                    d.timestamp,
+                    {ts_text('d')} AS timestamp,
                     d.open, d.high, d.low, d.close, d.volume,
                     d.rsi, d.atr,
                     l.score_long, l.score_short,
                     l.realized_return_long, l.realized_return_short,
                     l.exit_type_long, l.exit_type_short,
                     l.bars_held_long, l.bars_held_short
-                FROM training_data d
-                INNER JOIN training_labels l
-                    ON d.symbol = l.symbol AND d.timeframe = l.timeframe AND d.timestamp = l.timestamp
-                WHERE d.symbol = ? AND d.timeframe = ?
-                ORDER BY d.timestamp DESC
+                FROM training_data_c d
+                INNER JOIN training_labels_c l
+                    ON d.symbol_id = l.symbol_id AND d.tf_id = l.tf_id AND d.ts = l.ts
+                WHERE {series_filter('d')}
+                ORDER BY d.ts DESC
                 LIMIT ?
             '''
             df = pd.read_sql_query(query, conn, params=(symbol, timeframe, last_n))
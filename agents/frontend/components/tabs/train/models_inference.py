@@ -12,10 +12,11 @@ import pandas as pd
 import numpy as np
 import json
 import pickle
-import sqlite3
 from pathlib import Path
 import os
 
+from database import get_connection
+from database.compact_schema import series_filter, ts_text
 from services.feature_alignment import align_features_dataframe
 from services.xgb_normalization import normalize_long_short_scores
 
@@ -62,14 +63,17 @@ def load_model_for_timeframe(timeframe: str):
 
 def get_realtime_symbols() -> list:
     """Get list of symbols from realtime_ohlcv table"""
-    db_path = get_db_path()
-    if not db_path.exists():
+    conn = get_connection()
+    if not conn:
         return []
     
     try:
-        conn = sqlite3.connect(str(db_path), timeout=30)
         cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT symbol FROM realtime_ohlcv ORDER BY symbol")
+        cursor.execute("""
+            SELECT symbol FROM symbol_ids
+            WHERE EXISTS (SELECT 1 FROM realtime_ohlcv_c WHERE symbol_id = symbol_ids.id)
+            ORDER BY symbol
+        """)
         symbols = [row[0] for row in cursor.fetchall()]
         conn.close()
         return symbols
@@ -79,13 +83,10 @@ def get_realtime_symbols() -> list:
 
 def fetch_realtime_data(symbol: str, timeframe: str, limit: int = 200) -> pd.DataFrame:
     """Fetch real-time OHLCV data with indicators from database"""
-    db_path = get_db_path()
-    
-    if not db_path.exists():
+    conn = get_connection()
+    if not conn:
         return pd.DataFrame()
     
-    conn = sqlite3.connect(str(db_path), timeout=30)
-    
     try:
         # Check available columns
         cursor = conn.cursor()
@@ -101,25 +102,21 @@ def fetch_realtime_data(symbol: str, timeframe: str, limit: int = 200) -> pd.Dat
         available_indicators = [c for c in indicator_cols if c in columns]
         indicator_select = ', '.join(available_indicators) if available_indicators else ''
         
-        if indicator_select:
-            query = f"""
-                SELECT timestamp, symbol, open, high, low, close, volume, {indicator_select}
-                FROM realtime_ohlcv WHERE symbol = ? AND timeframe = ?
-                ORDER BY timestamp DESC LIMIT ?
-            """
-        else:
-            query = """
-                SELECT timestamp, symbol, open, high, low, close, volume
-                FROM realtime_ohlcv WHERE symbol = ? AND timeframe = ?
-                ORDER BY timestamp DESC LIMIT ?
-            """
+        # Compact table read in primary-key order (newest first)
+        query = f"""
+            SELECT {ts_text('d')} AS timestamp, ? AS symbol, open, high, low, close, volume
+                   {', ' + indicator_select if indicator_select else ''}
+            FROM realtime_ohlcv_c d WHERE {series_filter('d')}
+            ORDER BY d.ts DESC LIMIT ?
+        """
+        params = [symbol, symbol, timeframe, limit]
         
-        df = pd.read_sql_query(query, conn, params=[symbol, timeframe, limit])
+        df = pd.read_sql_query(query, conn, params=params)
         
         if len(df) == 0:
             # Fallback to training_data
-            query = query.replace('realtime_ohlcv', 'training_data')
-            df = pd.read_sql_query(query, conn, params=[symbol, timeframe, limit])
+            query = query.replace('realtime_ohlcv_c', 'training_data_c')
+            df = pd.read_sql_query(query, conn, params=params)
         
         if len(df) > 0:
             df = df.sort_values('timestamp').reset_index(drop=True)
@@ -43,7 +43,7 @@ def get_pipeline_status() -> dict:
         cur = conn.cursor()
         
         # === STEP 1: Check training_data ===
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if cur.fetchone():
             cur.execute('''
                 SELECT 
@@ -78,7 +78,7 @@ def get_pipeline_status() -> dict:
                 status['step1_data']['details'] = data_stats
         
         # === STEP 2: Check training_labels ===
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_labels'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_labels'")
         if cur.fetchone():
             cur.execute('''
                 SELECT 
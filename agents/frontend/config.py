@@ -14,10 +14,18 @@ UPDATE_INTERVAL_MINUTES = 15
 # Paths
 SHARED_PATH = os.getenv("SHARED_DATA_PATH", "/app/shared")
 DB_PATH = f"{SHARED_PATH}/data_cache/trading_data.db"
+LAKE_DIR = f"{SHARED_PATH}/data_cache/lake"  # Parquet mirror of training_data / v_xgb_training
 
-# Signal files
-REFRESH_SIGNAL_FILE = f"{SHARED_PATH}/refresh_signal.txt"  # Refresh OHLCV data only
-UPDATE_LIST_SIGNAL_FILE = f"{SHARED_PATH}/update_list_signal.txt"  # Update top 100 list + refresh data
+# SQLite connection pool (database/pool.py)
+DB_READ_CACHE_MB = int(os.getenv("DB_READ_CACHE_MB", "64"))  # Page cache of each per-thread reader
+DB_MMAP_MB = int(os.getenv("DB_MMAP_MB", "256"))  # Memory-mapped I/O of each reader
+DB_DEBUG_PANEL = os.getenv("DB_DEBUG_PANEL", "false").lower() in ("1", "true", "yes")  # Query timings in the sidebar
+
+# Background labeling jobs (components/tabs/train/labeling_jobs.py)
+LABELING_WORKERS = int(os.getenv("LABELING_WORKERS", "0"))  # Worker processes (0 = one per CPU core)
+
+# Persistent label optimization studies (ai/optimizer/label_study.py, scripts/optimize_labels.py)
+LABEL_STUDY_STORAGE = os.getenv("LABEL_STUDY_STORAGE", f"sqlite:///{SHARED_PATH}/data_cache/label_studies.db")
 
 # Candles configuration
 CANDLES_LIMIT = 300  # Candele da visualizzare (include warmup per indicatori)
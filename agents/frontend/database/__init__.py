@@ -6,11 +6,13 @@ All functions are re-exported for backwards compatibility.
 """
 
 # Connection
-from .connection import get_connection
+from .connection import get_connection, get_write_connection, query_stats, reset_query_stats
 
 # OHLCV functions
 from .ohlcv import (
     get_top_symbols,
+    get_ticker_snapshot,
+    get_latest_candles,
     get_symbols,
     get_timeframes,
     get_ohlcv,
@@ -18,6 +20,12 @@ from .ohlcv import (
     get_update_status,
 )
 
+# ML signals board (ml-inference agent)
+from .ml_signals import get_ml_signal_board
+
+# Agent triggers (event bus)
+from .agent_events import publish_agent_event, request_data_refresh, is_request_pending
+
 # Historical data functions
 from .historical import (
     get_historical_stats,
@@ -61,6 +69,14 @@ from .explorer import (
     ML_LABELS_EXAMPLE_QUERIES,
 )
 
+# Training data lake (Parquet first, SQLite fallback)
+from .training_lake import (
+    load_training_frame,
+    export_xgb_training,
+    refresh_stale_xgb_training,
+    drop_training_lake,
+)
+
 # Feature statistics (for pipeline feature count reminders)
 from .feature_stats import (
     EXPECTED_FEATURES,
@@ -77,15 +93,28 @@ from .feature_stats import (
 __all__ = [
     # Connection
     'get_connection',
+    'get_write_connection',
+    'query_stats',
+    'reset_query_stats',
     
     # OHLCV
     'get_top_symbols',
+    'get_ticker_snapshot',
+    'get_latest_candles',
     'get_symbols',
     'get_timeframes',
     'get_ohlcv',
     'get_stats',
     'get_update_status',
     
+    # ML signals board
+    'get_ml_signal_board',
+    
+    # Agent triggers
+    'publish_agent_event',
+    'request_data_refresh',
+    'is_request_pending',
+    
     # Historical
     'get_historical_stats',
     'get_backfill_status_all',
@@ -122,6 +151,12 @@ __all__ = [
     'execute_custom_query',
     'ML_LABELS_EXAMPLE_QUERIES',
     
+    # Training data lake
+    'load_training_frame',
+    'export_xgb_training',
+    'refresh_stale_xgb_training',
+    'drop_training_lake',
+    
     # Feature Statistics
     'EXPECTED_FEATURES',
     'EXPECTED_FEATURE_COUNT',
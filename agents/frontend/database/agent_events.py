@@ -0,0 +1,50 @@
+"""
+Agent triggers (event bus)
+
+The dashboard asks the other agents for work by publishing events on the
+shared database (see database/event_bus.py): the data-fetcher and the
+historical-data agent sleep on them instead of polling signal files.
+"""
+
+from .connection import get_connection, get_write_connection
+from .event_bus import LIST_UPDATE_REQUESTED, REFRESH_REQUESTED, pending_events, publish, ring
+
+# Import from parent config
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import DB_PATH
+
+
+def publish_agent_event(topic: str, payload: dict = None) -> bool:
+    """Publish an event for the agents (False if the database is unavailable)"""
+    conn = get_write_connection()
+    if not conn:
+        return False
+    try:
+        publish(conn, topic, payload)
+        conn.commit()
+    except Exception as e:
+        print(f"Error publishing {topic}: {e}")
+        return False
+    finally:
+        conn.close()
+    ring(DB_PATH, topic)
+    return True
+
+
+def request_data_refresh(update_list: bool = False) -> bool:
+    """Ask the data-fetcher for an OHLCV refresh (update_list: also re-rank the Top 100)"""
+    return publish_agent_event(LIST_UPDATE_REQUESTED if update_list else REFRESH_REQUESTED,
+                               {'source': 'dashboard'})
+
+
+def is_request_pending(topic: str, subscriber: str) -> bool:
+    """True while an event of `topic` has not been picked up by the named agent"""
+    conn = get_connection()
+    if not conn:
+        return False
+    try:
+        return pending_events(conn, topic, subscriber) > 0
+    finally:
+        conn.close()
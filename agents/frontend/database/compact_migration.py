@@ -0,0 +1,202 @@
+"""
+🚚 Compact Migration Module - Create / migrate tables to schema v2
+
+Same copies as compact_schema (data-fetcher core/, historical-data core/,
+frontend database/, ml-inference core/).
+
+Copying a legacy v1 table holds the write lock for the whole copy, so it
+is done by one designated migrator only: the data-fetcher at startup
+(first agent started by docker-compose) or scripts/migrate_compact_schema.py
+with the agents stopped. Every other agent polls schema_versions until the
+table is v2 instead of queuing on the lock, where its busy_timeout would
+expire during a multi-million-row copy.
+"""
+
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from .compact_schema import (
+    COMPACT_TABLES, SCHEMA_VERSION, _create_compact_table, _create_compat_view,
+    _init_dictionaries, _ts_ms_sql, compact_name
+)
+
+logger = logging.getLogger(__name__)
+
+# How often non-migrating agents re-check schema_versions during a migration
+MIGRATION_POLL_SECONDS = 2.0
+
+
+def get_schema_version(conn: sqlite3.Connection, table: str) -> int:
+    """Layout version of `table` (1 = legacy TEXT layout or not created yet)"""
+    try:
+        row = conn.execute('SELECT version FROM schema_versions WHERE table_name = ?', (table,)).fetchone()
+    except sqlite3.OperationalError:
+        return 1
+    return row[0] if row else 1
+
+
+def _object_type(conn: sqlite3.Connection, name: str) -> Optional[str]:
+    row = conn.execute('SELECT type FROM sqlite_master WHERE name = ?', (name,)).fetchone()
+    return row[0] if row else None
+
+
+def _copy_legacy_rows(conn: sqlite3.Connection, table: str) -> int:
+    """Copy the v1 table into <table>_c (rows with unparseable timestamps are dropped)"""
+    legacy = table
+    names = [c for c, _, _ in COMPACT_TABLES[table]]
+    legacy_cols = {row[1] for row in conn.execute(f'PRAGMA table_info({legacy})')}
+    select = ', '.join(f'o.{c}' if c in legacy_cols else 'NULL' for c in names)
+
+    conn.execute(f'INSERT OR IGNORE INTO symbol_ids (symbol) SELECT DISTINCT symbol FROM {legacy}')
+    conn.execute(f'INSERT OR IGNORE INTO timeframe_ids (timeframe) SELECT DISTINCT timeframe FROM {legacy}')
+    return conn.execute(f'''
+        INSERT OR REPLACE INTO {compact_name(table)} (symbol_id, tf_id, ts, {', '.join(names)})
+        SELECT s.id, t.id, {_ts_ms_sql('o.timestamp')}, {select}
+        FROM {legacy} o
+        JOIN symbol_ids s ON s.symbol = o.symbol
+        JOIN timeframe_ids t ON t.timeframe = o.timeframe
+        WHERE strftime('%s', o.timestamp) IS NOT NULL
+    ''').rowcount
+
+
+def _require_no_transaction(conn: sqlite3.Connection, caller: str):
+    """Schema changes run in their own transaction: never commit the caller's pending work"""
+    if conn.in_transaction:
+        raise RuntimeError(f"{caller}() needs a connection without an open transaction (commit or roll back first)")
+
+
+def _migrate_table(conn: sqlite3.Connection, table: str, migrate: bool) -> Optional[bool]:
+    """
+    One attempt under BEGIN IMMEDIATE.
+
+    Returns:
+        True if created/migrated, False if already v2, None if a legacy
+        table must be migrated and `migrate` is off
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        _init_dictionaries(conn)
+        if get_schema_version(conn, table) >= SCHEMA_VERSION:
+            conn.commit()
+            return False
+
+        kind = _object_type(conn, table)
+        if kind == 'table' and not migrate:
+            conn.rollback()
+            return None
+
+        # The legacy table is copied and dropped (not renamed: a rename would
+        # rewrite views such as v_xgb_training to the old name)
+        copied = 0
+        _create_compact_table(conn, table)
+        if kind == 'table':
+            copied = _copy_legacy_rows(conn, table)
+            conn.execute(f'DROP TABLE {table}')
+        elif kind == 'view':
+            conn.execute(f'DROP VIEW {table}')
+        _create_compat_view(conn, table)
+
+        conn.execute('''
+            INSERT OR REPLACE INTO schema_versions (table_name, version, migrated_at)
+            VALUES (?, ?, ?)
+        ''', (table, SCHEMA_VERSION, datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if kind == 'table':
+        logger.info(f"🗜️ Migrated {table} to compact schema v{SCHEMA_VERSION} ({copied:,} rows)")
+    return True
+
+
+def _is_locked(exc: sqlite3.OperationalError) -> bool:
+    return 'locked' in str(exc).lower() or 'busy' in str(exc).lower()
+
+
+def ensure_compact_table(conn: sqlite3.Connection, table: str, migrate: bool = False,
+                         wait_seconds: Optional[float] = None) -> bool:
+    """
+    Create `table` in layout v2.
+
+    Only the designated migrator (migrate=True: the data-fetcher at startup
+    and scripts/migrate_compact_schema.py) copies a legacy v1 table, which
+    holds the write lock for the whole copy. Every other caller polls
+    schema_versions until that migration has finished instead of queuing
+    on the lock, so its busy_timeout cannot expire during the copy.
+
+    Args:
+        migrate: Copy a legacy v1 table in place (designated migrator only)
+        wait_seconds: Give up waiting after this long (None = wait forever)
+
+    Returns:
+        True if the table was created or migrated by this call
+
+    Raises:
+        RuntimeError: `conn` has an open transaction
+        TimeoutError: The migration did not finish within wait_seconds
+    """
+    if table not in COMPACT_TABLES:
+        raise ValueError(f"Unknown table: {table} (expected one of {list(COMPACT_TABLES)})")
+    if get_schema_version(conn, table) >= SCHEMA_VERSION:
+        return False
+    _require_no_transaction(conn, 'ensure_compact_table')
+
+    if migrate:
+        return _migrate_table(conn, table, migrate=True)
+
+    deadline = None if wait_seconds is None else time.monotonic() + wait_seconds
+    busy_ms = conn.execute('PRAGMA busy_timeout').fetchone()[0]
+    conn.execute(f'PRAGMA busy_timeout = {int(MIGRATION_POLL_SECONDS * 1000)}')
+    waiting = False
+    try:
+        while True:
+            if get_schema_version(conn, table) >= SCHEMA_VERSION:
+                return False
+            # A legacy table is left to the migrator; a missing one is created here
+            if _object_type(conn, table) != 'table':
+                try:
+                    result = _migrate_table(conn, table, migrate=False)
+                    if result is not None:
+                        return result
+                except sqlite3.OperationalError as e:
+                    if not _is_locked(e):
+                        raise
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"{table} is still in the v1 layout: waiting for the data-fetcher or "
+                    f"scripts/migrate_compact_schema.py to migrate it to v{SCHEMA_VERSION}"
+                )
+            if not waiting:
+                logger.info(f"⏳ Waiting for the compact schema migration of {table}")
+                waiting = True
+            time.sleep(MIGRATION_POLL_SECONDS)
+    finally:
+        conn.execute(f'PRAGMA busy_timeout = {busy_ms}')
+
+
+def ensure_compact_tables(conn: sqlite3.Connection, tables: Iterable[str] = None, migrate: bool = False,
+                          wait_seconds: Optional[float] = None) -> List[str]:
+    """ensure_compact_table() for several tables; returns those created/migrated"""
+    return [t for t in (tables or COMPACT_TABLES) if ensure_compact_table(conn, t, migrate, wait_seconds)]
+
+
+def drop_compact_table(conn: sqlite3.Connection, table: str):
+    """Drop the view, triggers and <table>_c (used by drop-and-recreate callers)"""
+    _require_no_transaction(conn, 'drop_compact_table')
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        _init_dictionaries(conn)
+        if _object_type(conn, table) == 'view':
+            conn.execute(f'DROP VIEW {table}')
+        else:
+            conn.execute(f'DROP TABLE IF EXISTS {table}')
+        conn.execute(f'DROP TABLE IF EXISTS {compact_name(table)}')
+        conn.execute('DELETE FROM schema_versions WHERE table_name = ?', (table,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,263 @@
+"""
+🗜️ Compact Schema Module - Integer-epoch candle storage (schema v2)
+
+Shared by every agent that owns or reads a candle-keyed table (identical
+copy in data-fetcher core/, historical-data core/, frontend database/ and
+ml-inference core/ because they are built as separate Docker contexts).
+
+Layout v2 of each table in COMPACT_TABLES:
+- symbol_ids / timeframe_ids: dictionary tables (small INTEGER ids)
+- <table>_c: WITHOUT ROWID table clustered on (symbol_id, tf_id, ts),
+  ts = candle open time in epoch milliseconds (UTC)
+- <table>: compatibility VIEW with the v1 columns (symbol, timeframe,
+  timestamp as '%Y-%m-%d %H:%M:%S' TEXT) plus INSTEAD OF triggers, so
+  existing readers and writers keep working unchanged
+
+Hot paths read and write <table>_c directly (no string parsing). Joins
+between two tables must use the _c tables: the view timestamp is an
+expression and cannot use the primary key.
+
+schema_versions records the layout version of every migrated table;
+creating and migrating the tables is done by compact_migration.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_VERSION = 2
+
+_OHLCV = [('open', 'REAL'), ('high', 'REAL'), ('low', 'REAL'), ('close', 'REAL'), ('volume', 'REAL')]
+_INDICATORS = [
+    'sma_20', 'sma_50', 'ema_12', 'ema_26',
+    'bb_upper', 'bb_mid', 'bb_lower',
+    'macd', 'macd_signal', 'macd_hist',
+    'rsi', 'stoch_k', 'stoch_d', 'atr',
+    'volume_sma', 'obv',
+]
+
+# table -> [(column, type, default)] of the non-key columns (v1 order)
+COMPACT_TABLES: Dict[str, List[Tuple[str, str, Optional[str]]]] = {
+    'realtime_ohlcv': [(c, t, None) for c, t in _OHLCV] + [(c, 'REAL', None) for c in _INDICATORS],
+    'training_data': (
+        [(c, 'REAL NOT NULL', None) for c, _ in _OHLCV]
+        + [(c, 'REAL NOT NULL', None) for c in _INDICATORS]
+        + [('fetched_at', 'TEXT', 'CURRENT_TIMESTAMP')]
+    ),
+    'training_labels': [
+        ('score_long', 'REAL', None), ('score_short', 'REAL', None),
+        ('realized_return_long', 'REAL', None), ('realized_return_short', 'REAL', None),
+        ('mfe_long', 'REAL', None), ('mfe_short', 'REAL', None),
+        ('mae_long', 'REAL', None), ('mae_short', 'REAL', None),
+        ('bars_held_long', 'INTEGER', None), ('bars_held_short', 'INTEGER', None),
+        ('exit_type_long', 'TEXT', None), ('exit_type_short', 'TEXT', None),
+        ('atr_pct', 'REAL', None),
+    ],
+    'ml_training_labels': [(c, t, None) for c, t in _OHLCV] + [
+        ('score_long', 'REAL', None), ('realized_return_long', 'REAL', None),
+        ('mfe_long', 'REAL', None), ('mae_long', 'REAL', None),
+        ('bars_held_long', 'INTEGER', None), ('exit_type_long', 'TEXT', None),
+        ('score_short', 'REAL', None), ('realized_return_short', 'REAL', None),
+        ('mfe_short', 'REAL', None), ('mae_short', 'REAL', None),
+        ('bars_held_short', 'INTEGER', None), ('exit_type_short', 'TEXT', None),
+        ('trailing_stop_pct', 'REAL', None), ('max_bars', 'INTEGER', None),
+        ('time_penalty_lambda', 'REAL', None), ('trading_cost', 'REAL', None),
+        ('generated_at', 'TEXT', None),
+    ],
+    'ml_signals': [
+        ('score_long', 'REAL', None), ('score_short', 'REAL', None),
+        ('confidence_long', 'REAL', None), ('confidence_short', 'REAL', None),
+        ('signal_long', 'TEXT', None), ('signal_short', 'TEXT', None),
+        ('model_version', 'TEXT', None),
+        ('created_at', 'DATETIME', 'CURRENT_TIMESTAMP'),
+    ],
+}
+
+_EPOCH = pd.Timestamp('1970-01-01')
+_MS = pd.Timedelta(milliseconds=1)
+
+
+# =========================================
+# CONVERSIONS
+# =========================================
+
+def compact_name(table: str) -> str:
+    """Name of the physical v2 table behind `table`"""
+    return f'{table}_c'
+
+
+def ts_text(alias: str = 'd') -> str:
+    """SQL expression rendering `alias`.ts as '%Y-%m-%d %H:%M:%S' (the v1 format)"""
+    return f"strftime('%Y-%m-%d %H:%M:%S', {alias}.ts / 1000, 'unixepoch')"
+
+
+def series_filter(alias: str = 'd') -> str:
+    """WHERE fragment selecting one (symbol, timeframe) series by name (binds 2 parameters)"""
+    return (f"{alias}.symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?) "
+            f"AND {alias}.tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)")
+
+
+def _ts_ms_sql(value: str) -> str:
+    """SQL expression converting a v1 timestamp string into epoch ms"""
+    return f"CAST(strftime('%s', {value}) AS INTEGER) * 1000"
+
+
+def to_epoch_ms(values) -> np.ndarray:
+    """Datetime index / series / strings / datetimes -> int64 epoch ms (naive = UTC)"""
+    index = pd.DatetimeIndex(pd.to_datetime(values))
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return np.asarray((index - _EPOCH) // _MS, dtype=np.int64)
+
+
+def epoch_ms(value) -> int:
+    """Single datetime / string -> epoch ms"""
+    return int(to_epoch_ms([value])[0])
+
+
+def from_epoch_ms(values) -> pd.DatetimeIndex:
+    """int epoch ms -> naive UTC DatetimeIndex (no string parsing)"""
+    return pd.DatetimeIndex(pd.to_datetime(np.asarray(values, dtype=np.int64), unit='ms'))
+
+
+def ms_to_text(value: Optional[int]) -> Optional[str]:
+    """epoch ms -> '%Y-%m-%d %H:%M:%S' (None stays None)"""
+    if value is None:
+        return None
+    return datetime.utcfromtimestamp(value / 1000).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# =========================================
+# DICTIONARY IDS
+# =========================================
+
+def _init_dictionaries(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS symbol_ids (
+            id INTEGER PRIMARY KEY,
+            symbol TEXT NOT NULL UNIQUE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS timeframe_ids (
+            id INTEGER PRIMARY KEY,
+            timeframe TEXT NOT NULL UNIQUE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            migrated_at TEXT
+        )
+    ''')
+
+
+def get_ids(conn: sqlite3.Connection, symbol: str, timeframe: str,
+            create: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    (symbol_id, tf_id) of a symbol/timeframe pair.
+
+    Args:
+        create: Register unknown names (writers); readers get None instead
+
+    Returns:
+        Tuple of ids, or None when a name is unknown
+    """
+    if create:
+        conn.execute('INSERT OR IGNORE INTO symbol_ids (symbol) VALUES (?)', (symbol,))
+        conn.execute('INSERT OR IGNORE INTO timeframe_ids (timeframe) VALUES (?)', (timeframe,))
+    row = conn.execute('''
+        SELECT (SELECT id FROM symbol_ids WHERE symbol = ?),
+               (SELECT id FROM timeframe_ids WHERE timeframe = ?)
+    ''', (symbol, timeframe)).fetchone()
+    if row is None or row[0] is None or row[1] is None:
+        return None
+    return row[0], row[1]
+
+
+def get_symbol_id(conn: sqlite3.Connection, symbol: str) -> Optional[int]:
+    row = conn.execute('SELECT id FROM symbol_ids WHERE symbol = ?', (symbol,)).fetchone()
+    return row[0] if row else None
+
+
+def get_timeframe_id(conn: sqlite3.Connection, timeframe: str) -> Optional[int]:
+    row = conn.execute('SELECT id FROM timeframe_ids WHERE timeframe = ?', (timeframe,)).fetchone()
+    return row[0] if row else None
+
+
+# =========================================
+# LAYOUT DDL (used by compact_migration)
+# =========================================
+
+def _create_compact_table(conn: sqlite3.Connection, table: str):
+    """<table>_c clustered on (symbol_id, tf_id, ts)"""
+    col_defs = ',\n'.join(
+        f'{c} {t}' + (f' DEFAULT {d}' if d else '') for c, t, d in COMPACT_TABLES[table]
+    )
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {compact_name(table)} (
+            symbol_id INTEGER NOT NULL,
+            tf_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            {col_defs},
+            PRIMARY KEY (symbol_id, tf_id, ts)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _create_compat_view(conn: sqlite3.Connection, table: str):
+    """v1 compatibility view + INSTEAD OF triggers over <table>_c"""
+    columns = COMPACT_TABLES[table]
+    names = [c for c, _, _ in columns]
+    physical = compact_name(table)
+
+    conn.execute(f'''
+        CREATE VIEW {table} AS
+        SELECT s.symbol, t.timeframe, {ts_text('d')} AS timestamp, {', '.join(f'd.{c}' for c in names)}
+        FROM {physical} d
+        JOIN symbol_ids s ON s.id = d.symbol_id
+        JOIN timeframe_ids t ON t.id = d.tf_id
+    ''')
+
+    key_match = f'''
+            symbol_id = (SELECT id FROM symbol_ids WHERE symbol = OLD.symbol)
+            AND tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = OLD.timeframe)
+            AND ts = {_ts_ms_sql('OLD.timestamp')}
+    '''
+    new_values = ', '.join(f'COALESCE(NEW.{c}, {d})' if d else f'NEW.{c}' for c, _, d in columns)
+
+    # Dictionary inserts never conflict, so the caller's OR REPLACE / OR IGNORE
+    # only applies to the row itself (the v1 UNIQUE key)
+    conn.execute(f'''
+        CREATE TRIGGER {table}_insert INSTEAD OF INSERT ON {table}
+        BEGIN
+            INSERT INTO symbol_ids (symbol)
+            SELECT NEW.symbol WHERE NOT EXISTS (SELECT 1 FROM symbol_ids WHERE symbol = NEW.symbol);
+            INSERT INTO timeframe_ids (timeframe)
+            SELECT NEW.timeframe WHERE NOT EXISTS (SELECT 1 FROM timeframe_ids WHERE timeframe = NEW.timeframe);
+            INSERT INTO {physical} (symbol_id, tf_id, ts, {', '.join(names)})
+            VALUES (
+                (SELECT id FROM symbol_ids WHERE symbol = NEW.symbol),
+                (SELECT id FROM timeframe_ids WHERE timeframe = NEW.timeframe),
+                {_ts_ms_sql('NEW.timestamp')},
+                {new_values}
+            );
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER {table}_update INSTEAD OF UPDATE ON {table}
+        BEGIN
+            UPDATE {physical} SET {', '.join(f'{c} = NEW.{c}' for c in names)}
+            WHERE {key_match};
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER {table}_delete INSTEAD OF DELETE ON {table}
+        BEGIN
+            DELETE FROM {physical} WHERE {key_match};
+        END
+    ''')
@@ -1,38 +1,99 @@
 """
 Database connection module
+
+All frontend database access goes through one process-wide ConnectionPool
+(database/pool.py): get_connection() returns the calling thread's
+read-only connection, get_write_connection() the shared writer. Both keep
+the sqlite3 API and are released with conn.close().
 """
 
-import sqlite3
+import threading
 from pathlib import Path
+from typing import Dict, List
 
 # Import from parent config
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from config import DB_PATH
+from config import DB_PATH, DB_READ_CACHE_MB, DB_MMAP_MB
+from .compact_migration import ensure_compact_tables
+from .event_bus import ensure_events_table
+from .labeling_jobs import ensure_labeling_jobs_table
+from .pool import ConnectionPool
+from .table_stats import TRACKED_TABLES, ensure_stats
+from .xgb_view import upgrade_xgb_view
 
 # Connection timeout in seconds (wait if database is locked)
 DB_TIMEOUT = 30
 
+# Seconds a page load waits for a running compact schema migration
+# (done by the data-fetcher); after that the page shows the error and retries on reload
+SCHEMA_WAIT_SECONDS = 10
+
+# Indexes found unused or harmful by scripts/audit_query_plans.py
+OBSOLETE_INDEXES = ('idx_tl_score_long', 'idx_tl_score_short')
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _ensure_schema(conn):
+    """Create the candle-keyed tables in the compact layout (once, on the writer)"""
+    ensure_compact_tables(conn, wait_seconds=SCHEMA_WAIT_SECONDS)
+    upgrade_xgb_view(conn)
+    with conn:
+        for index in OBSOLETE_INDEXES:
+            conn.execute(f'DROP INDEX IF EXISTS {index}')
+        for table in TRACKED_TABLES:
+            ensure_stats(conn, table)
+        ensure_events_table(conn)
+        ensure_labeling_jobs_table(conn)
+
+
+def get_pool() -> ConnectionPool:
+    """Process-wide pool; the schema is checked before the first connection is handed out"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(DB_PATH, DB_TIMEOUT, DB_READ_CACHE_MB, DB_MMAP_MB,
+                                      on_first_write=_ensure_schema)
+                pool.writer().close()
+                _pool = pool
+    return _pool
+
 
 def get_connection():
     """
-    Get database connection with optimized settings for concurrent access.
-    
+    Read-only connection of the calling thread (None if the database is missing).
+
     Features:
-    - timeout=30: Wait up to 30 seconds if database is locked
-    - WAL mode: Allow concurrent reads during writes
-    - busy_timeout: SQLite-level timeout for locked operations
+    - mode=ro + query_only: writes fail instead of taking the write lock
+    - Reused across calls: pragmas run once per thread, the page cache stays warm
+    - WAL: reads never wait for the data-fetcher / historical-data writers
+    """
+    if not Path(DB_PATH).exists():
+        return None
+    return get_pool().reader()
+
+
+def get_write_connection():
+    """
+    The shared writer connection (None if the database is missing).
+
+    The calling thread holds it until conn.close(); uncommitted changes are
+    rolled back on close, as with a plain sqlite3 connection.
     """
     if not Path(DB_PATH).exists():
         return None
-    
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=DB_TIMEOUT)
-    
-    # Enable WAL mode for better concurrency
-    # WAL allows readers and writer to operate concurrently
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA busy_timeout=30000")  # 30 seconds in milliseconds
-    conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes, still safe with WAL
-    
-    return conn
+    return get_pool().writer()
+
+
+def query_stats() -> List[Dict]:
+    """Per-statement timings since start / last reset (sorted by total time)"""
+    return _pool.stats.snapshot() if _pool else []
+
+
+def reset_query_stats():
+    if _pool:
+        _pool.stats.reset()
@@ -7,6 +7,9 @@ for display in the ML training pipeline UI.
 
 from typing import Dict, List, Tuple, Optional
 from .connection import get_connection
+from .table_stats import get_table_summary
+from .training_lake import refresh_stale_xgb_training
+from .xgb_view import XGB_STATE
 
 
 # Expected feature columns for XGBoost training
@@ -43,6 +46,15 @@ def get_table_columns(table_name: str) -> List[str]:
         conn.close()
 
 
+def _count_rows_and_symbols(cur, table: str) -> Tuple[int, int]:
+    """Row and symbol count from the table_stats counters (full scan only if never built)"""
+    summary = get_table_summary(cur.connection, table)
+    if summary is not None:
+        return summary['rows'], summary['symbols']
+    cur.execute(f"SELECT COUNT(*), COUNT(DISTINCT symbol) FROM {table}")
+    return tuple(cur.fetchone())
+
+
 def get_training_data_stats() -> Dict:
     """
     Get statistics from training_data table (Phase 1).
@@ -56,7 +68,7 @@ def get_training_data_stats() -> Dict:
         cur = conn.cursor()
         
         # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if not cur.fetchone():
             return {'exists': False, 'error': 'Table training_data not found'}
         
@@ -68,13 +80,7 @@ def get_training_data_stats() -> Dict:
         exclude = {'id', 'symbol', 'timeframe', 'timestamp', 'fetched_at', 'interpolated'}
         feature_cols = [c for c in all_cols if c not in exclude]
         
-        # Count rows
-        cur.execute("SELECT COUNT(*) FROM training_data")
-        row_count = cur.fetchone()[0]
-        
-        # Count symbols
-        cur.execute("SELECT COUNT(DISTINCT symbol) FROM training_data")
-        symbol_count = cur.fetchone()[0]
+        row_count, symbol_count = _count_rows_and_symbols(cur, 'training_data')
         
         return {
             'exists': True,
@@ -106,7 +112,7 @@ def get_training_labels_stats() -> Dict:
         cur = conn.cursor()
         
         # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_labels'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_labels'")
         if not cur.fetchone():
             return {'exists': False, 'error': 'Table training_labels not found'}
         
@@ -118,13 +124,7 @@ def get_training_labels_stats() -> Dict:
         label_cols = [c for c in all_cols if 'score' in c or 'return' in c or 
                      'mfe' in c or 'mae' in c or 'bars_held' in c or 'exit_type' in c]
         
-        # Count rows
-        cur.execute("SELECT COUNT(*) FROM training_labels")
-        row_count = cur.fetchone()[0]
-        
-        # Count symbols
-        cur.execute("SELECT COUNT(DISTINCT symbol) FROM training_labels")
-        symbol_count = cur.fetchone()[0]
+        row_count, symbol_count = _count_rows_and_symbols(cur, 'training_labels')
         
         return {
             'exists': True,
@@ -144,8 +144,9 @@ def get_training_labels_stats() -> Dict:
 def get_xgb_view_stats() -> Dict:
     """
     Get statistics from v_xgb_training view (Phase 3).
-    This view joins training_data + training_labels.
+    This view reads the materialized training_data + training_labels join.
     """
+    refresh_stale_xgb_training()
     conn = get_connection()
     if not conn:
         return {'exists': False, 'error': 'No connection'}
@@ -178,12 +179,12 @@ def get_xgb_view_stats() -> Dict:
             else:
                 missing_features.append(f)
         
-        # Count rows (might be slow for large views)
+        # Row count and generation from the refresh bookkeeping (no scan)
         try:
-            cur.execute("SELECT COUNT(*) FROM v_xgb_training LIMIT 1")
-            row_count = cur.fetchone()[0]
+            cur.execute(f"SELECT COALESCE(SUM(row_count), 0), COALESCE(MAX(generation), 0) FROM {XGB_STATE}")
+            row_count, generation = cur.fetchone()
         except Exception:
-            row_count = -1
+            row_count, generation = -1, 0
         
         return {
             'exists': True,
@@ -193,6 +194,7 @@ def get_xgb_view_stats() -> Dict:
             'feature_columns': feature_cols,
             'label_columns': list(label_cols),
             'row_count': row_count,
+            'generation': generation,
             'expected_features': EXPECTED_FEATURE_COUNT,
             'available_features': available_features,
             'missing_features': missing_features,
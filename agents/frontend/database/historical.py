@@ -11,8 +11,12 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 import os
-import json
-from .connection import get_connection
+from .agent_events import is_request_pending, publish_agent_event
+from .connection import get_connection, get_write_connection
+from .event_bus import BACKFILL_REQUESTED
+from .table_stats import get_table_summary, refresh_series_stats, tracked_series
+from .training_lake import drop_training_lake
+from .xgb_view import refresh_xgb_training
 
 # Import from parent config
 import sys
@@ -34,16 +38,22 @@ def get_historical_stats():
         cur = conn.cursor()
         
         # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if not cur.fetchone():
             return {'exists': False}
         
-        cur.execute('''
-            SELECT COUNT(DISTINCT symbol), COUNT(DISTINCT timeframe), 
-                   COUNT(*), MIN(timestamp), MAX(timestamp)
-            FROM training_data
-        ''')
-        r = cur.fetchone()
+        # Maintained counters; scan only if they were never built
+        summary = get_table_summary(conn, 'training_data')
+        if summary is not None:
+            r = (summary['symbols'], summary['timeframes'], summary['rows'],
+                 summary['min_date'], summary['max_date'])
+        else:
+            cur.execute('''
+                SELECT COUNT(DISTINCT symbol), COUNT(DISTINCT timeframe), 
+                       COUNT(*), MIN(timestamp), MAX(timestamp)
+                FROM training_data
+            ''')
+            r = cur.fetchone()
         
         # Database file size
         db_size = Path(DB_PATH).stat().st_size if Path(DB_PATH).exists() else 0
@@ -87,7 +97,7 @@ def get_historical_ohlcv(symbol, timeframe, limit=1000, include_indicators=True)
     try:
         # Check if table exists
         cur = conn.cursor()
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if not cur.fetchone():
             return pd.DataFrame()
         
@@ -145,7 +155,7 @@ def get_historical_symbols():
         cur = conn.cursor()
         
         # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if not cur.fetchone():
             return []
         
@@ -167,7 +177,7 @@ def get_historical_symbols_by_volume():
         cur = conn.cursor()
         
         # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if not cur.fetchone():
             return []
         
@@ -223,7 +233,7 @@ def get_historical_inventory():
         cur = conn.cursor()
         
         # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='training_data'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='training_data'")
         if not cur.fetchone():
             return []
         
@@ -337,32 +347,20 @@ def get_symbol_data_quality(symbol: str, timeframe: str):
 
 def trigger_backfill_with_dates(start_date, end_date):
     """
-    Create trigger file with date range to start training data download.
+    Publish a backfill_requested event with the date range to start the training data download.
     
     Args:
         start_date: Start date for data download
         end_date: End date for data download
     
     Returns:
-        bool: True if trigger file was created successfully
+        bool: True if the request was published
     """
-    shared_path = os.environ.get('SHARED_DATA_PATH', '/app/shared')
-    trigger_file = Path(shared_path) / 'start_backfill.txt'
-    
-    try:
-        trigger_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write trigger with date range info
-        trigger_data = {
-            'triggered_at': str(pd.Timestamp.now()),
-            'start_date': str(start_date),
-            'end_date': str(end_date)
-        }
-        trigger_file.write_text(json.dumps(trigger_data))
-        return True
-    except Exception as e:
-        print(f"Error creating trigger file: {e}")
-        return False
+    return publish_agent_event(BACKFILL_REQUESTED, {
+        'triggered_at': str(pd.Timestamp.now()),
+        'start_date': str(start_date),
+        'end_date': str(end_date)
+    })
 
 
 def trigger_backfill():
@@ -371,10 +369,8 @@ def trigger_backfill():
 
 
 def check_backfill_running():
-    """Check if download is currently running (check for trigger file)"""
-    shared_path = os.environ.get('SHARED_DATA_PATH', '/app/shared')
-    trigger_file = Path(shared_path) / 'start_backfill.txt'
-    return trigger_file.exists()
+    """Check if a download request is waiting for the historical-data agent"""
+    return is_request_pending(BACKFILL_REQUESTED, 'historical-data')
 
 
 # =========================================
@@ -383,19 +379,25 @@ def check_backfill_running():
 
 def clear_historical_data():
     """Clear all training data and backfill status to start fresh"""
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return False
     try:
         cur = conn.cursor()
+        series = tracked_series(conn, 'training_data')
         
-        # Clear training data table
-        cur.execute("DELETE FROM training_data")
+        # Clear training data table (compact table, the view DELETE fires per row)
+        cur.execute("DELETE FROM training_data_c")
+        refresh_series_stats(conn, 'training_data', series)
         
         # Clear backfill status table (reset progress)
         cur.execute("DELETE FROM backfill_status")
         
         conn.commit()
+        refresh_xgb_training(conn)  # v_xgb_training joins the cleared features: empty it too
+        
+        # The Parquet mirrors are derived from the cleared tables
+        drop_training_lake()
         return True
     except Exception as e:
         print(f"Error clearing training data: {e}")
@@ -518,7 +520,7 @@ def get_backfill_errors():
 
 def retry_failed_downloads():
     """Reset ERROR status to PENDING for retry"""
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return 0
     try:
@@ -551,7 +553,7 @@ def cleanup_no_data_errors():
     Returns:
         Tuple of (converted_count, removed_from_top_symbols_count)
     """
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return 0, 0
     try:
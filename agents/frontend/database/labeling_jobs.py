@@ -0,0 +1,110 @@
+"""
+Labeling job status
+
+Progress of the background labeling jobs (components/tabs/train/labeling_jobs.py),
+one row per job in the labeling_jobs table. The job's writer thread updates
+it after every symbol; the dashboard polls it.
+
+Functions take the connection (as xgb_view / table_stats), so the schema
+hook of database/connection.py can create the table.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import List, Optional
+
+LABELING_JOBS_TABLE = 'labeling_jobs'
+MAX_STORED_ERRORS = 50
+
+LABELING_JOBS_TABLE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {LABELING_JOBS_TABLE} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        status TEXT NOT NULL,
+        timeframes TEXT,
+        workers INTEGER,
+        total_tasks INTEGER DEFAULT 0,
+        done_tasks INTEGER DEFAULT 0,
+        failed_tasks INTEGER DEFAULT 0,
+        rows_written INTEGER DEFAULT 0,
+        current TEXT,
+        message TEXT,
+        errors TEXT,
+        started_at TEXT,
+        updated_at TEXT,
+        finished_at TEXT
+    )
+'''
+
+# Job states
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_INTERRUPTED = 'interrupted'  # The dashboard process stopped while the job was running
+
+
+def _now_text() -> str:
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def ensure_labeling_jobs_table(conn: sqlite3.Connection):
+    """Create the status table (caller commits)"""
+    conn.execute(LABELING_JOBS_TABLE_SQL)
+
+
+def create_labeling_job(conn: sqlite3.Connection, timeframes: List[str], total_tasks: int, workers: int) -> int:
+    """Insert a running job (caller commits); returns its id"""
+    now = _now_text()
+    return conn.execute(f'''
+        INSERT INTO {LABELING_JOBS_TABLE}
+        (status, timeframes, workers, total_tasks, message, errors, started_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, '[]', ?, ?)
+    ''', (JOB_RUNNING, ','.join(timeframes), workers, total_tasks, 'Starting workers', now, now)).lastrowid
+
+
+def update_labeling_job(conn: sqlite3.Connection, job_id: int, done: int = 0, failed: int = 0, rows: int = 0,
+                        current: str = None, message: str = None, error: str = None,
+                        status: str = None):
+    """
+    Add to the job counters inside the caller's transaction (caller commits).
+
+    Args:
+        done / failed / rows: Increments
+        current: Last task handled ("BTC/USDT:USDT 15m")
+        message: Status line shown by the dashboard
+        error: Appended to the error list (first MAX_STORED_ERRORS kept)
+        status: New state (the final ones also set finished_at)
+    """
+    row = conn.execute(f'SELECT errors FROM {LABELING_JOBS_TABLE} WHERE id = ?', (job_id,)).fetchone()
+    errors = json.loads(row[0] or '[]') if row else []
+    if error and len(errors) < MAX_STORED_ERRORS:
+        errors.append(error)
+    now = _now_text()
+    conn.execute(f'''
+        UPDATE {LABELING_JOBS_TABLE} SET
+            done_tasks = done_tasks + ?,
+            failed_tasks = failed_tasks + ?,
+            rows_written = rows_written + ?,
+            current = COALESCE(?, current),
+            message = COALESCE(?, message),
+            errors = ?,
+            status = COALESCE(?, status),
+            updated_at = ?,
+            finished_at = CASE WHEN ? IN (?, ?, ?) THEN ? ELSE finished_at END
+        WHERE id = ?
+    ''', (done, failed, rows, current, message, json.dumps(errors), status, now,
+          status, JOB_DONE, JOB_FAILED, JOB_INTERRUPTED, now, job_id))
+
+
+def get_latest_labeling_job(conn: sqlite3.Connection) -> Optional[dict]:
+    """Last labeling job as a dict (None if there is none or the table is missing)"""
+    try:
+        cur = conn.execute(f'SELECT * FROM {LABELING_JOBS_TABLE} ORDER BY id DESC LIMIT 1')
+    except sqlite3.OperationalError:
+        return None
+    row = cur.fetchone()
+    if row is None:
+        return None
+    job = dict(zip([d[0] for d in cur.description], row))
+    job['errors'] = json.loads(job['errors'] or '[]')
+    return job
@@ -5,7 +5,9 @@ Basic read and delete operations for ML training labels.
 """
 
 import pandas as pd
-from ..connection import get_connection
+from ..connection import get_connection, get_write_connection
+from ..compact_schema import series_filter, ts_text
+from ..table_stats import refresh_series_stats, tracked_series
 
 
 def get_training_labels(
@@ -102,21 +104,21 @@ def get_ml_labels(symbol: str, timeframe: str, limit: int = 5000) -> pd.DataFram
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return pd.DataFrame()
         
-        query = '''
+        query = f'''
             SELECT 
-                timestamp, open, high, low, close, volume,
+                {ts_text('l')} AS timestamp, open, high, low, close, volume,
                 score_long, realized_return_long, mfe_long, mae_long, 
                 bars_held_long, exit_type_long,
                 score_short, realized_return_short, mfe_short, mae_short, 
                 bars_held_short, exit_type_short
-            FROM ml_training_labels
-            WHERE symbol = ? AND timeframe = ?
-            ORDER BY timestamp DESC
+            FROM ml_training_labels_c l
+            WHERE {series_filter('l')}
+            ORDER BY l.ts DESC
             LIMIT ?
         '''
         
@@ -159,7 +161,7 @@ def get_ml_labels_full(
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return pd.DataFrame()
@@ -196,7 +198,7 @@ def get_ml_labels_full(
 
 def clear_ml_labels(symbol: str = None, timeframe: str = None) -> int:
     """Clear ML labels from database (all or filtered by symbol/timeframe)."""
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return 0
     try:
@@ -204,25 +206,31 @@ def clear_ml_labels(symbol: str = None, timeframe: str = None) -> int:
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return 0
         
+        series = tracked_series(conn, 'ml_training_labels', symbol, timeframe if symbol else None)
+        
+        # Delete from the compact table (rowcount of a view DELETE is always 0)
+        symbol_filter = 'symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)'
         if symbol and timeframe:
             cur.execute(
-                'DELETE FROM ml_training_labels WHERE symbol = ? AND timeframe = ?', 
+                f'DELETE FROM ml_training_labels_c WHERE {symbol_filter} '
+                'AND tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)', 
                 (symbol, timeframe)
             )
         elif symbol:
             cur.execute(
-                'DELETE FROM ml_training_labels WHERE symbol = ?', 
+                f'DELETE FROM ml_training_labels_c WHERE {symbol_filter}', 
                 (symbol,)
             )
         else:
-            cur.execute('DELETE FROM ml_training_labels')
+            cur.execute('DELETE FROM ml_training_labels_c')
         
         count = cur.rowcount
+        refresh_series_stats(conn, 'ml_training_labels', series)
         conn.commit()
         return count
     except Exception as e:
@@ -5,8 +5,10 @@ Functions to save ML labels to database.
 """
 
 import pandas as pd
-from ..connection import get_connection
+from ..connection import get_write_connection
 from .schema import create_ml_labels_table
+from ..compact_schema import get_ids
+from ..table_stats import refresh_series_stats
 
 
 def _safe_float(value, default=0.0):
@@ -55,7 +57,7 @@ def save_ml_labels_to_db(
     Returns:
         Number of rows saved
     """
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         print("Error: No database connection")
         return 0
@@ -151,6 +153,9 @@ def save_ml_labels_to_db(
                 print(f"Error saving row at {idx}: {row_error}")
                 continue
         
+        ids = get_ids(conn, symbol, timeframe)
+        if ids:
+            refresh_series_stats(conn, 'ml_training_labels', [ids])
         conn.commit()
         return rows_saved
     except Exception as e:
@@ -6,32 +6,25 @@ Table creation and dataset export functions.
 
 import streamlit as st
 import pandas as pd
-from ..connection import get_connection
+from ..connection import get_connection, get_write_connection
+from config import LAKE_DIR
+from ..compact_migration import ensure_compact_table
+from ..compact_schema import from_epoch_ms, ts_text
+from ..parquet_lake import read_dataset
+
+LABEL_COLUMNS = ['score_long', 'score_short', 'realized_return_long', 'realized_return_short',
+                 'mfe_long', 'mae_long', 'mfe_short', 'mae_short',
+                 'bars_held_long', 'bars_held_short', 'exit_type_long', 'exit_type_short']
 
 
 def create_ml_labels_table():
     """Create ml_training_labels table if not exists."""
-    conn = get_connection()
+    conn = get_write_connection()
     if not conn:
         return False
     try:
-        cur = conn.cursor()
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS ml_training_labels (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL, timeframe TEXT NOT NULL, timestamp TEXT NOT NULL,
-                open REAL, high REAL, low REAL, close REAL, volume REAL,
-                score_long REAL, realized_return_long REAL, mfe_long REAL, mae_long REAL,
-                bars_held_long INTEGER, exit_type_long TEXT,
-                score_short REAL, realized_return_short REAL, mfe_short REAL, mae_short REAL,
-                bars_held_short INTEGER, exit_type_short TEXT,
-                trailing_stop_pct REAL, max_bars INTEGER, time_penalty_lambda REAL, trading_cost REAL,
-                generated_at TEXT,
-                UNIQUE(symbol, timeframe, timestamp)
-            )
-        ''')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_ml_labels_symbol_tf ON ml_training_labels(symbol, timeframe)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_ml_labels_timestamp ON ml_training_labels(timestamp)')
+        # ml_training_labels is a view over the compact ml_training_labels_c table
+        ensure_compact_table(conn, 'ml_training_labels')
         conn.commit()
         return True
     except Exception as e:
@@ -49,7 +42,7 @@ def get_ml_labels_table_schema():
         return []
     try:
         cur = conn.cursor()
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='ml_training_labels'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='ml_training_labels'")
         if not cur.fetchone():
             return []
         cur.execute("PRAGMA table_info(ml_training_labels)")
@@ -72,7 +65,7 @@ def get_ml_training_dataset(symbol: str = None, timeframe: str = None, symbols:
         
         # Check tables
         for table in ['training_data', 'ml_training_labels']:
-            cur.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
+            cur.execute(f"SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='{table}'")
             if not cur.fetchone():
                 return pd.DataFrame(), {'error': f'{table} not found'}, [f'{table} not found']
         
@@ -81,34 +74,56 @@ def get_ml_training_dataset(symbol: str = None, timeframe: str = None, symbols:
         exclude = {'id', 'symbol', 'timeframe', 'timestamp', 'fetched_at', 'interpolated', 'open', 'high', 'low', 'close', 'volume'}
         indicator_cols = [r[1] for r in cur.fetchall() if r[1] not in exclude]
         ind_select = ', '.join([f'h.{c}' for c in indicator_cols])
-        
-        query = f'''
-            SELECT l.timestamp, l.symbol, l.timeframe, l.open, l.high, l.low, l.close, l.volume,
-                {ind_select},
-                l.score_long, l.score_short, l.realized_return_long, l.realized_return_short,
-                l.mfe_long, l.mae_long, l.mfe_short, l.mae_short,
-                l.bars_held_long, l.bars_held_short, l.exit_type_long, l.exit_type_short
-            FROM ml_training_labels l
-            INNER JOIN training_data h ON l.symbol = h.symbol AND l.timeframe = h.timeframe AND l.timestamp = h.timestamp
-        '''
+        label_select = ', '.join([f'l.{c}' for c in LABEL_COLUMNS])
         
         conditions, params = [], []
         if symbol:
-            conditions.append('l.symbol = ?')
+            conditions.append('s.symbol = ?')
             params.append(symbol)
         elif symbols:
-            conditions.append(f'l.symbol IN ({",".join(["?" for _ in symbols])})')
+            conditions.append(f's.symbol IN ({",".join(["?" for _ in symbols])})')
             params.extend(symbols)
         if timeframe:
-            conditions.append('l.timeframe = ?')
+            conditions.append('t.timeframe = ?')
             params.append(timeframe)
-        if conditions:
-            query += ' WHERE ' + ' AND '.join(conditions)
-        query += ' ORDER BY l.symbol, l.timeframe, l.timestamp'
-        if limit:
-            query += f' LIMIT {int(limit)}'
+        where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+        
+        # Indicators from the Parquet lake (memory-mapped, projected) when it has the timeframe
+        features = None
+        if timeframe and not limit:
+            features = read_dataset(LAKE_DIR, 'training_data', timeframe,
+                                    [symbol] if symbol else symbols, indicator_cols)
+        
+        if features is not None:
+            # Only the narrow label rows come from SQLite
+            labels = pd.read_sql_query(f'''
+                SELECT l.ts AS ts_ms, s.symbol, t.timeframe, l.open, l.high, l.low, l.close, l.volume, {label_select}
+                FROM ml_training_labels_c l
+                JOIN symbol_ids s ON s.id = l.symbol_id
+                JOIN timeframe_ids t ON t.id = l.tf_id
+                {where} ORDER BY s.symbol, l.ts
+            ''', conn, params=params if params else None)
+            labels.insert(0, 'timestamp', from_epoch_ms(labels.pop('ts_ms')))
+            df = labels.merge(features.drop(columns=['timeframe']), on=['symbol', 'timestamp'], how='inner')
+            order = ['timestamp', 'symbol', 'timeframe', 'open', 'high', 'low', 'close', 'volume',
+                     *indicator_cols, *LABEL_COLUMNS]
+            df = df[[c for c in order if c in df.columns]]
+        else:
+            # Join the compact tables on their integer keys
+            query = f'''
+                SELECT {ts_text('l')} AS timestamp, s.symbol, t.timeframe, l.open, l.high, l.low, l.close, l.volume,
+                    {ind_select},
+                    {label_select}
+                FROM ml_training_labels_c l
+                INNER JOIN training_data_c h ON l.symbol_id = h.symbol_id AND l.tf_id = h.tf_id AND l.ts = h.ts
+                JOIN symbol_ids s ON s.id = l.symbol_id
+                JOIN timeframe_ids t ON t.id = l.tf_id
+                {where} ORDER BY s.symbol, t.timeframe, l.ts
+            '''
+            if limit:
+                query += f' LIMIT {int(limit)}'
+            df = pd.read_sql_query(query, conn, params=params if params else None)
         
-        df = pd.read_sql_query(query, conn, params=params if params else None)
         if len(df) == 0:
             return pd.DataFrame(), {'total_rows': 0}, ['No data found']
         
@@ -149,21 +164,23 @@ def get_dataset_availability():
     try:
         cur = conn.cursor()
         for table in ['training_data', 'ml_training_labels']:
-            cur.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
+            cur.execute(f"SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='{table}'")
             if not cur.fetchone():
                 return []
         
         cur.execute('''
-            SELECT COALESCE(h.symbol, l.symbol), COALESCE(h.timeframe, l.timeframe),
-                COALESCE(h.cnt, 0), COALESCE(l.cnt, 0), COALESCE(j.cnt, 0)
-            FROM (SELECT symbol, timeframe, COUNT(*) as cnt FROM training_data GROUP BY symbol, timeframe) h
-            FULL OUTER JOIN (SELECT symbol, timeframe, COUNT(*) as cnt FROM ml_training_labels GROUP BY symbol, timeframe) l
-                ON h.symbol = l.symbol AND h.timeframe = l.timeframe
+            SELECT s.symbol, t.timeframe, COALESCE(h.cnt, 0), COALESCE(l.cnt, 0), COALESCE(j.cnt, 0)
+            FROM (SELECT symbol_id, tf_id, COUNT(*) as cnt FROM training_data_c GROUP BY symbol_id, tf_id) h
+            FULL OUTER JOIN (SELECT symbol_id, tf_id, COUNT(*) as cnt FROM ml_training_labels_c GROUP BY symbol_id, tf_id) l
+                ON h.symbol_id = l.symbol_id AND h.tf_id = l.tf_id
             LEFT JOIN (
-                SELECT h.symbol, h.timeframe, COUNT(*) as cnt FROM training_data h
-                INNER JOIN ml_training_labels l ON h.symbol = l.symbol AND h.timeframe = l.timeframe AND h.timestamp = l.timestamp
-                GROUP BY h.symbol, h.timeframe
-            ) j ON COALESCE(h.symbol, l.symbol) = j.symbol AND COALESCE(h.timeframe, l.timeframe) = j.timeframe
+                SELECT h.symbol_id, h.tf_id, COUNT(*) as cnt FROM training_data_c h
+                INNER JOIN ml_training_labels_c l ON h.symbol_id = l.symbol_id AND h.tf_id = l.tf_id AND h.ts = l.ts
+                GROUP BY h.symbol_id, h.tf_id
+            ) j ON COALESCE(h.symbol_id, l.symbol_id) = j.symbol_id AND COALESCE(h.tf_id, l.tf_id) = j.tf_id
+            JOIN symbol_ids s ON s.id = COALESCE(h.symbol_id, l.symbol_id)
+            JOIN timeframe_ids t ON t.id = COALESCE(h.tf_id, l.tf_id)
+            ORDER BY s.symbol, t.timeframe
         ''')
         return [{'symbol': r[0], 'timeframe': r[1], 'historical': r[2], 'labels': r[3], 'joinable': r[4], 'ready': r[4] > 0} for r in cur.fetchall()]
     except Exception:
@@ -19,7 +19,7 @@ def get_ml_labels_stats():
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return {'exists': False}
@@ -64,7 +64,7 @@ def get_ml_labels_by_symbol():
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return []
@@ -105,7 +105,7 @@ def get_available_symbols_for_labels():
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return []
@@ -129,7 +129,7 @@ def get_ml_labels_inventory():
         
         cur.execute(
             "SELECT name FROM sqlite_master "
-            "WHERE type='table' AND name='ml_training_labels'"
+            "WHERE type IN ('table', 'view') AND name='ml_training_labels'"
         )
         if not cur.fetchone():
             return []
@@ -0,0 +1,37 @@
+"""
+ML signals board
+
+Reads ml_signals_latest, kept by the ml-inference agent in the same
+transaction as the ml_signals history: one row per (symbol, timeframe),
+so the board costs the same however much history has accumulated.
+"""
+
+import streamlit as st
+import pandas as pd
+from .connection import get_connection
+
+SIGNALS_BOARD_VIEW = 'v_ml_signals_latest'  # ml-inference core/signals_latest.py
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_ml_signal_board(timeframe: str = None) -> pd.DataFrame:
+    """
+    Current ML signal of every symbol (cached 30s), best LONG confidence first.
+
+    Empty DataFrame if the ml-inference agent has not created the board yet.
+    """
+    conn = get_connection()
+    if not conn:
+        return pd.DataFrame()
+    try:
+        query = f'SELECT * FROM {SIGNALS_BOARD_VIEW}'
+        params = ()
+        if timeframe:
+            query += ' WHERE timeframe = ?'
+            params = (timeframe,)
+        query += ' ORDER BY confidence_long DESC'
+        return pd.read_sql_query(query, conn, params=params)
+    except Exception:
+        return pd.DataFrame()
+    finally:
+        conn.close()
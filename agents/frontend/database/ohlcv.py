@@ -1,12 +1,18 @@
 """
 OHLCV data access functions
 
-Reads from realtime_ohlcv table (OHLCV + 16 technical indicators)
+Reads from realtime_ohlcv_c (OHLCV + 16 technical indicators, compact
+layout - see database.compact_schema)
 """
 
 import streamlit as st
 import pandas as pd
 from .connection import get_connection
+from .compact_schema import compact_name, from_epoch_ms, get_ids, ms_to_text
+from .table_stats import get_table_summary
+
+REALTIME_TABLE = compact_name('realtime_ohlcv')
+LATEST_VIEW = 'v_latest_candles'  # data-fetcher core/latest_candles.py
 
 # Import from parent config
 import sys
@@ -43,6 +49,60 @@ def get_top_symbols():
         conn.close()
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def get_ticker_snapshot():
+    """Get last price / 24h change / 24h volume per symbol from ticker_snapshot (cached 5min)"""
+    conn = get_connection()
+    if not conn:
+        return {}
+    try:
+        cur = conn.cursor()
+        cur.execute('''
+            SELECT symbol, last_price, change_24h_pct, volume_24h, high_24h, low_24h, fetched_at
+            FROM ticker_snapshot
+        ''')
+        return {
+            row[0]: {
+                'last_price': row[1],
+                'change_24h_pct': row[2],
+                'volume_24h': row[3],
+                'high_24h': row[4],
+                'low_24h': row[5],
+                'fetched_at': row[6]
+            }
+            for row in cur.fetchall()
+        }
+    except Exception:
+        return {}
+    finally:
+        conn.close()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_latest_candles(timeframe=None):
+    """
+    Newest candle + indicators + 24h change of every series (cached 30s).
+    
+    Reads latest_candles, kept by the data-fetcher in the same transaction
+    as realtime_ohlcv: one scan of ~600 rows instead of a query per symbol.
+    Empty DataFrame if the data-fetcher has not created it yet.
+    """
+    conn = get_connection()
+    if not conn:
+        return pd.DataFrame()
+    try:
+        query = f'SELECT * FROM {LATEST_VIEW}'
+        params = ()
+        if timeframe:
+            query += ' WHERE timeframe = ?'
+            params = (timeframe,)
+        return pd.read_sql_query(query, conn, params=params)
+    except Exception:
+        return pd.DataFrame()
+    finally:
+        conn.close()
+
+
 @st.cache_data(ttl=300, show_spinner=False)
 def get_symbols():
     """Get list of distinct symbols ordered by volume (cached 5min)"""
@@ -52,17 +112,22 @@ def get_symbols():
     try:
         cur = conn.cursor()
         # First try to get from top_symbols (ordered by rank = volume)
-        cur.execute('''
+        cur.execute(f'''
             SELECT ts.symbol 
             FROM top_symbols ts
-            INNER JOIN (SELECT DISTINCT symbol FROM realtime_ohlcv) rt ON ts.symbol = rt.symbol
+            INNER JOIN symbol_ids s ON s.symbol = ts.symbol
+            WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE} WHERE symbol_id = s.id)
             ORDER BY ts.rank ASC
         ''')
         symbols = [r[0] for r in cur.fetchall()]
         
         # Fallback to alphabetical if no top_symbols
         if not symbols:
-            cur.execute('SELECT DISTINCT symbol FROM realtime_ohlcv ORDER BY symbol')
+            cur.execute(f'''
+                SELECT symbol FROM symbol_ids
+                WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE} WHERE symbol_id = symbol_ids.id)
+                ORDER BY symbol
+            ''')
             symbols = [r[0] for r in cur.fetchall()]
         
         return symbols
@@ -80,10 +145,13 @@ def get_timeframes(symbol):
         return []
     try:
         cur = conn.cursor()
-        cur.execute(
-            'SELECT DISTINCT timeframe FROM realtime_ohlcv WHERE symbol=? ORDER BY timeframe',
-            (symbol,)
-        )
+        cur.execute(f'''
+            SELECT timeframe FROM timeframe_ids
+            WHERE EXISTS (SELECT 1 FROM {REALTIME_TABLE}
+                         WHERE symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)
+                           AND tf_id = timeframe_ids.id)
+            ORDER BY timeframe
+        ''', (symbol,))
         return [r[0] for r in cur.fetchall()]
     except Exception:
         return []
@@ -91,23 +159,23 @@ def get_timeframes(symbol):
         conn.close()
 
 
-def get_ohlcv(symbol, timeframe, limit=CANDLES_LIMIT):
-    """
-    Get OHLCV data for a symbol and timeframe.
-    Reads from realtime_ohlcv table (includes indicators).
-    """
+def _read_latest_candles(columns, symbol, timeframe, limit):
+    """Last `limit` rows of realtime_ohlcv_c, oldest first, datetime index"""
     conn = get_connection()
     if not conn:
         return pd.DataFrame()
     try:
-        query = '''
-            SELECT timestamp, open, high, low, close, volume
-            FROM realtime_ohlcv WHERE symbol=? AND timeframe=?
-            ORDER BY timestamp DESC LIMIT ?
+        ids = get_ids(conn, symbol, timeframe)
+        if ids is None:
+            return pd.DataFrame()
+        query = f'''
+            SELECT ts AS timestamp, {columns}
+            FROM {REALTIME_TABLE} WHERE symbol_id=? AND tf_id=?
+            ORDER BY ts DESC LIMIT ?
         '''
-        df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
+        df = pd.read_sql_query(query, conn, params=(*ids, limit))
         if len(df) > 0:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = from_epoch_ms(df['timestamp'])
             df = df.sort_values('timestamp')
             df.set_index('timestamp', inplace=True)
         return df
@@ -117,35 +185,27 @@ def get_ohlcv(symbol, timeframe, limit=CANDLES_LIMIT):
         conn.close()
 
 
+def get_ohlcv(symbol, timeframe, limit=CANDLES_LIMIT):
+    """
+    Get OHLCV data for a symbol and timeframe.
+    Reads from realtime_ohlcv_c (includes indicators).
+    """
+    return _read_latest_candles('open, high, low, close, volume', symbol, timeframe, limit)
+
+
 def get_ohlcv_with_indicators(symbol, timeframe, limit=CANDLES_LIMIT):
     """
     Get OHLCV data WITH all pre-calculated indicators.
     Returns DataFrame with OHLCV + 16 indicator columns.
     """
-    conn = get_connection()
-    if not conn:
-        return pd.DataFrame()
-    try:
-        query = '''
-            SELECT timestamp, open, high, low, close, volume,
-                   sma_20, sma_50, ema_12, ema_26,
-                   bb_upper, bb_mid, bb_lower,
-                   macd, macd_signal, macd_hist,
-                   rsi, stoch_k, stoch_d, atr,
-                   volume_sma, obv
-            FROM realtime_ohlcv WHERE symbol=? AND timeframe=?
-            ORDER BY timestamp DESC LIMIT ?
-        '''
-        df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
-        if len(df) > 0:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            df.set_index('timestamp', inplace=True)
-        return df
-    except Exception:
-        return pd.DataFrame()
-    finally:
-        conn.close()
+    return _read_latest_candles('''
+        open, high, low, close, volume,
+        sma_20, sma_50, ema_12, ema_26,
+        bb_upper, bb_mid, bb_lower,
+        macd, macd_signal, macd_hist,
+        rsi, stoch_k, stoch_d, atr,
+        volume_sma, obv
+    ''', symbol, timeframe, limit)
 
 
 @st.cache_data(ttl=30, show_spinner=False)
@@ -156,12 +216,18 @@ def get_stats():
         return {}
     try:
         cur = conn.cursor()
-        cur.execute('''
-            SELECT COUNT(DISTINCT symbol), COUNT(DISTINCT timeframe), 
-                   COUNT(*), MAX(timestamp)
-            FROM realtime_ohlcv
-        ''')
-        r = cur.fetchone()
+        # Counts and last candle from the table_stats counters (one row per series)
+        summary = get_table_summary(conn, 'realtime_ohlcv')
+        if summary is not None:
+            r = (summary['symbols'], summary['timeframes'], summary['rows'], summary['max_date'])
+        else:
+            cur.execute(f'''
+                SELECT COUNT(DISTINCT symbol_id), COUNT(DISTINCT tf_id), 
+                       COUNT(*), MAX(ts)
+                FROM {REALTIME_TABLE}
+            ''')
+            row = cur.fetchone()
+            r = (row[0], row[1], row[2], ms_to_text(row[3]))
         
         # Top symbols info
         cur.execute('SELECT COUNT(*), MIN(fetched_at) FROM top_symbols')
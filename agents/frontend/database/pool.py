@@ -0,0 +1,234 @@
+"""
+SQLite connection pool
+
+Streamlit reruns call get_connection() dozens of times; opening a fresh
+connection (and re-issuing the pragmas) every time costs more than most of
+the queries. The pool keeps, per process:
+
+- one read-only connection per thread (mode=ro, query_only, large page
+  cache and mmap), reused across calls and closed when its thread is gone
+- one writer connection shared by all threads, handed out under a
+  re-entrant lock so writes are serialized inside the process
+
+Connections handed out by the pool keep the sqlite3 API; close() returns
+them to the pool instead of closing them. Every statement is timed per
+SQL text (see query_stats()) for the debug panel.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+MAX_TRACKED_QUERIES = 500
+
+
+class QueryStats:
+    """Per-statement call count and timings (execute + fetch)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[tuple, List[float]] = {}
+
+    def record(self, mode: str, sql: str, elapsed: float, calls: int = 1):
+        key = (mode, re.sub(r'\s+', ' ', sql).strip()[:300])
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= MAX_TRACKED_QUERIES:
+                    key = (mode, '(other)')
+                entry = self._stats.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += calls
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+
+    def snapshot(self) -> List[Dict]:
+        """Statements sorted by total time"""
+        with self._lock:
+            items = [(key, list(entry)) for key, entry in self._stats.items()]
+        rows = [
+            {'mode': mode, 'sql': sql, 'calls': calls, 'total_ms': total * 1000,
+             'avg_ms': total * 1000 / calls if calls else 0.0, 'max_ms': worst * 1000}
+            for (mode, sql), (calls, total, worst) in items
+        ]
+        return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports execute and fetch time to the pool statistics"""
+
+    _sql = ''
+
+    def _record(self, elapsed: float, calls: int = 1):
+        conn = self.connection
+        conn.stats.record(conn.mode, self._sql, elapsed, calls)
+
+    def execute(self, sql, parameters=()):
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._record(time.perf_counter() - start, calls=0)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._record(time.perf_counter() - start, calls=0)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection owned by a ConnectionPool (close() releases it)"""
+
+    pool = None
+    mode = 'ro'
+    stats = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def _dispose(self):
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Per-thread read-only connections plus one shared writer for one database.
+
+    Args:
+        db_path: SQLite file
+        timeout: Seconds to wait on a locked database
+        read_cache_mb: Page cache of each reader
+        mmap_mb: Memory-mapped I/O size of each reader
+        on_first_write: Called once with the writer before it is first handed
+            out (schema creation / migrations)
+    """
+
+    def __init__(self, db_path: str, timeout: int = 30, read_cache_mb: int = 64, mmap_mb: int = 256,
+                 on_first_write: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.read_cache_mb = read_cache_mb
+        self.mmap_mb = mmap_mb
+        self.on_first_write = on_first_write
+        self.stats = QueryStats()
+        self._readers: Dict[int, PooledConnection] = {}
+        self._readers_lock = threading.Lock()
+        self._writer: Optional[PooledConnection] = None
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+
+    def _open(self, mode: str) -> PooledConnection:
+        if mode == 'ro':
+            conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, timeout=self.timeout,
+                                   check_same_thread=False, factory=PooledConnection)
+            conn.mode, conn.stats = mode, self.stats
+            conn.execute('PRAGMA query_only=ON')
+            conn.execute(f'PRAGMA cache_size=-{self.read_cache_mb * 1024}')
+            conn.execute(f'PRAGMA mmap_size={self.mmap_mb * 1024 * 1024}')
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                   check_same_thread=False, factory=PooledConnection)
+            conn.mode, conn.stats = mode, self.stats
+            # WAL lets the per-thread readers run while the writer holds its lock
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={self.timeout * 1000}')
+        return conn
+
+    def reader(self) -> PooledConnection:
+        """Read-only connection of the calling thread"""
+        ident = threading.get_ident()
+        conn = self._readers.get(ident)
+        if conn is None:
+            conn = self._open('ro')
+            with self._readers_lock:
+                self._prune_readers()
+                self._readers[ident] = conn
+            conn.pool = self
+        return conn
+
+    def _prune_readers(self):
+        """Close the readers of finished threads (Streamlit runs each rerun in a new thread)"""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [i for i in self._readers if i not in alive]:
+            self._readers.pop(ident)._dispose()
+
+    def writer(self) -> PooledConnection:
+        """The shared writer; the calling thread holds it until close()"""
+        self._write_lock.acquire()
+        try:
+            if self._writer is None:
+                conn = self._open('rw')
+                if self.on_first_write:
+                    try:
+                        self.on_first_write(conn)
+                    except BaseException:
+                        conn._dispose()
+                        raise
+                conn.pool = self
+                self._writer = conn
+        except BaseException:
+            self._write_lock.release()
+            raise
+        self._write_depth += 1
+        return self._writer
+
+    def release(self, conn: PooledConnection):
+        """close() of a pooled connection: readers stay open, the writer is unlocked"""
+        if conn is not self._writer or self._write_depth == 0:
+            return
+        if self._write_depth == 1 and conn.in_transaction:
+            # Same outcome as closing a connection with uncommitted changes
+            conn.rollback()
+        self._write_depth -= 1
+        self._write_lock.release()
+
+    def close_all(self):
+        """Close every pooled connection (tests / shutdown)"""
+        with self._readers_lock:
+            for conn in self._readers.values():
+                conn._dispose()
+            self._readers.clear()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer._dispose()
+                self._writer = None
+
+    def reader_count(self) -> int:
+        return len(self._readers)
@@ -0,0 +1,183 @@
+"""
+Training data lake access (Parquet first, SQLite fallback)
+
+Bulk readers for training, explorers and the label optimizer: one
+timeframe at a time, only the requested columns, memory-mapped from the
+Parquet lake when it exists and from the compact tables otherwise.
+
+Datasets:
+- training_data: OHLCV + indicators, exported by historical-data
+- xgb_training: v_xgb_training rows (features + ATR labels), exported by
+  the labeling pipeline after each run
+
+refresh_stale_xgb_training() re-materializes (and re-exports) the
+v_xgb_training series whose features changed without a labeling run.
+"""
+
+import logging
+
+import pandas as pd
+
+from config import LAKE_DIR
+from .compact_schema import epoch_ms, from_epoch_ms, series_filter
+from .connection import get_connection, get_write_connection
+from .parquet_lake import PARQUET_AVAILABLE, drop_series, read_dataset, write_series
+from .xgb_view import XGB_TABLE, XGB_VIEW, create_xgb_view, refresh_xgb_training, xgb_training_stale
+
+TRAINING_DATASET = 'training_data'
+XGB_DATASET = 'xgb_training'
+
+
+def _read_sqlite(timeframe: str, symbols=None, columns=None, start=None, end=None) -> pd.DataFrame:
+    """Same frame as read_dataset(), from training_data_c"""
+    conn = get_connection()
+    if not conn:
+        return pd.DataFrame()
+    try:
+        select = ', '.join(f'd.{c}' for c in columns) if columns else 'd.*'
+        query = f'''
+            SELECT d.ts AS ts_ms, s.symbol, {select} FROM training_data_c d
+            JOIN symbol_ids s ON s.id = d.symbol_id
+            WHERE d.tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
+        '''
+        params = [timeframe]
+        if symbols is not None:
+            query += f' AND s.symbol IN ({",".join("?" for _ in symbols)})'
+            params.extend(symbols)
+        if start is not None:
+            query += ' AND d.ts >= ?'
+            params.append(epoch_ms(start))
+        if end is not None:
+            query += ' AND d.ts <= ?'
+            params.append(epoch_ms(end))
+        df = pd.read_sql_query(query + ' ORDER BY s.symbol, d.ts', conn, params=params)
+        df = df.drop(columns=[c for c in ('symbol_id', 'tf_id', 'ts') if c in df.columns])
+        df.insert(0, 'timestamp', from_epoch_ms(df.pop('ts_ms')))
+        df.insert(2, 'timeframe', timeframe)
+        return df
+    finally:
+        conn.close()
+
+
+def load_training_frame(timeframe: str, symbols=None, columns=None, start=None, end=None,
+                        dataset: str = TRAINING_DATASET) -> pd.DataFrame:
+    """
+    Load OHLCV + indicators (or xgb_training rows) for one timeframe.
+
+    Returns:
+        DataFrame (timestamp, symbol, timeframe, columns...) sorted by
+        symbol, timestamp. Lake values are float32.
+    """
+    if dataset == XGB_DATASET:
+        refresh_stale_xgb_training(timeframe)
+    df = read_dataset(LAKE_DIR, dataset, timeframe, symbols, columns, start, end)
+    if df is not None:
+        return df
+    if dataset == XGB_DATASET:
+        return pd.DataFrame()
+    return _read_sqlite(timeframe, symbols, columns, start, end)
+
+
+def export_xgb_training(timeframe: str, symbols: list, replace_all: bool = False) -> int:
+    """
+    Mirror v_xgb_training rows of the given symbols into the lake.
+
+    With replace_all=True the timeframe is cleared first (a full labeling
+    run recreates training_labels, so symbols not relabeled are gone).
+
+    Returns:
+        Number of month files written (0 without pyarrow)
+    """
+    if not PARQUET_AVAILABLE or not symbols:
+        return 0
+    conn = get_connection()
+    if not conn:
+        return 0
+    written = 0
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='view' AND name=?", (XGB_VIEW,)).fetchone():
+            _build_xgb_view()
+        if replace_all:
+            drop_series(LAKE_DIR, XGB_DATASET, timeframe=timeframe)
+        # Series reads and Parquet I/O on the thread's reader: dashboard writes never wait on them
+        for symbol in symbols:
+            # Range scan of the materialized table in key order
+            df = pd.read_sql_query(
+                f'SELECT * FROM {XGB_TABLE} x WHERE {series_filter("x")} ORDER BY x.ts',
+                conn, params=(symbol, timeframe)
+            )
+            df.index = from_epoch_ms(df.pop('ts')).rename('timestamp')
+            df = df.drop(columns=['symbol_id', 'tf_id', 'generation'])
+            written += write_series(LAKE_DIR, XGB_DATASET, symbol, timeframe, df, replace=True)
+    except Exception as e:
+        logging.warning(f"Parquet lake export of {XGB_DATASET}/{timeframe} failed: {e}")
+    finally:
+        conn.close()
+    return written
+
+
+def _build_xgb_view():
+    """One-off creation and first materialization of v_xgb_training (the only export step that writes)"""
+    conn = get_write_connection()
+    try:
+        with conn:
+            create_xgb_view(conn)
+        refresh_xgb_training(conn)
+    finally:
+        conn.close()
+
+
+def refresh_stale_xgb_training(timeframe: str = None) -> bool:
+    """
+    Refresh v_xgb_training if a backfill or a clear changed its features
+    since the last labeling run, and mirror the changed series into the lake.
+
+    The check runs on the thread's reader; the writer is taken only when
+    something is stale.
+
+    Returns:
+        True if series were refreshed
+    """
+    conn = get_connection()
+    if not conn:
+        return False
+    try:
+        stale = xgb_training_stale(conn, timeframe)
+    finally:
+        conn.close()
+    if not stale:
+        return False
+
+    conn = get_write_connection()
+    if not conn:
+        return False
+    try:
+        result = refresh_xgb_training(conn, timeframe)
+    except Exception as e:
+        logging.warning(f"xgb_training refresh failed: {e}")
+        return False
+    finally:
+        conn.close()
+
+    by_timeframe = {}
+    for symbol, tf in result['series']:
+        by_timeframe.setdefault(tf, []).append(symbol)
+    for tf, symbols in by_timeframe.items():
+        export_xgb_training(tf, symbols)
+    return True
+
+
+def drop_training_lake(dataset: str = None):
+    """Remove one lake dataset, or both"""
+    for name in ([dataset] if dataset else [TRAINING_DATASET, XGB_DATASET]):
+        drop_series(LAKE_DIR, name)
+
+
+__all__ = [
+    'TRAINING_DATASET',
+    'XGB_DATASET',
+    'load_training_frame',
+    'export_xgb_training',
+    'refresh_stale_xgb_training',
+    'drop_training_lake',
+]
@@ -0,0 +1,266 @@
+"""
+v_xgb_training VIEW (OHLCV + indicators + ATR labels)
+
+The join of training_data and training_labels is materialized in
+xgb_training_c (WITHOUT ROWID, keyed like the other compact tables) and
+v_xgb_training is a thin view over it, so readers range-scan one table
+instead of re-running the join.
+
+refresh_xgb_training() rebuilds only the series whose features or labels
+changed since the last refresh. Every refresh that changes something
+takes a new generation number; xgb_training_state records, per series,
+the generation, the source signatures and the row count (0 for series
+whose labels were removed). Readers call xgb_training_stale() (a few
+primary-key seeks per series) to catch feature changes made without a
+labeling run.
+
+connection.py upgrades a view created before the materialized table.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from .compact_schema import ts_text
+
+XGB_VIEW = 'v_xgb_training'
+XGB_TABLE = 'xgb_training_c'
+XGB_STATE = 'xgb_training_state'
+
+# (materialized column, training_data_c column) - 5 OHLCV + 16 indicators
+FEATURE_COLUMNS: List[Tuple[str, str]] = [
+    ('open', 'open'), ('high', 'high'), ('low', 'low'), ('close', 'close'), ('volume', 'volume'),
+    ('sma_20', 'sma_20'), ('sma_50', 'sma_50'), ('ema_12', 'ema_12'), ('ema_26', 'ema_26'),
+    # bb_mid is the actual column name
+    ('bb_upper', 'bb_upper'), ('bb_middle', 'bb_mid'), ('bb_lower', 'bb_lower'),
+    ('rsi', 'rsi'), ('macd', 'macd'), ('macd_signal', 'macd_signal'), ('macd_hist', 'macd_hist'),
+    ('stoch_k', 'stoch_k'), ('stoch_d', 'stoch_d'),
+    ('atr', 'atr'), ('volume_sma', 'volume_sma'), ('obv', 'obv'),
+]
+
+LABEL_COLUMNS: List[Tuple[str, str]] = [
+    ('score_long', 'REAL'), ('score_short', 'REAL'),
+    ('realized_return_long', 'REAL'), ('realized_return_short', 'REAL'),
+    ('mfe_long', 'REAL'), ('mfe_short', 'REAL'), ('mae_long', 'REAL'), ('mae_short', 'REAL'),
+    ('bars_held_long', 'INTEGER'), ('bars_held_short', 'INTEGER'),
+    ('exit_type_long', 'TEXT'), ('exit_type_short', 'TEXT'),
+    ('atr_pct', 'REAL'),
+]
+
+_VALUE_COLUMNS = [name for name, _ in FEATURE_COLUMNS] + [name for name, _ in LABEL_COLUMNS]
+
+XGB_TABLE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {XGB_TABLE} (
+        symbol_id INTEGER NOT NULL,
+        tf_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        {', '.join(f'{name} REAL' for name, _ in FEATURE_COLUMNS)},
+        {', '.join(f'{name} {kind}' for name, kind in LABEL_COLUMNS)},
+        generation INTEGER NOT NULL,
+        PRIMARY KEY (symbol_id, tf_id, ts)
+    ) WITHOUT ROWID
+'''
+
+XGB_STATE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {XGB_STATE} (
+        symbol_id INTEGER NOT NULL,
+        tf_id INTEGER NOT NULL,
+        generation INTEGER NOT NULL,
+        features_sig TEXT,
+        labels_sig TEXT,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        refreshed_at TEXT,
+        PRIMARY KEY (symbol_id, tf_id)
+    ) WITHOUT ROWID
+'''
+
+# Same columns (and order) as the v1 join view
+XGB_VIEW_SQL = f'''
+    CREATE VIEW {XGB_VIEW} AS
+    SELECT
+        s.symbol, t.timeframe, {ts_text('x')} AS timestamp,
+        {', '.join(f'x.{name}' for name in _VALUE_COLUMNS)}
+    FROM {XGB_TABLE} x
+    JOIN symbol_ids s ON s.id = x.symbol_id
+    JOIN timeframe_ids t ON t.id = x.tf_id
+'''
+
+# One series: join the compact tables on their integer keys
+REFRESH_INSERT_SQL = f'''
+    INSERT INTO {XGB_TABLE} (symbol_id, tf_id, ts, {', '.join(_VALUE_COLUMNS)}, generation)
+    SELECT l.symbol_id, l.tf_id, l.ts,
+           {', '.join(f'd.{source}' for _, source in FEATURE_COLUMNS)},
+           {', '.join(f'l.{name}' for name, _ in LABEL_COLUMNS)},
+           ?
+    FROM training_labels_c l
+    JOIN training_data_c d ON d.symbol_id = l.symbol_id AND d.tf_id = l.tf_id AND d.ts = l.ts
+    WHERE l.symbol_id = ? AND l.tf_id = ?
+'''
+
+# Series that have labels (primary-key probes, no table scan)
+LABELED_SERIES_SQL = '''
+    SELECT s.id, t.id, s.symbol, t.timeframe FROM symbol_ids s, timeframe_ids t
+    WHERE EXISTS (SELECT 1 FROM training_labels_c WHERE symbol_id = s.id AND tf_id = t.id)
+'''
+
+
+def ensure_xgb_tables(conn: sqlite3.Connection):
+    """Create the materialized table and its state table (caller commits)"""
+    conn.execute(XGB_TABLE_SQL)
+    conn.execute(XGB_STATE_SQL)
+
+
+def create_xgb_view(conn: sqlite3.Connection):
+    """(Re)create v_xgb_training over the materialized table (caller commits)"""
+    ensure_xgb_tables(conn)
+    conn.execute(f'DROP VIEW IF EXISTS {XGB_VIEW}')
+    conn.execute(XGB_VIEW_SQL)
+
+
+def get_generation(conn: sqlite3.Connection) -> int:
+    """Latest generation of xgb_training_c (0 = never refreshed)"""
+    try:
+        return conn.execute(f'SELECT COALESCE(MAX(generation), 0) FROM {XGB_STATE}').fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+
+
+def _range_sig(conn: sqlite3.Connection, table: str, symbol_id: int, tf_id: int) -> str:
+    """First and last timestamp of one series (two primary-key seeks)"""
+    # Separate subqueries: SQLite only optimizes a lone MIN() or MAX() into a seek
+    series = f'FROM {table} WHERE symbol_id = ? AND tf_id = ?'
+    low, high = conn.execute(
+        f'SELECT (SELECT MIN(ts) {series}), (SELECT MAX(ts) {series})', (symbol_id, tf_id) * 2
+    ).fetchone()
+    return f'{low}|{high}'
+
+
+def _features_sig(conn: sqlite3.Connection, symbol_id: int, tf_id: int, symbol: str, timeframe: str) -> str:
+    """Feature range plus the backfill bookkeeping historical-data updates on every save"""
+    sig = _range_sig(conn, 'training_data_c', symbol_id, tf_id)
+    try:
+        row = conn.execute(
+            'SELECT last_update, total_candles FROM backfill_status WHERE symbol = ? AND timeframe = ?',
+            (symbol, timeframe)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    return f'{sig}|{row[0]}|{row[1]}' if row else sig
+
+
+def _pending_series(conn: sqlite3.Connection, timeframe: str = None, force: Iterable[str] = ()) -> Tuple[list, list]:
+    """
+    Series whose materialized rows no longer match their sources (no writes).
+
+    Returns:
+        Tuple of (series to rebuild as (symbol_id, tf_id, symbol, timeframe,
+        features_sig, labels_sig), series to empty as (symbol_id, tf_id))
+    """
+    force = set(force)
+    state = {
+        (sid, tid): (fsig, lsig, rows)
+        for sid, tid, fsig, lsig, rows in conn.execute(
+            f'SELECT symbol_id, tf_id, features_sig, labels_sig, row_count FROM {XGB_STATE}'
+        )
+    }
+    labeled = conn.execute(LABELED_SERIES_SQL).fetchall()
+
+    rebuild = []
+    for sid, tid, symbol, tf in labeled:
+        if timeframe is not None and tf != timeframe:
+            continue
+        fsig = _features_sig(conn, sid, tid, symbol, tf)
+        lsig = _range_sig(conn, 'training_labels_c', sid, tid)
+        previous = state.get((sid, tid))
+        if symbol not in force and previous and previous[:2] == (fsig, lsig):
+            continue
+        rebuild.append((sid, tid, symbol, tf, fsig, lsig))
+
+    labeled_keys = {(sid, tid) for sid, tid, _, _ in labeled}
+    remove = [key for key, (_, _, rows) in state.items() if rows and key not in labeled_keys]
+    return rebuild, remove
+
+
+def xgb_training_stale(conn: sqlite3.Connection, timeframe: str = None) -> bool:
+    """
+    True when a refresh would change xgb_training_c (read-only check).
+
+    Features are rewritten by historical-data backfills and cleared from the
+    dashboard without a labeling run, so readers check before trusting it.
+    """
+    try:
+        rebuild, remove = _pending_series(conn, timeframe)
+    except sqlite3.OperationalError:
+        return False  # Never materialized (no xgb_training_state yet)
+    return bool(rebuild or remove)
+
+
+def refresh_xgb_training(
+    conn: sqlite3.Connection,
+    timeframe: str = None,
+    force_symbols: Iterable[str] = (),
+    now: datetime = None
+) -> Dict:
+    """
+    Bring xgb_training_c up to date.
+
+    Every labeled series (of `timeframe`, or all) is compared with its
+    recorded signatures; changed series and the series of `force_symbols`
+    (labels rewritten over the same range) are rebuilt. Series of any
+    timeframe whose labels are gone are emptied. Each series is rebuilt in
+    its own transaction.
+
+    Returns:
+        Dict with generation, refreshed, removed, rows and series (the
+        (symbol, timeframe) pairs rebuilt or emptied)
+    """
+    with conn:
+        ensure_xgb_tables(conn)
+    now = (now or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+    generation = get_generation(conn) + 1
+    result = {'generation': generation - 1, 'refreshed': 0, 'removed': 0, 'rows': 0, 'series': []}
+    rebuild, remove = _pending_series(conn, timeframe, force_symbols)
+
+    for sid, tid, symbol, tf, fsig, lsig in rebuild:
+        with conn:
+            conn.execute(f'DELETE FROM {XGB_TABLE} WHERE symbol_id = ? AND tf_id = ?', (sid, tid))
+            rows = conn.execute(REFRESH_INSERT_SQL, (generation, sid, tid)).rowcount
+            conn.execute(f'INSERT OR REPLACE INTO {XGB_STATE} VALUES (?, ?, ?, ?, ?, ?, ?)',
+                         (sid, tid, generation, fsig, lsig, rows, now))
+        result['refreshed'] += 1
+        result['rows'] += rows
+        result['series'].append((symbol, tf))
+
+    for sid, tid in remove:
+        with conn:
+            conn.execute(f'DELETE FROM {XGB_TABLE} WHERE symbol_id = ? AND tf_id = ?', (sid, tid))
+            conn.execute(f'UPDATE {XGB_STATE} SET generation = ?, features_sig = NULL, labels_sig = NULL, '
+                         f'row_count = 0, refreshed_at = ? WHERE symbol_id = ? AND tf_id = ?',
+                         (generation, now, sid, tid))
+        result['removed'] += 1
+        result['series'].append(conn.execute(
+            'SELECT s.symbol, t.timeframe FROM symbol_ids s, timeframe_ids t WHERE s.id = ? AND t.id = ?',
+            (sid, tid)
+        ).fetchone())
+
+    if result['refreshed'] or result['removed']:
+        result['generation'] = generation
+        logging.info(f"xgb_training generation {generation}: {result['refreshed']} series rebuilt "
+                     f"({result['rows']:,} rows), {result['removed']} removed")
+    return result
+
+
+def upgrade_xgb_view(conn: sqlite3.Connection) -> bool:
+    """Replace a live-join v_xgb_training with the materialized table (one-off full build)"""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='view' AND name=?", (XGB_VIEW,)
+    ).fetchone()
+    if not row or XGB_TABLE in row[0]:
+        return False
+    with conn:
+        ensure_xgb_tables(conn)
+    refresh_xgb_training(conn)
+    with conn:
+        create_xgb_view(conn)
+    return True
@@ -19,11 +19,15 @@ from .models import (
     RETRY_DELAY_BASE,
     CACHE_TTL_SECONDS,
     EXCHANGE_RECONNECT_INTERVAL,
+    RATE_LIMIT_MARKET_SHARE,
 )
 
 # Decorators
 from .decorators import retry_with_backoff
 
+# Rate limiting
+from .rate_limiter import BybitRateLimiter, get_rate_limiter
+
 # Service class
 from .service import BybitService
 
@@ -45,10 +49,15 @@ __all__ = [
     'RETRY_DELAY_BASE',
     'CACHE_TTL_SECONDS',
     'EXCHANGE_RECONNECT_INTERVAL',
+    'RATE_LIMIT_MARKET_SHARE',
     
     # Decorators
     'retry_with_backoff',
     
+    # Rate limiting
+    'BybitRateLimiter',
+    'get_rate_limiter',
+    
     # Service
     'BybitService',
     
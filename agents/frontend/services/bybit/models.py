@@ -13,6 +13,7 @@ MAX_RETRIES = 3
 RETRY_DELAY_BASE = 1.0  # Base delay in seconds (exponential backoff)
 CACHE_TTL_SECONDS = 15  # Cache balance/positions for 15 seconds
 EXCHANGE_RECONNECT_INTERVAL = 300  # Force reconnect every 5 minutes
+RATE_LIMIT_MARKET_SHARE = 0.1  # Share of the per-IP market data budget (data agents use the rest)
 
 
 @dataclass
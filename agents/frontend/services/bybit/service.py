@@ -15,9 +15,11 @@ except ImportError:
 
 from .models import (
     BalanceInfo, PositionInfo, OrderResult, CachedData,
-    API_TIMEOUT_MS, MAX_RETRIES, RETRY_DELAY_BASE, EXCHANGE_RECONNECT_INTERVAL
+    API_TIMEOUT_MS, MAX_RETRIES, RETRY_DELAY_BASE, EXCHANGE_RECONNECT_INTERVAL,
+    RATE_LIMIT_MARKET_SHARE
 )
 from .decorators import retry_with_backoff
+from .rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -30,8 +32,9 @@ class BybitService:
     - Automatic timeout on all API calls
     - Retry with exponential backoff
     - Response caching to reduce API calls
-    - Automatic exchange reconnection
+    - Automatic exchange reconnection (keeps the keep-alive HTTP session)
     - Thread-safe operations
+    - Per-endpoint rate limits with adaptive backoff (rate_limiter)
     """
     
     def __init__(self, api_key: str = None, api_secret: str = None):
@@ -41,6 +44,7 @@ class BybitService:
         self._exchange_created_at: Optional[datetime] = None
         self._initialized = False
         self._lock = threading.Lock()
+        self._limiter = get_rate_limiter(RATE_LIMIT_MARKET_SHARE)
         
         self._balance_cache: Optional[CachedData] = None
         self._positions_cache: Optional[CachedData] = None
@@ -57,7 +61,7 @@ class BybitService:
         age = (datetime.now() - self._exchange_created_at).total_seconds()
         return age > EXCHANGE_RECONNECT_INTERVAL
     
-    def _create_exchange(self) -> Optional['ccxt.bybit']:
+    def _create_exchange(self, session=None) -> Optional['ccxt.bybit']:
         if ccxt is None:
             logger.error("❌ CCXT library not installed")
             return None
@@ -65,14 +69,17 @@ class BybitService:
             return None
         
         try:
-            exchange = ccxt.bybit({
+            exchange_config = {
                 'apiKey': self.api_key,
                 'secret': self.api_secret,
                 'enableRateLimit': True,
                 'timeout': API_TIMEOUT_MS,
                 'options': {'adjustForTimeDifference': True, 'recvWindow': 60000},
                 'rateLimit': 100,
-            })
+            }
+            if session is not None:
+                exchange_config['session'] = session  # Reuse keep-alive connections
+            exchange = ccxt.bybit(exchange_config)
             logger.info("✅ Bybit exchange initialized with timeout=%dms", API_TIMEOUT_MS)
             return exchange
         except Exception as e:
@@ -83,7 +90,8 @@ class BybitService:
         with self._lock:
             if force_reconnect or self._should_reconnect():
                 logger.info("🔄 Reconnecting to Bybit exchange...")
-                self._exchange = self._create_exchange()
+                session = getattr(self._exchange, 'session', None)
+                self._exchange = self._create_exchange(session)
                 self._exchange_created_at = datetime.now() if self._exchange else None
                 self._initialized = self._exchange is not None
             return self._exchange
@@ -125,7 +133,7 @@ class BybitService:
             raise Exception("Exchange not initialized")
         
         try:
-            balance_data = exchange.fetch_balance()
+            balance_data = self._limiter.call_sync('account', exchange.fetch_balance)
             usdt_total, usdt_free, usdt_used = 0.0, 0.0, 0.0
             
             if 'USDT' in balance_data:
@@ -177,7 +185,7 @@ class BybitService:
             raise Exception("Exchange not initialized")
         
         try:
-            positions_data = exchange.fetch_positions()
+            positions_data = self._limiter.call_sync('account', exchange.fetch_positions)
             positions = []
             for pos in positions_data:
                 contracts = float(pos.get('contracts', 0) or 0)
@@ -240,7 +248,7 @@ class BybitService:
         position_idx = 0
         
         if position_side is None:
-            positions = exchange.fetch_positions([symbol])
+            positions = self._limiter.call_sync('account', exchange.fetch_positions, [symbol])
             for pos in positions:
                 if pos.get('symbol') == symbol and float(pos.get('contracts', 0)) != 0:
                     position_side = pos.get('side', '').lower()
@@ -254,7 +262,7 @@ class BybitService:
         if take_profit:
             params['takeProfit'] = str(take_profit)
         
-        result = exchange.private_post_v5_position_trading_stop(params)
+        result = self._limiter.call_sync('order', exchange.private_post_v5_position_trading_stop, params)
         ret_code = result.get('retCode', -1)
         ret_msg = result.get('retMsg', 'Unknown response')
         
@@ -285,18 +293,18 @@ class BybitService:
             raise Exception("Exchange not initialized")
         
         try:
-            exchange.set_leverage(leverage, symbol)
+            self._limiter.call_sync('order', exchange.set_leverage, leverage, symbol)
             logger.info(f"⚡ Leverage set to {leverage}x for {symbol}")
         except Exception as e:
             logger.warning(f"⚠️ Could not set leverage: {e}")
         
         params = {}
         if order_type == 'market':
-            order = exchange.create_market_order(symbol, side, amount, params=params)
+            order = self._limiter.call_sync('order', exchange.create_market_order, symbol, side, amount, params=params)
         else:
             if price is None:
                 return OrderResult(success=False, order_id=None, symbol=symbol, side=side, amount=amount, price=None, error="Price required for limit orders")
-            order = exchange.create_limit_order(symbol, side, amount, price, params=params)
+            order = self._limiter.call_sync('order', exchange.create_limit_order, symbol, side, amount, price, params=params)
         
         order_id = order.get('id')
         fill_price = float(order.get('average', 0) or order.get('price', 0) or 0)
@@ -331,5 +339,5 @@ class BybitService:
         exchange = self._get_exchange()
         if exchange is None:
             return None
-        ticker = exchange.fetch_ticker(symbol)
+        ticker = self._limiter.call_sync('market', exchange.fetch_ticker, symbol)
         return float(ticker.get('last', 0) or 0)
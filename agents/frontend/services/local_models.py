@@ -16,6 +16,8 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from database import get_connection
+from database.compact_schema import series_filter, ts_text
 from services.feature_alignment import align_features_dataframe
 from services.xgb_normalization import normalize_long_short_scores
 
@@ -26,16 +28,21 @@ class InferenceDataNotFoundError(RuntimeError):
 
 def list_realtime_symbols(timeframe: str) -> List[str]:
     """List available symbols in the realtime_ohlcv table for a timeframe."""
-    import sqlite3
-
-    db_path = _get_realtime_db_path()
-    if not Path(db_path).exists():
+    conn = get_connection()
+    if not conn:
         return []
 
     try:
-        conn = sqlite3.connect(db_path, timeout=30)
         rows = conn.execute(
-            "SELECT DISTINCT symbol FROM realtime_ohlcv WHERE timeframe = ? ORDER BY symbol ASC",
+            """
+            SELECT symbol FROM symbol_ids
+            WHERE EXISTS (
+                SELECT 1 FROM realtime_ohlcv_c
+                WHERE symbol_id = symbol_ids.id
+                  AND tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
+            )
+            ORDER BY symbol ASC
+            """,
             (timeframe,),
         ).fetchall()
         return [r[0] for r in rows]
@@ -239,8 +246,6 @@ def run_inference(
     Returns:
         DataFrame with timestamp, ohlcv, raw scores, normalized scores and signal.
     """
-    import sqlite3
-    
     # Load models
     model_long, model_short, scaler = load_models(timeframe)
     if model_long is None:
@@ -253,29 +258,27 @@ def run_inference(
     
     feature_names = meta.feature_names
     
-    # Connect to real-time database (trading_data.db)
-    db_path = _get_realtime_db_path()
-    if not Path(db_path).exists():
-        print(f"Real-time database not found: {db_path}")
+    # Pooled read-only connection to the real-time database (trading_data.db)
+    conn = get_connection()
+    if not conn:
+        print(f"Real-time database not found: {_get_realtime_db_path()}")
         return None
     
-    conn = None
     try:
-        conn = sqlite3.connect(db_path, timeout=30)
-        
         # Convert symbol to CCXT format (BTCUSDT -> BTC/USDT:USDT)
         ccxt_symbol = _convert_symbol_to_ccxt_format(symbol)
         
         # Get data from realtime_ohlcv (data-fetcher table)
+        # Compact table read in primary-key order (newest first)
         query = f'''
-            SELECT timestamp, open, high, low, close, volume,
+            SELECT {ts_text('d')} AS timestamp, open, high, low, close, volume,
                    sma_20, sma_50, ema_12, ema_26,
                    bb_upper, bb_mid as bb_middle, bb_lower,
                    rsi, macd, macd_signal, macd_hist,
                    stoch_k, stoch_d, atr, volume_sma, obv
-            FROM realtime_ohlcv
-            WHERE symbol = ? AND timeframe = ?
-            ORDER BY timestamp DESC
+            FROM realtime_ohlcv_c d
+            WHERE {series_filter('d')}
+            ORDER BY d.ts DESC
             LIMIT ?
         '''
         
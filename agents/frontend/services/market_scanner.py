@@ -6,15 +6,13 @@ Scans all Top 100 cryptocurrencies and generates XGBoost signals.
 Uses data from the database (no new API calls needed).
 
 Features:
-- Loads latest candle + indicators from historical_ohlcv
+- Loads latest candle + indicators of all symbols from latest_candles (one query)
 - Runs XGBoost inference for LONG/SHORT scores
 - Calculates combined signal (BUY/SELL/NEUTRAL)
 - Returns ranked list by volume
 """
 
-import os
 import sqlite3
-from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
@@ -22,21 +20,11 @@ from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 
+from database import get_connection
+from database.compact_schema import series_filter, ts_text
 from services.ml_inference import get_ml_inference_service, compute_ml_features, normalize_xgb_score_batch
 
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# PATH CONFIGURATION
-# ═══════════════════════════════════════════════════════════════════════════════
-
-SHARED_PATH = os.environ.get('SHARED_DATA_PATH', '/app/shared')
-DB_PATH = Path(SHARED_PATH) / 'data_cache' / 'trading_data.db'
-
-# Fallback for local dev
-if not DB_PATH.exists():
-    DB_PATH = Path(__file__).parent.parent.parent.parent / 'shared' / 'data_cache' / 'trading_data.db'
-
-
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -114,33 +102,29 @@ class MarketScannerService:
         signals = []
         raw_data = []  # Collect raw data first for batch normalization
         
-        if not DB_PATH.exists():
+        # Pooled read-only connection of this thread
+        conn = get_connection()
+        if not conn:
             return signals
         
-        # Connect with timeout and WAL mode for better concurrency
-        conn = sqlite3.connect(str(DB_PATH), timeout=30)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=30000")
-        
         try:
-            # Get top symbols by volume
+            # Top symbols by volume with their latest candle: one query on the
+            # latest_candles snapshot kept by the data-fetcher
             top_symbols = pd.read_sql_query("""
-                SELECT symbol, volume_24h, rank
-                FROM top_symbols
-                ORDER BY rank ASC
+                SELECT t.symbol, t.volume_24h, t.rank, l.*
+                FROM top_symbols t
+                JOIN v_latest_candles l ON l.symbol = t.symbol AND l.timeframe = ?
+                ORDER BY t.rank ASC
                 LIMIT ?
-            """, conn, params=(top_n,))
+            """, conn, params=(timeframe, top_n))
             
             if top_symbols.empty:
                 return signals
+            top_symbols = top_symbols.loc[:, ~top_symbols.columns.duplicated()]
             
             # Phase 1: Collect raw XGB scores for all symbols
             for _, row in top_symbols.iterrows():
-                symbol = row['symbol']
-                volume_24h = row['volume_24h']
-                rank = row['rank']
-                
-                data = self._get_symbol_data(conn, symbol, timeframe, rank, volume_24h)
+                data = self._get_symbol_data(conn, row, timeframe)
                 if data:
                     raw_data.append(data)
             
@@ -204,55 +188,23 @@ class MarketScannerService:
     def _get_symbol_data(
         self,
         conn: sqlite3.Connection,
-        symbol: str,
-        timeframe: str,
-        rank: int,
-        volume_24h: float
+        latest: pd.Series,
+        timeframe: str
     ) -> Optional[Dict[str, Any]]:
-        """Get raw data for a symbol (before normalization)"""
+        """Get raw data for a symbol (before normalization) from its latest_candles row"""
         
+        symbol = latest['symbol']
         try:
-            # Get latest candles (need ~200 for feature calculation)
-            df = pd.read_sql_query(f"""
-                SELECT *
-                FROM historical_ohlcv
-                WHERE symbol = ? AND timeframe = ?
-                ORDER BY timestamp DESC
-                LIMIT 250
-            """, conn, params=(symbol, timeframe))
-            
-            if len(df) < 50:
-                return None
-            
-            # Reverse to chronological order
-            df = df.iloc[::-1].reset_index(drop=True)
-            
-            # Get latest row
-            latest = df.iloc[-1]
-            prev = df.iloc[-2] if len(df) > 1 else latest
-            
-            # Calculate indicators if not present
-            if 'rsi' not in df.columns or pd.isna(latest.get('rsi')):
-                df = compute_ml_features(df)
-                latest = df.iloc[-1]
-            
-            # Get price info
+            # Price info and 24h change come from the snapshot
             price = float(latest['close'])
-            open_price = float(df.iloc[0]['close']) if len(df) > 24 else float(latest['open'])
-            change_24h = ((price - open_price) / open_price) * 100 if open_price > 0 else 0
-            
-            # ALWAYS compute ML features (69 features needed by XGBoost)
-            # The database only has basic indicators, not all 69 features
-            df = compute_ml_features(df)
-            latest = df.iloc[-1]
-            prev = df.iloc[-2] if len(df) > 1 else latest
+            change_24h = float(latest['change_24h_pct']) if pd.notna(latest['change_24h_pct']) else 0.0
             
             # Get RSI
             rsi = float(latest.get('rsi', 50))
             
-            # Get MACD signal
+            # Get MACD signal (histogram of the previous candle is in the snapshot)
             macd_hist = float(latest.get('macd_hist', 0))
-            prev_macd_hist = float(prev.get('macd_hist', 0)) if 'macd_hist' in prev else 0
+            prev_macd_hist = float(latest['macd_hist_prev']) if pd.notna(latest['macd_hist_prev']) else macd_hist
             
             if macd_hist > 0 and macd_hist > prev_macd_hist:
                 macd_signal = "BULLISH"
@@ -302,8 +254,10 @@ class MarketScannerService:
             xgb_short_raw = 0.0
             
             if self.ml_service.is_available:
-                pred = self.ml_service.predict(latest)
-                if pred.is_valid:
+                # The 69 ML features need history: only the model reads candles
+                features = self._get_ml_features(conn, symbol, timeframe)
+                pred = self.ml_service.predict(features) if features is not None else None
+                if pred is not None and pred.is_valid:
                     xgb_long_raw = pred.score_long  # RAW score
                     xgb_short_raw = pred.score_short  # RAW score
             
@@ -313,8 +267,8 @@ class MarketScannerService:
             return {
                 'symbol': symbol,
                 'coin': coin,
-                'rank': rank,
-                'volume_24h': volume_24h,
+                'rank': int(latest['rank']),
+                'volume_24h': float(latest['volume_24h']),
                 'price': price,
                 'change_24h': change_24h,
                 'rsi': rsi,
@@ -332,6 +286,22 @@ class MarketScannerService:
             print(f"Error getting data for {symbol}: {e}")
             return None
     
+    def _get_ml_features(self, conn: sqlite3.Connection, symbol: str, timeframe: str) -> Optional[pd.Series]:
+        """ML features of the latest candle (needs ~200 candles of history)"""
+        df = pd.read_sql_query(f"""
+            SELECT {ts_text('d')} AS timestamp, open, high, low, close, volume
+            FROM realtime_ohlcv_c d
+            WHERE {series_filter('d')}
+            ORDER BY d.ts DESC
+            LIMIT 250
+        """, conn, params=(symbol, timeframe))
+        if len(df) < 50:
+            return None
+        
+        # Reverse to chronological order
+        df = compute_ml_features(df.iloc[::-1].reset_index(drop=True))
+        return df.iloc[-1]
+    
     def _analyze_symbol(
         self, 
         conn: sqlite3.Connection, 
@@ -3,11 +3,10 @@ Utility functions for the Crypto Dashboard
 """
 
 from datetime import datetime, timedelta
-from pathlib import Path
 import pytz
 import streamlit as st
 
-from config import ROME_TZ, UPDATE_INTERVAL_MINUTES, REFRESH_SIGNAL_FILE
+from config import ROME_TZ, UPDATE_INTERVAL_MINUTES
 
 
 def format_volume(vol):
@@ -85,10 +84,9 @@ def get_next_update_info():
 
 
 def trigger_refresh():
-    """Create signal file to trigger data refresh"""
-    try:
-        Path(REFRESH_SIGNAL_FILE).write_text(datetime.now().isoformat())
+    """Ask the data-fetcher for a data refresh (refresh_requested event)"""
+    from database import request_data_refresh
+    if request_data_refresh():
         return True
-    except Exception as e:
-        st.error(f"Error: {e}")
-        return False
+    st.error("Error: refresh request not sent (database unavailable)")
+    return False
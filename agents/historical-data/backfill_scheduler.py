@@ -0,0 +1,386 @@
+"""
+🗓️ Backfill Scheduler - Concurrent multi-symbol historical download
+
+Downloads up to N symbols in parallel under one shared token bucket,
+computes indicators in a process pool and funnels every database write
+through a single writer task (SQLite allows one writer at a time).
+
+Symbols with stored data are resumed: only the missing head/tail ranges
+are downloaded and appended (see core.resume).
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+from termcolor import colored
+
+import config
+from core.database import TrainingDatabase, BackfillStatus, WARMUP_CANDLES
+from core import parquet_lake
+from core.resume import (
+    MIN_TAIL_HISTORY, ResumePlan, plan_resume, prepare_head_frame, prepare_tail_frame, prepare_training_frame,
+    timeframe_to_timedelta
+)
+from fetcher.bybit_historical import BybitHistoricalFetcher
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning "coin has no history for this range" (SKIPPED, not ERROR)
+NO_DATA_KEYWORDS = ["No valid data", "No data received", "may not be listed"]
+
+
+def export_lake(db: TrainingDatabase, symbol: str, timeframe: str, since: datetime = None):
+    """
+    Writer-side: mirror the stored series into the Parquet lake.
+
+    With `since` only the months from that timestamp on are rewritten,
+    otherwise the whole series is replaced. Failures are logged and never
+    fail the backfill (SQLite remains the source of truth).
+    """
+    if not config.PARQUET_LAKE or not parquet_lake.PARQUET_AVAILABLE:
+        return
+    try:
+        month_start = pd.Timestamp(since).to_period('M').start_time if since is not None else None
+        df = db.get_training_data(symbol, timeframe, start_date=month_start)
+        parquet_lake.write_series(config.LAKE_DIR, 'training_data', symbol, timeframe, df,
+                                  replace=since is None)
+    except Exception as e:
+        logger.warning(f"⚠️ {symbol}[{timeframe}]: Parquet lake export failed: {e}")
+
+
+class BackfillScheduler:
+    """
+    Bounded-concurrency backfill for one timeframe at a time.
+
+    Usage:
+        scheduler = BackfillScheduler(db, fetcher, process_pool, concurrency=10)
+        stats = await scheduler.run_timeframe(symbols, '15m', warmup_start, start, end, target=100)
+    """
+
+    def __init__(
+        self,
+        db: TrainingDatabase,
+        fetcher: BybitHistoricalFetcher,
+        process_pool: Executor,
+        concurrency: int,
+        should_stop: Callable[[], bool] = lambda: False
+    ):
+        self.db = db
+        self.fetcher = fetcher
+        self.process_pool = process_pool
+        self.concurrency = max(1, concurrency)
+        self.should_stop = should_stop
+        self.stats: Dict = {}
+        self._write_queue: asyncio.Queue = None
+
+    # =========================================
+    # SINGLE WRITER
+    # =========================================
+
+    async def _writer(self):
+        """Execute queued database operations one at a time (off the event loop)"""
+        while True:
+            item = await self._write_queue.get()
+            if item is None:
+                break
+            func, args, kwargs, future = item
+            if future.done():
+                continue  # Caller cancelled while queued (run() stopping)
+            try:
+                result = await asyncio.to_thread(func, *args, **kwargs)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _write(self, func, *args, **kwargs):
+        """Queue a database operation for the writer task and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((func, args, kwargs, future))
+        return await future
+
+    # =========================================
+    # PER-SYMBOL PIPELINE
+    # =========================================
+
+    async def _process_symbol(
+        self,
+        symbol: str,
+        timeframe: str,
+        warmup_start: datetime,
+        aligned_start: datetime,
+        aligned_end: datetime
+    ) -> str:
+        """
+        Download, compute and save one symbol.
+
+        Returns:
+            Final status value (COMPLETE / SKIPPED / ERROR)
+        """
+        await self._write(self.db.update_backfill_status, symbol=symbol, timeframe=timeframe,
+                          status=BackfillStatus.IN_PROGRESS)
+        try:
+            plan = await asyncio.to_thread(self._plan_symbol, symbol, timeframe, aligned_start, aligned_end)
+            if plan.full:
+                saved = await self._download_full(symbol, timeframe, warmup_start, aligned_start, aligned_end)
+            else:
+                saved = await self._download_missing(symbol, timeframe, plan, warmup_start, aligned_start, aligned_end)
+            self.stats['candles'] += saved
+            return BackfillStatus.COMPLETE.value
+
+        except Exception as e:
+            error_msg = str(e)
+            if any(kw.lower() in error_msg.lower() for kw in NO_DATA_KEYWORDS):
+                print(colored(f"   ⏭️ {symbol}[{timeframe}]: Skipped (no historical data)", "yellow"))
+                await self._write(self.db.update_backfill_status, symbol=symbol, timeframe=timeframe,
+                                  status=BackfillStatus.SKIPPED, error_message=error_msg[:200])
+                # Remove from top_symbols to clean up dashboard
+                await self._write(self.db.remove_from_top_symbols, symbol)
+                return BackfillStatus.SKIPPED.value
+
+            logger.error(f"❌ {symbol}[{timeframe}]: {error_msg}")
+            await self._write(self.db.update_backfill_status, symbol=symbol, timeframe=timeframe,
+                              status=BackfillStatus.ERROR, error_message=error_msg[:200])
+            return BackfillStatus.ERROR.value
+
+    def _plan_symbol(self, symbol: str, timeframe: str, aligned_start: datetime, aligned_end: datetime) -> ResumePlan:
+        """Missing head/tail ranges from training_data + backfill_status"""
+        if not config.RESUME_BACKFILL:
+            return ResumePlan(full=True)
+        stored_first, stored_last = self.db.get_date_range(symbol, timeframe)
+        info = self.db.get_backfill_status(symbol, timeframe)
+        return plan_resume(timeframe, aligned_start, aligned_end, stored_first, stored_last,
+                           info.training_start if info else None)
+
+    async def _download_full(
+        self,
+        symbol: str,
+        timeframe: str,
+        warmup_start: datetime,
+        aligned_start: datetime,
+        aligned_end: datetime
+    ) -> int:
+        """Download the whole range and replace stored rows"""
+        df = await self.fetcher.fetch_historical_ohlcv(
+            symbol=symbol,
+            timeframe=timeframe,
+            start_date=warmup_start,
+            end_date=aligned_end
+        )
+        if df is None or df.empty:
+            raise Exception("No data received")
+
+        loop = asyncio.get_running_loop()
+        df_aligned = await loop.run_in_executor(
+            self.process_pool, prepare_training_frame, df, aligned_start, aligned_end
+        )
+        if df_aligned.index.min() > aligned_start:
+            print(colored(f"   ⚠️ {symbol}: listed after {aligned_start.strftime('%Y-%m-%d')}, "
+                          f"using data from {df_aligned.index.min().strftime('%Y-%m-%d')}", "yellow"))
+
+        saved = await self._write(self._replace_symbol_data, symbol, timeframe, df_aligned, aligned_start)
+        print(colored(f"   ✅ {symbol}[{timeframe}]: {len(df):,} downloaded, {saved:,} saved", "green"))
+        return saved
+
+    async def _download_missing(
+        self,
+        symbol: str,
+        timeframe: str,
+        plan: ResumePlan,
+        warmup_start: datetime,
+        aligned_start: datetime,
+        aligned_end: datetime
+    ) -> int:
+        """
+        Download only the missing head/tail ranges and append them.
+
+        Falls back to _download_full() when fewer than MIN_TAIL_HISTORY rows
+        precede the tail (the rolling indicators could not continue). Raises
+        when the head download stops before the stored range (a hole would
+        be left before stored_first).
+        """
+        loop = asyncio.get_running_loop()
+        frames = []
+        tf = timeframe_to_timedelta(timeframe)
+
+        history = None
+        if plan.tail:
+            history_start = plan.stored_last - tf * WARMUP_CANDLES
+            history = await asyncio.to_thread(self.db.get_training_data, symbol, timeframe, history_start)
+            if len(history) < MIN_TAIL_HISTORY:
+                print(colored(f"   ♻️ {symbol}[{timeframe}]: {len(history)} stored rows before the tail "
+                              f"(< {MIN_TAIL_HISTORY}), downloading the full range", "yellow"))
+                return await self._download_full(symbol, timeframe, warmup_start, aligned_start, aligned_end)
+
+        if plan.head:
+            df = await self.fetcher.fetch_historical_ohlcv(
+                symbol=symbol,
+                timeframe=timeframe,
+                start_date=warmup_start,
+                end_date=plan.stored_first
+            )
+            if df is not None and not df.empty:
+                if df.index.max() < plan.head[1]:
+                    raise Exception(f"Head download incomplete: ends at {df.index.max()}, "
+                                    f"stored data starts at {plan.stored_first}")
+                junction = await asyncio.to_thread(
+                    self.db.get_training_data, symbol, timeframe, plan.stored_first, plan.stored_first
+                )
+                frames.append(await loop.run_in_executor(
+                    self.process_pool, prepare_head_frame, df, junction, aligned_start
+                ))
+
+        if plan.tail:
+            df = await self.fetcher.fetch_incremental(symbol, timeframe, plan.stored_last, end_date=aligned_end)
+            if df is not None and not df.empty:
+                frames.append(await loop.run_in_executor(
+                    self.process_pool, prepare_tail_frame, history, df, aligned_end
+                ))
+
+        new_rows = pd.concat(frames).sort_index() if frames else pd.DataFrame()
+        saved, total = await self._write(self._merge_symbol_data, symbol, timeframe, new_rows,
+                                         aligned_start, aligned_end)
+        if plan.up_to_date:
+            print(colored(f"   ♻️ {symbol}[{timeframe}]: up to date ({total:,} stored)", "green"))
+        else:
+            print(colored(f"   ♻️ {symbol}[{timeframe}]: resumed, {saved:,} new ({total:,} stored)", "green"))
+        return saved
+
+    def _replace_symbol_data(self, symbol: str, timeframe: str, df_aligned: pd.DataFrame,
+                             aligned_start: datetime) -> int:
+        """Writer-side: replace stored rows and mark the backfill COMPLETE"""
+        self.db.clear_training_data(symbol, timeframe)
+        saved = self.db.save_training_data(symbol, timeframe, df_aligned)
+        self.db.update_backfill_status(
+            symbol=symbol,
+            timeframe=timeframe,
+            status=BackfillStatus.COMPLETE,
+            oldest_timestamp=df_aligned.index.min(),
+            newest_timestamp=df_aligned.index.max(),
+            training_start=aligned_start,
+            total_candles=saved,
+            training_candles=saved,
+            completeness_pct=100.0
+        )
+        export_lake(self.db, symbol, timeframe)
+        return saved
+
+    def _merge_symbol_data(self, symbol: str, timeframe: str, new_rows: pd.DataFrame,
+                           aligned_start: datetime, aligned_end: datetime) -> Tuple[int, int]:
+        """
+        Writer-side: drop rows outside the requested range, append new rows
+        and mark the backfill COMPLETE.
+
+        One writer operation, but three commits (trim, append, status). If it
+        stops in between, the status stays IN_PROGRESS and the next run plans
+        from what is stored: the trimmed range and any appended rows.
+
+        Returns:
+            Tuple of (saved, total stored)
+        """
+        trimmed = self.db.trim_training_data(symbol, timeframe, aligned_start, aligned_end)
+        saved = self.db.save_training_data(symbol, timeframe, new_rows, chunk_size=max(1, len(new_rows)))
+        oldest, newest = self.db.get_date_range(symbol, timeframe)
+        total = self.db.get_candle_count(symbol, timeframe)
+        self.db.update_backfill_status(
+            symbol=symbol,
+            timeframe=timeframe,
+            status=BackfillStatus.COMPLETE,
+            oldest_timestamp=oldest,
+            newest_timestamp=newest,
+            training_start=aligned_start,
+            total_candles=total,
+            training_candles=total,
+            completeness_pct=100.0
+        )
+        if trimmed:
+            export_lake(self.db, symbol, timeframe)
+        elif saved:
+            export_lake(self.db, symbol, timeframe, since=new_rows.index.min())
+        return saved, total
+
+    # =========================================
+    # SCHEDULING
+    # =========================================
+
+    async def run_timeframe(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        warmup_start: datetime,
+        aligned_start: datetime,
+        aligned_end: datetime,
+        target: int
+    ) -> Dict:
+        """
+        Backfill symbols (in rank order) until `target` downloads succeed.
+
+        A new symbol is started only while successes + in-flight symbols stay
+        below the target, so at most `target` symbols end up COMPLETE. Symbols
+        never started after the target is reached are marked SKIPPED.
+
+        Returns:
+            Dict with successful, failed, skipped, candles, stopped
+        """
+        self.stats = {'successful': 0, 'failed': 0, 'skipped': 0, 'candles': 0, 'stopped': False}
+        self._write_queue = asyncio.Queue()
+        writer = asyncio.create_task(self._writer())
+
+        in_flight: Dict[asyncio.Task, str] = {}
+        next_index = 0
+
+        try:
+            while True:
+                while (next_index < len(symbols)
+                       and len(in_flight) < self.concurrency
+                       and self.stats['successful'] + len(in_flight) < target
+                       and not self.should_stop()):
+                    symbol = symbols[next_index]
+                    next_index += 1
+                    print(colored(f"\n[{next_index}/{len(symbols)}] {symbol} started "
+                                  f"(success: {self.stats['successful']}/{target}, in flight: {len(in_flight) + 1})",
+                                  "yellow"))
+                    task = asyncio.create_task(
+                        self._process_symbol(symbol, timeframe, warmup_start, aligned_start, aligned_end)
+                    )
+                    in_flight[task] = symbol
+
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.pop(task)
+                    status = task.result()
+                    if status == BackfillStatus.COMPLETE.value:
+                        self.stats['successful'] += 1
+                    elif status == BackfillStatus.SKIPPED.value:
+                        self.stats['skipped'] += 1
+                    else:
+                        self.stats['failed'] += 1
+
+            if self.should_stop():
+                logger.info("🛑 Shutdown requested, stopping download...")
+                self.stats['stopped'] = True
+            elif self.stats['successful'] >= target and next_index < len(symbols):
+                remaining = symbols[next_index:]
+                print(colored(f"\n✅ Reached {target} successful downloads for {timeframe}. Moving to next timeframe.",
+                              "green", attrs=['bold']))
+                for remaining_symbol in remaining:
+                    await self._write(self.db.update_backfill_status, symbol=remaining_symbol, timeframe=timeframe,
+                                      status=BackfillStatus.SKIPPED,
+                                      error_message=f"Target {target} reached - not processed")
+                print(colored(f"   ⏭️ Marked {len(remaining)} remaining symbols as SKIPPED", "yellow"))
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            await self._write_queue.put(None)
+            await writer
+
+        return self.stats
@@ -70,14 +70,19 @@ TOP_SYMBOLS_COUNT = 100
 # Bybit API Limits
 # ----------------------------------------------------------------------
 MAX_CANDLES_PER_REQUEST = 1000  # Bybit maximum per request
-REQUEST_DELAY_MS = 100  # Rate limiting delay between requests
 MAX_CONCURRENT_REQUESTS = 10  # Concurrent symbol downloads
+BYBIT_MARKET_SHARE = float(os.getenv("BYBIT_MARKET_SHARE", "0.4"))  # Share of the per-IP market data budget (120 req/s)
+PARALLEL_PAGINATION = os.getenv("PARALLEL_PAGINATION", "true").lower() == "true"  # Fetch page windows concurrently
+WINDOW_CONCURRENCY = int(os.getenv("WINDOW_CONCURRENCY", "4"))  # Parallel page requests per symbol
 
 # ----------------------------------------------------------------------
 # Update Configuration
 # ----------------------------------------------------------------------
 UPDATE_INTERVAL_MINUTES = 15  # Sync with 15m candles
 BATCH_SIZE = 10  # Symbols to process in parallel
+INDICATOR_WORKERS = int(os.getenv("INDICATOR_WORKERS", str(min(4, os.cpu_count() or 1))))  # Process pool size
+SAVE_CHUNK_SIZE = int(os.getenv("SAVE_CHUNK_SIZE", "5000"))  # Rows per insert transaction
+RESUME_BACKFILL = os.getenv("RESUME_BACKFILL", "true").lower() == "true"  # Download only missing head/tail ranges
 
 # ----------------------------------------------------------------------
 # Validation Configuration
@@ -94,13 +99,14 @@ SHARED_DATA_PATH = os.getenv("SHARED_DATA_PATH", "/app/shared")
 # ----------------------------------------------------------------------
 # Auto-Start Configuration
 # ----------------------------------------------------------------------
-# If False, backfill waits for trigger file from frontend
+# If False, backfill waits for a 'backfill_requested' event from frontend
 # If True, backfill starts automatically on service start
 AUTO_BACKFILL = os.getenv("AUTO_BACKFILL", "false").lower() == "true"
-TRIGGER_FILE_PATH = f"{SHARED_DATA_PATH}/start_backfill.txt"
 CACHE_DIR = f"{SHARED_DATA_PATH}/data_cache"
 DB_FILE = "trading_data.db"
 DB_PATH = f"{CACHE_DIR}/{DB_FILE}"
+LAKE_DIR = f"{CACHE_DIR}/lake"  # Parquet mirror of training_data (needs pyarrow)
+PARQUET_LAKE = os.getenv("PARQUET_LAKE", "true").lower() == "true"  # Export each saved series to the lake
 
 # ----------------------------------------------------------------------
 # Logging Configuration
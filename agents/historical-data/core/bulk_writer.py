@@ -0,0 +1,101 @@
+"""
+🚚 Bulk Writer Module - Columnar training_data inserts
+
+Converts an OHLCV + indicators DataFrame into column arrays, drops rows
+with any NULL value using a single NumPy validity mask, and writes the
+remaining rows with chunked executemany (one transaction per chunk).
+Rows go straight to training_data_c (integer ids + epoch-ms timestamps,
+see core.compact_schema).
+"""
+
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from .compact_schema import compact_name, to_epoch_ms
+from .indicators import INDICATOR_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+VALUE_COLUMNS = OHLCV_COLUMNS + INDICATOR_COLUMNS
+
+TRAINING_INSERT_SQL = f'''
+    INSERT OR REPLACE INTO {compact_name('training_data')}
+    (symbol_id, tf_id, ts, {', '.join(VALUE_COLUMNS)}, fetched_at)
+    VALUES ({', '.join(['?'] * (4 + len(VALUE_COLUMNS)))})
+'''
+
+
+def frame_to_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a DataFrame into (int64 epoch-ms timestamps, float64 value matrix).
+
+    The value matrix has VALUE_COLUMNS in order; missing columns are NaN.
+    """
+    if 'timestamp' in df.columns:
+        timestamps = to_epoch_ms(df['timestamp'])
+    else:
+        timestamps = to_epoch_ms(df.index)
+
+    values = df.reindex(columns=VALUE_COLUMNS).to_numpy(dtype=np.float64, na_value=np.nan)
+    return timestamps, values
+
+
+def build_training_rows(
+    symbol_id: int,
+    tf_id: int,
+    df: pd.DataFrame,
+    fetched_at: str = None
+) -> Tuple[List[tuple], int]:
+    """
+    Build insert tuples for all rows where OHLCV and all 16 indicators are valid.
+
+    Args:
+        symbol_id / tf_id: Dictionary ids (compact_schema.get_ids)
+
+    Returns:
+        Tuple of (rows, skipped_count)
+    """
+    timestamps, values = frame_to_arrays(df)
+    valid = ~np.isnan(values).any(axis=1)
+
+    fetched_at = fetched_at or datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    rows = [
+        (symbol_id, tf_id, ts, *vals, fetched_at)
+        for ts, vals in zip(timestamps[valid].tolist(), values[valid].tolist())
+    ]
+    return rows, int((~valid).sum())
+
+
+def write_training_rows(
+    conn: sqlite3.Connection,
+    rows: List[tuple],
+    chunk_size: int = None
+) -> int:
+    """
+    Insert rows with chunked executemany, committing after each chunk.
+
+    Short transactions keep the shared database writable for the
+    data-fetcher while a large backfill is being saved.
+
+    Returns:
+        Number of rows written
+    """
+    chunk_size = chunk_size or config.SAVE_CHUNK_SIZE
+    start = time.perf_counter()
+
+    for i in range(0, len(rows), chunk_size):
+        with conn:
+            conn.executemany(TRAINING_INSERT_SQL, rows[i:i + chunk_size])
+
+    elapsed = time.perf_counter() - start
+    if rows and elapsed > 0:
+        logger.debug(f"Wrote {len(rows):,} rows in {elapsed:.2f}s ({len(rows) / elapsed:,.0f} rows/s)")
+    return len(rows)
@@ -6,6 +6,8 @@ Manages SQLite database for ML training data:
   - Date aligned between 15m and 1h timeframes
   - No NULL values (warmup candles are fetched but discarded)
 - backfill_status: Tracks download progress per symbol/timeframe
+- table_stats: Row counts / date bounds per series, kept up to date by
+  every write (statistics never scan training_data)
 """
 
 import sqlite3
@@ -20,12 +22,22 @@ import pandas as pd
 from termcolor import colored
 
 import config
+from .bulk_writer import build_training_rows, write_training_rows
+from .event_bus import ensure_events_table
+from .obv_rebuild import rebuild_obv
+from .compact_migration import ensure_compact_table
+from .compact_schema import compact_name, epoch_ms, from_epoch_ms, get_ids, ms_to_text
+from .table_stats import (
+    check_stats, ensure_stats, get_series_stats, get_table_summary, refresh_series_stats, tracked_series
+)
 
 logger = logging.getLogger(__name__)
 
 # Warmup period - extra candles to fetch for indicator calculation
 WARMUP_CANDLES = 200
 
+TRAINING_TABLE = compact_name('training_data')
+
 
 class BackfillStatus(Enum):
     """Status of data backfill for a symbol/timeframe"""
@@ -44,6 +56,7 @@ class BackfillInfo:
     status: BackfillStatus
     oldest_timestamp: Optional[datetime] = None
     newest_timestamp: Optional[datetime] = None
+    training_start: Optional[datetime] = None  # Requested start covered by the last COMPLETE run
     total_candles: int = 0
     warmup_candles: int = 0
     training_candles: int = 0
@@ -96,53 +109,6 @@ class TrainingDatabase:
         conn = self._get_connection()
         cur = conn.cursor()
         
-        # Training Data table (OHLCV + 16 indicators)
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS training_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                timeframe TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                
-                -- OHLCV
-                open REAL NOT NULL,
-                high REAL NOT NULL,
-                low REAL NOT NULL,
-                close REAL NOT NULL,
-                volume REAL NOT NULL,
-                
-                -- Technical Indicators (16 total - NO NULL values)
-                sma_20 REAL NOT NULL,
-                sma_50 REAL NOT NULL,
-                ema_12 REAL NOT NULL,
-                ema_26 REAL NOT NULL,
-                bb_upper REAL NOT NULL,
-                bb_mid REAL NOT NULL,
-                bb_lower REAL NOT NULL,
-                macd REAL NOT NULL,
-                macd_signal REAL NOT NULL,
-                macd_hist REAL NOT NULL,
-                rsi REAL NOT NULL,
-                stoch_k REAL NOT NULL,
-                stoch_d REAL NOT NULL,
-                atr REAL NOT NULL,
-                volume_sma REAL NOT NULL,
-                obv REAL NOT NULL,
-                
-                -- Metadata
-                fetched_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                
-                UNIQUE(symbol, timeframe, timestamp)
-            )
-        ''')
-        
-        # Indexes for fast queries
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_train_symbol ON training_data(symbol)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_train_timeframe ON training_data(timeframe)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_train_timestamp ON training_data(timestamp)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_train_symbol_tf ON training_data(symbol, timeframe)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_train_symbol_tf_ts ON training_data(symbol, timeframe, timestamp)')
-        
         # Backfill Status table
         cur.execute('''
             CREATE TABLE IF NOT EXISTS backfill_status (
@@ -166,9 +132,20 @@ class TrainingDatabase:
         ''')
         
         conn.commit()
+        
+        # Training Data table (OHLCV + 16 indicators)
+        # Compact layout v2: training_data_c + compatibility view
+        ensure_compact_table(conn, 'training_data')
+        
+        # Row counts / date bounds per series (statistics without table scans)
+        with conn:
+            ensure_stats(conn, 'training_data')
+            # Backfill requests from the frontend (change notifications)
+            ensure_events_table(conn)
         conn.close()
         
-        logger.info("🗄️ Training database initialized (2 tables: training_data, backfill_status)")
+        logger.info("🗄️ Training database initialized (4 tables: training_data, backfill_status, table_stats, "
+                    "agent_events)")
     
     # =========================================
     # BACKFILL STATUS OPERATIONS
@@ -274,7 +251,7 @@ class TrainingDatabase:
         cur = conn.cursor()
         
         cur.execute('''
-            SELECT symbol, timeframe, status, oldest_timestamp, newest_timestamp,
+            SELECT symbol, timeframe, status, oldest_timestamp, newest_timestamp, training_start,
                    total_candles, warmup_candles, training_candles,
                    completeness_pct, gap_count, last_update, error_message
             FROM backfill_status
@@ -293,6 +270,7 @@ class TrainingDatabase:
             status=BackfillStatus(row['status']),
             oldest_timestamp=datetime.strptime(row['oldest_timestamp'], '%Y-%m-%d %H:%M:%S') if row['oldest_timestamp'] else None,
             newest_timestamp=datetime.strptime(row['newest_timestamp'], '%Y-%m-%d %H:%M:%S') if row['newest_timestamp'] else None,
+            training_start=datetime.strptime(row['training_start'], '%Y-%m-%d %H:%M:%S') if row['training_start'] else None,
             total_candles=row['total_candles'] or 0,
             warmup_candles=row['warmup_candles'] or 0,
             training_candles=row['training_candles'] or 0,
@@ -308,7 +286,7 @@ class TrainingDatabase:
         cur = conn.cursor()
         
         cur.execute('''
-            SELECT symbol, timeframe, status, oldest_timestamp, newest_timestamp,
+            SELECT symbol, timeframe, status, oldest_timestamp, newest_timestamp, training_start,
                    total_candles, warmup_candles, training_candles,
                    completeness_pct, gap_count, last_update, error_message
             FROM backfill_status
@@ -323,6 +301,7 @@ class TrainingDatabase:
                 status=BackfillStatus(row['status']),
                 oldest_timestamp=datetime.strptime(row['oldest_timestamp'], '%Y-%m-%d %H:%M:%S') if row['oldest_timestamp'] else None,
                 newest_timestamp=datetime.strptime(row['newest_timestamp'], '%Y-%m-%d %H:%M:%S') if row['newest_timestamp'] else None,
+                training_start=datetime.strptime(row['training_start'], '%Y-%m-%d %H:%M:%S') if row['training_start'] else None,
                 total_candles=row['total_candles'] or 0,
                 warmup_candles=row['warmup_candles'] or 0,
                 training_candles=row['training_candles'] or 0,
@@ -358,16 +337,21 @@ class TrainingDatabase:
         self, 
         symbol: str, 
         timeframe: str, 
-        df: pd.DataFrame
+        df: pd.DataFrame,
+        chunk_size: int = None
     ) -> int:
         """
         Save OHLCV candles with indicators to training_data table.
         Only saves rows where ALL indicators are valid (no NULL).
         
+        Rows are filtered with a vectorized validity mask and written with
+        chunked executemany (see core.bulk_writer).
+        
         Args:
             symbol: Trading pair symbol
             timeframe: Candle timeframe (e.g., '15m')
             df: DataFrame with OHLCV data and indicators (must have datetime index)
+            chunk_size: Rows per transaction (default: config.SAVE_CHUNK_SIZE)
             
         Returns:
             Number of candles saved
@@ -376,79 +360,15 @@ class TrainingDatabase:
             return 0
         
         conn = self._get_connection()
-        cur = conn.cursor()
-        
-        # Prepare data
-        data = df.reset_index()
-        if 'timestamp' not in data.columns and df.index.name == 'timestamp':
-            data = data.reset_index()
-        
-        # Convert timestamp to string if datetime
-        if 'timestamp' in data.columns:
-            if pd.api.types.is_datetime64_any_dtype(data['timestamp']):
-                data['timestamp'] = data['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Indicator columns (all required)
-        indicator_cols = [
-            'sma_20', 'sma_50', 'ema_12', 'ema_26',
-            'bb_upper', 'bb_mid', 'bb_lower',
-            'macd', 'macd_signal', 'macd_hist',
-            'rsi', 'stoch_k', 'stoch_d', 'atr',
-            'volume_sma', 'obv'
-        ]
-        
-        count = 0
-        skipped = 0
-        
-        for _, row in data.iterrows():
-            try:
-                # Check if all indicators are valid (not NULL)
-                has_all_indicators = True
-                for col in indicator_cols:
-                    val = row.get(col, None)
-                    if val is None or pd.isna(val):
-                        has_all_indicators = False
-                        break
-                
-                if not has_all_indicators:
-                    skipped += 1
-                    continue
-                
-                # Build insert query
-                cols = 'symbol, timeframe, timestamp, open, high, low, close, volume'
-                placeholders = '?, ?, ?, ?, ?, ?, ?, ?'
-                values = [
-                    symbol, timeframe, row['timestamp'],
-                    float(row['open']), float(row['high']), 
-                    float(row['low']), float(row['close']), 
-                    float(row['volume'])
-                ]
-                
-                # Add all indicators
-                for col in indicator_cols:
-                    cols += f', {col}'
-                    placeholders += ', ?'
-                    values.append(float(row[col]))
-                
-                cols += ', fetched_at'
-                placeholders += ', ?'
-                values.append(now)
-                
-                cur.execute(f'''
-                    INSERT OR REPLACE INTO training_data 
-                    ({cols})
-                    VALUES ({placeholders})
-                ''', values)
-                count += 1
-                
-            except Exception as e:
-                logger.warning(f"Error saving candle {symbol}[{timeframe}] {row.get('timestamp', 'N/A')}: {e}")
-                skipped += 1
-        
-        conn.commit()
-        conn.close()
+        try:
+            with conn:
+                symbol_id, tf_id = get_ids(conn, symbol, timeframe, create=True)
+            rows, skipped = build_training_rows(symbol_id, tf_id, df)
+            count = write_training_rows(conn, rows, chunk_size)
+            with conn:
+                refresh_series_stats(conn, 'training_data', [(symbol_id, tf_id)])
+        finally:
+            conn.close()
         
         if skipped > 0:
             logger.info(f"  ⚠️ Skipped {skipped} candles with NULL indicators (warmup period)")
@@ -459,24 +379,45 @@ class TrainingDatabase:
         """Clear training data (optionally filtered by symbol/timeframe)"""
         conn = self._get_connection()
         cur = conn.cursor()
+        series = tracked_series(conn, 'training_data', symbol, timeframe)
         
+        symbol_filter = 'symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)'
+        tf_filter = 'tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)'
         if symbol and timeframe:
-            cur.execute('DELETE FROM training_data WHERE symbol = ? AND timeframe = ?', 
+            cur.execute(f'DELETE FROM {TRAINING_TABLE} WHERE {symbol_filter} AND {tf_filter}',
                        (symbol, timeframe))
         elif symbol:
-            cur.execute('DELETE FROM training_data WHERE symbol = ?', (symbol,))
+            cur.execute(f'DELETE FROM {TRAINING_TABLE} WHERE {symbol_filter}', (symbol,))
         elif timeframe:
-            cur.execute('DELETE FROM training_data WHERE timeframe = ?', (timeframe,))
+            cur.execute(f'DELETE FROM {TRAINING_TABLE} WHERE {tf_filter}', (timeframe,))
         else:
-            cur.execute('DELETE FROM training_data')
+            cur.execute(f'DELETE FROM {TRAINING_TABLE}')
         
         deleted = cur.rowcount
+        refresh_series_stats(conn, 'training_data', series)
         conn.commit()
         conn.close()
         
         logger.info(f"🗑️ Cleared {deleted} rows from training_data")
         return deleted
     
+    def trim_training_data(self, symbol: str, timeframe: str, start_date: datetime, end_date: datetime) -> int:
+        """Delete rows of a symbol/timeframe outside [start_date, end_date]"""
+        conn = self._get_connection()
+        ids = get_ids(conn, symbol, timeframe)
+        if ids is None:
+            conn.close()
+            return 0
+        with conn:
+            deleted = conn.execute(f'''
+                DELETE FROM {TRAINING_TABLE}
+                WHERE symbol_id = ? AND tf_id = ? AND (ts < ? OR ts > ?)
+            ''', (*ids, epoch_ms(start_date), epoch_ms(end_date))).rowcount
+            if deleted:
+                refresh_series_stats(conn, 'training_data', [ids])
+        conn.close()
+        return deleted
+    
     # =========================================
     # READ OPERATIONS
     # =========================================
@@ -504,28 +445,32 @@ class TrainingDatabase:
             DataFrame with OHLCV + 16 indicators, datetime index
         """
         conn = self._get_connection()
+        ids = get_ids(conn, symbol, timeframe)
+        if ids is None:
+            conn.close()
+            return pd.DataFrame()
         
-        query = '''
-            SELECT timestamp, open, high, low, close, volume,
+        query = f'''
+            SELECT ts AS timestamp, open, high, low, close, volume,
                    sma_20, sma_50, ema_12, ema_26,
                    bb_upper, bb_mid, bb_lower,
                    macd, macd_signal, macd_hist,
                    rsi, stoch_k, stoch_d, atr,
                    volume_sma, obv
-            FROM training_data
-            WHERE symbol = ? AND timeframe = ?
+            FROM {TRAINING_TABLE}
+            WHERE symbol_id = ? AND tf_id = ?
         '''
-        params = [symbol, timeframe]
+        params = list(ids)
         
         if start_date:
-            query += ' AND timestamp >= ?'
-            params.append(start_date.strftime('%Y-%m-%d %H:%M:%S'))
+            query += ' AND ts >= ?'
+            params.append(epoch_ms(start_date))
         
         if end_date:
-            query += ' AND timestamp <= ?'
-            params.append(end_date.strftime('%Y-%m-%d %H:%M:%S'))
+            query += ' AND ts <= ?'
+            params.append(epoch_ms(end_date))
         
-        query += ' ORDER BY timestamp ASC'
+        query += ' ORDER BY ts ASC'
         
         if limit:
             query += f' LIMIT {limit}'
@@ -534,7 +479,7 @@ class TrainingDatabase:
         conn.close()
         
         if len(df) > 0:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = from_epoch_ms(df['timestamp'])
             df.set_index('timestamp', inplace=True)
         
         return df
@@ -544,20 +489,18 @@ class TrainingDatabase:
         conn = self._get_connection()
         cur = conn.cursor()
         
-        cur.execute('''
-            SELECT MIN(timestamp), MAX(timestamp)
-            FROM training_data
-            WHERE symbol = ? AND timeframe = ?
+        cur.execute(f'''
+            SELECT MIN(ts), MAX(ts)
+            FROM {TRAINING_TABLE}
+            WHERE symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)
+              AND tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
         ''', (symbol, timeframe))
         
         row = cur.fetchone()
         conn.close()
         
-        if row and row[0] and row[1]:
-            return (
-                datetime.strptime(row[0], '%Y-%m-%d %H:%M:%S'),
-                datetime.strptime(row[1], '%Y-%m-%d %H:%M:%S')
-            )
+        if row and row[0] is not None and row[1] is not None:
+            return tuple(from_epoch_ms([row[0], row[1]]).to_pydatetime())
         return None, None
     
     def get_candle_count(self, symbol: str, timeframe: str) -> int:
@@ -565,9 +508,10 @@ class TrainingDatabase:
         conn = self._get_connection()
         cur = conn.cursor()
         
-        cur.execute('''
-            SELECT COUNT(*) FROM training_data
-            WHERE symbol = ? AND timeframe = ?
+        cur.execute(f'''
+            SELECT COUNT(*) FROM {TRAINING_TABLE}
+            WHERE symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)
+              AND tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
         ''', (symbol, timeframe))
         
         count = cur.fetchone()[0]
@@ -579,7 +523,11 @@ class TrainingDatabase:
         conn = self._get_connection()
         cur = conn.cursor()
         
-        cur.execute('SELECT DISTINCT symbol FROM training_data ORDER BY symbol')
+        cur.execute(f'''
+            SELECT symbol FROM symbol_ids
+            WHERE EXISTS (SELECT 1 FROM {TRAINING_TABLE} WHERE symbol_id = symbol_ids.id)
+            ORDER BY symbol
+        ''')
         symbols = [row[0] for row in cur.fetchall()]
         
         conn.close()
@@ -591,9 +539,17 @@ class TrainingDatabase:
         cur = conn.cursor()
         
         if symbol:
-            cur.execute('SELECT DISTINCT timeframe FROM training_data WHERE symbol = ?', (symbol,))
+            cur.execute(f'''
+                SELECT timeframe FROM timeframe_ids
+                WHERE EXISTS (SELECT 1 FROM {TRAINING_TABLE}
+                             WHERE symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)
+                               AND tf_id = timeframe_ids.id)
+            ''', (symbol,))
         else:
-            cur.execute('SELECT DISTINCT timeframe FROM training_data')
+            cur.execute(f'''
+                SELECT timeframe FROM timeframe_ids
+                WHERE EXISTS (SELECT 1 FROM {TRAINING_TABLE} WHERE tf_id = timeframe_ids.id)
+            ''')
         
         timeframes = [row[0] for row in cur.fetchall()]
         conn.close()
@@ -604,49 +560,57 @@ class TrainingDatabase:
     # =========================================
     
     def get_stats(self) -> Dict:
-        """Get overall database statistics"""
+        """Get overall database statistics (from the table_stats counters)"""
         conn = self._get_connection()
-        cur = conn.cursor()
-        
-        cur.execute('SELECT COUNT(DISTINCT symbol) FROM training_data')
-        symbols_count = cur.fetchone()[0] or 0
-        
-        cur.execute('SELECT COUNT(DISTINCT timeframe) FROM training_data')
-        tf_count = cur.fetchone()[0] or 0
-        
-        cur.execute('SELECT COUNT(*) FROM training_data')
-        candles_count = cur.fetchone()[0] or 0
-        
-        cur.execute('SELECT MIN(timestamp), MAX(timestamp) FROM training_data')
-        time_range = cur.fetchone()
-        
+        summary = get_table_summary(conn, 'training_data')
+        if summary is None:
+            # Counters not built yet: scan the table once
+            row = conn.execute(f'''
+                SELECT COUNT(DISTINCT symbol_id), COUNT(DISTINCT tf_id), COUNT(*), MIN(ts), MAX(ts)
+                FROM {TRAINING_TABLE}
+            ''').fetchone()
+            summary = {'symbols': row[0], 'timeframes': row[1], 'rows': row[2],
+                       'min_date': ms_to_text(row[3]), 'max_date': ms_to_text(row[4])}
         conn.close()
         
         # Database file size
         db_size = Path(self.db_path).stat().st_size if Path(self.db_path).exists() else 0
         
         return {
-            'symbols': symbols_count,
-            'timeframes': tf_count,
-            'total_candles': candles_count,
-            'min_date': time_range[0] if time_range else None,
-            'max_date': time_range[1] if time_range else None,
+            'symbols': summary['symbols'] or 0,
+            'timeframes': summary['timeframes'] or 0,
+            'total_candles': summary['rows'] or 0,
+            'min_date': summary['min_date'],
+            'max_date': summary['max_date'],
             'db_size_mb': db_size / (1024 * 1024)
         }
     
     def get_symbol_stats(self) -> List[Dict]:
         """Get per-symbol statistics"""
         conn = self._get_connection()
-        cur = conn.cursor()
+        series = get_series_stats(conn, 'training_data')
+        if series is not None:
+            conn.close()
+            return [
+                {'symbol': s['symbol'], 'timeframe': s['timeframe'], 'candles': s['rows'],
+                 'start_date': s['start_date'], 'end_date': s['end_date']}
+                for s in series
+            ]
         
-        cur.execute('''
-            SELECT symbol, timeframe, 
-                   COUNT(*) as candles,
-                   MIN(timestamp) as start_date,
-                   MAX(timestamp) as end_date
-            FROM training_data
-            GROUP BY symbol, timeframe
-            ORDER BY symbol, timeframe
+        cur = conn.cursor()
+        cur.execute(f'''
+            SELECT s.symbol, t.timeframe, d.candles, d.start_ts, d.end_ts
+            FROM (
+                SELECT symbol_id, tf_id,
+                       COUNT(*) as candles,
+                       MIN(ts) as start_ts,
+                       MAX(ts) as end_ts
+                FROM {TRAINING_TABLE}
+                GROUP BY symbol_id, tf_id
+            ) d
+            JOIN symbol_ids s ON s.id = d.symbol_id
+            JOIN timeframe_ids t ON t.id = d.tf_id
+            ORDER BY s.symbol, t.timeframe
         ''')
         
         results = []
@@ -655,13 +619,29 @@ class TrainingDatabase:
                 'symbol': row[0],
                 'timeframe': row[1],
                 'candles': row[2],
-                'start_date': row[3],
-                'end_date': row[4]
+                'start_date': ms_to_text(row[3]),
+                'end_date': ms_to_text(row[4])
             })
         
         conn.close()
         return results
     
+    def check_table_stats(self) -> Dict:
+        """Compare the training_data counters with the table and repair drifted series"""
+        conn = self._get_connection()
+        try:
+            return check_stats(conn, 'training_data')
+        finally:
+            conn.close()
+    
+    def rebuild_obv(self) -> List[Tuple[str, str]]:
+        """Recompute the stored OBV once after the formula change (see core.obv_rebuild)"""
+        conn = self._get_connection()
+        try:
+            return rebuild_obv(conn)
+        finally:
+            conn.close()
+    
     def print_stats(self):
         """Print database statistics"""
         stats = self.get_stats()
@@ -696,7 +676,27 @@ class TrainingDatabase:
         
         conn.close()
         return symbols
-    
+
+    def get_ticker_snapshot(self) -> Dict[str, Dict]:
+        """
+        Get the data-fetcher's bulk ticker snapshot (24h volume, last price,
+        24h change per symbol) without calling the exchange.
+        """
+        conn = self._get_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute('''
+                SELECT symbol, last_price, change_24h_pct, volume_24h, fetched_at
+                FROM ticker_snapshot
+            ''')
+            snapshot = {row['symbol']: dict(row) for row in cur.fetchall()}
+        except sqlite3.OperationalError:
+            snapshot = {}
+
+        conn.close()
+        return snapshot
+
     def remove_from_top_symbols(self, symbol: str):
         """
         Remove a symbol from the top_symbols table.
@@ -0,0 +1,44 @@
+"""
+🧮 Indicator Kernels Module - Vectorized building blocks
+
+Shared numerics for the technical indicators of data-fetcher and
+historical-data (each agent ships an identical copy of this file because
+they are built as separate Docker contexts).
+
+Conventions:
+- OBV starts at 0; an unchanged close leaves OBV unchanged
+- True range of the first candle is high - low
+- Stochastic %K is NaN when the high/low range is 0
+- Rolling standard deviation is the sample std (ddof=1)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    """On Balance Volume (cumulative signed volume)"""
+    direction = np.sign(close.diff().fillna(0.0).to_numpy())
+    return pd.Series(np.cumsum(direction * volume.to_numpy(dtype=np.float64)), index=close.index)
+
+
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    """True range: max(high - low, |high - prev close|, |low - prev close|)"""
+    prev_close = close.shift().to_numpy()
+    high_v = high.to_numpy(dtype=np.float64)
+    low_v = low.to_numpy(dtype=np.float64)
+    tr = np.fmax(high_v - low_v, np.fmax(np.abs(high_v - prev_close), np.abs(low_v - prev_close)))
+    return pd.Series(tr, index=high.index)
+
+
+def stochastic_k(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+    """Stochastic %K over `period` candles (NaN when the range is 0)"""
+    low_min = low.rolling(window=period).min()
+    high_max = high.rolling(window=period).max()
+    value_range = (high_max - low_min).replace(0, np.nan)
+    return 100 * ((close - low_min) / value_range)
+
+
+def rolling_std(series: pd.Series, window: int) -> pd.Series:
+    """Sample rolling standard deviation (ddof=1)"""
+    return series.rolling(window=window).std(ddof=1)
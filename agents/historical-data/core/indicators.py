@@ -10,6 +10,8 @@ import numpy as np
 from typing import Dict, List
 import logging
 
+from .indicator_kernels import obv, true_range, stochastic_k, rolling_std
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,7 +58,7 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
         
         # === Bollinger Bands ===
         df['bb_mid'] = df['close'].rolling(20).mean()
-        bb_std = df['close'].rolling(20).std()
+        bb_std = rolling_std(df['close'], 20)
         df['bb_upper'] = df['bb_mid'] + (bb_std * 2)
         df['bb_lower'] = df['bb_mid'] - (bb_std * 2)
         
@@ -73,24 +75,17 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
         df['rsi'] = 100 - (100 / (1 + rs))
         
         # === Stochastic ===
-        low_14 = df['low'].rolling(14).min()
-        high_14 = df['high'].rolling(14).max()
-        df['stoch_k'] = 100 * ((df['close'] - low_14) / (high_14 - low_14))
+        df['stoch_k'] = stochastic_k(df['high'], df['low'], df['close'], 14)
         df['stoch_d'] = df['stoch_k'].rolling(3).mean()
         
         # === ATR (Average True Range) ===
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['close'].shift())
-        low_close = abs(df['low'] - df['close'].shift())
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        df['atr'] = tr.rolling(14).mean()
+        df['atr'] = true_range(df['high'], df['low'], df['close']).rolling(14).mean()
         
         # === Volume indicators ===
         df['volume_sma'] = df['volume'].rolling(20).mean()
         
         # OBV (On Balance Volume)
-        obv = (df['volume'] * np.where(df['close'] > df['close'].shift(), 1, -1)).cumsum()
-        df['obv'] = obv
+        df['obv'] = obv(df['close'], df['volume'])
         
         logger.debug(f"Calculated {len(INDICATOR_COLUMNS)} indicators for {len(df)} candles")
         
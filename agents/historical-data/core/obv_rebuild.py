@@ -0,0 +1,98 @@
+"""
+🔁 OBV Rebuild Module - One-off recompute of the stored OBV
+
+The indicator kernels changed the historical OBV formula: the increment
+is now sign(close diff) * volume, so an unchanged close and the first
+candle add 0 (the old formula subtracted the volume for both). Rows
+saved before the change keep the old increments, and a resumed tail
+would continue them.
+
+rebuild_obv() recomputes the OBV of every stored training_data series
+from its close/volume with the current kernel, once per database (the
+OBV_MARKER row of schema_versions records it). The first stored row
+keeps its value: it carries the warmup candles that are not stored.
+OBV levels are relative anyway (a full backfill starts at 0 at its own
+warmup start), so a rebuilt series differs from a fresh full backfill
+by a constant only.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import List, Tuple
+
+import pandas as pd
+
+from .compact_schema import compact_name
+from .indicator_kernels import obv
+
+logger = logging.getLogger(__name__)
+
+OBV_MARKER = 'training_data.obv'
+OBV_VERSION = 2  # sign(diff) increments (indicator_kernels.obv)
+
+
+def obv_version(conn: sqlite3.Connection) -> int:
+    """OBV formula of the stored training_data (1 = saved before the kernels)"""
+    try:
+        row = conn.execute('SELECT version FROM schema_versions WHERE table_name = ?', (OBV_MARKER,)).fetchone()
+    except sqlite3.OperationalError:
+        return 1
+    return row[0] if row else 1
+
+
+def _rebuild_series(conn: sqlite3.Connection, table: str, symbol_id: int, tf_id: int) -> int:
+    """Recompute one series in its own transaction; returns the rows updated"""
+    df = pd.read_sql_query(
+        f'SELECT ts, close, volume, obv FROM {table} WHERE symbol_id = ? AND tf_id = ? ORDER BY ts',
+        conn, params=(symbol_id, tf_id)
+    )
+    if df.empty:
+        return 0
+    values = obv(df['close'], df['volume']).to_numpy() + df['obv'].iloc[0]
+    with conn:
+        conn.executemany(
+            f'UPDATE {table} SET obv = ? WHERE symbol_id = ? AND tf_id = ? AND ts = ?',
+            zip(values.tolist(), [symbol_id] * len(df), [tf_id] * len(df), df['ts'].tolist())
+        )
+    return len(df)
+
+
+def rebuild_obv(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """
+    Recompute the stored OBV with the current formula if not done yet.
+
+    Each series is committed on its own (an interrupted rebuild simply runs
+    again: the result does not depend on the OBV it starts from). The
+    backfill_status last_update of each series is bumped so derived copies
+    (v_xgb_training) see the change.
+
+    Returns:
+        (symbol, timeframe) of the rebuilt series (empty if already done)
+    """
+    if obv_version(conn) >= OBV_VERSION:
+        return []
+
+    table = compact_name('training_data')
+    series = conn.execute(f'''
+        SELECT s.id, t.id, s.symbol, t.timeframe FROM symbol_ids s
+        JOIN timeframe_ids t
+        WHERE EXISTS (SELECT 1 FROM {table} d WHERE d.symbol_id = s.id AND d.tf_id = t.id)
+        ORDER BY s.symbol, t.timeframe
+    ''').fetchall()
+
+    rebuilt = []
+    for symbol_id, tf_id, symbol, timeframe in series:
+        rows = _rebuild_series(conn, table, symbol_id, tf_id)
+        with conn:
+            conn.execute("UPDATE backfill_status SET last_update = datetime('now') WHERE symbol = ? AND timeframe = ?",
+                         (symbol, timeframe))
+        rebuilt.append((symbol, timeframe))
+        logger.info(f"🔁 {symbol}[{timeframe}]: OBV rebuilt ({rows:,} rows)")
+
+    with conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO schema_versions (table_name, version, migrated_at)
+            VALUES (?, ?, ?)
+        ''', (OBV_MARKER, OBV_VERSION, datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')))
+    return rebuilt
@@ -0,0 +1,174 @@
+"""
+🗄️ Parquet Lake - Columnar mirror of the training tables
+
+SQLite stays the source of truth; the lake is a derived copy laid out for
+bulk reads (training, explorers, label optimizer):
+
+    <root>/<dataset>/timeframe=<tf>/sym=<symbol key>/month=<YYYY-MM>/data.parquet
+
+Each file holds one month of one series sorted by timestamp, with the
+float columns stored as float32. Readers open the dataset memory-mapped,
+prune partitions by timeframe/symbol/month and project only the columns
+they ask for.
+
+The module has no database code and is shared verbatim by historical-data
+(core/) and frontend (database/). pyarrow is optional: without it every
+writer is a no-op and every reader returns None (callers fall back to
+SQLite).
+"""
+
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+FILE_NAME = 'data.parquet'
+
+
+def symbol_key(symbol: str) -> str:
+    """Directory-safe partition value of a symbol (BTC/USDT:USDT -> BTC_USDT_USDT)"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', symbol).strip('_')
+
+
+def series_dir(root: str, dataset: str, symbol: str, timeframe: str) -> str:
+    return os.path.join(root, dataset, f'timeframe={timeframe}', f'sym={symbol_key(symbol)}')
+
+
+def to_lake_frame(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Timestamp-indexed frame -> lake columns (timestamp, symbol, float32 values)"""
+    out = df.drop(columns=[c for c in ('symbol', 'timeframe') if c in df.columns])
+    out = out.reset_index().rename(columns={out.index.name or 'index': 'timestamp'})
+    out['timestamp'] = pd.to_datetime(out['timestamp']).astype('datetime64[ms]')
+    out.insert(1, 'symbol', symbol)
+    floats = out.select_dtypes(include=[np.floating]).columns
+    out[floats] = out[floats].astype(np.float32)
+    return out
+
+
+def write_series(root: str, dataset: str, symbol: str, timeframe: str, df: pd.DataFrame,
+                 replace: bool = False) -> int:
+    """
+    Write one series (timestamp index) into month partitions.
+
+    Months present in `df` are rewritten whole; with replace=True the
+    series directory is cleared first. Each file is written to a temporary
+    name and renamed, so readers never see a partial file.
+
+    Returns:
+        Number of month files written (0 without pyarrow)
+    """
+    if not PARQUET_AVAILABLE:
+        return 0
+    target = series_dir(root, dataset, symbol, timeframe)
+    if replace:
+        shutil.rmtree(target, ignore_errors=True)
+    if df is None or len(df) == 0:
+        return 0
+
+    frame = to_lake_frame(df, symbol)
+    written = 0
+    for month, part in frame.groupby(frame['timestamp'].dt.strftime('%Y-%m'), sort=True):
+        month_dir = os.path.join(target, f'month={month}')
+        os.makedirs(month_dir, exist_ok=True)
+        path = os.path.join(month_dir, FILE_NAME)
+        table = pa.Table.from_pandas(part.sort_values('timestamp'), preserve_index=False)
+        pq.write_table(table, f'{path}.tmp', compression='zstd')
+        os.replace(f'{path}.tmp', path)
+        written += 1
+    return written
+
+
+def drop_series(root: str, dataset: str, symbol: str = None, timeframe: str = None):
+    """Remove one series, one timeframe or the whole dataset"""
+    if symbol and timeframe:
+        path = series_dir(root, dataset, symbol, timeframe)
+    elif timeframe:
+        path = os.path.join(root, dataset, f'timeframe={timeframe}')
+    else:
+        path = os.path.join(root, dataset)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def has_dataset(root: str, dataset: str, timeframe: str) -> bool:
+    return PARQUET_AVAILABLE and os.path.isdir(os.path.join(root, dataset, f'timeframe={timeframe}'))
+
+
+def read_dataset(
+    root: str,
+    dataset: str,
+    timeframe: str,
+    symbols: Iterable[str] = None,
+    columns: List[str] = None,
+    start: datetime = None,
+    end: datetime = None
+) -> Optional[pd.DataFrame]:
+    """
+    Load a dataset for one timeframe.
+
+    Args:
+        symbols: Restrict to these symbols (partition pruning)
+        columns: Value columns to load (timestamp and symbol are always included)
+        start / end: Inclusive timestamp bounds (month pruning + row filter)
+
+    Returns:
+        DataFrame sorted by symbol, timestamp with a 'timeframe' column
+        (symbol and timeframe are categoricals), or None when pyarrow or
+        the dataset is missing
+    """
+    if not has_dataset(root, dataset, timeframe):
+        return None
+
+    path = os.path.join(root, dataset, f'timeframe={timeframe}')
+    lake = ds.dataset(path, format='parquet', partitioning='hive',
+                      filesystem=fs.LocalFileSystem(use_mmap=True), exclude_invalid_files=True)
+
+    condition = None
+    if symbols is not None:
+        condition = ds.field('sym').isin([symbol_key(s) for s in symbols])
+    if start is not None:
+        bound = (ds.field('month') >= pd.Timestamp(start).strftime('%Y-%m')) & \
+                (ds.field('timestamp') >= pa.scalar(pd.Timestamp(start), pa.timestamp('ms')))
+        condition = bound if condition is None else condition & bound
+    if end is not None:
+        bound = (ds.field('month') <= pd.Timestamp(end).strftime('%Y-%m')) & \
+                (ds.field('timestamp') <= pa.scalar(pd.Timestamp(end), pa.timestamp('ms')))
+        condition = bound if condition is None else condition & bound
+
+    names = ['timestamp', 'symbol'] + [c for c in (columns or []) if c not in ('timestamp', 'symbol')]
+    if columns is None:
+        names = [n for n in lake.schema.names if n not in ('sym', 'month')]
+    else:
+        missing = [c for c in names if c not in lake.schema.names]
+        if missing:
+            logging.warning(f"Parquet lake {dataset}/{timeframe}: missing columns {missing}")
+            names = [c for c in names if c not in missing]
+
+    df = lake.to_table(columns=names, filter=condition).to_pandas()
+    df['symbol'] = df['symbol'].astype('category')
+    df.insert(2, 'timeframe', pd.Categorical([timeframe] * len(df)))
+    return df.sort_values(['symbol', 'timestamp'], kind='stable', ignore_index=True)
+
+
+__all__ = [
+    'PARQUET_AVAILABLE',
+    'symbol_key',
+    'series_dir',
+    'write_series',
+    'drop_series',
+    'has_dataset',
+    'read_dataset',
+]
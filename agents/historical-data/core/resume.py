@@ -0,0 +1,184 @@
+"""
+♻️ Resume Module - Incremental (checkpointed) backfill
+
+Computes which parts of a requested range are missing from training_data
+(head and tail) and calculates indicators for newly fetched candles so
+they continue the stored series:
+- Rolling indicators (window <= 50) are recomputed on stored rows + new rows,
+  so a tail needs MIN_TAIL_HISTORY stored rows (fewer: full re-download)
+- EMA / MACD signal are corrected to the stored EMA state (exact for
+  ewm(adjust=False): the error of a wrong seed decays by (1 - alpha)^t)
+- OBV is offset to the stored OBV level
+
+prepare_training_frame() is the full-download counterpart.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bulk_writer import OHLCV_COLUMNS
+from .indicators import calculate_all_indicators
+
+# (start, end) - both inclusive
+DateRange = Tuple[datetime, datetime]
+
+# (column, span) of the ewm(adjust=False) indicators
+EMA_SPANS = [('ema_12', 12), ('ema_26', 26)]
+MACD_SIGNAL_SPAN = 9
+
+# Longest rolling window of calculate_all_indicators (sma_50)
+MIN_TAIL_HISTORY = 50
+
+# Indicators that must be valid when a coin was listed after the requested start
+FALLBACK_REQUIRED_INDICATORS = ['sma_20', 'sma_50', 'ema_12', 'ema_26', 'bb_upper', 'rsi', 'macd', 'atr']
+
+
+@dataclass
+class ResumePlan:
+    """What to download for one symbol/timeframe"""
+    full: bool
+    head: Optional[DateRange] = None
+    tail: Optional[DateRange] = None
+    stored_first: Optional[datetime] = None
+    stored_last: Optional[datetime] = None
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.full and self.head is None and self.tail is None
+
+
+def timeframe_to_timedelta(timeframe: str) -> timedelta:
+    """'15m' -> 15 minutes, '1h' -> 1 hour, '1d' -> 1 day"""
+    unit = {'m': 'minutes', 'h': 'hours', 'd': 'days'}[timeframe[-1]]
+    return timedelta(**{unit: int(timeframe[:-1])})
+
+
+def plan_resume(
+    timeframe: str,
+    aligned_start: datetime,
+    aligned_end: datetime,
+    stored_first: Optional[datetime],
+    stored_last: Optional[datetime],
+    covered_start: Optional[datetime] = None
+) -> ResumePlan:
+    """
+    Compute the missing head/tail ranges of [aligned_start, aligned_end].
+
+    Args:
+        stored_first / stored_last: Range currently in training_data
+        covered_start: Earliest start already requested successfully
+            (backfill_status.training_start). Stored data may begin later
+            when the coin was listed after it; no head is fetched then.
+
+    Returns:
+        ResumePlan (full=True when nothing usable is stored)
+    """
+    if stored_first is None or stored_last is None:
+        return ResumePlan(full=True)
+    if stored_last < aligned_start or stored_first > aligned_end:
+        return ResumePlan(full=True)
+
+    tf = timeframe_to_timedelta(timeframe)
+    plan = ResumePlan(full=False, stored_first=stored_first, stored_last=stored_last)
+
+    head_covered = covered_start is not None and covered_start <= aligned_start
+    if aligned_start < stored_first and not head_covered:
+        plan.head = (aligned_start, stored_first - tf)
+    if stored_last + tf <= aligned_end:
+        plan.tail = (stored_last + tf, aligned_end)
+    return plan
+
+
+def _correct_ewm(values: pd.Series, stored_first: float, span: int) -> pd.Series:
+    """Shift an ewm(adjust=False) series so its first value equals stored_first"""
+    decay = (1 - 2 / (span + 1)) ** np.arange(len(values))
+    return values + (stored_first - values.iloc[0]) * decay
+
+
+def prepare_training_frame(df: pd.DataFrame, aligned_start: datetime, aligned_end: datetime) -> pd.DataFrame:
+    """
+    Calculate indicators on the full download (incl. warmup) and trim it to
+    the aligned range. Runs in a worker process.
+
+    If the coin was listed after aligned_start, the first rows with valid
+    indicators are used instead.
+
+    Raises:
+        Exception: "No valid data available ..." when nothing usable remains
+    """
+    df = calculate_all_indicators(df)
+
+    df_aligned = df[(df.index >= aligned_start) & (df.index <= aligned_end)]
+    if df_aligned.empty:
+        existing_cols = [c for c in FALLBACK_REQUIRED_INDICATORS if c in df.columns]
+        df_valid = df.dropna(subset=existing_cols) if existing_cols else df
+        df_aligned = df_valid[df_valid.index <= aligned_end]
+
+        if df_aligned.empty:
+            raise Exception("No valid data available (coin may not be listed yet)")
+
+    return df_aligned.copy()
+
+
+def prepare_tail_frame(history: pd.DataFrame, new: pd.DataFrame, aligned_end: datetime) -> pd.DataFrame:
+    """
+    Indicators for candles after the stored range. Runs in a worker process.
+
+    Args:
+        history: Last stored rows (OHLCV + indicators, >= MIN_TAIL_HISTORY
+            rows for exact rolling windows)
+        new: Downloaded OHLCV (rows <= history's last timestamp are ignored)
+        aligned_end: Last timestamp to keep
+
+    Returns:
+        New rows only, with indicators continuing the stored series
+
+    Raises:
+        ValueError: history is shorter than MIN_TAIL_HISTORY
+    """
+    if len(history) < MIN_TAIL_HISTORY:
+        raise ValueError(f"Tail needs {MIN_TAIL_HISTORY} stored rows, got {len(history)}")
+    last = history.index.max()
+    new = new[(new.index > last) & (new.index <= aligned_end)]
+    if new.empty:
+        return new.copy()
+
+    df = calculate_all_indicators(pd.concat([history[OHLCV_COLUMNS], new[OHLCV_COLUMNS]]))
+    first = history.iloc[0]
+
+    for col, span in EMA_SPANS:
+        df[col] = _correct_ewm(df[col], first[col], span)
+    df['macd'] = df['ema_12'] - df['ema_26']
+    signal = df['macd'].ewm(span=MACD_SIGNAL_SPAN, adjust=False).mean()
+    df['macd_signal'] = _correct_ewm(signal, first['macd_signal'], MACD_SIGNAL_SPAN)
+    df['macd_hist'] = df['macd'] - df['macd_signal']
+    df['obv'] = df['obv'] + (first['obv'] - df['obv'].iloc[0])
+
+    return df[df.index > last].copy()
+
+
+def prepare_head_frame(new: pd.DataFrame, junction: pd.DataFrame, aligned_start: datetime) -> pd.DataFrame:
+    """
+    Indicators for candles before the stored range. Runs in a worker process.
+
+    Args:
+        new: Downloaded OHLCV incl. warmup (rows >= junction are ignored)
+        junction: First stored row (OHLCV + indicators)
+        aligned_start: First timestamp to keep
+
+    Returns:
+        New rows only; OBV is offset so it joins the stored OBV at the junction
+    """
+    first = junction.index.min()
+    new = new[new.index < first]
+    if new.empty:
+        return new.copy()
+
+    df = calculate_all_indicators(pd.concat([new[OHLCV_COLUMNS], junction[OHLCV_COLUMNS].iloc[:1]]))
+    df['obv'] = df['obv'] + (junction['obv'].iloc[0] - df['obv'].iloc[-1])
+
+    return df[(df.index >= aligned_start) & (df.index < first)].copy()
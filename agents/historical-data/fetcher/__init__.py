@@ -6,7 +6,11 @@ with pagination support for large date ranges.
 """
 
 from .bybit_historical import BybitHistoricalFetcher
+from .rate_limiter import TokenBucket, BybitRateLimiter, get_rate_limiter
 
 __all__ = [
     "BybitHistoricalFetcher",
+    "TokenBucket",
+    "BybitRateLimiter",
+    "get_rate_limiter",
 ]
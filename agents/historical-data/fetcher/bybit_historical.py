@@ -17,6 +17,8 @@ import ccxt.async_support as ccxt
 from termcolor import colored
 
 import config
+from .rate_limiter import BybitRateLimiter, get_rate_limiter
+from .windowed import plan_windows, fetch_windows
 
 logger = logging.getLogger(__name__)
 
@@ -50,16 +52,20 @@ class BybitHistoricalFetcher:
     Fetches historical OHLCV data from Bybit with pagination.
     
     Features:
-    - Pagination for large date ranges
+    - Pagination for large date ranges (sequential or parallel windows)
     - Rate limiting compliance
     - Progress callbacks
     - Retry logic for failed requests
+    
+    Every page request goes through the process-wide BybitRateLimiter
+    ('market' group, adaptive backoff on rate-limit responses).
     """
     
-    def __init__(self, exchange: ccxt.Exchange = None):
+    def __init__(self, exchange: ccxt.Exchange = None, rate_limiter: BybitRateLimiter = None):
         self._exchange = exchange
         self._own_exchange = False
         self.markets = None
+        self.rate_limiter = rate_limiter or get_rate_limiter(config.BYBIT_MARKET_SHARE)
     
     async def __aenter__(self):
         if self._exchange is None:
@@ -124,7 +130,8 @@ class BybitHistoricalFetcher:
         start_date: datetime = None,
         end_date: datetime = None,
         progress_callback: Callable[[DownloadProgress], None] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        parallel: bool = None
     ) -> pd.DataFrame:
         """
         Fetch historical OHLCV data with pagination.
@@ -136,6 +143,8 @@ class BybitHistoricalFetcher:
             end_date: End date (default: now)
             progress_callback: Optional callback for progress updates
             max_retries: Max retries per request
+            parallel: Fetch precomputed page windows concurrently
+                (default: config.PARALLEL_PAGINATION)
             
         Returns:
             DataFrame with all historical candles
@@ -174,15 +183,22 @@ class BybitHistoricalFetcher:
         logger.info(f"   Date range: {start_date.strftime('%Y-%m-%d')} → {end_date.strftime('%Y-%m-%d')}")
         logger.info(f"   Expected candles: ~{expected_candles:,}")
         
+        if parallel is None:
+            parallel = config.PARALLEL_PAGINATION
+        if parallel:
+            all_candles = await self._fetch_windowed(
+                symbol, timeframe, current_start_ms, end_ms, progress, progress_callback, max_retries
+            )
+            current_start_ms = end_ms  # Skip sequential loop
+        
         while current_start_ms < end_ms:
-            # Rate limiting delay
-            await asyncio.sleep(config.REQUEST_DELAY_MS / 1000)
-            
             # Retry loop
             for retry in range(max_retries):
                 try:
-                    # Fetch batch (max 1000 candles per request)
-                    ohlcv = await self._exchange.fetch_ohlcv(
+                    # Fetch batch (max 1000 candles per request, shared rate limit)
+                    ohlcv = await self.rate_limiter.call(
+                        'market',
+                        self._exchange.fetch_ohlcv,
                         symbol,
                         timeframe=timeframe,
                         since=current_start_ms,
@@ -243,11 +259,61 @@ class BybitHistoricalFetcher:
         
         return df
     
+    async def _fetch_windowed(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+        progress: DownloadProgress,
+        progress_callback: Callable[[DownloadProgress], None],
+        max_retries: int
+    ) -> List[list]:
+        """
+        Fetch all page windows of [start_ms, end_ms) concurrently
+        (at most WINDOW_CONCURRENCY requests in flight for this symbol).
+        
+        Returns:
+            Raw candles in window order (only those before the first
+            window still missing after the retries)
+        """
+        tf_ms = self._get_timeframe_ms(timeframe)
+        windows = plan_windows(start_ms, end_ms + 1, tf_ms, config.MAX_CANDLES_PER_REQUEST)  # end inclusive
+        
+        async def fetch_page(window):
+            since, until = window
+            progress.requests_made += 1
+            return await self.rate_limiter.call(
+                'market',
+                self._exchange.fetch_ohlcv,
+                symbol,
+                timeframe=timeframe,
+                since=since,
+                limit=config.MAX_CANDLES_PER_REQUEST,
+                params={'until': until - 1}
+            )
+        
+        def on_page(window, candles):
+            progress.downloaded_candles += len(candles)
+            if progress_callback:
+                progress_callback(progress)
+        
+        all_candles, missing = await fetch_windows(
+            fetch_page, windows, config.WINDOW_CONCURRENCY, max_retries, on_page
+        )
+        if missing:
+            progress.errors += len(missing)
+            logger.error(f"Failed to fetch {len(missing)}/{len(windows)} windows for {symbol}, "
+                         f"keeping the {len(all_candles):,} candles before the first missing one")
+        
+        return all_candles
+    
     async def fetch_incremental(
         self,
         symbol: str,
         timeframe: str,
-        last_timestamp: datetime
+        last_timestamp: datetime,
+        end_date: datetime = None
     ) -> pd.DataFrame:
         """
         Fetch only new candles since last_timestamp.
@@ -256,6 +322,7 @@ class BybitHistoricalFetcher:
             symbol: Trading pair symbol
             timeframe: Candle timeframe
             last_timestamp: Last known candle timestamp
+            end_date: End date (default: now)
             
         Returns:
             DataFrame with new candles only
@@ -264,7 +331,7 @@ class BybitHistoricalFetcher:
             symbol=symbol,
             timeframe=timeframe,
             start_date=last_timestamp,
-            end_date=datetime.utcnow()
+            end_date=end_date or datetime.utcnow()
         )
 
 
@@ -0,0 +1,226 @@
+"""
+⏱️ Rate Limiter Module - Bybit request budget
+
+Shared by every Bybit caller of a process (data-fetcher, historical-data and
+frontend each ship an identical copy of this file because they are built as
+separate Docker contexts).
+
+- TokenBucket: thread-safe token bucket usable from asyncio and from threads
+- BybitRateLimiter: one bucket per endpoint group with Bybit's limits,
+  adaptive backoff on 429 / retCode 10006 / 10018 and gradual recovery
+- get_rate_limiter(): process-wide instance
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Requests/second per endpoint group (Bybit v5, non-VIP)
+# - market: public market data, 600 requests / 5 s per IP (shared by all agents on the host)
+# - account: wallet balance / positions, 50 / s per UID
+# - order: create / amend / cancel / trading-stop, 10 / s per UID
+BYBIT_LIMITS: Dict[str, float] = {
+    'market': 120.0,
+    'account': 50.0,
+    'order': 10.0,
+}
+
+# Markers of a rate-limit response (HTTP 429, "Too many visits", IP limit exceeded)
+RATE_LIMIT_MARKERS = ('429', '10006', '10018', 'too many visits', 'rate limit')
+RATE_LIMIT_EXCEPTIONS = ('RateLimitExceeded', 'DDoSProtection')
+
+MIN_RATE_FACTOR = 0.1      # Never throttle below 10% of the configured rate
+RECOVERY_STEP = 0.05       # Rate factor regained per successful request
+MAX_PAUSE_SECONDS = 30.0
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations (waiters are served in call order).
+
+    Args:
+        rate: Tokens added per second (sustained requests/sec)
+        capacity: Maximum burst size (default: rate)
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        # While paused _updated lies in the future: nothing accrues until then
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` (the balance may go negative) and return the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            # The balance is back to zero at _updated + deficit / rate
+            ready_at = self._updated + max(0.0, -self._tokens) / self.rate
+            return max(0.0, ready_at - now)
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def pause(self, seconds: float):
+        """
+        Block new requests for `seconds` (requests already reserved keep their slot).
+
+        No tokens accrue during the pause, so requests queued behind it are
+        released at the bucket rate instead of all at once when it ends.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, self._paused_until)
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait (asyncio) until `tokens` are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: float = 1.0):
+        """Wait (blocking) until `tokens` are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for ccxt RateLimitExceeded / DDoSProtection or a 429 / 10006 / 10018 message"""
+    if any(cls.__name__ in RATE_LIMIT_EXCEPTIONS for cls in type(exc).__mro__):
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+class BybitRateLimiter:
+    """
+    Per-endpoint-group token buckets with AIMD backoff.
+
+    A rate-limit response halves the group's rate and pauses it
+    (1 s, 2 s, 4 s ... up to 30 s for consecutive hits); every successful
+    request restores RECOVERY_STEP of the configured rate.
+
+    Args:
+        market_share: Fraction of the per-IP market budget used by this
+            process (the agents share one IP)
+        limits: Override of BYBIT_LIMITS
+
+    Usage:
+        limiter = get_rate_limiter(market_share=0.5)
+        ohlcv = await limiter.call('market', exchange.fetch_ohlcv, symbol, '15m')
+        balance = limiter.call_sync('account', exchange.fetch_balance)
+    """
+
+    def __init__(self, market_share: float = 1.0, limits: Dict[str, float] = None):
+        self.limits = dict(limits or BYBIT_LIMITS)
+        self.limits['market'] = self.limits['market'] * market_share
+        self.buckets = {group: TokenBucket(rate) for group, rate in self.limits.items()}
+        self._factors = {group: 1.0 for group in self.limits}
+        self._strikes = {group: 0 for group in self.limits}
+        self._lock = threading.Lock()
+
+    def _bucket(self, group: str) -> TokenBucket:
+        if group not in self.buckets:
+            raise ValueError(f"Unknown endpoint group: {group} (expected one of {list(self.buckets)})")
+        return self.buckets[group]
+
+    async def acquire(self, group: str = 'market', weight: float = 1.0):
+        await self._bucket(group).acquire(weight)
+
+    def acquire_sync(self, group: str = 'market', weight: float = 1.0):
+        self._bucket(group).acquire_sync(weight)
+
+    def on_success(self, group: str):
+        """Additive recovery towards the configured rate"""
+        with self._lock:
+            self._strikes[group] = 0
+            if self._factors[group] >= 1.0:
+                return
+            self._factors[group] = min(1.0, self._factors[group] + RECOVERY_STEP)
+            factor = self._factors[group]
+        self.buckets[group].set_rate(self.limits[group] * factor)
+
+    def on_rate_limited(self, group: str) -> float:
+        """Multiplicative decrease + pause; returns the pause in seconds"""
+        bucket = self.buckets[group]
+        with self._lock:
+            remaining = bucket._paused_until - time.monotonic()
+            if remaining > 0:
+                return remaining  # Same burst of 429s, already backing off
+            self._factors[group] = max(MIN_RATE_FACTOR, self._factors[group] / 2)
+            pause = min(MAX_PAUSE_SECONDS, 2.0 ** self._strikes[group])
+            self._strikes[group] += 1
+            factor = self._factors[group]
+            bucket.pause(pause)
+        bucket.set_rate(self.limits[group] * factor)
+        logger.warning(f"⏳ Bybit rate limit hit [{group}]: {bucket.rate:.1f} req/s, pausing {pause:.1f}s")
+        return pause
+
+    def current_rate(self, group: str) -> float:
+        return self._bucket(group).rate
+
+    async def call(self, group: str, func: Callable, *args, retries: int = 3, weight: float = 1.0, **kwargs):
+        """
+        Await `func(*args, **kwargs)` under the group's budget.
+
+        Rate-limit errors are retried (after the backoff pause) up to
+        `retries` times; other errors are raised unchanged.
+        """
+        for attempt in range(retries + 1):
+            await self.acquire(group, weight)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == retries:
+                    raise
+                self.on_rate_limited(group)
+                continue
+            self.on_success(group)
+            return result
+
+    def call_sync(self, group: str, func: Callable, *args, retries: int = 3, weight: float = 1.0, **kwargs):
+        """Blocking variant of call() for synchronous ccxt clients"""
+        for attempt in range(retries + 1):
+            self.acquire_sync(group, weight)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == retries:
+                    raise
+                self.on_rate_limited(group)
+                continue
+            self.on_success(group)
+            return result
+
+
+_limiter: Optional[BybitRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(market_share: float = 1.0) -> BybitRateLimiter:
+    """Process-wide limiter (market_share is used on first call only)"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = BybitRateLimiter(market_share=market_share)
+    return _limiter
@@ -0,0 +1,107 @@
+"""
+🪟 Windowed Pagination Module
+
+Splits a date range into fixed page windows (candle boundaries are known
+from the timeframe), fetches them concurrently, merges the pages and
+re-fetches only the windows that are missing. Windows still missing
+after the retries cut the result: only the candles before the first one
+are returned, so a download never has a hole in the middle (resume can
+refill a missing tail, not an interior gap).
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (since_ms, until_ms) - until is exclusive
+Window = Tuple[int, int]
+
+
+def plan_windows(start_ms: int, end_ms: int, tf_ms: int, page_size: int) -> List[Window]:
+    """
+    Split [start_ms, end_ms) into windows of at most `page_size` candles.
+
+    start_ms is rounded up to the next candle open time (the first candle
+    with timestamp >= start_ms), so windows start on candle boundaries.
+    """
+    start_ms += -start_ms % tf_ms
+    span = tf_ms * page_size
+    return [(since, min(since + span, end_ms)) for since in range(start_ms, end_ms, span)]
+
+
+def find_retry_windows(windows: List[Window], pages: Dict[Window, Optional[list]]) -> List[Window]:
+    """
+    Windows that must be fetched again.
+
+    A window is retried when its request failed (page is None), or when it
+    came back empty although earlier and later windows have data (a hole in
+    the middle of the history). Empty windows before the first or after the
+    last window with data are expected (coin listed later / no newer data).
+    """
+    with_data = [i for i, w in enumerate(windows) if pages.get(w)]
+    first = with_data[0] if with_data else len(windows)
+    last = with_data[-1] if with_data else -1
+
+    retry = []
+    for i, window in enumerate(windows):
+        page = pages.get(window)
+        if page is None:
+            retry.append(window)
+        elif not page and first < i < last:
+            retry.append(window)
+    return retry
+
+
+async def fetch_windows(
+    fetch_page: Callable[[Window], "asyncio.Future"],
+    windows: List[Window],
+    concurrency: int,
+    max_retries: int = 3,
+    on_page: Callable[[Window, list], None] = None
+) -> Tuple[List[list], List[Window]]:
+    """
+    Fetch all windows with at most `concurrency` requests in flight.
+
+    Args:
+        fetch_page: Coroutine function returning the candles of one window
+        windows: Windows from plan_windows()
+        concurrency: Max parallel requests for this symbol
+        max_retries: Fetch rounds (the first round included)
+        on_page: Optional callback after each successful page
+
+    Returns:
+        Tuple of (candles of the windows before the first missing one, in
+        order; windows still missing)
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    pages: Dict[Window, Optional[list]] = {}
+
+    async def fetch_one(window: Window):
+        async with semaphore:
+            try:
+                candles = await fetch_page(window)
+            except Exception as e:
+                logger.warning(f"Window {window[0]}-{window[1]} failed: {e}")
+                pages[window] = None
+                return
+        since, until = window
+        pages[window] = [c for c in candles or [] if since <= c[0] < until]
+        if on_page:
+            on_page(window, pages[window])
+
+    pending = windows
+    for attempt in range(max_retries):
+        if attempt > 0:
+            logger.info(f"   Retrying {len(pending)} missing windows ({attempt}/{max_retries - 1})")
+            await asyncio.sleep(1)  # Wait before retry
+        await asyncio.gather(*(fetch_one(w) for w in pending))
+        pending = find_retry_windows(windows, pages)
+        if not pending:
+            break
+
+    # Stop at the first missing window: later candles would leave an interior gap
+    cut = windows.index(pending[0]) if pending else len(windows)
+    candles = [c for w in windows[:cut] for c in pages.get(w) or []]
+    return candles, pending
@@ -4,10 +4,11 @@
 Downloads OHLCV + indicators for ML training with:
 - Date alignment between 15m and 1h timeframes
 - No NULL values (warmup candles are fetched but discarded)
-- Manual trigger from frontend (no auto-update)
+- Manual trigger from frontend (no auto-update): the agent sleeps on the
+  'backfill_requested' event (core.event_bus) published by the dashboard
 
 Usage:
-    python main.py              # Wait for trigger file
+    python main.py              # Wait for a backfill_requested event
     python main.py --status     # Show current status
 """
 
@@ -17,17 +18,17 @@ import logging
 import signal
 import sys
 import time
-import json
 from datetime import datetime, timedelta
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Tuple
 
 from termcolor import colored
 
 import config
-from core.database import TrainingDatabase, BackfillStatus, get_aligned_date_range, WARMUP_CANDLES
-from core.indicators import calculate_all_indicators, INDICATOR_COLUMNS
-from fetcher.bybit_historical import BybitHistoricalFetcher, print_download_progress
+from core.database import TrainingDatabase, get_aligned_date_range, WARMUP_CANDLES
+from core.event_bus import BACKFILL_REQUESTED, EventSubscriber
+from fetcher.bybit_historical import BybitHistoricalFetcher
+from backfill_scheduler import BackfillScheduler, export_lake
 
 # Configure logging
 logging.basicConfig(
@@ -39,13 +40,17 @@ logger = logging.getLogger(__name__)
 # Global flag for graceful shutdown
 shutdown_requested = False
 
+# Subscriber the main loop sleeps on (woken by the signal handler)
+event_subscriber: Optional[EventSubscriber] = None
+
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
     global shutdown_requested
     logger.info("🛑 Shutdown requested...")
     shutdown_requested = True
-
+    if event_subscriber is not None:
+        event_subscriber.interrupt()
 
 # Target number of successful downloads per timeframe
 TARGET_SUCCESSFUL_DOWNLOADS = 100
@@ -59,6 +64,7 @@ class TrainingDataAgent:
     - Downloads OHLCV + 16 technical indicators
     - Aligns dates between 15m and 1h timeframes  
     - Discards warmup candles (no NULL values in final data)
+    - Downloads MAX_CONCURRENT_REQUESTS symbols in parallel (shared rate limit)
     - Stops at TARGET_SUCCESSFUL_DOWNLOADS (100) per timeframe
     - Skips coins without historical data (SKIPPED status, not ERROR)
     """
@@ -111,155 +117,45 @@ class TrainingDataAgent:
                 self.db.init_backfill_status(symbol, tf)
         print(colored(f"   ✅ Initialized {len(symbols) * len(timeframes)} records", "green"))
         
-        async with BybitHistoricalFetcher() as fetcher:
-            await fetcher.load_markets()
-            
-            for tf in timeframes:
-                print(colored(f"\n⏰ TIMEFRAME: {tf}", "magenta", attrs=['bold']))
-                print(colored("-"*50, "magenta"))
+        with ProcessPoolExecutor(max_workers=config.INDICATOR_WORKERS) as process_pool:
+            async with BybitHistoricalFetcher() as fetcher:
+                await fetcher.load_markets()
                 
-                # Calculate warmup for this timeframe
-                if tf == '15m':
-                    # 200 candles × 15 min = 3000 min = 50 hours
-                    tf_warmup_start = aligned_start - timedelta(minutes=WARMUP_CANDLES * 15)
-                else:
-                    # 200 candles × 60 min = 12000 min = 200 hours
-                    tf_warmup_start = warmup_start
+                scheduler = BackfillScheduler(
+                    db=self.db,
+                    fetcher=fetcher,
+                    process_pool=process_pool,
+                    concurrency=config.MAX_CONCURRENT_REQUESTS,
+                    should_stop=lambda: shutdown_requested
+                )
                 
-                # Track successful downloads for this timeframe
-                tf_successful = 0
-                tf_skipped = 0
-                
-                for i, symbol in enumerate(symbols):
-                    if shutdown_requested:
-                        logger.info("🛑 Shutdown requested, stopping download...")
-                        return
+                for tf in timeframes:
+                    print(colored(f"\n⏰ TIMEFRAME: {tf}", "magenta", attrs=['bold']))
+                    print(colored("-"*50, "magenta"))
                     
-                    # Stop if we reached TARGET (100 successful downloads)
-                    if tf_successful >= TARGET_SUCCESSFUL_DOWNLOADS:
-                        print(colored(f"\n✅ Reached {TARGET_SUCCESSFUL_DOWNLOADS} successful downloads for {tf}. Moving to next timeframe.", "green", attrs=['bold']))
-                        
-                        # Mark remaining symbols as SKIPPED (target reached)
-                        remaining_symbols = symbols[i:]
-                        for remaining_symbol in remaining_symbols:
-                            self.db.update_backfill_status(
-                                symbol=remaining_symbol,
-                                timeframe=tf,
-                                status=BackfillStatus.SKIPPED,
-                                error_message="Target 100 reached - not processed"
-                            )
-                        print(colored(f"   ⏭️ Marked {len(remaining_symbols)} remaining symbols as SKIPPED", "yellow"))
-                        break
+                    # Calculate warmup for this timeframe
+                    if tf == '15m':
+                        # 200 candles × 15 min = 3000 min = 50 hours
+                        tf_warmup_start = aligned_start - timedelta(minutes=WARMUP_CANDLES * 15)
+                    else:
+                        # 200 candles × 60 min = 12000 min = 200 hours
+                        tf_warmup_start = warmup_start
                     
-                    # Initialize backfill status
-                    self.db.init_backfill_status(symbol, tf)
-                    
-                    # Update status to IN_PROGRESS
-                    self.db.update_backfill_status(
-                        symbol=symbol,
+                    # Up to MAX_CONCURRENT_REQUESTS symbols in flight, stops at TARGET successes
+                    tf_stats = await scheduler.run_timeframe(
+                        symbols=symbols,
                         timeframe=tf,
-                        status=BackfillStatus.IN_PROGRESS
+                        warmup_start=tf_warmup_start,
+                        aligned_start=aligned_start,
+                        aligned_end=aligned_end,
+                        target=TARGET_SUCCESSFUL_DOWNLOADS
                     )
+                    successful += tf_stats['successful']
+                    failed += tf_stats['failed']
+                    total_candles_saved += tf_stats['candles']
                     
-                    try:
-                        print(colored(f"\n[{i+1}/{len(symbols)}] {symbol} (success: {tf_successful}/{TARGET_SUCCESSFUL_DOWNLOADS})", "yellow"))
-                        
-                        # Download with warmup (extra candles before aligned_start)
-                        df = await fetcher.fetch_historical_ohlcv(
-                            symbol=symbol,
-                            timeframe=tf,
-                            start_date=tf_warmup_start,
-                            end_date=aligned_end,
-                            progress_callback=print_download_progress
-                        )
-                        
-                        if df is None or df.empty:
-                            raise Exception("No data received")
-                        
-                        print(colored(f"   📊 Downloaded {len(df):,} candles (incl. warmup)", "cyan"))
-                        
-                        # Calculate technical indicators on FULL data (including warmup)
-                        print(colored(f"   📐 Calculating {len(INDICATOR_COLUMNS)} indicators...", "cyan"))
-                        df = calculate_all_indicators(df)
-                        
-                        # Trim to aligned range (discard warmup - they have NULL indicators anyway)
-                        df_aligned = df[df.index >= aligned_start].copy()
-                        df_aligned = df_aligned[df_aligned.index <= aligned_end].copy()
-                        
-                        # If no data in aligned range (coin listed after start_date), use available data
-                        if df_aligned.empty:
-                            # Use all data after warmup period (first ~200 candles may have NULL indicators)
-                            # Find the first row without NULL indicators
-                            indicator_cols = ['sma_20', 'sma_50', 'ema_12', 'ema_26', 'bb_upper', 'rsi', 'macd', 'atr']
-                            existing_cols = [c for c in indicator_cols if c in df.columns]
-                            
-                            if existing_cols:
-                                df_valid = df.dropna(subset=existing_cols)
-                            else:
-                                df_valid = df.copy()
-                            
-                            # Filter to end date only
-                            df_aligned = df_valid[df_valid.index <= aligned_end].copy()
-                            
-                            if df_aligned.empty:
-                                raise Exception("No valid data available (coin may not be listed yet)")
-                            
-                            actual_start = df_aligned.index.min()
-                            print(colored(f"   ⚠️ Coin listed after {aligned_start.strftime('%Y-%m-%d')}, using data from {actual_start.strftime('%Y-%m-%d')}", "yellow"))
-                        
-                        # Clear old data for this symbol/timeframe
-                        self.db.clear_training_data(symbol, tf)
-                        
-                        # Save to database (will skip rows with NULL indicators)
-                        saved = self.db.save_training_data(symbol, tf, df_aligned)
-                        
-                        print(colored(f"   ✅ Saved {saved:,} candles (no NULL values)", "green"))
-                        
-                        # Update backfill status to COMPLETE
-                        self.db.update_backfill_status(
-                            symbol=symbol,
-                            timeframe=tf,
-                            status=BackfillStatus.COMPLETE,
-                            oldest_timestamp=df_aligned.index.min(),
-                            newest_timestamp=df_aligned.index.max(),
-                            total_candles=saved,
-                            training_candles=saved,
-                            completeness_pct=100.0
-                        )
-                        
-                        successful += 1
-                        tf_successful += 1  # Track per-timeframe success
-                        total_candles_saved += saved
-                        
-                    except Exception as e:
-                        error_msg = str(e)
-                        
-                        # Determine if this is a "no data" issue (SKIPPED) or actual error (ERROR)
-                        no_data_keywords = ["No valid data", "No data received", "may not be listed"]
-                        is_no_data = any(kw.lower() in error_msg.lower() for kw in no_data_keywords)
-                        
-                        if is_no_data:
-                            # SKIPPED - Coin doesn't have historical data (not an error)
-                            print(colored(f"   ⏭️ {symbol}[{tf}]: Skipped (no historical data)", "yellow"))
-                            self.db.update_backfill_status(
-                                symbol=symbol,
-                                timeframe=tf,
-                                status=BackfillStatus.SKIPPED,
-                                error_message=error_msg[:200]
-                            )
-                            # Remove from top_symbols to clean up dashboard
-                            self.db.remove_from_top_symbols(symbol)
-                            tf_skipped += 1
-                        else:
-                            # ERROR - Actual technical error
-                            logger.error(f"❌ {symbol}[{tf}]: {error_msg}")
-                            self.db.update_backfill_status(
-                                symbol=symbol,
-                                timeframe=tf,
-                                status=BackfillStatus.ERROR,
-                                error_message=error_msg[:200]
-                            )
-                            failed += 1
+                    if tf_stats['stopped']:
+                        return
         
         total_duration = time.time() - total_start
         
@@ -272,6 +168,11 @@ class TrainingDataAgent:
         print(colored(f"  ⏱️ Duration: {total_duration/60:.1f} minutes", "white"))
         print(colored("="*70, "cyan", attrs=['bold']))
         
+        # Consistency check of the table_stats counters after the bulk writes
+        check = self.db.check_table_stats()
+        if check['mismatched']:
+            logger.warning(f"📏 table_stats: {check['mismatched']} series repaired")
+        
         # Print database stats
         self.db.print_stats()
     
@@ -311,43 +212,26 @@ class TrainingDataAgent:
         self.db.print_stats()
 
 
-def wait_for_trigger_file() -> Tuple[bool, Optional[str], Optional[str]]:
+def wait_for_backfill_request(subscriber: EventSubscriber) -> Tuple[bool, Optional[str], Optional[str]]:
     """
-    Wait for trigger file from frontend.
+    Wait for a backfill_requested event from the frontend.
     
     Returns:
         Tuple of (found, start_date, end_date)
     """
-    trigger_path = Path(config.TRIGGER_FILE_PATH)
-    
-    logger.info(f"⏳ Waiting for trigger file: {trigger_path}")
+    logger.info(f"⏳ Waiting for '{BACKFILL_REQUESTED}' event")
     logger.info("   (Click 'Start Download' in frontend to begin)")
     
     while not shutdown_requested:
-        if trigger_path.exists():
-            logger.info(f"✅ Trigger file found! Reading configuration...")
-            
-            start_date = None
-            end_date = None
-            
-            try:
-                content = trigger_path.read_text()
-                trigger_data = json.loads(content)
-                start_date = trigger_data.get('start_date')
-                end_date = trigger_data.get('end_date')
-                logger.info(f"   📅 Date range: {start_date} → {end_date}")
-            except Exception as e:
-                logger.warning(f"Could not parse trigger file: {e}")
-            
-            # Delete trigger file after reading
-            try:
-                trigger_path.unlink()
-            except:
-                pass
-            
+        # No timeout: a signal interrupts the wait (returns [])
+        events = subscriber.wait()
+        if events:
+            # Several clicks while a download was running: the newest range wins
+            payload = events[-1].payload
+            start_date = payload.get('start_date')
+            end_date = payload.get('end_date')
+            logger.info(f"✅ Backfill requested! 📅 Date range: {start_date} → {end_date}")
             return True, start_date, end_date
-        
-        time.sleep(2)  # Check every 2 seconds
     
     return False, None, None
 
@@ -371,11 +255,23 @@ async def main():
         agent.print_status()
         return
     
-    # Main loop: wait for trigger file
+    # One-off: OBV saved before the indicator kernels is recomputed (core.obv_rebuild)
+    rebuilt = agent.db.rebuild_obv()
+    for symbol, timeframe in rebuilt:
+        export_lake(agent.db, symbol, timeframe)
+    if rebuilt:
+        logger.info(f"🔁 OBV rebuilt with the current formula for {len(rebuilt)} series")
+    
+    # Durable subscriber: a request published while the agent was down is handled on start
+    global event_subscriber
+    subscriber = EventSubscriber(agent.db.db_path, [BACKFILL_REQUESTED], name='historical-data')
+    event_subscriber = subscriber
+    
+    # Main loop: wait for backfill requests
     while not shutdown_requested:
         logger.info("⏳ Waiting for download trigger from frontend...")
         
-        found, start_date, end_date = wait_for_trigger_file()
+        found, start_date, end_date = wait_for_backfill_request(subscriber)
         
         if not found:
             break  # Shutdown requested
@@ -411,6 +307,8 @@ async def main():
         )
         
         logger.info("📦 Download complete. Waiting for next trigger...")
+    
+    subscriber.close()
 
 
 if __name__ == "__main__":
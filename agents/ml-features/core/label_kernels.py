@@ -0,0 +1,151 @@
+"""
+⚙️ Label Kernels - Batch trailing-stop simulation
+
+Vectorized counterpart of core.label_reference.simulate_long /
+simulate_short: every entry of a series is simulated at once, for both sides.
+The loop runs over the max_bars future offsets instead of over the
+entries; at offset j each array op covers all entries, reading the
+contiguous slice high[i + 1 + j] of every entry i (a sliding window
+without materializing the entries × max_bars matrix).
+
+- running extremes seeded with the entry price, as in the loop
+- an entry is closed at the first offset whose low / high crosses its
+  trailing level (MFE / MAE taken from the extremes at that bar); the
+  ones still open after max_bars exit on time at the last close
+- stops early once every entry of the block is closed
+
+Same float operations in the same order as the Python loop, so results
+are bit-identical (scripts/check_label_kernel.py). Entries are processed
+in blocks of `chunk_rows`, which also paces the progress callback.
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# exit_type codes (EXIT_TYPE_NAMES[code + 1] gives the label text)
+EXIT_INVALID = -1
+EXIT_TIME = 0
+EXIT_TRAILING = 1
+EXIT_TYPE_NAMES = np.array(['invalid', 'time', 'trailing'], dtype=object)
+
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def exit_type_names(codes: np.ndarray) -> np.ndarray:
+    """int8 exit_type codes → object array of 'trailing' / 'time' / 'invalid'"""
+    return EXIT_TYPE_NAMES[codes.astype(np.int64) + 1]
+
+
+def _empty_side(n: int) -> Dict[str, np.ndarray]:
+    return {
+        'exit_price': np.full(n, np.nan),
+        'bars_held': np.full(n, -1, dtype=np.int32),
+        'exit_type': np.full(n, EXIT_INVALID, dtype=np.int8),
+        'mfe': np.full(n, np.nan),
+        'mae': np.full(n, np.nan),
+    }
+
+
+def _simulate_side(high, low, close, start, stop, max_bars, trailing_stop_pct, long_side: bool):
+    """Entries start..stop-1 of one side (arrays are the whole series)"""
+    entry = close[start:stop]
+    k = len(entry)
+    highest = entry.copy()
+    lowest = entry.copy()
+    exit_price = np.full(k, np.nan)
+    bars_held = np.full(k, max_bars, dtype=np.int32)
+    exit_type = np.full(k, EXIT_TIME, dtype=np.int8)
+    high_at_exit = np.empty(k)
+    low_at_exit = np.empty(k)
+    open_ = np.ones(k, dtype=bool)
+
+    for j in range(max_bars):
+        bar_high = high[start + 1 + j: stop + 1 + j]
+        bar_low = low[start + 1 + j: stop + 1 + j]
+        np.maximum(highest, bar_high, out=highest)
+        np.minimum(lowest, bar_low, out=lowest)
+
+        if long_side:
+            level = highest * (1 - trailing_stop_pct)
+            hit = bar_low <= level
+        else:
+            level = lowest * (1 + trailing_stop_pct)
+            hit = bar_high >= level
+        hit &= open_
+
+        closed = np.flatnonzero(hit)
+        if len(closed):
+            exit_price[closed] = level[closed]
+            bars_held[closed] = j + 1
+            exit_type[closed] = EXIT_TRAILING
+            high_at_exit[closed] = highest[closed]
+            low_at_exit[closed] = lowest[closed]
+            open_[closed] = False
+            if not open_.any():
+                break
+
+    # Time exit at the close of the last bar of the window
+    still_open = np.flatnonzero(open_)
+    exit_price[still_open] = close[start + max_bars + still_open]
+    high_at_exit[still_open] = highest[still_open]
+    low_at_exit[still_open] = lowest[still_open]
+
+    if long_side:
+        mfe = (high_at_exit - entry) / entry
+        mae = (entry - low_at_exit) / entry
+    else:
+        mfe = (entry - low_at_exit) / entry
+        mae = (high_at_exit - entry) / entry
+    return exit_price, bars_held, exit_type, mfe, mae
+
+
+def trailing_stop_kernel(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    trailing_stop_pct: float,
+    max_bars: int,
+    chunk_rows: int = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Simulate LONG and SHORT trailing-stop trades from every candle close.
+
+    Entry i uses the candles i+1 .. i+max_bars; the last max_bars entries
+    (incomplete future window) are returned as invalid.
+
+    Args:
+        high, low, close: Price arrays of one series
+        trailing_stop_pct: Trailing stop (e.g. 0.015 for 1.5%)
+        max_bars: Maximum bars held
+        chunk_rows: Entries simulated per vectorized block (default DEFAULT_CHUNK_ROWS)
+        progress_callback: Called with (entries_done, entries_total) after each block
+
+    Returns:
+        {'long': side, 'short': side}, each side a dict of length-n arrays:
+        exit_price (float64), bars_held (int32, -1 invalid), exit_type (int8
+        EXIT_* code), mfe, mae (float64)
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    result = {'long': _empty_side(n), 'short': _empty_side(n)}
+
+    valid = n - max_bars
+    if valid <= 0 or max_bars <= 0:
+        return result
+    chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+
+    for start in range(0, valid, chunk_rows):
+        stop = min(start + chunk_rows, valid)
+        for side, long_side in (('long', True), ('short', False)):
+            out = result[side]
+            (out['exit_price'][start:stop], out['bars_held'][start:stop], out['exit_type'][start:stop],
+             out['mfe'][start:stop], out['mae'][start:stop]) = _simulate_side(
+                high, low, close, start, stop, max_bars, trailing_stop_pct, long_side)
+        if progress_callback:
+            progress_callback(stop, valid)
+
+    return result
@@ -0,0 +1,187 @@
+"""
+🐢 Trailing Stop Label Reference - Per-bar Python simulation
+
+The original loops of TrailingStopLabeler, kept as the reference the
+vectorized kernel (core.label_kernels) is checked against
+(scripts/check_label_kernel.py):
+
+- simulate_long() / simulate_short(): one trade, one bar at a time
+- label_arrays_reference(): every entry of one series, one trade at a time
+
+TrailingStopLabeler.generate_labels_for_timeframe(use_kernel=False)
+delegates here.
+"""
+
+from math import log
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def score(realized_return: float, bars_held: int, time_penalty_lambda: float, trading_cost: float) -> float:
+    """score = R - λ*log(1+D) - costs"""
+    return realized_return - time_penalty_lambda * log(1 + bars_held) - trading_cost
+
+
+def simulate_long(
+    entry_price: float,
+    high_prices: np.ndarray,
+    low_prices: np.ndarray,
+    close_prices: np.ndarray,
+    trailing_stop_pct: float,
+    max_bars: int
+) -> Tuple[float, int, str, float, float]:
+    """
+    Simulate a LONG trade with trailing stop.
+
+    The trailing stop tracks the highest price seen and exits when
+    price drops by trailing_stop_pct from that high.
+
+    Args:
+        entry_price: Entry price (close of entry candle)
+        high_prices: Array of high prices after entry
+        low_prices: Array of low prices after entry
+        close_prices: Array of close prices after entry
+        trailing_stop_pct: Trailing stop percentage (e.g., 0.015 for 1.5%)
+        max_bars: Maximum bars to hold
+
+    Returns:
+        Tuple of (exit_price, bars_held, exit_type, mfe, mae)
+        - exit_type: 'trailing' or 'time'
+        - mfe / mae: Maximum Favorable / Adverse Excursion up to the exit
+    """
+    n_bars = min(len(high_prices), max_bars)
+
+    highest_seen = entry_price
+    lowest_seen = entry_price
+
+    for i in range(n_bars):
+        # Highest seen drives the trailing level, lowest seen the MAE
+        if high_prices[i] > highest_seen:
+            highest_seen = high_prices[i]
+        if low_prices[i] < lowest_seen:
+            lowest_seen = low_prices[i]
+
+        trailing_level = highest_seen * (1 - trailing_stop_pct)
+
+        if low_prices[i] <= trailing_level:
+            mfe = (highest_seen - entry_price) / entry_price
+            mae = (entry_price - lowest_seen) / entry_price
+            return trailing_level, i + 1, 'trailing', mfe, mae
+
+    # Time exit (max bars reached)
+    exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
+    mfe = (highest_seen - entry_price) / entry_price
+    mae = (entry_price - lowest_seen) / entry_price
+
+    return exit_price, n_bars, 'time', mfe, mae
+
+
+def simulate_short(
+    entry_price: float,
+    high_prices: np.ndarray,
+    low_prices: np.ndarray,
+    close_prices: np.ndarray,
+    trailing_stop_pct: float,
+    max_bars: int
+) -> Tuple[float, int, str, float, float]:
+    """
+    Simulate a SHORT trade with trailing stop (mirror of simulate_long).
+
+    The trailing stop tracks the lowest price seen and exits when
+    price rises by trailing_stop_pct from that low.
+
+    Returns:
+        Tuple of (exit_price, bars_held, exit_type, mfe, mae)
+    """
+    n_bars = min(len(high_prices), max_bars)
+
+    lowest_seen = entry_price
+    highest_seen = entry_price
+
+    for i in range(n_bars):
+        # Lowest seen drives the trailing level (SHORT profits when price goes down)
+        if low_prices[i] < lowest_seen:
+            lowest_seen = low_prices[i]
+        if high_prices[i] > highest_seen:
+            highest_seen = high_prices[i]
+
+        # For SHORT the stop is above
+        trailing_level = lowest_seen * (1 + trailing_stop_pct)
+
+        if high_prices[i] >= trailing_level:
+            mfe = (entry_price - lowest_seen) / entry_price
+            mae = (highest_seen - entry_price) / entry_price
+            return trailing_level, i + 1, 'trailing', mfe, mae
+
+    # Time exit (max bars reached)
+    exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
+    mfe = (entry_price - lowest_seen) / entry_price
+    mae = (highest_seen - entry_price) / entry_price
+
+    return exit_price, n_bars, 'time', mfe, mae
+
+
+def label_arrays_reference(
+    df: pd.DataFrame,
+    timeframe: str,
+    trailing_stop_pct: float,
+    max_bars: int,
+    time_penalty_lambda: float,
+    trading_cost: float,
+    progress_callback: Callable = None
+) -> Dict[str, np.ndarray]:
+    """
+    Label columns of one series, one Python simulation per entry and side.
+
+    Returns:
+        {'<name>_<side>': array} for score, realized_return, mfe, mae,
+        bars_held and exit_type ('invalid' on the last max_bars rows)
+    """
+    close = df['close'].values
+    high = df['high'].values
+    low = df['low'].values
+
+    n = len(df)
+
+    columns = {
+        f'{name}_{side}': np.full(n, np.nan)
+        for name in ('score', 'realized_return', 'mfe', 'mae', 'bars_held') for side in ('long', 'short')
+    }
+    columns['exit_type_long'] = np.empty(n, dtype=object)
+    columns['exit_type_short'] = np.empty(n, dtype=object)
+
+    # Process each bar (skip last max_bars - not enough future data)
+    valid_range = n - max_bars
+
+    for i in range(valid_range):
+        if progress_callback and i % 1000 == 0:
+            progress_callback(i, valid_range, timeframe)
+
+        entry_price = close[i]
+        future = (high[i + 1: i + 1 + max_bars], low[i + 1: i + 1 + max_bars], close[i + 1: i + 1 + max_bars])
+
+        for side, simulate in (('long', simulate_long), ('short', simulate_short)):
+            exit_price, bars, exit_type, mfe, mae = simulate(entry_price, *future, trailing_stop_pct, max_bars)
+
+            # Realized return (SHORT profits when price goes down)
+            if side == 'long':
+                r = (exit_price - entry_price) / entry_price
+            else:
+                r = (entry_price - exit_price) / entry_price
+
+            columns[f'score_{side}'][i] = score(r, bars, time_penalty_lambda, trading_cost)
+            columns[f'realized_return_{side}'][i] = r
+            columns[f'mfe_{side}'][i] = mfe
+            columns[f'mae_{side}'][i] = mae
+            columns[f'bars_held_{side}'][i] = bars
+            columns[f'exit_type_{side}'][i] = exit_type
+
+    # Mark last bars as invalid
+    columns['exit_type_long'][max(valid_range, 0):] = 'invalid'
+    columns['exit_type_short'][max(valid_range, 0):] = 'invalid'
+    return columns
+
+
+__all__ = ['simulate_long', 'simulate_short', 'label_arrays_reference', 'score']
@@ -12,16 +12,23 @@ IMPORTANTE:
 - Servono SOLO per l'addestramento supervisionato
 - MFE/MAE sono diagnostica, NON entrano nello score
 
+generate_labels_for_timeframe() uses the vectorized kernel of
+core.label_kernels by default; use_kernel=False runs the per-bar Python
+loop of core.label_reference, the reference for the kernel.
+
 Reference: Custom implementation for trailing stop based labeling
 """
 
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional, Dict, List
+from typing import Dict, List
 from dataclasses import dataclass
 import logging
 from math import log
 
+from .label_kernels import trailing_stop_kernel, exit_type_names
+from .label_reference import label_arrays_reference
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,180 +106,12 @@ class TrailingStopLabeler:
         """
         self.config = config or TrailingLabelConfig()
     
-    def _simulate_trailing_stop_long(
-        self,
-        entry_price: float,
-        high_prices: np.ndarray,
-        low_prices: np.ndarray,
-        close_prices: np.ndarray,
-        trailing_stop_pct: float,
-        max_bars: int
-    ) -> Tuple[float, int, str, float, float]:
-        """
-        Simulate a LONG trade with trailing stop.
-        
-        The trailing stop tracks the highest price seen and exits when
-        price drops by trailing_stop_pct from that high.
-        
-        Args:
-            entry_price: Entry price (close of entry candle)
-            high_prices: Array of high prices after entry
-            low_prices: Array of low prices after entry
-            close_prices: Array of close prices after entry
-            trailing_stop_pct: Trailing stop percentage (e.g., 0.015 for 1.5%)
-            max_bars: Maximum bars to hold
-        
-        Returns:
-            Tuple of (exit_price, bars_held, exit_type, mfe, mae)
-            - exit_price: Price at exit
-            - bars_held: Number of bars held
-            - exit_type: 'trailing' or 'time'
-            - mfe: Maximum Favorable Excursion (highest profit %)
-            - mae: Maximum Adverse Excursion (worst drawdown %)
-        """
-        n_bars = min(len(high_prices), max_bars)
-        
-        highest_seen = entry_price
-        lowest_seen = entry_price
-        
-        for i in range(n_bars):
-            # Update highest seen (for trailing)
-            if high_prices[i] > highest_seen:
-                highest_seen = high_prices[i]
-            
-            # Update lowest seen (for MAE)
-            if low_prices[i] < lowest_seen:
-                lowest_seen = low_prices[i]
-            
-            # Calculate trailing stop level
-            trailing_level = highest_seen * (1 - trailing_stop_pct)
-            
-            # Check if trailing stop hit
-            if low_prices[i] <= trailing_level:
-                # Exit at trailing level
-                exit_price = trailing_level
-                bars_held = i + 1
-                exit_type = 'trailing'
-                
-                # Calculate MFE/MAE up to exit point only
-                mfe = (highest_seen - entry_price) / entry_price
-                mae = (entry_price - lowest_seen) / entry_price
-                
-                return exit_price, bars_held, exit_type, mfe, mae
-        
-        # Time exit (max bars reached)
-        exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
-        bars_held = n_bars
-        exit_type = 'time'
-        
-        # Calculate MFE/MAE up to exit point only
-        mfe = (highest_seen - entry_price) / entry_price
-        mae = (entry_price - lowest_seen) / entry_price
-        
-        return exit_price, bars_held, exit_type, mfe, mae
-    
-    def _simulate_trailing_stop_short(
-        self,
-        entry_price: float,
-        high_prices: np.ndarray,
-        low_prices: np.ndarray,
-        close_prices: np.ndarray,
-        trailing_stop_pct: float,
-        max_bars: int
-    ) -> Tuple[float, int, str, float, float]:
-        """
-        Simulate a SHORT trade with trailing stop.
-        
-        The trailing stop tracks the lowest price seen and exits when
-        price rises by trailing_stop_pct from that low.
-        
-        Args:
-            entry_price: Entry price (close of entry candle)
-            high_prices: Array of high prices after entry
-            low_prices: Array of low prices after entry
-            close_prices: Array of close prices after entry
-            trailing_stop_pct: Trailing stop percentage (e.g., 0.015 for 1.5%)
-            max_bars: Maximum bars to hold
-        
-        Returns:
-            Tuple of (exit_price, bars_held, exit_type, mfe, mae)
-            - exit_price: Price at exit
-            - bars_held: Number of bars held
-            - exit_type: 'trailing' or 'time'
-            - mfe: Maximum Favorable Excursion (lowest price %)
-            - mae: Maximum Adverse Excursion (worst spike up %)
-        """
-        n_bars = min(len(high_prices), max_bars)
-        
-        lowest_seen = entry_price
-        highest_seen = entry_price
-        
-        for i in range(n_bars):
-            # Update lowest seen (for trailing - SHORT profits when price goes down)
-            if low_prices[i] < lowest_seen:
-                lowest_seen = low_prices[i]
-            
-            # Update highest seen (for MAE)
-            if high_prices[i] > highest_seen:
-                highest_seen = high_prices[i]
-            
-            # Calculate trailing stop level (for SHORT, stop is above)
-            trailing_level = lowest_seen * (1 + trailing_stop_pct)
-            
-            # Check if trailing stop hit
-            if high_prices[i] >= trailing_level:
-                # Exit at trailing level
-                exit_price = trailing_level
-                bars_held = i + 1
-                exit_type = 'trailing'
-                
-                # Calculate MFE/MAE up to exit point only (inverted for SHORT)
-                mfe = (entry_price - lowest_seen) / entry_price
-                mae = (highest_seen - entry_price) / entry_price
-                
-                return exit_price, bars_held, exit_type, mfe, mae
-        
-        # Time exit (max bars reached)
-        exit_price = close_prices[n_bars - 1] if n_bars > 0 else entry_price
-        bars_held = n_bars
-        exit_type = 'time'
-        
-        # Calculate MFE/MAE up to exit point only
-        mfe = (entry_price - lowest_seen) / entry_price
-        mae = (highest_seen - entry_price) / entry_price
-        
-        return exit_price, bars_held, exit_type, mfe, mae
-    
-    def _calculate_score(
-        self,
-        realized_return: float,
-        bars_held: int
-    ) -> float:
-        """
-        Calculate final score using the approved formula.
-        
-        Formula: score = R - λ*log(1+D) - costs
-        
-        Args:
-            realized_return: R = (exit_price - entry_price) / entry_price
-            bars_held: D = number of bars held
-        
-        Returns:
-            Score (range libero, NON normalizzato)
-        """
-        # Time penalty: λ * log(1 + D)
-        time_penalty = self.config.time_penalty_lambda * log(1 + bars_held)
-        
-        # Final score
-        score = realized_return - time_penalty - self.config.trading_cost
-        
-        return score
-    
     def generate_labels_for_timeframe(
         self,
         df: pd.DataFrame,
         timeframe: str = '15m',
-        progress_callback: callable = None
+        progress_callback: callable = None,
+        use_kernel: bool = True
     ) -> pd.DataFrame:
         """
         Generate labels for a specific timeframe.
@@ -281,6 +120,7 @@ class TrailingStopLabeler:
             df: OHLCV DataFrame with columns [open, high, low, close, volume]
             timeframe: '15m' or '1h'
             progress_callback: Optional callback for progress updates
+            use_kernel: Vectorized kernel (default) or the per-bar Python reference loop
         
         Returns:
             DataFrame with columns:
@@ -301,125 +141,63 @@ class TrailingStopLabeler:
         trailing_stop_pct = self.config.get_trailing_stop_pct(timeframe)
         max_bars = self.config.get_max_bars(timeframe)
         
-        # Convert to numpy for speed
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        
-        n = len(df)
-        
-        # Initialize output arrays
-        score_long = np.full(n, np.nan)
-        score_short = np.full(n, np.nan)
-        realized_return_long = np.full(n, np.nan)
-        realized_return_short = np.full(n, np.nan)
-        mfe_long = np.full(n, np.nan)
-        mfe_short = np.full(n, np.nan)
-        mae_long = np.full(n, np.nan)
-        mae_short = np.full(n, np.nan)
-        bars_held_long = np.full(n, np.nan)
-        bars_held_short = np.full(n, np.nan)
-        exit_type_long = np.empty(n, dtype=object)
-        exit_type_short = np.empty(n, dtype=object)
-        
-        # Process each bar (skip last max_bars - not enough future data)
-        valid_range = n - max_bars
-        
-        for i in range(valid_range):
-            if progress_callback and i % 1000 == 0:
-                progress_callback(i, valid_range, timeframe)
-            
-            entry_price = close[i]
-            
-            # Future price arrays (after entry)
-            future_high = high[i + 1: i + 1 + max_bars]
-            future_low = low[i + 1: i + 1 + max_bars]
-            future_close = close[i + 1: i + 1 + max_bars]
-            
-            # ═══════════════════════════════════════════════════════════════
-            # LONG SIMULATION
-            # ═══════════════════════════════════════════════════════════════
-            
-            exit_price_l, bars_l, exit_t_l, mfe_l, mae_l = self._simulate_trailing_stop_long(
-                entry_price=entry_price,
-                high_prices=future_high,
-                low_prices=future_low,
-                close_prices=future_close,
-                trailing_stop_pct=trailing_stop_pct,
-                max_bars=max_bars
-            )
-            
-            # Realized return for LONG
-            r_long = (exit_price_l - entry_price) / entry_price
-            
-            # Score for LONG
-            s_long = self._calculate_score(r_long, bars_l)
-            
-            # Store LONG results
-            score_long[i] = s_long
-            realized_return_long[i] = r_long
-            mfe_long[i] = mfe_l
-            mae_long[i] = mae_l
-            bars_held_long[i] = bars_l
-            exit_type_long[i] = exit_t_l
-            
-            # ═══════════════════════════════════════════════════════════════
-            # SHORT SIMULATION
-            # ═══════════════════════════════════════════════════════════════
-            
-            exit_price_s, bars_s, exit_t_s, mfe_s, mae_s = self._simulate_trailing_stop_short(
-                entry_price=entry_price,
-                high_prices=future_high,
-                low_prices=future_low,
-                close_prices=future_close,
-                trailing_stop_pct=trailing_stop_pct,
-                max_bars=max_bars
-            )
-            
-            # Realized return for SHORT (profit when price goes down)
-            r_short = (entry_price - exit_price_s) / entry_price
-            
-            # Score for SHORT
-            s_short = self._calculate_score(r_short, bars_s)
-            
-            # Store SHORT results
-            score_short[i] = s_short
-            realized_return_short[i] = r_short
-            mfe_short[i] = mfe_s
-            mae_short[i] = mae_s
-            bars_held_short[i] = bars_s
-            exit_type_short[i] = exit_t_s
-        
-        # Mark last bars as invalid
-        exit_type_long[valid_range:] = 'invalid'
-        exit_type_short[valid_range:] = 'invalid'
-        
-        # Create result DataFrame
-        labels_df = pd.DataFrame({
-            # LABELS (main targets for ML)
-            f'score_long_{tf}': score_long,
-            f'score_short_{tf}': score_short,
-            
-            # DIAGNOSTICS (for analysis, not training)
-            f'realized_return_long_{tf}': realized_return_long,
-            f'realized_return_short_{tf}': realized_return_short,
-            f'mfe_long_{tf}': mfe_long,
-            f'mfe_short_{tf}': mfe_short,
-            f'mae_long_{tf}': mae_long,
-            f'mae_short_{tf}': mae_short,
-            f'bars_held_long_{tf}': bars_held_long,
-            f'bars_held_short_{tf}': bars_held_short,
-            f'exit_type_long_{tf}': exit_type_long,
-            f'exit_type_short_{tf}': exit_type_short,
+        if use_kernel:
+            columns = self._label_arrays_kernel(df, timeframe, trailing_stop_pct, max_bars, progress_callback)
+        else:
+            columns = label_arrays_reference(df, timeframe, trailing_stop_pct, max_bars, self.config.time_penalty_lambda,
+                                             self.config.trading_cost, progress_callback)
+        
+        # LABELS (main targets for ML) first, then DIAGNOSTICS (for analysis, not training)
+        order = ['score', 'realized_return', 'mfe', 'mae', 'bars_held', 'exit_type']
+        return pd.DataFrame({
+            f'{name}_{side}_{tf}': columns[f'{name}_{side}']
+            for name in order for side in ('long', 'short')
         }, index=df.index)
-        
-        return labels_df
+    
+    def _label_arrays_kernel(
+        self,
+        df: pd.DataFrame,
+        timeframe: str,
+        trailing_stop_pct: float,
+        max_bars: int,
+        progress_callback: callable = None
+    ) -> Dict[str, np.ndarray]:
+        """All entries of both sides at once (core.label_kernels), scored vectorized"""
+        callback = None
+        if progress_callback:
+            callback = lambda done, total: progress_callback(done, total, timeframe)
+        
+        sides = trailing_stop_kernel(
+            df['high'].values, df['low'].values, df['close'].values,
+            trailing_stop_pct, max_bars, progress_callback=callback
+        )
+        entry = df['close'].values.astype(np.float64)
+        
+        # λ*log(1+D) per possible D with math.log: identical to label_reference.score()
+        penalty = np.array([self.config.time_penalty_lambda * log(1 + d) for d in range(max_bars + 1)] + [np.nan])
+        
+        columns = {}
+        for side, out in sides.items():
+            valid = out['bars_held'] >= 0
+            if side == 'long':
+                realized = (out['exit_price'] - entry) / entry
+            else:
+                realized = (entry - out['exit_price']) / entry
+            
+            columns[f'score_{side}'] = realized - penalty[out['bars_held']] - self.config.trading_cost
+            columns[f'realized_return_{side}'] = realized
+            columns[f'mfe_{side}'] = out['mfe']
+            columns[f'mae_{side}'] = out['mae']
+            columns[f'bars_held_{side}'] = np.where(valid, out['bars_held'], np.nan)
+            columns[f'exit_type_{side}'] = exit_type_names(out['exit_type'])
+        return columns
     
     def generate_all_labels(
         self,
         df: pd.DataFrame,
         timeframes: List[str] = None,
-        progress_callback: callable = None
+        progress_callback: callable = None,
+        use_kernel: bool = True
     ) -> pd.DataFrame:
         """
         Generate labels for all specified timeframes.
@@ -428,6 +206,7 @@ class TrailingStopLabeler:
             df: OHLCV DataFrame
             timeframes: List of timeframes to process (default: ['15m', '1h'])
             progress_callback: Optional callback for progress updates
+            use_kernel: Vectorized kernel (default) or the Python reference loop
         
         Returns:
             DataFrame with all label columns for all timeframes
@@ -439,7 +218,7 @@ class TrailingStopLabeler:
         
         for tf in timeframes:
             logger.info(f"Generating labels for timeframe: {tf}")
-            labels = self.generate_labels_for_timeframe(df, tf, progress_callback)
+            labels = self.generate_labels_for_timeframe(df, tf, progress_callback, use_kernel)
             all_labels.append(labels)
         
         # Combine all labels
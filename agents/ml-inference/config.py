@@ -16,9 +16,13 @@ MODELS_PATH = f"{SHARED_DATA_PATH}/models"
 # INFERENCE SETTINGS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-# How often to run inference (in seconds)
+# Longest wait between inference runs (in seconds); new candles of
+# INFERENCE_TIMEFRAME ('candles_updated' event) start a run immediately
 INFERENCE_INTERVAL = int(os.environ.get('INFERENCE_INTERVAL', 300))  # 5 minutes
 
+# How often old signals are deleted (in seconds)
+CLEANUP_INTERVAL = 3600  # 1 hour
+
 # Timeframe to use for inference
 INFERENCE_TIMEFRAME = os.environ.get('INFERENCE_TIMEFRAME', '15m')
 
@@ -1,5 +1,8 @@
 """
 🗄️ ML Inference Agent - Database Operations
+
+Signals are written to ml_signals_c (history) and ml_signals_latest (one
+row per series, see core.signals_latest) in one transaction.
 """
 
 import sqlite3
@@ -10,28 +13,24 @@ from typing import List, Dict, Optional
 import pandas as pd
 
 from config import DATABASE_PATH
+from .compact_migration import ensure_compact_tables
+from .compact_schema import compact_name, epoch_ms, from_epoch_ms, get_ids, ts_text
+from .signals_latest import (
+    LATEST_SIGNALS_VIEW, SIGNAL_COLUMNS, delete_expired_signals, ensure_latest_signals, refresh_latest_signals
+)
 
 logger = logging.getLogger(__name__)
 
 
-OHLCV_TABLE = "realtime_ohlcv"
-
-
-def _to_db_timestamp(value) -> str:
-    """Convert a Timestamp-like value into a SQLite-friendly ISO string.
-
-    sqlite3 does not accept pandas.Timestamp directly as a bound parameter.
-    We store timestamps as ISO-8601 strings for consistency across agents.
-    """
-
-    if value is None:
-        return ""
+OHLCV_TABLE = compact_name("realtime_ohlcv")
+SIGNALS_TABLE = compact_name("ml_signals")
 
-    try:
-        # pandas.Timestamp supports isoformat()
-        return value.isoformat()
-    except Exception:
-        return str(value)
+SIGNAL_UPSERT_SQL = f"""
+    INSERT OR REPLACE INTO {SIGNALS_TABLE}
+    (symbol_id, tf_id, ts, score_long, score_short,
+     confidence_long, confidence_short, signal_long, signal_short, model_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 def get_connection():
@@ -54,37 +53,19 @@ def get_connection():
 
 
 def init_ml_signals_table():
-    """Create ml_signals table if not exists"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    """
+    Create ml_signals in the compact layout (see core.compact_schema).
     
-    # Create table if not exists (safe for concurrent access)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ml_signals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            symbol TEXT NOT NULL,
-            timeframe TEXT NOT NULL,
-            timestamp DATETIME NOT NULL,
-            score_long REAL,
-            score_short REAL,
-            confidence_long REAL,
-            confidence_short REAL,
-            signal_long TEXT,
-            signal_short TEXT,
-            model_version TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(symbol, timeframe, timestamp)
-        )
-    """)
-    
-    # Index for fast queries
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_ml_signals_symbol_timeframe 
-        ON ml_signals(symbol, timeframe, timestamp DESC)
-    """)
-    
-    conn.commit()
-    conn.close()
+    Also makes sure realtime_ohlcv is migrated, since candles are read
+    from realtime_ohlcv_c directly, and creates the ml_signals_latest board.
+    """
+    conn = get_connection()
+    try:
+        ensure_compact_tables(conn, ['realtime_ohlcv', 'ml_signals'])
+        with conn:
+            ensure_latest_signals(conn)
+    finally:
+        conn.close()
     logger.info("✅ ml_signals table initialized")
 
 
@@ -93,12 +74,22 @@ def get_available_symbols(timeframe: str = '15m') -> List[str]:
     conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT DISTINCT symbol 
-        FROM realtime_ohlcv 
-        WHERE timeframe = ?
-        ORDER BY symbol
-    """, (timeframe,))
+    try:
+        # latest_candles (data-fetcher) has one row per series
+        cursor.execute("""
+            SELECT symbol FROM v_latest_candles WHERE timeframe = ? ORDER BY symbol
+        """, (timeframe,))
+    except sqlite3.OperationalError:
+        cursor.execute(f"""
+            SELECT symbol
+            FROM symbol_ids
+            WHERE EXISTS (
+                SELECT 1 FROM {OHLCV_TABLE}
+                WHERE symbol_id = symbol_ids.id
+                  AND tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
+            )
+            ORDER BY symbol
+        """, (timeframe,))
     
     symbols = [row[0] for row in cursor.fetchall()]
     conn.close()
@@ -109,23 +100,27 @@ def get_available_symbols(timeframe: str = '15m') -> List[str]:
 def get_ohlcv_data(symbol: str, timeframe: str, limit: int = 200) -> Optional[pd.DataFrame]:
     """Get OHLCV data for a symbol"""
     conn = get_connection()
+    ids = get_ids(conn, symbol, timeframe)
+    if ids is None:
+        conn.close()
+        return None
     
-    query = """
-        SELECT timestamp, open, high, low, close, volume
-        FROM realtime_ohlcv
-        WHERE symbol = ? AND timeframe = ?
-        ORDER BY timestamp DESC
+    query = f"""
+        SELECT ts AS timestamp, open, high, low, close, volume
+        FROM {OHLCV_TABLE}
+        WHERE symbol_id = ? AND tf_id = ?
+        ORDER BY ts DESC
         LIMIT ?
     """
     
-    df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
+    df = pd.read_sql_query(query, conn, params=(*ids, limit))
     conn.close()
     
     if df.empty:
         return None
     
-    # Convert timestamp to datetime and sort ascending
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    # Convert epoch ms to datetime and sort ascending
+    df['timestamp'] = from_epoch_ms(df['timestamp'])
     df = df.sort_values('timestamp').reset_index(drop=True)
     
     return df
@@ -133,89 +128,78 @@ def get_ohlcv_data(symbol: str, timeframe: str, limit: int = 200) -> Optional[pd
 
 def save_ml_signal(signal: Dict):
     """Save ML signal to database"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT OR REPLACE INTO ml_signals 
-        (symbol, timeframe, timestamp, score_long, score_short, 
-         confidence_long, confidence_short, signal_long, signal_short, model_version)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        signal['symbol'],
-        signal['timeframe'],
-        _to_db_timestamp(signal.get('timestamp')),
-        signal['score_long'],
-        signal['score_short'],
-        signal['confidence_long'],
-        signal['confidence_short'],
-        signal['signal_long'],
-        signal['signal_short'],
-        signal['model_version']
-    ))
-    
-    conn.commit()
-    conn.close()
+    save_ml_signals_batch([signal])
 
 
 def save_ml_signals_batch(signals: List[Dict]):
-    """Save multiple ML signals in batch"""
+    """Save multiple ML signals in batch (history + latest board, one transaction)"""
     if not signals:
         return
     
     conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.executemany("""
-        INSERT OR REPLACE INTO ml_signals 
-        (symbol, timeframe, timestamp, score_long, score_short, 
-         confidence_long, confidence_short, signal_long, signal_short, model_version)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, [
-        (s['symbol'], s['timeframe'], _to_db_timestamp(s.get('timestamp')), s['score_long'], s['score_short'],
-         s['confidence_long'], s['confidence_short'], s['signal_long'], s['signal_short'], s['model_version'])
-        for s in signals
-    ])
-    
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            ids = [get_ids(conn, s['symbol'], s['timeframe'], create=True) for s in signals]
+            conn.executemany(SIGNAL_UPSERT_SQL, [
+                (*series, epoch_ms(s['timestamp']), s['score_long'], s['score_short'],
+                 s['confidence_long'], s['confidence_short'], s['signal_long'], s['signal_short'],
+                 s['model_version'])
+                for series, s in zip(ids, signals)
+            ])
+            refresh_latest_signals(conn, ids)
+    finally:
+        conn.close()
     logger.info(f"✅ Saved {len(signals)} ML signals to database")
 
 
 def get_latest_signals(timeframe: str = '15m', limit: int = 100) -> pd.DataFrame:
-    """Get latest ML signals for all symbols"""
+    """Get latest ML signals for all symbols (from the ml_signals_latest board)"""
     conn = get_connection()
+    try:
+        df = pd.read_sql_query(f"""
+            SELECT symbol, timeframe, timestamp, {', '.join(SIGNAL_COLUMNS)}
+            FROM {LATEST_SIGNALS_VIEW}
+            WHERE timeframe = ?
+            ORDER BY confidence_long DESC
+            LIMIT ?
+        """, conn, params=(timeframe, limit))
+    finally:
+        conn.close()
     
-    query = """
-        SELECT * FROM ml_signals
-        WHERE timeframe = ?
-        AND timestamp = (
-            SELECT MAX(timestamp) FROM ml_signals s2 
-            WHERE s2.symbol = ml_signals.symbol AND s2.timeframe = ml_signals.timeframe
-        )
-        ORDER BY confidence_long DESC
-        LIMIT ?
-    """
-    
-    df = pd.read_sql_query(query, conn, params=(timeframe, limit))
-    conn.close()
+    return df
+
+
+def get_signal_history(timeframe: str = '15m', symbol: str = None, hours: int = 24) -> pd.DataFrame:
+    """Signals of the last `hours` (one symbol: primary-key range; all symbols: idx_ml_signals_tf_ts)"""
+    conn = get_connection()
+    try:
+        since = epoch_ms(datetime.utcnow()) - hours * 3600 * 1000
+        symbol_filter = "AND d.symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?)" if symbol else ""
+        params = (timeframe, since, symbol) if symbol else (timeframe, since)
+        df = pd.read_sql_query(f"""
+            SELECT s.symbol, t.timeframe, {ts_text('d')} AS timestamp,
+                   {', '.join(f'd.{c}' for c in SIGNAL_COLUMNS)}
+            FROM {SIGNALS_TABLE} d
+            JOIN symbol_ids s ON s.id = d.symbol_id
+            JOIN timeframe_ids t ON t.id = d.tf_id
+            WHERE d.tf_id = (SELECT id FROM timeframe_ids WHERE timeframe = ?)
+              AND d.ts >= ? {symbol_filter}
+            ORDER BY d.ts, s.symbol
+        """, conn, params=params)
+    finally:
+        conn.close()
     
     return df
 
 
 def cleanup_old_signals(days: int = 7):
-    """Remove signals older than N days"""
+    """Remove signals whose candle is older than N days (per-series primary-key range deletes)"""
     conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        DELETE FROM ml_signals 
-        WHERE created_at < datetime('now', ?)
-    """, (f'-{days} days',))
-    
-    deleted = cursor.rowcount
-    conn.commit()
-    conn.close()
+    try:
+        deleted = delete_expired_signals(conn, days)
+    finally:
+        conn.close()
     
     if deleted > 0:
         logger.info(f"🗑️ Cleaned up {deleted} old ML signals")
+    return deleted
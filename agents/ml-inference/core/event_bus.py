@@ -0,0 +1,341 @@
+"""
+🔔 Event Bus Module - Change notification between agents
+
+Agents publish events ("candles updated", "backfill requested", ...) into
+the agent_events table of the shared trading_data.db and subscribe to the
+topics they care about, instead of polling signal files or sleeping a
+fixed interval.
+
+- publish() inserts the event inside the caller's transaction (the event
+  commits atomically with the data it announces); ring() then touches
+  `<db dir>/events/<topic>` so sleeping subscribers wake up
+- EventSubscriber.wait() / wait_async() block on an inotify watch of that
+  directory (no wakeups while idle) and read the new events with one
+  primary-key range query. Without inotify (non-Linux, restricted
+  sandboxes) they poll `PRAGMA data_version` every FALLBACK_POLL_SEC
+- Named subscribers keep their position in agent_event_cursors, so a
+  request published while the agent was down is handled when it starts
+- EventSubscriber.interrupt() (signal-handler safe) wakes a blocked wait
+  through a self-pipe, so daemons can wait with timeout=None and still
+  shut down immediately
+
+Standard library only: shared verbatim by data-fetcher (core/),
+historical-data (core/), ml-inference (core/) and frontend (database/);
+train_local.py loads the historical-data copy by path.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Topics
+CANDLES_UPDATED = 'candles_updated'          # data-fetcher, after each bulk upsert
+REFRESH_REQUESTED = 'refresh_requested'      # frontend → data-fetcher (OHLCV refresh)
+LIST_UPDATE_REQUESTED = 'list_update_requested'  # frontend → data-fetcher (Top 100 + refresh)
+BACKFILL_REQUESTED = 'backfill_requested'    # frontend → historical-data (payload: start/end date)
+LABELS_REBUILT = 'labels_rebuilt'            # frontend labeling pipeline
+MODEL_PROMOTED = 'model_promoted'            # train_local.py → ml-inference
+
+EVENTS_TABLE = 'agent_events'
+CURSORS_TABLE = 'agent_event_cursors'
+EVENTS_KEEP = 1000          # Events kept after each publish (older ids are pruned)
+SAFETY_POLL_SEC = 60        # Re-read the table at least this often even with inotify
+FALLBACK_POLL_SEC = 5       # Poll interval without inotify
+
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+
+EVENTS_TABLE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {EVENTS_TABLE} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        topic TEXT NOT NULL,
+        payload TEXT,
+        created_at TEXT NOT NULL
+    )
+'''
+
+CURSORS_TABLE_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {CURSORS_TABLE} (
+        subscriber TEXT PRIMARY KEY,
+        last_id INTEGER NOT NULL,
+        updated_at TEXT
+    )
+'''
+
+
+@dataclass
+class Event:
+    """One published event"""
+    id: int
+    topic: str
+    payload: Dict = field(default_factory=dict)
+    created_at: str = ''
+
+
+def _now_text() -> str:
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def bell_dir(db_path) -> Path:
+    """Directory of the wake-up files (next to the database on the shared volume)"""
+    return Path(db_path).parent / 'events'
+
+
+def ensure_events_table(conn: sqlite3.Connection):
+    """Create the events and cursor tables (caller commits)"""
+    conn.execute(EVENTS_TABLE_SQL)
+    conn.execute(CURSORS_TABLE_SQL)
+
+
+def publish(conn: sqlite3.Connection, topic: str, payload: Dict = None) -> int:
+    """
+    Record an event inside the caller's transaction; call ring() after the commit.
+
+    Returns:
+        Event id
+    """
+    event_id = conn.execute(
+        f'INSERT INTO {EVENTS_TABLE} (topic, payload, created_at) VALUES (?, ?, ?)',
+        (topic, json.dumps(payload or {}, default=str), _now_text())
+    ).lastrowid
+    conn.execute(f'DELETE FROM {EVENTS_TABLE} WHERE id <= ?', (event_id - EVENTS_KEEP,))
+    return event_id
+
+
+def ring(db_path, *topics: str):
+    """Wake the subscribers sleeping on the bell directory (never raises)"""
+    try:
+        directory = bell_dir(db_path)
+        directory.mkdir(parents=True, exist_ok=True)
+        for topic in topics:
+            (directory / topic).write_text(_now_text())
+    except OSError as e:
+        logger.debug(f"Event bell not rung: {e}")
+
+
+def publish_event(db_path, topic: str, payload: Dict = None, timeout: int = 30) -> int:
+    """publish() in a short transaction of its own, then ring()"""
+    conn = sqlite3.connect(str(db_path), timeout=timeout)
+    try:
+        with conn:
+            ensure_events_table(conn)
+            event_id = publish(conn, topic, payload)
+    finally:
+        conn.close()
+    ring(db_path, topic)
+    return event_id
+
+
+def pending_events(conn: sqlite3.Connection, topic: str, subscriber: str) -> int:
+    """Events of `topic` not yet read by the named subscriber (0 if the tables are missing)"""
+    try:
+        row = conn.execute(f'''
+            SELECT COUNT(*) FROM {EVENTS_TABLE}
+            WHERE topic = ? AND id > COALESCE(
+                (SELECT last_id FROM {CURSORS_TABLE} WHERE subscriber = ?), 0)
+        ''', (topic, subscriber)).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0]
+
+
+def _open_inotify(directory: Path) -> Optional[int]:
+    """Non-blocking inotify descriptor watching `directory` (None if unavailable)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_ATTRIB
+        if libc.inotify_add_watch(fd, str(directory).encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class EventSubscriber:
+    """
+    Receives the events of some topics published after it was created.
+
+    Args:
+        db_path: Shared SQLite database
+        topics: Topics to receive
+        name: Durable subscriber name - the read position is stored in
+            agent_event_cursors and resumed on the next start (None: only
+            events published from now on)
+
+    Usage:
+        subscriber = EventSubscriber(db_path, [REFRESH_REQUESTED], name='data-fetcher')
+        events = subscriber.wait(timeout=900)       # [] on timeout
+        events = await subscriber.wait_async(900)   # asyncio loops
+        subscriber.interrupt()                      # e.g. from a SIGTERM handler
+    """
+
+    def __init__(self, db_path, topics: Iterable[str], name: str = None, timeout: int = 30):
+        self.db_path = str(db_path)
+        self.topics = list(topics)
+        self.name = name
+        self._conn = sqlite3.connect(self.db_path, timeout=timeout)
+        with self._conn:
+            ensure_events_table(self._conn)
+        self._last_id = self._load_cursor()
+        self._data_version = None
+
+        directory = bell_dir(db_path)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+        self._fd = _open_inotify(directory)
+        if self._fd is None:
+            logger.info(f"🔔 inotify unavailable, polling events every {FALLBACK_POLL_SEC}s")
+
+        # Self-pipe written by interrupt(): wakes select() / the loop reader
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._interrupted = False
+
+    def _load_cursor(self) -> int:
+        latest = self._conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {EVENTS_TABLE}').fetchone()[0]
+        if self.name is None:
+            return latest
+        row = self._conn.execute(
+            f'SELECT last_id FROM {CURSORS_TABLE} WHERE subscriber = ?', (self.name,)
+        ).fetchone()
+        if row is None:
+            self._store_cursor(latest)
+            return latest
+        return row[0]
+
+    def _store_cursor(self, last_id: int):
+        with self._conn:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {CURSORS_TABLE} (subscriber, last_id, updated_at) VALUES (?, ?, ?)',
+                (self.name, last_id, _now_text())
+            )
+
+    def poll(self) -> List[Event]:
+        """New events of the subscribed topics (non-blocking)"""
+        # data_version only changes when another connection commits
+        version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+        if version == self._data_version:
+            return []
+        self._data_version = version
+
+        marks = ', '.join('?' * len(self.topics))
+        rows = self._conn.execute(f'''
+            SELECT id, topic, payload, created_at FROM {EVENTS_TABLE}
+            WHERE id > ? AND topic IN ({marks})
+            ORDER BY id
+        ''', (self._last_id, *self.topics)).fetchall()
+        if not rows:
+            return []
+
+        self._last_id = rows[-1][0]
+        if self.name is not None:
+            self._store_cursor(self._last_id)
+        return [Event(row[0], row[1], json.loads(row[2] or '{}'), row[3]) for row in rows]
+
+    @staticmethod
+    def _drain(fd: Optional[int]):
+        """Discard the queued bytes of a non-blocking descriptor (inotify records, wake-ups)"""
+        if fd is None:
+            return
+        try:
+            while os.read(fd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def interrupt(self):
+        """Make the current (or next) wait() / wait_async() return [] (safe in signal handlers)"""
+        self._interrupted = True
+        try:
+            os.write(self._wake_w, b'\0')
+        except OSError:
+            pass  # Pipe full: a wake-up is already pending
+
+    def _consume_interrupt(self) -> bool:
+        if not self._interrupted:
+            return False
+        self._interrupted = False
+        self._drain(self._wake_r)
+        return True
+
+    def _watched(self) -> List[int]:
+        return [self._wake_r] + ([self._fd] if self._fd is not None else [])
+
+    def _step(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds to sleep before the next table read (None: the deadline passed)"""
+        limit = SAFETY_POLL_SEC if self._fd is not None else FALLBACK_POLL_SEC
+        if deadline is None:
+            return limit
+        remaining = deadline - time.monotonic()
+        return min(limit, remaining) if remaining > 0 else None
+
+    def wait(self, timeout: float = None) -> List[Event]:
+        """Block until events arrive (or `timeout` seconds pass / interrupt(): returns [])"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            if self._consume_interrupt():
+                return []
+            events = self.poll()
+            if events:
+                return events
+            step = self._step(deadline)
+            if step is None:
+                return []
+            ready, _, _ = select.select(self._watched(), [], [], step)
+            if self._fd is not None and self._fd in ready:
+                self._drain(self._fd)
+                self._data_version = None
+
+    async def wait_async(self, timeout: float = None) -> List[Event]:
+        """wait() for asyncio loops (the watch and the self-pipe are registered as loop readers)"""
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            if self._consume_interrupt():
+                return []
+            events = self.poll()
+            if events:
+                return events
+            step = self._step(deadline)
+            if step is None:
+                return []
+            ready = loop.create_future()
+            for fd in self._watched():
+                loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+            try:
+                await asyncio.wait_for(ready, step)
+                self._drain(self._fd)
+                self._data_version = None
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                for fd in self._watched():
+                    loop.remove_reader(fd)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        self._conn.close()
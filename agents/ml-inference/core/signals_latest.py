@@ -0,0 +1,140 @@
+"""
+📍 ML Signals Latest - Current signal board and ml_signals history layout
+
+`ml_signals_latest` holds one row per (symbol, timeframe): the newest
+signal of ml_signals_c. save_ml_signals_batch() refreshes the series it
+wrote in the same transaction, so the board is read in constant time no
+matter how much history ml_signals_c accumulates.
+
+v_ml_signals_latest exposes it with symbol / timeframe / timestamp text.
+
+History stays in ml_signals_c, clustered on (symbol_id, tf_id, ts):
+per-symbol history is a primary-key range, and idx_ml_signals_tf_ts
+serves cross-symbol windows of one timeframe. Retention deletes old
+candles per series as primary-key ranges (ts is the partition key).
+"""
+
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Tuple
+
+from .compact_schema import compact_name, epoch_ms, ts_text
+
+logger = logging.getLogger(__name__)
+
+SIGNALS_TABLE = compact_name('ml_signals')
+LATEST_SIGNALS_TABLE = 'ml_signals_latest'
+LATEST_SIGNALS_VIEW = 'v_ml_signals_latest'
+SIGNAL_COLUMNS = [
+    'score_long', 'score_short', 'confidence_long', 'confidence_short',
+    'signal_long', 'signal_short', 'model_version', 'created_at',
+]
+
+LATEST_SIGNALS_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {LATEST_SIGNALS_TABLE} (
+        symbol_id INTEGER NOT NULL,
+        tf_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        score_long REAL, score_short REAL,
+        confidence_long REAL, confidence_short REAL,
+        signal_long TEXT, signal_short TEXT,
+        model_version TEXT,
+        created_at DATETIME,
+        PRIMARY KEY (symbol_id, tf_id)
+    ) WITHOUT ROWID
+'''
+
+LATEST_SIGNALS_VIEW_SQL = f'''
+    CREATE VIEW IF NOT EXISTS {LATEST_SIGNALS_VIEW} AS
+    SELECT s.symbol, t.timeframe, {ts_text('l')} AS timestamp,
+           {', '.join(f'l.{c}' for c in SIGNAL_COLUMNS)}
+    FROM {LATEST_SIGNALS_TABLE} l
+    JOIN symbol_ids s ON s.id = l.symbol_id
+    JOIN timeframe_ids t ON t.id = l.tf_id
+'''
+
+# Cross-symbol history of one timeframe ("all signals of the last 24h")
+HISTORY_INDEX_SQL = f'CREATE INDEX IF NOT EXISTS idx_ml_signals_tf_ts ON {SIGNALS_TABLE} (tf_id, ts)'
+
+# Newest signal of one series (primary-key seek)
+REFRESH_SQL = f'''
+    INSERT OR REPLACE INTO {LATEST_SIGNALS_TABLE} (symbol_id, tf_id, ts, {', '.join(SIGNAL_COLUMNS)})
+    SELECT symbol_id, tf_id, ts, {', '.join(SIGNAL_COLUMNS)}
+    FROM {SIGNALS_TABLE}
+    WHERE symbol_id = :sid AND tf_id = :tid
+      AND ts = (SELECT MAX(ts) FROM {SIGNALS_TABLE} WHERE symbol_id = :sid AND tf_id = :tid)
+'''
+
+
+def ensure_latest_signals(conn: sqlite3.Connection) -> bool:
+    """
+    Create ml_signals_latest, its view and the history index (caller commits).
+
+    Returns:
+        True if the table was created and filled from ml_signals_c
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (LATEST_SIGNALS_TABLE,)
+    ).fetchone()
+    conn.execute(LATEST_SIGNALS_SQL)
+    conn.execute(LATEST_SIGNALS_VIEW_SQL)
+    conn.execute(HISTORY_INDEX_SQL)
+    if exists:
+        return False
+
+    series = conn.execute(f'''
+        SELECT s.id, t.id FROM symbol_ids s, timeframe_ids t
+        WHERE EXISTS (SELECT 1 FROM {SIGNALS_TABLE} WHERE symbol_id = s.id AND tf_id = t.id)
+    ''').fetchall()
+    refresh_latest_signals(conn, series)
+    if series:
+        logger.info(f"📍 ml_signals_latest initialized ({len(series)} series)")
+    return True
+
+
+def refresh_latest_signals(conn: sqlite3.Connection, series: Iterable[Tuple[int, int]]) -> int:
+    """
+    Re-read the newest signal of each (symbol_id, tf_id) into ml_signals_latest.
+
+    Runs inside the caller's transaction (the batch save).
+
+    Returns:
+        Number of series refreshed
+    """
+    params = [{'sid': sid, 'tid': tid} for sid, tid in dict.fromkeys(series)]
+    if params:
+        conn.executemany(REFRESH_SQL, params)
+    return len(params)
+
+
+def delete_expired_signals(conn: sqlite3.Connection, days: int, series_per_batch: int = 50,
+                           now: datetime = None, pause_sec: float = 0.05) -> int:
+    """
+    Delete signals whose candle is older than `days`, one primary-key range per series.
+
+    Series are taken from ml_signals_latest and deleted in short transactions
+    of `series_per_batch` ranges. Board rows whose newest signal expired are
+    removed with their series.
+
+    Returns:
+        Number of history rows deleted
+    """
+    cutoff = epoch_ms((now or datetime.utcnow()) - timedelta(days=days))
+    series = conn.execute(f'SELECT symbol_id, tf_id FROM {LATEST_SIGNALS_TABLE}').fetchall()
+
+    deleted = 0
+    for i in range(0, len(series), series_per_batch):
+        batch = [(sid, tid, cutoff) for sid, tid in series[i:i + series_per_batch]]
+        with conn:
+            for params in batch:
+                deleted += conn.execute(
+                    f'DELETE FROM {SIGNALS_TABLE} WHERE symbol_id = ? AND tf_id = ? AND ts < ?', params
+                ).rowcount
+            conn.executemany(
+                f'DELETE FROM {LATEST_SIGNALS_TABLE} WHERE symbol_id = ? AND tf_id = ? AND ts < ?', batch
+            )
+        if pause_sec and i + series_per_batch < len(series):
+            time.sleep(pause_sec)
+    return deleted
@@ -1,7 +1,10 @@
 """
 🤖 ML Inference Agent - Main Entry Point
 
-Runs inference on all symbols periodically and saves to database.
+Runs inference on all symbols and saves to database:
+- as soon as the data-fetcher publishes 'candles_updated' for INFERENCE_TIMEFRAME
+- at the latest every INFERENCE_INTERVAL seconds
+- 'model_promoted' (train_local.py) reloads the models without a restart
 """
 
 import time
@@ -10,9 +13,11 @@ import sys
 from datetime import datetime
 
 from config import (
+    DATABASE_PATH,
     INFERENCE_INTERVAL, 
     INFERENCE_TIMEFRAME, 
     CANDLES_FOR_FEATURES,
+    CLEANUP_INTERVAL,
     LOG_LEVEL
 )
 from core.database import (
@@ -22,6 +27,7 @@ from core.database import (
     save_ml_signals_batch,
     cleanup_old_signals
 )
+from core.event_bus import CANDLES_UPDATED, MODEL_PROMOTED, EventSubscriber
 from core.predictor import MLPredictor
 
 # Setup logging
@@ -101,6 +107,34 @@ def run_inference_cycle(predictor: MLPredictor, timeframe: str):
     logger.info(f"⏱️ Inference cycle completed in {elapsed:.2f}s")
 
 
+def wait_for_next_cycle(subscriber: EventSubscriber, predictor: MLPredictor) -> MLPredictor:
+    """
+    Block until candles of INFERENCE_TIMEFRAME are updated or INFERENCE_INTERVAL passes.
+    
+    A promoted model is loaded on the way (the current one is kept if loading fails).
+    
+    Returns:
+        Predictor to use for the next cycle
+    """
+    deadline = time.time() + INFERENCE_INTERVAL
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return predictor
+        
+        for event in subscriber.wait(timeout=remaining):
+            if event.topic == MODEL_PROMOTED:
+                logger.info(f"🔔 Model promoted ({event.payload.get('version', 'latest')}), reloading...")
+                promoted = MLPredictor()
+                if promoted.load_models("latest"):
+                    predictor = promoted
+                else:
+                    logger.warning("⚠️ Promoted model could not be loaded, keeping the current one")
+            elif INFERENCE_TIMEFRAME in event.payload.get('timeframes', []):
+                logger.info(f"🔔 New {INFERENCE_TIMEFRAME} candles ({event.payload.get('rows', 0):,} rows)")
+                return predictor
+
+
 def main():
     """Main entry point"""
     
@@ -122,8 +156,12 @@ def main():
         logger.error("❌ Failed to load models. Exiting.")
         sys.exit(1)
     
+    # New candles / promoted models wake the loop (no need to replay old events)
+    subscriber = EventSubscriber(DATABASE_PATH, [CANDLES_UPDATED, MODEL_PROMOTED])
+    
     # Main loop
     cycle_count = 0
+    last_cleanup = time.time()
     while True:
         try:
             cycle_count += 1
@@ -135,12 +173,13 @@ def main():
             run_inference_cycle(predictor, INFERENCE_TIMEFRAME)
             
             # Cleanup old signals periodically
-            if cycle_count % 12 == 0:  # Every hour (if interval is 5 min)
+            if time.time() - last_cleanup >= CLEANUP_INTERVAL:
                 cleanup_old_signals(days=7)
+                last_cleanup = time.time()
             
-            # Wait for next cycle
-            logger.info(f"💤 Sleeping for {INFERENCE_INTERVAL}s until next cycle...")
-            time.sleep(INFERENCE_INTERVAL)
+            # Wait for new candles, a promoted model or the next scheduled cycle
+            logger.info(f"💤 Waiting for new {INFERENCE_TIMEFRAME} candles (at most {INFERENCE_INTERVAL}s)...")
+            predictor = wait_for_next_cycle(subscriber, predictor)
             
         except KeyboardInterrupt:
             logger.info("👋 Received shutdown signal. Exiting...")
@@ -149,6 +188,8 @@ def main():
             logger.error(f"❌ Error in inference cycle: {e}")
             logger.info("⏳ Waiting 60s before retry...")
             time.sleep(60)
+    
+    subscriber.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,267 @@
+"""scripts/audit_query_plans
+
+Purpose
+-------
+Schema audit for the shared trading_data.db: runs EXPLAIN QUERY PLAN over
+every SQL statement found in the agents' sources and reports
+- statements that scan a whole table (or a whole non-covering index, one
+  primary-key lookup per row) or sort through a temp B-tree
+- indexes that no statement uses
+- indexes that are redundant (their columns are a prefix of the primary
+  key or of another index on the same table)
+
+With `--apply` the redundant indexes are dropped.
+
+How it works
+------------
+- Walks the .py files of data-fetcher, historical-data, ml-inference and
+  frontend and collects string literals and f-strings that start with
+  SELECT / WITH / UPDATE / DELETE (INSERT only when it contains a SELECT)
+- f-string placeholders are evaluated against the module-level constants
+  of the same file plus the compact_schema helpers (`compact_name`,
+  `ts_text`); statements whose placeholders cannot be resolved are
+  reported as skipped
+- Statements are planned against `db_path`. With `--init` the schema is
+  created first from the CREATE TABLE / CREATE INDEX statements in the
+  sources and ensure_compact_tables(), so an empty file can be audited
+
+Limitations
+-----------
+- Static extraction: queries assembled with `+=` are planned with their
+  base text only, and placeholders filled at run time (column lists built
+  from PRAGMA table_info) are skipped.
+- Plans depend on ANALYZE statistics; audit a copy of the production
+  database for the most representative result.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import importlib
+import re
+import sqlite3
+import sys
+import types
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+AGENTS_DIR = ROOT / "agents"
+DEFAULT_AGENTS = ["data-fetcher", "historical-data", "ml-inference", "frontend"]
+SQL_START = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT)\s")
+DDL_START = re.compile(r"^\s*CREATE\s+(TABLE|INDEX|UNIQUE\s+INDEX)\b", re.IGNORECASE)
+INDEX_IN_PLAN = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+@dataclass
+class Statement:
+    sql: str
+    location: str
+    plan: list = field(default_factory=list)
+    error: str = ""
+
+
+def load_compact_modules():
+    """compact_schema and compact_migration of historical-data (core/__init__ is not run)"""
+    package = types.ModuleType("compact_core")
+    package.__path__ = [str(AGENTS_DIR / "historical-data" / "core")]
+    sys.modules["compact_core"] = package
+    return (importlib.import_module("compact_core.compact_schema"),
+            importlib.import_module("compact_core.compact_migration"))
+
+
+def module_namespace(tree: ast.Module, cs) -> dict:
+    """Module-level constants usable in f-string placeholders"""
+    namespace = {"compact_name": cs.compact_name, "ts_text": cs.ts_text}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                namespace[node.targets[0].id] = eval(compile(ast.Expression(node.value), "<const>", "eval"), dict(namespace))
+            except Exception:
+                continue
+    return namespace
+
+
+def render(node: ast.AST, namespace: dict):
+    """Text of a str constant / f-string, or None when a placeholder is unresolved"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value)
+            continue
+        try:
+            parts.append(str(eval(compile(ast.Expression(value.value), "<placeholder>", "eval"), dict(namespace))))
+        except Exception:
+            return None
+    return "".join(parts)
+
+
+def collect_sources(agents: list[str]):
+    for agent in agents:
+        for path in sorted((AGENTS_DIR / agent).rglob("*.py")):
+            if "__pycache__" not in path.parts:
+                yield path
+
+
+def extract(paths, cs):
+    """(statements, ddl, skipped) found in the sources"""
+    statements, ddl, skipped = [], [], []
+    for path in paths:
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"))
+        except SyntaxError:
+            continue
+        namespace = module_namespace(tree, cs)
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.Constant, ast.JoinedStr)):
+                continue
+            if isinstance(node, ast.Constant) and not isinstance(node.value, str):
+                continue
+            text = render(node, namespace)
+            location = f"{path.relative_to(ROOT)}:{node.lineno}"
+            if text is None:
+                head = "".join(v.value for v in node.values if isinstance(v, ast.Constant))
+                if SQL_START.match(head):
+                    skipped.append(location)
+                continue
+            if DDL_START.match(text):
+                ddl.append(text)
+            elif SQL_START.match(text):
+                if text.lstrip().upper().startswith("INSERT") and "SELECT" not in text.upper():
+                    continue
+                statements.append(Statement(text.strip(), location))
+    return statements, ddl, skipped
+
+
+def init_schema(conn: sqlite3.Connection, ddl: list[str], cm):
+    cm.ensure_compact_tables(conn, migrate=True)
+    for text in ddl:
+        try:
+            conn.execute(text)
+        except sqlite3.Error:
+            continue  # e.g. an index on a table created elsewhere
+    conn.commit()
+
+
+def explain(conn: sqlite3.Connection, statement: Statement):
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {statement.sql}", ()).fetchall()
+    except sqlite3.ProgrammingError:
+        # Named / numbered parameters: bind NULLs
+        count = statement.sql.count("?")
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {statement.sql}", (None,) * count).fetchall()
+        except sqlite3.Error as e:
+            statement.error = str(e)
+            return
+    except sqlite3.Error as e:
+        statement.error = str(e)
+        return
+    statement.plan = [row[-1] for row in rows]
+
+
+def is_costly(line: str) -> bool:
+    """Full table scan, full scan of a non-covering index, or temp B-tree sort"""
+    if line.startswith("SCAN sqlite_master") or line.startswith("SCAN (") or line.startswith("SCAN CONSTANT"):
+        return False
+    if "TEMP B-TREE" in line:
+        return True
+    return line.startswith("SCAN") and "COVERING INDEX" not in line
+
+
+def index_columns(conn: sqlite3.Connection):
+    """{table: {index_name: (columns, origin)}} including the primary key"""
+    result = defaultdict(dict)
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    for table in tables:
+        for row in conn.execute(f"PRAGMA index_list('{table}')"):
+            name, origin = row[1], row[3]
+            columns = tuple(r[2] for r in conn.execute(f"PRAGMA index_info('{name}')"))
+            result[table][name] = (columns, origin)
+        pk = tuple(r[1] for r in sorted(
+            (r for r in conn.execute(f"PRAGMA table_info('{table}')") if r[5]), key=lambda r: r[5]))
+        if pk and not any(origin == "pk" for _, origin in result[table].values()):
+            result[table]["<primary key>"] = (pk, "pk")
+    return result
+
+
+def redundant_indexes(indexes) -> list[tuple[str, str, str]]:
+    """(table, index, covered_by) for explicit indexes that prefix another index"""
+    found = []
+    for table, entries in indexes.items():
+        for name, (columns, origin) in entries.items():
+            if origin != "c":
+                continue
+            for other, (other_columns, _) in entries.items():
+                if other != name and len(other_columns) >= len(columns) and other_columns[:len(columns)] == columns:
+                    if len(other_columns) == len(columns) and other < name and entries[other][1] == "c":
+                        continue  # Exact duplicates: keep the first name
+                    found.append((table, name, other))
+                    break
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN audit of the agents' SQL")
+    parser.add_argument("db_path", help="SQLite database to plan against (a copy of trading_data.db)")
+    parser.add_argument("--init", action="store_true", help="Create the schema from the sources first")
+    parser.add_argument("--agent", choices=DEFAULT_AGENTS, action="append", help="Limit to some agents")
+    parser.add_argument("--apply", action="store_true", help="Drop the redundant indexes")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every statement")
+    args = parser.parse_args()
+
+    cs, cm = load_compact_modules()
+    statements, ddl, skipped = extract(collect_sources(args.agent or DEFAULT_AGENTS), cs)
+
+    conn = sqlite3.connect(args.db_path)
+    if args.init:
+        init_schema(conn, ddl, cm)
+
+    for statement in statements:
+        explain(conn, statement)
+
+    indexes = index_columns(conn)
+    used = {name for s in statements for line in s.plan for name in INDEX_IN_PLAN.findall(line)}
+    planned = [s for s in statements if not s.error]
+    scans = [s for s in planned if any(is_costly(line) for line in s.plan)]
+
+    print(f"Statements: {len(statements)} found, {len(planned)} planned, "
+          f"{len(statements) - len(planned)} failed, {len(skipped)} skipped (unresolved placeholders)")
+
+    print(f"\nFull scans / temp sorts ({len(scans)}):")
+    for s in scans:
+        detail = "; ".join(line for line in s.plan if is_costly(line))
+        print(f"  {s.location:<70} {detail}")
+
+    print("\nIndexes:")
+    for table, entries in sorted(indexes.items()):
+        for name, (columns, origin) in entries.items():
+            status = "used" if name in used or origin == "pk" else "UNUSED"
+            print(f"  {table:<24} {name:<36} ({', '.join(columns)}) [{origin}] {status}")
+
+    redundant = redundant_indexes(indexes)
+    print(f"\nRedundant indexes ({len(redundant)}):")
+    for table, name, other in redundant:
+        print(f"  {table}.{name} is a prefix of {other}")
+        if args.apply:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+    if args.apply and redundant:
+        conn.commit()
+        print("  dropped")
+
+    if args.verbose:
+        print("\nPlans:")
+        for s in statements:
+            print(f"\n{s.location}\n  {' '.join(s.sql.split())[:160]}")
+            for line in s.plan or [f"ERROR: {s.error}"]:
+                print(f"    {line}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
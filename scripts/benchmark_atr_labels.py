@@ -0,0 +1,82 @@
+"""scripts/benchmark_atr_labels
+
+Purpose
+-------
+Throughput of ATRLabeler (agents/frontend/ai/core/labels.py) on a
+synthetic universe: the per-bar Python reference symbol by symbol, the
+vectorized kernels symbol by symbol, and one
+generate_labels_for_universe() call for all symbols (what
+run_labeling_pipeline_single does).
+
+How it works
+------------
+- Loads the frontend ai.core package by path (without its __init__)
+- Builds `--symbols` random-walk series of `--rows` candles each
+- For each `--timeframes` entry times the three modes; the kernel modes
+  run `--repeat` times (best time), the reference once
+  (`--skip-reference` to leave it out)
+- Reports total rows/sec and the speedup over the reference
+- With `--budget SECONDS` exits with status 1 when the universe call for
+  any timeframe exceeds the budget
+
+Limitations
+-----------
+- Synthetic data: the reference stops early on stop exits, so its time
+  depends on volatility; the kernel's depends mostly on max_bars.
+- The ATR (Wilder) smoothing stays a sequential loop over native floats.
+- Timings depend on the host machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_labels import make_frame, timed  # noqa: E402
+from check_atr_label_kernel import load_atr_labels  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ATR label engine benchmark")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=35_000, help="Candles per symbol")
+    parser.add_argument("--timeframes", nargs="+", default=["15m", "1h"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-reference", action="store_true", help="Only time the kernels")
+    parser.add_argument("--budget", type=float, help="Seconds limit for the universe call")
+    args = parser.parse_args()
+
+    labels, _ = load_atr_labels()
+    labeler = labels.ATRLabeler()
+    frames = {f"SYM{k}": make_frame(args.rows, seed=k) for k in range(args.symbols)}
+    total = args.symbols * args.rows
+    failures = []
+
+    print(f"{args.symbols} symbols x {args.rows:,} rows = {total:,} rows")
+    print(f"{'tf':>4} {'mode':>18} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+    for tf in args.timeframes:
+        results = []
+        if not args.skip_reference:
+            results.append(("python per symbol", timed(lambda: [
+                labeler.generate_labels_for_timeframe(df, tf, use_kernel=False) for df in frames.values()], 1)))
+        results.append(("kernel per symbol", timed(lambda: [
+            labeler.generate_labels_for_timeframe(df, tf) for df in frames.values()], args.repeat)))
+        universe = timed(lambda: labeler.generate_labels_for_universe(frames, tf), args.repeat)
+        results.append(("kernel universe", universe))
+
+        baseline = results[0][1]
+        for mode, seconds in results:
+            print(f"{tf:>4} {mode:>18} {seconds:>9.3f} {total / seconds:>12,.0f} {baseline / seconds:>7.1f}x")
+        if args.budget is not None and universe > args.budget:
+            failures.append(f"{tf}: {universe:.3f}s > {args.budget:.3f}s")
+
+    if failures:
+        print("Budget exceeded:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
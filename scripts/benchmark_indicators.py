@@ -0,0 +1,101 @@
+"""scripts/benchmark_indicators
+
+Purpose
+-------
+Times calculate_all_indicators() of data-fetcher and historical-data on
+synthetic OHLCV frames of realtime (300), one-symbol backfill (35k) and
+multi-symbol (350k) size, so indicator regressions are visible before
+they reach production.
+
+How it works
+------------
+- Loads each agent's `core.indicators` module by path (without running the
+  package __init__, which needs API keys / database access)
+- Runs each size `--repeat` times and reports the best time and rows/sec
+- With `--budget SIZE=SECONDS` (repeatable) exits with status 1 when a
+  best time exceeds its budget (usable as a CI gate)
+
+Limitations
+-----------
+- Synthetic random-walk data; timings depend on the host machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "agents"
+AGENTS = {"data-fetcher": "bench_df_core", "historical-data": "bench_hd_core"}
+DEFAULT_SIZES = [300, 35_000, 350_000]
+
+
+def load_indicators(agent: str):
+    package = AGENTS[agent]
+    if package not in sys.modules:
+        module = types.ModuleType(package)
+        module.__path__ = [str(AGENTS_DIR / agent / "core")]
+        sys.modules[package] = module
+    return importlib.import_module(f"{package}.indicators")
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    return pd.DataFrame({
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1e3, 1e6, rows),
+    }, index=pd.date_range("2024-01-01", periods=rows, freq="15min", name="timestamp"))
+
+
+def best_time(func, df: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark calculate_all_indicators")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--agent", choices=list(AGENTS), action="append")
+    parser.add_argument("--budget", action="append", default=[],
+                        help="SIZE=SECONDS limit for the best time (any agent)")
+    args = parser.parse_args()
+
+    budgets = {int(k): float(v) for k, v in (b.split("=") for b in args.budget)}
+    failures = []
+
+    for agent in args.agent or list(AGENTS):
+        indicators = load_indicators(agent)
+        print(f"\n{agent}")
+        for rows in args.sizes:
+            df = make_frame(rows)
+            seconds = best_time(indicators.calculate_all_indicators, df, args.repeat)
+            print(f"  {rows:>9,} rows: {seconds * 1000:10.1f} ms  ({rows / seconds:>14,.0f} rows/s)")
+            if rows in budgets and seconds > budgets[rows]:
+                failures.append(f"{agent} {rows} rows: {seconds:.3f}s > {budgets[rows]:.3f}s")
+
+    if failures:
+        print("\nBudget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""scripts/benchmark_label_sweep
+
+Purpose
+-------
+Cost of a label-optimization trial (agents/frontend/ai/optimizer/
+label_optimizer.py): a full ATRLabeler run per config, as trials used to
+do, against one ATRLabelSweep plus a lookup per config.
+
+    python scripts/benchmark_label_sweep.py --rows 35000 --trials 200
+
+How it works
+------------
+- Loads the frontend ai.core package by path (without its __init__)
+- Draws `--trials` random configs from the optimizer's 15m search space:
+  k_trailing on a 0.1 grid in [0.5, 3.0], max_bars in `--max-bars`,
+  random lambda and cost
+- Times generate_labels_for_timeframe() on the first `--full-trials`
+  configs (per-trial time), then the sweep construction and outcomes()
+  for all configs
+- Reports the per-trial times, the sweep build time and the totals for
+  `--trials` trials
+
+Limitations
+-----------
+- Synthetic random-walk data (scripts/benchmark_labels.make_frame).
+- Optuna itself is not run (its sampler overhead is the same for both).
+- Timings depend on the host machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_labels import make_frame  # noqa: E402
+from check_atr_label_kernel import load_atr_labels  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Label sweep vs full relabeling per trial")
+    parser.add_argument("--rows", type=int, default=35_000)
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--full-trials", type=int, default=10, help="Configs timed with full labeling")
+    parser.add_argument("--max-bars", type=int, nargs=2, default=[12, 96], metavar=("LOW", "HIGH"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    labels, _ = load_atr_labels()
+    sweep_module = importlib.import_module("fe_ai_core.label_sweep")
+    df = make_frame(args.rows, seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    grid = np.round(0.5 + 0.1 * np.arange(26), 10)
+    configs = [(float(rng.choice(grid)), int(rng.integers(args.max_bars[0], args.max_bars[1] + 1)),
+                float(rng.uniform(0.0001, 0.01)), float(rng.uniform(0.0005, 0.003)))
+               for _ in range(args.trials)]
+
+    start = time.perf_counter()
+    for k_trailing, max_bars, lam, cost in configs[:args.full_trials]:
+        config = labels.ATRLabelConfig(k_trailing_15m=k_trailing, max_bars_15m=max_bars,
+                                       time_penalty_lambda=lam, trading_cost=cost)
+        labels.ATRLabeler(config).generate_labels_for_timeframe(df, "15m")
+    full_trial = (time.perf_counter() - start) / max(min(args.full_trials, args.trials), 1)
+
+    start = time.perf_counter()
+    sweep = sweep_module.ATRLabelSweep(df, "15m", grid, tuple(args.max_bars))
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for config in configs:
+        sweep.outcomes(*config)
+    lookup = (time.perf_counter() - start) / max(args.trials, 1)
+
+    print(f"{args.rows:,} rows, {len(grid)} k_trailing values, max_bars {args.max_bars[0]}-{args.max_bars[1]}")
+    print(f"{'full labeling per trial':>26} {full_trial * 1000:>9.1f} ms")
+    print(f"{'sweep build (once)':>26} {build * 1000:>9.1f} ms")
+    print(f"{'sweep lookup per trial':>26} {lookup * 1000:>9.1f} ms   {full_trial / lookup:.0f}x")
+    print(f"{args.trials} trials: {full_trial * args.trials:.2f} s full, {build + lookup * args.trials:.2f} s sweep")
+
+
+if __name__ == "__main__":
+    main()
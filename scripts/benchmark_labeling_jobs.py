@@ -0,0 +1,118 @@
+"""scripts/benchmark_labeling_jobs
+
+Purpose
+-------
+Scaling of the background labeling job (agents/frontend/components/tabs/
+train/labeling_jobs.py) with the number of worker processes, on a
+synthetic training_data universe.
+
+    python scripts/benchmark_labeling_jobs.py --symbols 100 --workers 1 2 4 8
+
+How it works
+------------
+- Creates a scratch SHARED_DATA_PATH (`--dir`, default a temp directory)
+  whose trading_data.db holds `--symbols` random-walk series: 35,040 15m
+  and 8,760 1h candles each, written straight into training_data_c with
+  the table_stats counters rebuilt (so every symbol passes the 95%
+  completeness filter)
+- For each `--workers` value runs start_labeling_job() and polls the
+  labeling_jobs status row until the job ends, like the dashboard does
+- Reports seconds, rows/sec and the speedup over the first run
+
+Limitations
+-----------
+- Needs the frontend dependencies (streamlit is imported by the
+  database and components packages, pyarrow for the Parquet export).
+- The job also refreshes v_xgb_training and exports the lake after each
+  timeframe; that part is sequential and weighs more with more workers.
+- Timings depend on the host: the speedup is bounded by its cores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+FRONTEND_DIR = ROOT / "agents" / "frontend"
+SERIES = (("15m", 35_040, "15min"), ("1h", 8_760, "1h"))
+
+
+def build_universe(symbols: int) -> None:
+    """Synthetic training_data series (the frontend pool creates the schema)"""
+    from database.connection import get_write_connection
+    from database.compact_schema import COMPACT_TABLES, get_ids, to_epoch_ms
+    from database.table_stats import rebuild_stats
+
+    columns = [c for c, _, _ in COMPACT_TABLES["training_data"] if c != "fetched_at"]
+    insert = (f"INSERT OR REPLACE INTO training_data_c (symbol_id, tf_id, ts, {', '.join(columns)}) "
+              f"VALUES ({', '.join(['?'] * (3 + len(columns)))})")
+    conn = get_write_connection()
+    try:
+        for k in range(symbols):
+            rng = np.random.default_rng(k)
+            for tf, rows, freq in SERIES:
+                symbol_id, tf_id = get_ids(conn, f"SYN{k}/USDT:USDT", tf, create=True)
+                close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, rows)))
+                spread = np.abs(rng.normal(0, 0.003, rows)) * close
+                values = {c: np.zeros(rows) for c in columns}
+                values.update(open=close, high=close + spread, low=close - spread, close=close,
+                              volume=rng.uniform(1e3, 1e6, rows))
+                ts = to_epoch_ms(pd.date_range("2025-01-01", periods=rows, freq=freq))
+                conn.executemany(insert, zip([symbol_id] * rows, [tf_id] * rows, ts.tolist(),
+                                             *(values[c].tolist() for c in columns)))
+            conn.commit()
+        rebuild_stats(conn, "training_data")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Labeling job scaling benchmark")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--dir", help="Scratch shared directory (default: a new temp directory)")
+    args = parser.parse_args()
+
+    shared = Path(args.dir or tempfile.mkdtemp(prefix="labeling_bench_"))
+    db_path = shared / "data_cache" / "trading_data.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    os.environ["SHARED_DATA_PATH"] = str(shared)
+    sqlite3.connect(db_path).execute("PRAGMA journal_mode=WAL").fetchall()
+    sys.path.insert(0, str(FRONTEND_DIR))
+
+    from ai.core.labels import ATRLabelConfig
+    from components.tabs.train.labeling_jobs import get_labeling_job, is_labeling_job_running, start_labeling_job
+
+    if not get_labeling_job():
+        print(f"Building {args.symbols} synthetic symbols in {db_path} ...")
+        build_universe(args.symbols)
+
+    print(f"{'workers':>8} {'seconds':>9} {'rows':>11} {'rows/s':>11} {'speedup':>8}  status")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        job_id, message = start_labeling_job(ATRLabelConfig(), workers=workers)
+        if job_id is None:
+            parser.error(message)
+        while is_labeling_job_running():
+            time.sleep(0.2)
+        seconds = time.perf_counter() - start
+        job = get_labeling_job()
+        baseline = baseline or seconds
+        rows = job["rows_written"] or 0
+        print(f"{workers:>8} {seconds:>9.2f} {rows:>11,} {rows / seconds:>11,.0f} {baseline / seconds:>7.1f}x  "
+              f"{job['status']} ({job['failed_tasks']} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""scripts/benchmark_labels
+
+Purpose
+-------
+Throughput of TrailingStopLabeler (agents/ml-features/core/labels.py):
+the vectorized trailing-stop kernel against the per-bar Python reference,
+on synthetic one-symbol series (35k rows ~ one year of 15m candles).
+
+How it works
+------------
+- Loads the ml-features core package by path (without its __init__)
+- Times generate_labels_for_timeframe() for each `--timeframes` entry and
+  each size; the kernel runs `--repeat` times (best time), the reference
+  once (`--skip-reference` to leave it out)
+- Reports rows/sec and the speedup
+- With `--budget SIZE=SECONDS` (repeatable) exits with status 1 when the
+  kernel's best time for a size exceeds its budget
+
+Limitations
+-----------
+- Synthetic random-walk data: the Python reference stops early on trailing
+  exits, so its time depends on volatility; the kernel's does not.
+- Timings depend on the host machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from check_label_kernel import load_labels  # noqa: E402
+
+DEFAULT_SIZES = [5_000, 35_000]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, rows)))
+    spread = np.abs(rng.normal(0, 0.003, rows)) * close
+    return pd.DataFrame({
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1e3, 1e6, rows),
+    }, index=pd.date_range("2024-01-01", periods=rows, freq="15min", name="timestamp"))
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Trailing-stop label kernel benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--timeframes", nargs="+", default=["15m", "1h"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-reference", action="store_true", help="Only time the kernel")
+    parser.add_argument("--budget", action="append", default=[],
+                        help="SIZE=SECONDS limit for the kernel (repeatable)")
+    args = parser.parse_args()
+    budgets = {int(k): float(v) for k, v in (b.split("=") for b in args.budget)}
+
+    labels, _ = load_labels()
+    labeler = labels.TrailingStopLabeler()
+    failures = []
+    print(f"{'rows':>8} {'tf':>4} {'kernel s':>9} {'rows/s':>11} {'python s':>9} {'rows/s':>9} {'speedup':>8}")
+    for rows in args.sizes:
+        df = make_frame(rows)
+        for tf in args.timeframes:
+            kernel = timed(lambda: labeler.generate_labels_for_timeframe(df, tf), args.repeat)
+            line = f"{rows:>8,} {tf:>4} {kernel:>9.3f} {rows / kernel:>11,.0f}"
+            if not args.skip_reference:
+                python = timed(lambda: labeler.generate_labels_for_timeframe(df, tf, use_kernel=False), 1)
+                line += f" {python:>9.2f} {rows / python:>9,.0f} {python / kernel:>7.0f}x"
+            print(line)
+            if rows in budgets and kernel > budgets[rows]:
+                failures.append(f"{rows} rows {tf}: {kernel:.3f}s > {budgets[rows]:.3f}s")
+
+    if failures:
+        print("Budget exceeded:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""scripts/benchmark_realtime_upsert
+
+Purpose
+-------
+Compares the legacy per-row realtime_ohlcv write path (iterrows + one
+execute per candle + one commit per symbol) against RealtimeBulkWriter
+(one executemany, one transaction per cycle) on a synthetic fetch cycle.
+
+Default cycle: 150 symbols x 4 timeframes x 300 candles (~180k rows).
+
+How it works
+------------
+- Builds random OHLCV frames and runs the data-fetcher indicators on them
+- Writes the cycle into two temporary SQLite databases, one per path
+- Prints elapsed time and rows/sec for both paths
+
+Limitations
+-----------
+- Uses a temporary local file, so numbers reflect local disk, not the
+  Docker shared volume.
+- The legacy path is reproduced here verbatim for comparison only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "agents" / "data-fetcher"))
+
+from core.bulk_writer import RealtimeBulkWriter  # noqa: E402
+from core.database_cache import DatabaseCache  # noqa: E402
+from core.indicators import INDICATOR_COLUMNS, calculate_all_indicators  # noqa: E402
+
+TIMEFRAMES = ["15m", "1h", "4h", "1d"]
+
+
+def make_frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    df = pd.DataFrame({
+        "open": close + rng.normal(0, 0.002, rows) * close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1e3, 1e6, rows),
+    }, index=pd.date_range("2026-01-01", periods=rows, freq="15min", name="timestamp"))
+    return calculate_all_indicators(df)
+
+
+def legacy_save(db: DatabaseCache, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+    conn = db._get_connection()
+    cur = conn.cursor()
+    data = df.reset_index()
+    data["timestamp"] = data["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S")
+    count = 0
+    for _, row in data.iterrows():
+        cols = "symbol, timeframe, timestamp, open, high, low, close, volume"
+        placeholders = "?, ?, ?, ?, ?, ?, ?, ?"
+        values = [symbol, timeframe, row["timestamp"],
+                  float(row["open"]), float(row["high"]),
+                  float(row["low"]), float(row["close"]), float(row["volume"])]
+        for col in INDICATOR_COLUMNS:
+            cols += f", {col}"
+            placeholders += ", ?"
+            val = row.get(col, None)
+            values.append(None if val is None or pd.isna(val) else float(val))
+        cur.execute(f"INSERT OR REPLACE INTO realtime_ohlcv ({cols}) VALUES ({placeholders})", values)
+        count += 1
+    conn.commit()
+    conn.close()
+    return count
+
+
+def run(symbols: int, rows: int) -> None:
+    base = make_frame(rows, seed=0)
+    cycle = [(f"SYM{i}/USDT:USDT", tf, base) for i in range(symbols) for tf in TIMEFRAMES]
+    total_rows = len(cycle) * rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = DatabaseCache(str(Path(tmp) / "legacy.db"))
+        start = time.perf_counter()
+        for symbol, tf, df in cycle:
+            legacy_save(legacy_db, symbol, tf, df)
+        legacy_sec = time.perf_counter() - start
+
+        bulk_db = DatabaseCache(str(Path(tmp) / "bulk.db"))
+        start = time.perf_counter()
+        writer = RealtimeBulkWriter(bulk_db)
+        for symbol, tf, df in cycle:
+            writer.add(symbol, tf, df)
+        writer.flush()
+        bulk_sec = time.perf_counter() - start
+
+    print(f"Cycle: {symbols} symbols x {len(TIMEFRAMES)} timeframes x {rows} rows = {total_rows:,} rows")
+    print(f"  legacy per-row : {legacy_sec:8.2f}s  ({total_rows / legacy_sec:>12,.0f} rows/s)")
+    print(f"  bulk executemany: {bulk_sec:8.2f}s  ({total_rows / bulk_sec:>12,.0f} rows/s)")
+    print(f"  speedup        : {legacy_sec / bulk_sec:8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark realtime_ohlcv write paths")
+    parser.add_argument("--symbols", type=int, default=150)
+    parser.add_argument("--rows", type=int, default=300)
+    args = parser.parse_args()
+    run(args.symbols, args.rows)
+
+
+if __name__ == "__main__":
+    main()
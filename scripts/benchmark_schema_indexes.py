@@ -0,0 +1,204 @@
+"""scripts/benchmark_schema_indexes
+
+Purpose
+-------
+Measures what the index rationalization buys on training_data: insert
+throughput and hot-query latency of the v1 layout (rowid table, UNIQUE
+key and five overlapping secondary indexes) against the compact v2 layout
+(WITHOUT ROWID primary key only).
+
+How it works
+------------
+- Creates two temporary databases: v1 with the DDL reproduced verbatim from
+  the pre-v2 TrainingDatabase, v2 through compact_migration.ensure_compact_table()
+- Inserts `--symbols` x `--candles` rows per layout (INSERT OR REPLACE, one
+  transaction per symbol, as the bulk writers do), then re-inserts the last
+  `--overlap` candles of each symbol (the incremental-update case)
+- Times the hot queries `--repeat` times on random series and reports the
+  median: latest 300 candles, full series, symbol list, timeframes of a symbol
+- Prints the file size of both databases
+
+Limitations
+-----------
+- Synthetic random data on a local temporary file; absolute numbers depend
+  on the disk, the ratios are what matters.
+- Only training_data is modelled; realtime_ohlcv has the same key layout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "agents"
+VALUE_COLUMNS = ["open", "high", "low", "close", "volume",
+                 "sma_20", "sma_50", "ema_12", "ema_26", "bb_upper", "bb_mid", "bb_lower",
+                 "macd", "macd_signal", "macd_hist", "rsi", "stoch_k", "stoch_d",
+                 "atr", "volume_sma", "obv"]
+TIMEFRAME = "15m"
+
+# Pre-v2 DDL (TrainingDatabase._init_db), reproduced for comparison only
+V1_DDL = [
+    f"""CREATE TABLE training_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL, timeframe TEXT NOT NULL, timestamp TEXT NOT NULL,
+        {', '.join(f'{c} REAL NOT NULL' for c in VALUE_COLUMNS)},
+        fetched_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(symbol, timeframe, timestamp))""",
+    "CREATE INDEX idx_train_symbol ON training_data(symbol)",
+    "CREATE INDEX idx_train_timeframe ON training_data(timeframe)",
+    "CREATE INDEX idx_train_timestamp ON training_data(timestamp)",
+    "CREATE INDEX idx_train_symbol_tf ON training_data(symbol, timeframe)",
+    "CREATE INDEX idx_train_symbol_tf_ts ON training_data(symbol, timeframe, timestamp)",
+]
+
+
+def load_compact_modules():
+    """compact_schema and compact_migration of historical-data (core/__init__ is not run)"""
+    package = types.ModuleType("compact_core")
+    package.__path__ = [str(AGENTS_DIR / "historical-data" / "core")]
+    sys.modules["compact_core"] = package
+    return (importlib.import_module("compact_core.compact_schema"),
+            importlib.import_module("compact_core.compact_migration"))
+
+
+class Layout:
+    """Insert / query statements of one schema layout"""
+
+    def __init__(self, name: str, path: str, cs, cm):
+        self.name = name
+        self.path = path
+        self.cs = cs
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        placeholders = ", ".join(["?"] * (len(VALUE_COLUMNS) + 3))
+        if name == "v1":
+            for statement in V1_DDL:
+                self.conn.execute(statement)
+            self.insert_sql = (f"INSERT OR REPLACE INTO training_data (symbol, timeframe, timestamp, "
+                               f"{', '.join(VALUE_COLUMNS)}) VALUES ({placeholders})")
+        else:
+            cm.ensure_compact_table(self.conn, "training_data")
+            self.insert_sql = (f"INSERT OR REPLACE INTO training_data_c (symbol_id, tf_id, ts, "
+                               f"{', '.join(VALUE_COLUMNS)}) VALUES ({placeholders})")
+        self.conn.commit()
+
+    def rows(self, symbol: str, index: pd.DatetimeIndex, values: np.ndarray):
+        if self.name == "v1":
+            keys = zip([symbol] * len(index), [TIMEFRAME] * len(index), index.strftime("%Y-%m-%d %H:%M:%S"))
+        else:
+            with self.conn:
+                sid, tid = self.cs.get_ids(self.conn, symbol, TIMEFRAME, create=True)
+            keys = zip([sid] * len(index), [tid] * len(index), self.cs.to_epoch_ms(index).tolist())
+        return [k + tuple(v) for k, v in zip(keys, values.tolist())]
+
+    def insert(self, symbol: str, index: pd.DatetimeIndex, values: np.ndarray) -> int:
+        rows = self.rows(symbol, index, values)
+        with self.conn:
+            self.conn.executemany(self.insert_sql, rows)
+        return len(rows)
+
+    def queries(self):
+        """name -> (sql, params factory taking a symbol)"""
+        if self.name == "v1":
+            series = "WHERE symbol = ? AND timeframe = ?"
+            return {
+                "latest 300": (f"SELECT * FROM training_data {series} ORDER BY timestamp DESC LIMIT 300",
+                               lambda s: (s, TIMEFRAME)),
+                "full series": (f"SELECT * FROM training_data {series} ORDER BY timestamp",
+                                lambda s: (s, TIMEFRAME)),
+                "symbols": ("SELECT DISTINCT symbol FROM training_data ORDER BY symbol", lambda s: ()),
+                "timeframes": ("SELECT DISTINCT timeframe FROM training_data WHERE symbol = ?", lambda s: (s,)),
+            }
+        series = f"WHERE {self.cs.series_filter('d')}"
+        return {
+            "latest 300": (f"SELECT * FROM training_data_c d {series} ORDER BY d.ts DESC LIMIT 300",
+                           lambda s: (s, TIMEFRAME)),
+            "full series": (f"SELECT * FROM training_data_c d {series} ORDER BY d.ts",
+                            lambda s: (s, TIMEFRAME)),
+            "symbols": ("SELECT symbol FROM symbol_ids WHERE EXISTS "
+                        "(SELECT 1 FROM training_data_c WHERE symbol_id = symbol_ids.id) ORDER BY symbol",
+                        lambda s: ()),
+            "timeframes": ("SELECT timeframe FROM timeframe_ids WHERE EXISTS (SELECT 1 FROM training_data_c "
+                           "WHERE symbol_id = (SELECT id FROM symbol_ids WHERE symbol = ?) "
+                           "AND tf_id = timeframe_ids.id)", lambda s: (s,)),
+        }
+
+
+def time_inserts(layout: Layout, symbols, index, data, overlap: int):
+    start = time.perf_counter()
+    rows = sum(layout.insert(symbol, index, data[i]) for i, symbol in enumerate(symbols))
+    bulk = rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rows = sum(layout.insert(symbol, index[-overlap:], data[i][-overlap:]) for i, symbol in enumerate(symbols))
+    incremental = rows / (time.perf_counter() - start)
+    return bulk, incremental
+
+
+def time_queries(layout: Layout, symbols, repeat: int, seed: int):
+    rng = random.Random(seed)
+    results = {}
+    for name, (sql, params) in layout.queries().items():
+        timings = []
+        for _ in range(repeat):
+            symbol = rng.choice(symbols)
+            start = time.perf_counter()
+            layout.conn.execute(sql, params(symbol)).fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark v1 vs compact v2 training_data layout")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--candles", type=int, default=35_000)
+    parser.add_argument("--overlap", type=int, default=300, help="Candles re-inserted per symbol")
+    parser.add_argument("--repeat", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cs, cm = load_compact_modules()
+    rng = np.random.default_rng(args.seed)
+    symbols = [f"SYM{i:03d}/USDT:USDT" for i in range(args.symbols)]
+    index = pd.date_range("2024-01-01", periods=args.candles, freq="15min")
+    data = [rng.random((args.candles, len(VALUE_COLUMNS))) for _ in symbols]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = {}
+        for name in ("v1", "v2"):
+            layout = Layout(name, os.path.join(tmp, f"{name}.db"), cs, cm)
+            bulk, incremental = time_inserts(layout, symbols, index, data, args.overlap)
+            queries = time_queries(layout, symbols, args.repeat, args.seed)
+            layout.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            layout.conn.close()
+            report[name] = (bulk, incremental, queries, os.path.getsize(layout.path))
+
+    total = args.symbols * args.candles
+    print(f"training_data: {args.symbols} symbols x {args.candles:,} candles ({total:,} rows)\n")
+    print(f"{'':<22}{'v1':>14}{'v2':>14}{'gain':>9}")
+    v1, v2 = report["v1"], report["v2"]
+    print(f"{'insert rows/s':<22}{v1[0]:>14,.0f}{v2[0]:>14,.0f}{v2[0] / v1[0]:>8.1f}x")
+    print(f"{'re-insert rows/s':<22}{v1[1]:>14,.0f}{v2[1]:>14,.0f}{v2[1] / v1[1]:>8.1f}x")
+    for name in v1[2]:
+        a, b = v1[2][name] * 1000, v2[2][name] * 1000
+        print(f"{name + ' ms':<22}{a:>14.3f}{b:>14.3f}{a / b:>8.1f}x")
+    print(f"{'size MB':<22}{v1[3] / 1e6:>14,.1f}{v2[3] / 1e6:>14,.1f}{v1[3] / v2[3]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""scripts/build_parquet_lake
+
+Purpose
+-------
+Builds (or rebuilds) the Parquet training-data lake from an existing
+trading_data.db, and compares a cold training load from the lake with the
+same load through v_xgb_training. Run it once after upgrading; after
+that historical-data and the labeling pipeline keep the lake current.
+
+How it works
+------------
+- Loads `compact_schema` and `parquet_lake` from historical-data by path
+  (no API keys needed)
+- For each series of training_data_c (and of v_xgb_training when the view
+  exists) reads the rows in key order and writes them with
+  parquet_lake.write_series(replace=True)
+- With `--benchmark` loads the 21 training features + scores of one
+  timeframe both ways and prints time and DataFrame memory
+
+Limitations
+-----------
+- The lake is a copy: the script reads the whole database once. Stop the
+  labeling pipeline while it runs so xgb_training matches training_labels.
+- Benchmark timings include the OS page cache; drop caches between runs
+  for a true cold read.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "agents"
+FEATURES = ["open", "high", "low", "close", "volume", "sma_20", "sma_50", "ema_12", "ema_26",
+            "bb_upper", "bb_middle", "bb_lower", "rsi", "macd", "macd_signal", "macd_hist",
+            "stoch_k", "stoch_d", "atr", "volume_sma", "obv"]
+SCORES = ["score_long", "score_short"]
+
+
+def load_module(name: str):
+    path = AGENTS_DIR / "historical-data" / "core" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def series_list(conn: sqlite3.Connection, table: str):
+    return conn.execute(f'''
+        SELECT s.symbol, t.timeframe, d.symbol_id, d.tf_id
+        FROM (SELECT DISTINCT symbol_id, tf_id FROM {table}) d
+        JOIN symbol_ids s ON s.id = d.symbol_id
+        JOIN timeframe_ids t ON t.id = d.tf_id
+        ORDER BY t.timeframe, s.symbol
+    ''').fetchall()
+
+
+def export_training_data(conn, cs, lake, root: str) -> int:
+    files = 0
+    for symbol, timeframe, sid, tid in series_list(conn, cs.compact_name("training_data")):
+        df = pd.read_sql_query(f"SELECT * FROM {cs.compact_name('training_data')} "
+                               f"WHERE symbol_id = ? AND tf_id = ? ORDER BY ts", conn, params=(sid, tid))
+        df.index = cs.from_epoch_ms(df.pop("ts")).rename("timestamp")
+        df = df.drop(columns=["symbol_id", "tf_id"])
+        files += lake.write_series(root, "training_data", symbol, timeframe, df, replace=True)
+    return files
+
+
+def export_xgb_training(conn, cs, lake, root: str) -> int:
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='view' AND name='v_xgb_training'").fetchone():
+        return 0
+    files = 0
+    for symbol, timeframe, _, _ in series_list(conn, cs.compact_name("training_labels")):
+        df = pd.read_sql_query("SELECT * FROM v_xgb_training WHERE symbol = ? AND timeframe = ? "
+                               "ORDER BY timestamp", conn, params=(symbol, timeframe))
+        df.index = pd.to_datetime(df.pop("timestamp")).rename("timestamp")
+        files += lake.write_series(root, "xgb_training", symbol, timeframe, df, replace=True)
+    return files
+
+
+def benchmark(conn, lake, root: str, timeframe: str) -> None:
+    start = time.perf_counter()
+    df_sql = pd.read_sql_query(
+        f"SELECT timestamp, symbol, timeframe, {', '.join(FEATURES + SCORES)} FROM v_xgb_training "
+        f"WHERE timeframe = ? ORDER BY symbol, timestamp", conn, params=(timeframe,))
+    df_sql["timestamp"] = pd.to_datetime(df_sql["timestamp"])
+    sql_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df_lake = lake.read_dataset(root, "xgb_training", timeframe, columns=FEATURES + SCORES)
+    lake_time = time.perf_counter() - start
+    if df_lake is None:
+        print("   xgb_training not in the lake")
+        return
+
+    print(f"\nCold load {timeframe}: {len(df_sql):,} rows (SQLite) / {len(df_lake):,} rows (lake)")
+    print(f"{'':<16}{'SQLite':>12}{'Parquet':>12}{'gain':>9}")
+    print(f"{'time s':<16}{sql_time:>12.2f}{lake_time:>12.2f}{sql_time / max(lake_time, 1e-9):>8.1f}x")
+    sql_mb = df_sql.memory_usage(deep=True).sum() / 1e6
+    lake_mb = df_lake.memory_usage(deep=True).sum() / 1e6
+    print(f"{'memory MB':<16}{sql_mb:>12,.0f}{lake_mb:>12,.0f}{sql_mb / max(lake_mb, 1e-9):>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the Parquet training-data lake from trading_data.db")
+    parser.add_argument("db_path", help="Path to trading_data.db")
+    parser.add_argument("--lake", help="Lake directory (default: <db dir>/lake)")
+    parser.add_argument("--skip-export", action="store_true", help="Only run the benchmark")
+    parser.add_argument("--benchmark", metavar="TIMEFRAME", help="Compare a cold load of this timeframe")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        sys.exit(f"Database not found: {args.db_path}")
+
+    cs, lake = load_module("compact_schema"), load_module("parquet_lake")
+    if not lake.PARQUET_AVAILABLE:
+        sys.exit("pyarrow is not installed")
+
+    root = args.lake or str(Path(args.db_path).resolve().parent / "lake")
+    conn = sqlite3.connect(args.db_path, timeout=30)
+
+    if not args.skip_export:
+        start = time.perf_counter()
+        files = export_training_data(conn, cs, lake, root)
+        files_xgb = export_xgb_training(conn, cs, lake, root)
+        print(f"Lake {root}: training_data {files} files, xgb_training {files_xgb} files "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    if args.benchmark:
+        benchmark(conn, lake, root, args.benchmark)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""scripts/check_atr_label_kernel
+
+Purpose
+-------
+Randomized equivalence check between the vectorized ATR label engine
+(agents/frontend/ai/core/label_kernels.py, used by ATRLabeler) and the
+per-bar Python reference (agents/frontend/ai/core/label_reference.py,
+reached through generate_labels_for_timeframe with use_kernel=False).
+
+How it works
+------------
+- Generates random walks with flat segments, zero-range candles (ATR
+  below the 0.1% floor: skipped entries) and gaps large enough to hit a
+  stop on the first bar
+- Random k_fixed_sl / k_trailing / max_bars / atr_period / lambda / cost
+  and kernel block sizes, including series shorter than
+  atr_period + max_bars and blocks smaller than the universe
+- Checks atr_wilder() against calculate_atr_reference(), each symbol's
+  generate_labels_for_timeframe() against the reference, and one
+  generate_labels_for_universe() call over all the case's symbols against
+  the per-symbol references
+- Requires bit-identical float columns (same NaN positions) and identical
+  exit_type labels; exits with status 1 on the first mismatch
+
+Limitations
+-----------
+- The frontend ai.core package is loaded by path without its __init__
+  (which imports the model and dataset modules).
+- On series shorter than atr_period + 1 + max_bars the reference leaves
+  some exit_type cells as None instead of 'invalid'; they are compared as
+  'invalid' (both are dropped by the labeling pipeline).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from check_label_kernel import assert_identical, random_frame  # noqa: E402
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "agents" / "frontend" / "ai" / "core"
+
+
+def load_atr_labels():
+    if "fe_ai_core" not in sys.modules:
+        package = types.ModuleType("fe_ai_core")
+        package.__path__ = [str(CORE_DIR)]
+        sys.modules["fe_ai_core"] = package
+    return importlib.import_module("fe_ai_core.labels"), importlib.import_module("fe_ai_core.label_kernels")
+
+
+def normalized(reference: pd.DataFrame) -> pd.DataFrame:
+    reference = reference.copy()
+    for col in reference.columns:
+        if col.startswith("exit_type"):
+            reference[col] = reference[col].where(reference[col].notna(), "invalid")
+    return reference
+
+
+def run(cases: int, seed: int) -> None:
+    labels, kernels = load_atr_labels()
+    label_reference = importlib.import_module("fe_ai_core.label_reference")
+    rng = np.random.default_rng(seed)
+    default_chunk = kernels.DEFAULT_CHUNK_ROWS
+    for case in range(cases):
+        config = labels.ATRLabelConfig(
+            k_fixed_sl_15m=float(rng.uniform(0.5, 4.0)),
+            k_trailing_15m=float(rng.uniform(0.3, 3.0)),
+            max_bars_15m=int(rng.integers(1, 100)),
+            atr_period=int(rng.integers(2, 30)),
+            time_penalty_lambda=float(rng.uniform(0, 0.01)),
+            trading_cost=float(rng.uniform(0, 0.003)),
+        )
+        labeler = labels.ATRLabeler(config)
+        frames = {f"S{k}": random_frame(rng, int(rng.integers(1, 1500))) for k in range(int(rng.integers(1, 5)))}
+        label = f"case {case} (max_bars={config.max_bars_15m}, atr_period={config.atr_period})"
+
+        kernels.DEFAULT_CHUNK_ROWS = int(rng.integers(1, 2000))
+        try:
+            check_case(label_reference, kernels, labeler, config, frames, label)
+        finally:
+            kernels.DEFAULT_CHUNK_ROWS = default_chunk
+
+    print(f"OK: {cases} random cases, ATR kernels identical to the Python reference")
+
+
+def check_case(label_reference, kernels, labeler, config, frames, label) -> None:
+    references = {}
+    for symbol, df in frames.items():
+        high, low, close = (df[c].to_numpy() for c in ("high", "low", "close"))
+        expected = label_reference.calculate_atr_reference(high, low, close, config.atr_period)
+        if not np.array_equal(expected, kernels.atr_wilder(high, low, close, config.atr_period)):
+            raise AssertionError(f"{label}: atr_wilder differs on {symbol} (rows={len(df)})")
+
+        references[symbol] = normalized(labeler.generate_labels_for_timeframe(df, "15m", use_kernel=False))
+        assert_identical(references[symbol], labeler.generate_labels_for_timeframe(df, "15m"),
+                         f"{label} {symbol} (rows={len(df)})")
+
+    universe = labeler.generate_labels_for_universe(frames, "15m")
+    for symbol, reference in references.items():
+        assert_identical(reference, universe[symbol], f"{label} universe {symbol}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ATR label kernels vs Python reference equivalence")
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        run(args.cases, args.seed)
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""scripts/check_atr_label_sweep
+
+Purpose
+-------
+Randomized equivalence check between the label sweep
+(agents/frontend/ai/core/label_sweep.py, used by LabelOptimizer) and a
+full ATRLabeler.generate_labels_for_timeframe() run per config.
+
+How it works
+------------
+- Random series as scripts/check_atr_label_kernel.py, random k_fixed_sl
+  and atr_period per case, a random vector of k_trailing values and a
+  random max_bars range; sweep block sizes are randomized too
+- Builds one ATRLabelSweep per case, then for several configs (k_trailing
+  from the vector or a new one, max_bars in the range, random lambda and
+  cost) compares sweep.labels() with the labeler's output for that config
+- Requires bit-identical score / realized_return / bars_held / atr_pct
+  columns (same NaN positions) and identical exit_type labels; exits with
+  status 1 on the first mismatch
+
+Limitations
+-----------
+- The sweep does not keep mfe / mae; those columns are not compared.
+- Same path-loading and None-vs-'invalid' caveats as
+  scripts/check_atr_label_kernel.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from check_atr_label_kernel import load_atr_labels, normalized  # noqa: E402
+from check_label_kernel import assert_identical, random_frame  # noqa: E402
+
+
+def run(cases: int, configs: int, seed: int) -> None:
+    labels, kernels = load_atr_labels()
+    sweep_module = importlib.import_module("fe_ai_core.label_sweep")
+    rng = np.random.default_rng(seed)
+    default_chunk = kernels.DEFAULT_CHUNK_ROWS
+    for case in range(cases):
+        base = labels.ATRLabelConfig(
+            k_fixed_sl_15m=float(rng.uniform(0.5, 4.0)),
+            atr_period=int(rng.integers(2, 30)),
+        )
+        low_bars = int(rng.integers(1, 60))
+        max_bars_range = (low_bars, low_bars + int(rng.integers(0, 60)))
+        k_trailings = np.round(rng.uniform(0.3, 3.0, int(rng.integers(1, 8))), 2)
+        df = random_frame(rng, int(rng.integers(1, 1500)))
+        label = f"case {case} (rows={len(df)}, max_bars={max_bars_range}, atr_period={base.atr_period})"
+
+        kernels.DEFAULT_CHUNK_ROWS = int(rng.integers(1, 2000))
+        try:
+            sweep = sweep_module.ATRLabelSweep(df, "15m", k_trailings, max_bars_range, base)
+        finally:
+            kernels.DEFAULT_CHUNK_ROWS = default_chunk
+
+        for _ in range(configs):
+            k_trailing = float(rng.choice(k_trailings)) if rng.random() < 0.8 else float(rng.uniform(0.3, 3.0))
+            config = labels.ATRLabelConfig(
+                k_fixed_sl_15m=base.k_fixed_sl_15m,
+                k_trailing_15m=k_trailing,
+                max_bars_15m=int(rng.integers(max_bars_range[0], max_bars_range[1] + 1)),
+                atr_period=base.atr_period,
+                time_penalty_lambda=float(rng.uniform(0, 0.01)),
+                trading_cost=float(rng.uniform(0, 0.003)),
+            )
+            expected = normalized(labels.ATRLabeler(config).generate_labels_for_timeframe(df, "15m"))
+            expected = expected.drop(columns=[c for c in expected.columns if c.startswith(("mfe", "mae"))])
+            actual = sweep.labels(k_trailing, config.max_bars_15m, config.time_penalty_lambda, config.trading_cost)
+            assert_identical(expected, actual[expected.columns],
+                             f"{label} k_trailing={k_trailing} max_bars={config.max_bars_15m}")
+
+    print(f"OK: {cases} random cases x {configs} configs, label sweep identical to full labeling")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ATR label sweep vs full labeling equivalence")
+    parser.add_argument("--cases", type=int, default=50)
+    parser.add_argument("--configs", type=int, default=10, help="Configs looked up per sweep")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        run(args.cases, args.configs, args.seed)
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""scripts/check_label_kernel
+
+Purpose
+-------
+Randomized equivalence check between the vectorized trailing-stop kernel
+(agents/ml-features/core/label_kernels.py) and the per-bar Python
+reference (agents/ml-features/core/label_reference.py, reached through
+generate_labels_for_timeframe with use_kernel=False).
+
+How it works
+------------
+- Generates random walks with flat segments, zero-range candles and gaps
+  large enough to hit the stop on the first bar
+- Random trailing stop / max_bars / chunk sizes, including series shorter
+  than max_bars (all rows invalid) and chunks smaller than the series
+- Requires bit-identical float columns (same NaN positions) and identical
+  exit_type labels; exits with status 1 on the first mismatch
+
+Limitations
+-----------
+- The ml-features core package is loaded by path without its __init__
+  (which imports the feature calculators).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CORE_DIR = Path(__file__).resolve().parents[1] / "agents" / "ml-features" / "core"
+
+
+def load_labels():
+    if "mlf_core" not in sys.modules:
+        package = types.ModuleType("mlf_core")
+        package.__path__ = [str(CORE_DIR)]
+        sys.modules["mlf_core"] = package
+    return importlib.import_module("mlf_core.labels"), importlib.import_module("mlf_core.label_kernels")
+
+
+def random_frame(rng: np.random.Generator, rows: int) -> pd.DataFrame:
+    steps = rng.normal(0, 0.01, rows)
+    steps[rng.random(rows) < 0.2] = 0.0  # flat candles
+    steps[rng.random(rows) < 0.02] *= 8  # gaps
+    close = 100 * np.exp(np.cumsum(steps))
+    spread = np.abs(rng.normal(0, 0.006, rows)) * close
+    spread[rng.random(rows) < 0.05] = 0.0  # zero-range candles
+    return pd.DataFrame({
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1, 1e5, rows),
+    }, index=pd.date_range("2026-01-01", periods=rows, freq="15min", name="timestamp"))
+
+
+def assert_identical(expected: pd.DataFrame, actual: pd.DataFrame, label: str) -> None:
+    if list(expected.columns) != list(actual.columns):
+        raise AssertionError(f"{label}: columns differ")
+    for col in expected.columns:
+        e, a = expected[col].to_numpy(), actual[col].to_numpy()
+        if col.startswith("exit_type"):
+            if not np.array_equal(e, a):
+                raise AssertionError(f"{label}: {col} differs at row {np.argmax(e != a)}")
+            continue
+        e, a = e.astype(float), a.astype(float)
+        if not np.array_equal(e, a, equal_nan=True):
+            row = np.argmax(~((e == a) | (np.isnan(e) & np.isnan(a))))
+            raise AssertionError(f"{label}: {col} differs at row {row} ({e[row]!r} != {a[row]!r})")
+
+
+def run(cases: int, seed: int) -> None:
+    labels, kernels = load_labels()
+    rng = np.random.default_rng(seed)
+    default_chunk = kernels.DEFAULT_CHUNK_ROWS
+    for case in range(cases):
+        config = labels.TrailingLabelConfig(
+            trailing_stop_pct_15m=float(rng.uniform(0.002, 0.04)),
+            max_bars_15m=int(rng.integers(1, 100)),
+            time_penalty_lambda=float(rng.uniform(0, 0.01)),
+        )
+        rows = int(rng.integers(1, 1500))
+        df = random_frame(rng, rows)
+        labeler = labels.TrailingStopLabeler(config)
+
+        kernels.DEFAULT_CHUNK_ROWS = int(rng.integers(1, 600))
+        reference = labeler.generate_labels_for_timeframe(df, "15m", use_kernel=False)
+        try:
+            vectorized = labeler.generate_labels_for_timeframe(df, "15m")
+        finally:
+            kernels.DEFAULT_CHUNK_ROWS = default_chunk
+        assert_identical(reference, vectorized,
+                         f"case {case} (rows={rows}, max_bars={config.max_bars_15m})")
+
+    print(f"OK: {cases} random series, kernel identical to the Python reference")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Trailing-stop kernel vs Python reference equivalence")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        run(args.cases, args.seed)
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""scripts/check_streaming_indicators
+
+Purpose
+-------
+Randomized equivalence check between the streaming indicator engine
+(agents/data-fetcher/core/streaming_indicators.py) and the batch
+calculate_all_indicators() of the data-fetcher.
+
+For each random series it verifies that:
+- pushing candles one by one into a fresh state reproduces the batch output
+- a state rebuilt from the first k batch rows (IndicatorState.from_history)
+  continues the batch series for the remaining rows
+- a JSON round-trip of the state does not change the continuation
+
+How it works
+------------
+- Generates random walks with flat segments (zero ranges / zero losses)
+- Compares all 16 INDICATOR_COLUMNS with rtol/atol and identical NaN positions
+- Exits with status 1 on the first mismatch
+
+Limitations
+-----------
+- Floating point results differ from pandas by rounding only (default
+  tolerance 1e-9 relative).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "agents" / "data-fetcher"))
+
+from core.indicators import INDICATOR_COLUMNS, calculate_all_indicators  # noqa: E402
+from core.streaming_indicators import IndicatorState, stream_frame  # noqa: E402
+
+
+def random_frame(rng: np.random.Generator, rows: int) -> pd.DataFrame:
+    steps = rng.normal(0, 0.01, rows)
+    steps[rng.random(rows) < 0.2] = 0.0  # flat candles
+    close = 100 * np.exp(np.cumsum(steps))
+    spread = np.abs(rng.normal(0, 0.004, rows)) * close
+    spread[rng.random(rows) < 0.05] = 0.0  # zero-range candles
+    return pd.DataFrame({
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1, 1e5, rows),
+    }, index=pd.date_range("2026-01-01", periods=rows, freq="15min", name="timestamp"))
+
+
+def assert_close(expected: pd.DataFrame, actual: pd.DataFrame, rtol: float, label: str) -> None:
+    for col in INDICATOR_COLUMNS:
+        e = expected[col].to_numpy(dtype=float)
+        a = actual[col].to_numpy(dtype=float)
+        if not np.array_equal(np.isnan(e), np.isnan(a)):
+            raise AssertionError(f"{label}: NaN mismatch in {col}")
+        mask = ~np.isnan(e)
+        scale = np.maximum(np.abs(e[mask]), 1.0)
+        if not np.all(np.abs(e[mask] - a[mask]) <= rtol * scale):
+            worst = np.max(np.abs(e[mask] - a[mask]) / scale)
+            raise AssertionError(f"{label}: {col} differs (max rel err {worst:.2e})")
+
+
+def run(cases: int, seed: int, rtol: float) -> None:
+    rng = np.random.default_rng(seed)
+    for case in range(cases):
+        rows = int(rng.integers(1, 400))
+        df = random_frame(rng, rows)
+        batch = calculate_all_indicators(df)
+
+        assert_close(batch, stream_frame(IndicatorState(), df), rtol, f"case {case} fresh")
+
+        k = int(rng.integers(1, rows + 1))
+        state = IndicatorState.from_history(batch.iloc[:k])
+        state = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+        tail = stream_frame(state, df.iloc[k:])
+        assert_close(batch.iloc[k:], tail, rtol, f"case {case} resumed at {k}")
+
+    print(f"OK: {cases} random series match calculate_all_indicators (rtol={rtol})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming vs batch indicator equivalence")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    args = parser.parse_args()
+    try:
+        run(args.cases, args.seed, args.rtol)
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""scripts/migrate_compact_schema
+
+Purpose
+-------
+Migrates an existing trading_data.db to the compact candle schema (v2)
+offline, before the agents are restarted, and reports what it gained:
+database size and the time of a one-symbol range scan before and after.
+
+The data-fetcher runs the same migration on startup (the other agents wait
+for it); running it here first keeps the (one-off) copy out of the first
+fetch cycle and allows a VACUUM.
+
+How it works
+------------
+- Loads `compact_schema` / `compact_migration` from historical-data by
+  path (no API keys needed)
+- Times `--scans` range reads of the most recent `--window` candles of the
+  busiest training_data series on the legacy table
+- Calls ensure_compact_tables(migrate=True) (copy into <table>_c, drop the legacy
+  table, create the compatibility view), optionally VACUUMs
+- Repeats the range read on training_data_c and prints both timings
+
+Limitations
+-----------
+- Needs exclusive access: stop the agents first (the migration takes a
+  write lock and VACUUM rewrites the whole file).
+- v_xgb_training is rebuilt over the _c tables by the frontend on its
+  next connection, not by this script.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sqlite3
+import sys
+import time
+import types
+from pathlib import Path
+
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "agents"
+
+
+def load_compact_modules():
+    """compact_schema and compact_migration of historical-data (core/__init__ is not run)"""
+    package = types.ModuleType("compact_core")
+    package.__path__ = [str(AGENTS_DIR / "historical-data" / "core")]
+    sys.modules["compact_core"] = package
+    return (importlib.import_module("compact_core.compact_schema"),
+            importlib.import_module("compact_core.compact_migration"))
+
+
+def file_size(db_path: str) -> int:
+    return sum(os.path.getsize(p) for p in (db_path, f"{db_path}-wal") if os.path.exists(p))
+
+
+def busiest_series(conn: sqlite3.Connection, compact: bool):
+    if compact:
+        row = conn.execute('''
+            SELECT s.symbol, t.timeframe FROM training_data_c d
+            JOIN symbol_ids s ON s.id = d.symbol_id
+            JOIN timeframe_ids t ON t.id = d.tf_id
+            GROUP BY d.symbol_id, d.tf_id ORDER BY COUNT(*) DESC LIMIT 1
+        ''').fetchone()
+    else:
+        row = conn.execute('''
+            SELECT symbol, timeframe FROM training_data
+            GROUP BY symbol, timeframe ORDER BY COUNT(*) DESC LIMIT 1
+        ''').fetchone()
+    return row
+
+
+def time_range_scan(conn: sqlite3.Connection, cs, series, window: int, scans: int, compact: bool) -> float:
+    symbol, timeframe = series
+    if compact:
+        sid, tid = cs.get_ids(conn, symbol, timeframe)
+        sql = f'''
+            SELECT ts, open, high, low, close, volume FROM {cs.compact_name("training_data")}
+            WHERE symbol_id = ? AND tf_id = ? ORDER BY ts DESC LIMIT ?
+        '''
+        params = (sid, tid, window)
+    else:
+        sql = '''
+            SELECT timestamp, open, high, low, close, volume FROM training_data
+            WHERE symbol = ? AND timeframe = ? ORDER BY timestamp DESC LIMIT ?
+        '''
+        params = (symbol, timeframe, window)
+
+    timings = []
+    for _ in range(scans):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate trading_data.db to the compact candle schema")
+    parser.add_argument("db_path", help="Path to trading_data.db")
+    parser.add_argument("--tables", nargs="+", help="Subset of tables to migrate (default: all)")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM after migrating to reclaim space")
+    parser.add_argument("--window", type=int, default=5000, help="Candles per timed range scan")
+    parser.add_argument("--scans", type=int, default=5)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        sys.exit(f"Database not found: {args.db_path}")
+
+    cs, cm = load_compact_modules()
+    conn = sqlite3.connect(args.db_path, timeout=30)
+    size_before = file_size(args.db_path)
+
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='training_data'"
+    ).fetchone() is not None
+    series = busiest_series(conn, compact=False) if legacy else None
+    scan_before = time_range_scan(conn, cs, series, args.window, args.scans, False) if series else None
+
+    start = time.perf_counter()
+    migrated = cm.ensure_compact_tables(conn, args.tables, migrate=True)
+    elapsed = time.perf_counter() - start
+
+    if args.vacuum:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    series = series or busiest_series(conn, compact=True)
+    scan_after = time_range_scan(conn, cs, series, args.window, args.scans, True) if series else None
+    size_after = file_size(args.db_path)
+    conn.close()
+
+    print(f"Migrated tables: {', '.join(migrated) or 'none (already v2)'} in {elapsed:.1f}s")
+    print(f"Database size:   {size_before / 1e6:,.1f} MB -> {size_after / 1e6:,.1f} MB")
+    if series:
+        label = f"{series[0]} {series[1]}, last {args.window:,} candles"
+        before = f"{scan_before * 1000:.2f} ms" if scan_before is not None else "n/a"
+        print(f"Range scan ({label}): {before} -> {scan_after * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""scripts/optimize_labels
+
+Purpose
+-------
+Long label-optimization sweeps outside the dashboard: runs (or resumes) a
+persistent Optuna study of the label parameters (k_trailing, max_bars,
+lambda, cost) on the training_data series of one timeframe. The Labeling
+step of the Train tab shows the stored studies.
+
+    python scripts/optimize_labels.py --timeframe 15m --trials 500 --workers 4
+    python scripts/optimize_labels.py -t 1h --objective sharpe_ratio --max-symbols 20
+
+How it works
+------------
+- Adds agents/frontend to sys.path and reads DB_PATH / LABEL_STUDY_STORAGE
+  from its config.py (SHARED_DATA_PATH / LABEL_STUDY_STORAGE env vars);
+  `--db` and `--storage` override them
+- Calls ai.optimizer.label_study.run_label_study(): `--workers` processes
+  share the study, each with `--jobs` trial threads, until `--trials` more
+  trials have finished; hopeless trials are pruned after the first symbols
+- Running it again with the same `--study` name resumes the study
+- Prints the best value and parameters of the whole study
+
+Limitations
+-----------
+- Needs optuna (and SQLAlchemy for the RDB storage); not the dashboard
+  dependencies.
+- Every worker loads the series and builds its own label sweeps: memory
+  grows with `--workers` and `--max-symbols`.
+- SQLite storage serializes the trial writes; with many workers on short
+  trials use a server database URL (`--storage postgresql://...`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+FRONTEND_DIR = Path(__file__).resolve().parents[1] / "agents" / "frontend"
+OBJECTIVES = ["win_rate", "sharpe_ratio", "profit_factor", "expected_value", "total_return", "combo_wr_pf"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Persistent Optuna label optimization")
+    parser.add_argument("--timeframe", "-t", choices=["15m", "1h"], default="15m")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="win_rate")
+    parser.add_argument("--trials", "-n", type=int, default=200, help="Trials to add to the study")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Processes sharing the study")
+    parser.add_argument("--jobs", type=int, default=1, help="Trial threads per process")
+    parser.add_argument("--timeout", type=int, help="Seconds per worker (default: until --trials)")
+    parser.add_argument("--study", help="Study name (default: label_optimization_<timeframe>_<objective>)")
+    parser.add_argument("--symbols", nargs="+", help="Symbols to optimize on (default: all)")
+    parser.add_argument("--max-symbols", type=int, help="Keep the N longest series")
+    parser.add_argument("--db", help="trading_data.db (default: config.DB_PATH)")
+    parser.add_argument("--storage", help="Optuna RDB URL (default: config.LABEL_STUDY_STORAGE)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(FRONTEND_DIR))
+    from config import DB_PATH, LABEL_STUDY_STORAGE
+    from ai.optimizer.label_study import label_study_name, run_label_study
+
+    db_path = args.db or DB_PATH
+    storage = args.storage or LABEL_STUDY_STORAGE
+    study_name = args.study or label_study_name(args.timeframe, args.objective)
+    if not Path(db_path).exists():
+        parser.error(f"Database not found: {db_path}")
+
+    print(f"Study '{study_name}' in {storage}")
+    print(f"{args.trials} trials, {args.workers} workers x {args.jobs} threads, {args.timeframe} {args.objective}")
+    try:
+        result = run_label_study(
+            db_path, storage,
+            timeframe=args.timeframe,
+            objective=args.objective,
+            n_trials=args.trials,
+            study_name=study_name,
+            workers=args.workers,
+            n_jobs=args.jobs,
+            timeout=args.timeout,
+            symbols=args.symbols,
+            max_symbols=args.max_symbols,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("\nInterrupted: finished trials are stored, run again to resume")
+        sys.exit(130)
+
+    states = {}
+    for trial in result.study.trials:
+        states[trial.state.name] = states.get(trial.state.name, 0) + 1
+    print(f"Done in {result.elapsed_time:.1f}s - study trials: "
+          + ", ".join(f"{count} {state.lower()}" for state, count in sorted(states.items())))
+    if not result.best_params:
+        print("No completed trial yet")
+        sys.exit(1)
+    print(f"Best {args.objective}: {result.best_value:.6f}")
+    for name, value in result.best_params.items():
+        print(f"  {name:>22} = {value}")
+
+
+if __name__ == "__main__":
+    main()
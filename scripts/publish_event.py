@@ -0,0 +1,100 @@
+"""scripts/publish_event
+
+Purpose
+-------
+Manual trigger for the agents (replaces touching the old signal files
+`refresh_signal.txt`, `update_list_signal.txt`, `start_backfill.txt`):
+publishes an event on the shared trading_data.db event bus, or lists
+the recent events and the subscriber cursors.
+
+    python scripts/publish_event.py shared/data_cache/trading_data.db refresh_requested
+    python scripts/publish_event.py shared/data_cache/trading_data.db backfill_requested \
+        --payload '{"start_date": "2025-01-01", "end_date": "2025-06-30"}'
+    python scripts/publish_event.py shared/data_cache/trading_data.db --list
+
+How it works
+------------
+- Loads the shared module agents/historical-data/core/event_bus.py by
+  path (standard library only) and calls publish_event(): the event is
+  committed to agent_events, then the bell file `<db dir>/events/<topic>`
+  is rewritten so subscribers sleeping on inotify wake up immediately
+- `--list` prints the last events and, for each durable subscriber
+  (data-fetcher, historical-data), its position and pending events
+
+Limitations
+-----------
+- The bell directory must be on the same filesystem view as the agents'
+  (the shared volume); otherwise they still see the event, but only at
+  their next safety poll (event_bus.SAFETY_POLL_SEC).
+- `--list` counts every event newer than a cursor, not only the topics
+  that subscriber listens to.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import sqlite3
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_event_bus():
+    path = ROOT / "agents" / "historical-data" / "core" / "event_bus.py"
+    spec = importlib.util.spec_from_file_location("event_bus", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def list_events(db_path: str, event_bus, limit: int) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        event_bus.ensure_events_table(conn)
+        rows = conn.execute(
+            f"SELECT id, topic, payload, created_at FROM {event_bus.EVENTS_TABLE} ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        print(f"Last {len(rows)} events:")
+        for event_id, topic, payload, created_at in reversed(rows):
+            print(f"  #{event_id:<6} {created_at}  {topic:<22} {payload}")
+
+        cursors = conn.execute(f"SELECT subscriber, last_id, updated_at FROM {event_bus.CURSORS_TABLE}").fetchall()
+        print("Subscribers:")
+        for subscriber, last_id, updated_at in cursors:
+            pending = conn.execute(
+                f"SELECT COUNT(*) FROM {event_bus.EVENTS_TABLE} WHERE id > ?", (last_id,)
+            ).fetchone()[0]
+            print(f"  {subscriber:<18} last_id={last_id:<6} updated_at={updated_at}  newer events: {pending}")
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    event_bus = load_event_bus()
+    topics = [event_bus.REFRESH_REQUESTED, event_bus.LIST_UPDATE_REQUESTED, event_bus.BACKFILL_REQUESTED,
+              event_bus.CANDLES_UPDATED, event_bus.LABELS_REBUILT, event_bus.MODEL_PROMOTED]
+
+    parser = argparse.ArgumentParser(description="Publish an event on the trading_data.db event bus")
+    parser.add_argument("db_path", help="Path to trading_data.db")
+    parser.add_argument("topic", nargs="?", choices=topics, help="Event topic to publish")
+    parser.add_argument("--payload", default="{}", help="JSON payload (default: {})")
+    parser.add_argument("--list", action="store_true", help="Show recent events and subscriber cursors")
+    parser.add_argument("--limit", type=int, default=20, help="Events shown by --list")
+    args = parser.parse_args()
+
+    if not Path(args.db_path).exists():
+        parser.error(f"database not found: {args.db_path}")
+    if args.topic:
+        payload = json.loads(args.payload)
+        payload.setdefault("source", "cli")
+        event_id = event_bus.publish_event(args.db_path, args.topic, payload)
+        print(f"Published #{event_id} {args.topic} {json.dumps(payload)}")
+    if args.list or not args.topic:
+        list_events(args.db_path, event_bus, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,6 @@ Arguments:
     --output-dir: Custom output directory (default: shared/models)
 """
 
-import os
 import sys
 import json
 import pickle
@@ -36,22 +35,7 @@ from xgboost import XGBRegressor
 import optuna
 from tqdm import tqdm
 
-
-# Feature columns for XGBoost training (21 features)
-FEATURE_COLUMNS = [
-    # OHLCV (5)
-    'open', 'high', 'low', 'close', 'volume',
-    # Moving Averages (4)
-    'sma_20', 'sma_50', 'ema_12', 'ema_26',
-    # Bollinger Bands (3)
-    'bb_upper', 'bb_middle', 'bb_lower',
-    # Momentum (4)
-    'rsi', 'macd', 'macd_signal', 'macd_hist',
-    # Stochastic (2)
-    'stoch_k', 'stoch_d',
-    # Other (3)
-    'atr', 'volume_sma', 'obv'
-]
+from train_local_data import FEATURE_COLUMNS, load_training_data, publish_model_promoted
 
 
 def print_banner():
@@ -66,97 +50,6 @@ def print_banner():
     """)
 
 
-def get_database_path() -> Path:
-    """Get path to SQLite database."""
-    # Try different locations
-    candidates = [
-        Path("shared/data_cache/trading_data.db"),
-        Path("shared/crypto_data.db"),
-        Path("agents/frontend/shared/crypto_data.db"),
-        Path(os.environ.get('SHARED_DATA_PATH', 'shared')) / "data_cache" / "trading_data.db",
-    ]
-    
-    for path in candidates:
-        if path.exists():
-            return path
-    
-    # Default
-    return Path("shared/data_cache/trading_data.db")
-
-
-def load_training_data(timeframe: str, verbose: bool = False) -> pd.DataFrame:
-    """Load training data from database."""
-    import sqlite3
-    
-    db_path = get_database_path()
-    if not db_path.exists():
-        print(f"❌ Database not found at {db_path}")
-        sys.exit(1)
-    
-    print(f"📂 Loading data from: {db_path}")
-    
-    conn = sqlite3.connect(str(db_path))
-    
-    try:
-        # Try v_xgb_training view first
-        try:
-            cur = conn.cursor()
-            cur.execute("PRAGMA table_info(v_xgb_training)")
-            view_cols = [row[1] for row in cur.fetchall()]
-            
-            if view_cols:
-                available_features = [c for c in FEATURE_COLUMNS if c in view_cols]
-                missing_features = [c for c in FEATURE_COLUMNS if c not in view_cols]
-                
-                if verbose:
-                    print(f"\n📊 Feature Check:")
-                    print(f"   Available: {len(available_features)}/{len(FEATURE_COLUMNS)}")
-                    if missing_features:
-                        print(f"   Missing: {', '.join(missing_features[:5])}...")
-                
-                cols_to_select = ['timestamp', 'symbol', 'timeframe']
-                cols_to_select.extend(available_features)
-                cols_to_select.extend(['score_long', 'score_short'])
-                
-                query = f'''
-                    SELECT {', '.join(cols_to_select)}
-                    FROM v_xgb_training
-                    WHERE timeframe = ?
-                    ORDER BY symbol, timestamp
-                '''
-                df = pd.read_sql_query(query, conn, params=(timeframe,))
-                
-                if len(df) > 0:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    print(f"✅ Loaded {len(df):,} samples with {len(available_features)} features")
-                    return df
-                    
-        except Exception as e:
-            if verbose:
-                print(f"   ⚠️ v_xgb_training not available: {e}")
-        
-        # Fallback to ml_training_labels
-        print("⚠️ Using fallback table (limited features)")
-        df = pd.read_sql_query('''
-            SELECT 
-                timestamp, symbol, timeframe,
-                open, high, low, close, volume,
-                score_long, score_short
-            FROM ml_training_labels
-            WHERE timeframe = ?
-            ORDER BY symbol, timestamp
-        ''', conn, params=(timeframe,))
-        
-        if len(df) > 0:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            print(f"📦 Loaded {len(df):,} samples (5 OHLCV features only)")
-        
-        return df
-        
-    finally:
-        conn.close()
-
-
 def prepare_features(df: pd.DataFrame) -> Tuple:
     """Prepare features and targets from dataframe."""
     available = [c for c in FEATURE_COLUMNS if c in df.columns]
@@ -504,6 +397,7 @@ def train_model(
         json.dump(metadata, f, indent=2, default=str)
     
     print(f"   ✅ metadata_{latest_suffix}.json")
+    publish_model_promoted(timeframe, version, output_dir)
     
     # ===== FINAL SUMMARY =====
     print(f"\n{'='*60}")
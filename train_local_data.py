@@ -0,0 +1,203 @@
+"""
+📂 Local Training Data - Inputs and events of train_local.py
+
+- load_training_data(): xgb_training rows of a timeframe, from the Parquet
+  lake when it exists, otherwise from v_xgb_training (SQLite). Series whose
+  features changed since the last labeling run (backfill, clear) are
+  re-materialized first, and then read from SQLite
+- publish_model_promoted(): model_promoted event for the ml-inference agent
+
+The lake and event bus modules are loaded from the historical-data agent
+(agents/historical-data/core), which needs no Docker-only dependencies;
+the v_xgb_training refresh from the frontend's database/xgb_view.py.
+"""
+
+import importlib
+import os
+import sqlite3
+import sys
+import types
+from pathlib import Path
+
+import pandas as pd
+
+AGENTS_DIR = Path(__file__).resolve().parent / "agents"
+
+# Feature columns for XGBoost training (21 features)
+FEATURE_COLUMNS = [
+    # OHLCV (5)
+    'open', 'high', 'low', 'close', 'volume',
+    # Moving Averages (4)
+    'sma_20', 'sma_50', 'ema_12', 'ema_26',
+    # Bollinger Bands (3)
+    'bb_upper', 'bb_middle', 'bb_lower',
+    # Momentum (4)
+    'rsi', 'macd', 'macd_signal', 'macd_hist',
+    # Stochastic (2)
+    'stoch_k', 'stoch_d',
+    # Other (3)
+    'atr', 'volume_sma', 'obv'
+]
+
+
+def get_database_path() -> Path:
+    """Get path to SQLite database."""
+    # Try different locations
+    candidates = [
+        Path("shared/data_cache/trading_data.db"),
+        Path("shared/crypto_data.db"),
+        Path("agents/frontend/shared/crypto_data.db"),
+        Path(os.environ.get('SHARED_DATA_PATH', 'shared')) / "data_cache" / "trading_data.db",
+    ]
+    
+    for path in candidates:
+        if path.exists():
+            return path
+    
+    # Default
+    return Path("shared/data_cache/trading_data.db")
+
+
+def _load_shared_module(name: str, package_dir: str = "historical-data/core"):
+    """
+    A module of an agent package (default agents/historical-data/core/<name>.py).
+
+    The package __init__ is not run, so only the module's own imports are needed.
+    """
+    package = "_shared_" + package_dir.replace("/", "_").replace("-", "_")
+    if package not in sys.modules:
+        module = types.ModuleType(package)
+        module.__path__ = [str(AGENTS_DIR / package_dir)]
+        sys.modules[package] = module
+    return importlib.import_module(f"{package}.{name}")
+
+
+def publish_model_promoted(timeframe: str, version: str, output_dir: Path):
+    """Tell the ml-inference agent that new *_latest models were saved (it reloads them)"""
+    db_path = get_database_path()
+    try:
+        event_bus = _load_shared_module("event_bus")
+        event_bus.publish_event(db_path, event_bus.MODEL_PROMOTED,
+                                {'timeframe': timeframe, 'version': version, 'models_dir': str(output_dir)})
+        print("   🔔 model_promoted event published")
+    except Exception as e:
+        print(f"   ⚠️ model_promoted event not published: {e}")
+
+
+def load_training_lake(timeframe: str, verbose: bool = False) -> pd.DataFrame:
+    """Load the xgb_training Parquet dataset (memory-mapped, only the needed columns)."""
+    lake_path = get_database_path().parent / "lake"
+    try:
+        lake = _load_shared_module("parquet_lake")
+        df = lake.read_dataset(str(lake_path), 'xgb_training', timeframe,
+                               columns=FEATURE_COLUMNS + ['score_long', 'score_short'])
+    except Exception as e:
+        if verbose:
+            print(f"   ⚠️ Parquet lake not available: {e}")
+        return None
+    
+    if df is None or len(df) == 0:
+        return None
+    
+    available_features = [c for c in FEATURE_COLUMNS if c in df.columns]
+    print(f"📂 Loading data from: {lake_path} (Parquet)")
+    print(f"✅ Loaded {len(df):,} samples with {len(available_features)} features "
+          f"({df.memory_usage(deep=False).sum() / 1e6:,.0f} MB)")
+    return df
+
+
+def refresh_stale_xgb_training(db_path: Path, timeframe: str) -> bool:
+    """Re-materialize the v_xgb_training series whose features changed since the last labeling run"""
+    xgb_view = _load_shared_module("xgb_view", "frontend/database")
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        if not xgb_view.xgb_training_stale(conn, timeframe):
+            return False
+        result = xgb_view.refresh_xgb_training(conn, timeframe)
+        print(f"♻️ v_xgb_training was stale: {result['refreshed']} series rebuilt, {result['removed']} removed")
+        return True
+    finally:
+        conn.close()
+
+
+def load_training_data(timeframe: str, verbose: bool = False) -> pd.DataFrame:
+    """Load training data from the Parquet lake, falling back to the database."""
+    db_path = get_database_path()
+    try:
+        stale = db_path.exists() and refresh_stale_xgb_training(db_path, timeframe)
+    except Exception as e:
+        stale = False
+        if verbose:
+            print(f"   ⚠️ v_xgb_training freshness check failed: {e}")
+    
+    # A stale v_xgb_training means a stale lake too: read the refreshed rows
+    df = None if stale else load_training_lake(timeframe, verbose)
+    if df is not None:
+        return df
+    
+    if not db_path.exists():
+        print(f"❌ Database not found at {db_path}")
+        sys.exit(1)
+    
+    print(f"📂 Loading data from: {db_path}")
+    
+    conn = sqlite3.connect(str(db_path))
+    
+    try:
+        # Try v_xgb_training view first
+        try:
+            cur = conn.cursor()
+            cur.execute("PRAGMA table_info(v_xgb_training)")
+            view_cols = [row[1] for row in cur.fetchall()]
+            
+            if view_cols:
+                available_features = [c for c in FEATURE_COLUMNS if c in view_cols]
+                missing_features = [c for c in FEATURE_COLUMNS if c not in view_cols]
+                
+                if verbose:
+                    print(f"\n📊 Feature Check:")
+                    print(f"   Available: {len(available_features)}/{len(FEATURE_COLUMNS)}")
+                    if missing_features:
+                        print(f"   Missing: {', '.join(missing_features[:5])}...")
+                
+                cols_to_select = ['timestamp', 'symbol', 'timeframe']
+                cols_to_select.extend(available_features)
+                cols_to_select.extend(['score_long', 'score_short'])
+                
+                query = f'''
+                    SELECT {', '.join(cols_to_select)}
+                    FROM v_xgb_training
+                    WHERE timeframe = ?
+                    ORDER BY symbol, timestamp
+                '''
+                df = pd.read_sql_query(query, conn, params=(timeframe,))
+                
+                if len(df) > 0:
+                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+                    print(f"✅ Loaded {len(df):,} samples with {len(available_features)} features")
+                    return df
+                    
+        except Exception as e:
+            if verbose:
+                print(f"   ⚠️ v_xgb_training not available: {e}")
+        
+        # Fallback to ml_training_labels
+        print("⚠️ Using fallback table (limited features)")
+        df = pd.read_sql_query('''
+            SELECT 
+                timestamp, symbol, timeframe,
+                open, high, low, close, volume,
+                score_long, score_short
+            FROM ml_training_labels
+            WHERE timeframe = ?
+            ORDER BY symbol, timestamp
+        ''', conn, params=(timeframe,))
+        
+        if len(df) > 0:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            print(f"📦 Loaded {len(df):,} samples (5 OHLCV features only)")
+        
+        return df
+        
+    finally:
+        conn.close()